@@ -6,12 +6,51 @@ Integrates with the existing processor architecture while adding agent decision
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 
 from .simple_agent import SimpleAgent
 from .enhanced_agent import EnhancedAgent
 from orchestration.tool_orchestrator import ToolOrchestrator
+from orchestration.document_session import DocumentSession
+from metrics import tracing
+from metrics.memory import MemoryTracker
+
+
+@dataclass
+class ProcessResult:
+    """
+    Result of processing one document in a batch
+    """
+    index: int
+    success: bool
+    result: Optional[str] = None
+    error: Optional[str] = None
+    execution_time_ms: float = 0.0
+    worker_pid: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None  # Set when SS2_MEMORY_TRACKING is on
+    profile_paths: Optional[Dict[str, str]] = None  # Set when process_many(profile=...)
+
+
+# Warm processor owned by each pool worker process
+_worker_processor: Optional['AgentProcessor'] = None
+
+
+def _init_worker(agent_type: str, audit_dir: Optional[str]) -> None:
+    """Create and warm this worker's processor once, before it receives documents"""
+    global _worker_processor
+    _worker_processor = AgentProcessor(agent_type=agent_type, audit_dir=audit_dir)
+    _worker_processor.warm_up()
+
+
+def _process_in_worker(index: int, instructions: str, report_content: str,
+                       profile: Optional[str] = None, profile_dir: Optional[str] = None) -> ProcessResult:
+    """Process one document with this worker's warm processor"""
+    return _worker_processor._process_one(index, instructions, report_content, profile, profile_dir)
 
 
 class AgentProcessor:
@@ -48,6 +87,21 @@ class AgentProcessor:
         
         # Also maintain tool orchestrator for direct access if needed
         self.tool_orchestrator = ToolOrchestrator(audit_dir=self.audit_dir)
+        
+        # Session for the document being processed in this run
+        self.document_session: Optional[DocumentSession] = None
+    
+    def warm_up(self) -> Dict[str, str]:
+        """
+        Prepare the agent for repeated processing
+        
+        Rules are loaded by the agent itself at construction; this connects
+        the pipeline tool backends and keeps the tool instances for reuse.
+        
+        Returns:
+            Backend status per tool class
+        """
+        return self.agent.tool_orchestrator.warm_up()
     
     def extract_pdf_text(self, pdf_path: str) -> str:
         """
@@ -61,33 +115,33 @@ class AgentProcessor:
         """
         # For Stage 2, agent analyzes input and routes through tools
         # This maintains interface compatibility while adding agent logic
+        # The document session makes sure the PDF is parsed only once for the run
+        session = DocumentSession(pdf_path=pdf_path)
+        self.document_session = session
         
-        agent_result = self.agent.execute(
-            pdf_file=pdf_path,
-            instructions="Extract all text content from the document",
-            operation_type="pdf_extraction",
-            simulate=True  # Default to simulation for Stage 2
-        )
+        with tracing.span('processor.extract_pdf_text', processor='agent'):
+            agent_result = self.agent.execute(
+                pdf_file=pdf_path,
+                instructions="Extract all text content from the document",
+                operation_type="pdf_extraction",
+                simulate=True,  # Default to simulation for Stage 2
+                document_session=session,
+            )
         
         if not agent_result.success:
             raise RuntimeError(f"Agent PDF extraction failed: {agent_result.error}")
         
-        # Extract the PDF text from the workflow result
-        workflow_result = agent_result.workflow_result
-        if isinstance(workflow_result, dict):
-            orchestration_result = workflow_result.get('orchestration_result')
-            if orchestration_result and 'extracted_text' in orchestration_result.context:
-                return orchestration_result.context['extracted_text']
-        
-        # Fallback: use tool orchestrator directly
-        from tools import PDFTool
-        pdf_tool = PDFTool()
-        tool_result = pdf_tool.execute(pdf_path=pdf_path)
+        # Adopt text extracted by the workflow's own pipeline step
+        if session.text is None:
+            workflow_result = agent_result.workflow_result
+            if isinstance(workflow_result, dict):
+                orchestration_result = workflow_result.get('orchestration_result')
+                if orchestration_result and 'extracted_text' in orchestration_result.context:
+                    session.set_text(orchestration_result.context['extracted_text'],
+                                     consumer="tool_orchestrator.pdf_extraction")
         
-        if not tool_result.success:
-            raise RuntimeError(f"PDF extraction failed: {tool_result.error}")
-            
-        return tool_result.data
+        # Fallback: the session extracts the PDF itself if the workflow did not
+        return session.get_text(consumer="agent_processor")
     
     def read_instruction_file(self, md_path: str) -> str:
         """
@@ -125,13 +179,21 @@ class AgentProcessor:
         Returns:
             Analysis result with agent processing metadata
         """
+        # Reuse the session from extract_pdf_text when processing the same text
+        session = self.document_session
+        if session is None or not session.matches(report_content):
+            session = DocumentSession.from_text(report_content)
+            self.document_session = session
+        
         # This is where the agent logic really kicks in
-        agent_result = self.agent.execute(
-            instructions=instructions,
-            document_content=report_content,
-            operation_type="report_processing",
-            simulate=True  # Default to simulation for Stage 2
-        )
+        with tracing.span('processor.process_report', processor='agent'):
+            agent_result = self.agent.execute(
+                instructions=instructions,
+                document_content=report_content,
+                operation_type="report_processing",
+                simulate=True,  # Default to simulation for Stage 2
+                document_session=session,
+            )
         
         if not agent_result.success:
             raise RuntimeError(f"Agent report processing failed: {agent_result.error}")
@@ -143,6 +205,106 @@ class AgentProcessor:
         
         return str(workflow_result)
     
+    def _process_one(self, index: int, instructions: str, report_content: str,
+                     profile: Optional[str] = None, profile_dir: Optional[str] = None) -> ProcessResult:
+        """Process one batch document, capturing failures in the result"""
+        start_time = time.time()
+        memory = MemoryTracker()
+        profiler = None
+        if profile:
+            from metrics.profiling import Profiler
+            profiler = Profiler(profile)
+        try:
+            with memory, profiler or nullcontext():
+                output = self.process_report(instructions, report_content)
+            result = ProcessResult(index=index, success=True, result=output)
+        except Exception as e:
+            result = ProcessResult(index=index, success=False, error=f"{type(e).__name__}: {e}")
+        result.execution_time_ms = (time.time() - start_time) * 1000.0
+        result.worker_pid = os.getpid()
+        if memory.usage:
+            result.peak_memory_bytes = memory.usage.peak_bytes
+        if profiler:
+            paths = profiler.write(profile_dir or '.', prefix=f"profile_doc{index:05d}")
+            result.profile_paths = {kind: str(path) for kind, path in paths.items()}
+        return result
+    
+    def process_many(self, documents: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+                     ordered: bool = False, max_in_flight: Optional[int] = None,
+                     profile: Optional[str] = None, profile_dir: Optional[str] = None) -> Iterator[ProcessResult]:
+        """
+        Process many reports on a pool of worker processes
+        
+        Each worker builds its own processor of the same agent type once and
+        reuses it (loaded rules, connected backends) for every document it
+        receives. Documents are read from the iterable lazily, so at most
+        max_in_flight documents and results are held in memory at a time.
+        
+        Args:
+            documents: Iterable of (instructions, report_content) pairs
+            workers: Number of worker processes (default: SS2_WORKERS or CPU count);
+                     0 processes the documents in this process with this processor
+            ordered: Yield results in submission order instead of completion order
+            max_in_flight: Maximum documents submitted but not yet yielded
+                           (default: twice the number of workers)
+            profile: Profile each document ('sample' or 'cprofile', see
+                     metrics.profiling) in the process that runs it
+            profile_dir: Directory for the profile_docNNNNN files (default: cwd);
+                         each result's profile_paths lists its files
+            
+        Returns:
+            Iterator of ProcessResult, one per document; failures are reported
+            in the result rather than raised
+        """
+        if workers is None:
+            workers = int(os.getenv('SS2_WORKERS', '0') or 0) or os.cpu_count() or 1
+        
+        if workers <= 0:
+            for index, (instructions, report_content) in enumerate(documents):
+                yield self._process_one(index, instructions, report_content, profile, profile_dir)
+            return
+        
+        max_in_flight = max(1, max_in_flight or workers * 2)
+        document_iter = enumerate(documents)
+        pending: Dict[Future, int] = {}
+        completed: Dict[int, ProcessResult] = {}  # Finished but waiting for earlier results (ordered mode)
+        next_index = 0
+        exhausted = False
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.agent_type, self.audit_dir)) as executor:
+            while True:
+                # Keep the pool fed up to the in-flight limit
+                while not exhausted and len(pending) + len(completed) < max_in_flight:
+                    try:
+                        index, (instructions, report_content) = next(document_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(_process_in_worker, index, instructions, report_content,
+                                            profile, profile_dir)] = index
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Worker crashed or the result could not be returned
+                        result = ProcessResult(index=index, success=False, error=f"{type(e).__name__}: {e}")
+                    
+                    if not ordered:
+                        yield result
+                    else:
+                        completed[index] = result
+                
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+    
     def save_results(self, results: str, output_path: str) -> None:
         """
         Save results with agent metadata
@@ -12,12 +12,16 @@ import abc
 import json
 import time
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import os
 
-from tools.base_tool import ToolResult
+from tools.base_tool import ToolResult, audit_timestamp
+from metrics import tracing
+from tools.document_view import DocumentView
+from audit.blob_store import BlobStore
+from audit.serialization import get_serializer
 
 
 @dataclass
@@ -36,9 +40,9 @@ class AgentDecision:
     reasoning: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    def to_json(self) -> str:
-        """Serialize decision to JSON for audit logging"""
-        return json.dumps({
+    def to_dict(self) -> Dict[str, Any]:
+        """Decision as a JSON-compatible dictionary"""
+        return {
             "decision_id": self.decision_id,
             "agent_name": self.agent_name,
             "agent_version": self.agent_version,
@@ -50,7 +54,11 @@ class AgentDecision:
             "confidence_score": self.confidence_score,
             "reasoning": self.reasoning,
             "metadata": self.metadata,
-        }, ensure_ascii=False, indent=2)
+        }
+    
+    def to_json(self) -> str:
+        """Serialize decision to JSON for audit logging"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
 
 
 @dataclass
@@ -69,8 +77,7 @@ class AgentResult:
     
     def add_audit_entry(self, entry: str) -> None:
         """Add entry to agent audit trail"""
-        timestamp = time.strftime('%H:%M:%S.%f')[:-3]
-        self.audit_trail.append(f"[{timestamp}] {entry}")
+        self.audit_trail.append(f"[{audit_timestamp()}] {entry}")
 
 
 class BaseAgent(abc.ABC):
@@ -97,10 +104,16 @@ class BaseAgent(abc.ABC):
         self.audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
         self.audit_dir.mkdir(parents=True, exist_ok=True)
         
+        # Large payloads (e.g. full document text) are stored once as blobs and referenced by hash
+        self.blob_store = BlobStore.for_audit_dir(self.audit_dir) \
+            if os.getenv('SS2_AUDIT_BLOBS', 'true').lower() == 'true' else None
+        self.blob_threshold = int(os.getenv('SS2_AUDIT_BLOB_THRESHOLD', '4096'))
+        
         # Set up agent-specific logger
         import logging
         self.logger = logging.getLogger(f'safety_sigma.agents.{self.name}')
     
+    @tracing.traced_method('agent.execute', agent='name')
     def execute(self, **inputs) -> AgentResult:
         """
         Execute agent with comprehensive decision audit logging
@@ -126,18 +139,21 @@ class BaseAgent(abc.ABC):
         try:
             # Step 1: Analyze inputs
             result.add_audit_entry("Performing input analysis...")
-            input_analysis = self._analyze_inputs(inputs)
+            with tracing.span('agent.analyze', agent=self.name):
+                input_analysis = self._analyze_inputs(inputs)
             result.add_audit_entry(f"Input analysis complete: {len(input_analysis)} characteristics detected")
             
             # Step 2: Make workflow selection decision
             result.add_audit_entry("Making workflow selection decision...")
-            decision = self._make_decision(decision_id, input_analysis, inputs)
+            with tracing.span('agent.decide', agent=self.name):
+                decision = self._make_decision(decision_id, input_analysis, inputs)
             result.decision = decision
             result.add_audit_entry(f"Decision made: {decision.selected_workflow} (confidence: {decision.confidence_score})")
             
             # Step 3: Execute selected workflow
             result.add_audit_entry(f"Executing workflow: {decision.selected_workflow}")
-            workflow_result = self._execute_workflow(decision, inputs, result)
+            with tracing.span('agent.execute_workflow', agent=self.name, workflow=decision.selected_workflow):
+                workflow_result = self._execute_workflow(decision, inputs, result)
             result.workflow_result = workflow_result
             
             result.success = True
@@ -153,9 +169,20 @@ class BaseAgent(abc.ABC):
             end_time = time.time()
             result.execution_time_ms = (end_time - start_time) * 1000.0
             
+            # Record which document the decision was made on and how its text was reused
+            session = inputs.get('document_session')
+            if result.decision and session is not None:
+                result.decision.metadata['document_session'] = session.to_audit()
+            
+            # End-to-end latency of the decision's workflow (read by analysis.perf_report)
+            if result.decision:
+                result.decision.metadata['execution_time_ms'] = result.execution_time_ms
+                result.decision.metadata['success'] = result.success
+            
             # Write decision audit record
             if result.decision:
-                self._write_decision_audit(result.decision)
+                with tracing.span('agent.audit', agent=self.name):
+                    self._write_decision_audit(result.decision)
                 result.add_audit_entry(f"Decision audit record written: {decision_id}")
         
         return result
@@ -220,14 +247,20 @@ class BaseAgent(abc.ABC):
             decision: Agent decision to log
         """
         try:
-            # Write individual decision record
-            decision_file = self.audit_dir / f"agent_decision_{decision.decision_id}.json"
-            decision_file.write_text(decision.to_json(), encoding="utf-8")
-            
-            # Also append to daily agent log
-            daily_log = self.audit_dir / f"agent_decisions_{time.strftime('%Y-%m-%d')}.jsonl"
-            with open(daily_log, 'a', encoding='utf-8') as f:
-                f.write(decision.to_json().replace('\n', '') + '\n')
+            # Replace large payloads with blob references (in-memory decision is unchanged)
+            if self.blob_store is not None:
+                decision = replace(
+                    decision,
+                    input_analysis=self.blob_store.externalize(decision.input_analysis, self.blob_threshold),
+                    metadata=self.blob_store.externalize(decision.metadata, self.blob_threshold),
+                )
+            # Encode once; write the individual decision record and append to the daily agent log
+            serializer = get_serializer()
+            serializer.write(
+                decision.to_dict(),
+                record_path=serializer.record_path(self.audit_dir, f"agent_decision_{decision.decision_id}"),
+                log_path=serializer.log_path(self.audit_dir, f"agent_decisions_{time.strftime('%Y-%m-%d')}"),
+            )
                 
         except Exception as e:
             self.logger.error(f"Failed to write decision audit: {e}")
@@ -237,93 +270,40 @@ class BaseAgent(abc.ABC):
 
 # Utility functions for input analysis
 
-def analyze_document_type(content: str) -> Tuple[str, float]:
+def analyze_document_type(content: Union[str, DocumentView]) -> Tuple[str, float]:
     """
-    Analyze document content to determine type
+    Analyze document content to determine type (see DocumentStats.document_type)
     
     Args:
-        content: Document text content
+        content: Document text content (or a shared DocumentView)
         
     Returns:
         Tuple of (document_type, confidence_score)
     """
-    content_lower = content.lower()
-    
-    # Fraud indicators
-    fraud_keywords = ['fraud', 'scam', 'phishing', 'deception', 'fake', 'suspicious']
-    fraud_score = sum(1 for keyword in fraud_keywords if keyword in content_lower)
-    
-    # Threat intelligence indicators  
-    threat_keywords = ['threat', 'attack', 'malware', 'vulnerability', 'exploit', 'breach']
-    threat_score = sum(1 for keyword in threat_keywords if keyword in content_lower)
-    
-    # Policy/compliance indicators
-    policy_keywords = ['policy', 'compliance', 'regulation', 'guideline', 'standard']
-    policy_score = sum(1 for keyword in policy_keywords if keyword in content_lower)
-    
-    # Determine primary type based on keyword density
-    total_words = len(content.split())
-    word_threshold = max(2, total_words * 0.02)  # At least 2% or 2 words minimum
-    
-    if fraud_score >= word_threshold:
-        return "fraud_analysis", min(0.95, fraud_score / word_threshold)
-    elif threat_score >= word_threshold:
-        return "threat_intelligence", min(0.95, threat_score / word_threshold) 
-    elif policy_score >= word_threshold:
-        return "policy_analysis", min(0.95, policy_score / word_threshold)
-    else:
-        return "general_analysis", 0.7  # Default with moderate confidence
+    return DocumentView.of(content).stats.document_type()
 
 
-def analyze_document_complexity(content: str) -> Tuple[str, float]:
+def analyze_document_complexity(content: Union[str, DocumentView]) -> Tuple[str, float]:
     """
-    Analyze document complexity level
+    Analyze document complexity level (see DocumentStats.complexity)
     
     Args:
-        content: Document text content
+        content: Document text content (or a shared DocumentView)
         
     Returns:
         Tuple of (complexity_level, confidence_score)
     """
-    # Simple metrics for complexity assessment
-    word_count = len(content.split())
-    sentence_count = content.count('.') + content.count('!') + content.count('?')
-    paragraph_count = content.count('\n\n') + 1
-    
-    # Technical terminology indicators
-    technical_patterns = ['API', 'URL', 'IP address', 'hash', 'encryption', 'protocol']
-    technical_score = sum(1 for pattern in technical_patterns if pattern.lower() in content.lower())
-    
-    # Complexity scoring
-    if word_count < 500:
-        complexity = "simple"
-        confidence = 0.9
-    elif word_count < 2000 and technical_score < 5:
-        complexity = "moderate" 
-        confidence = 0.8
-    else:
-        complexity = "complex"
-        confidence = 0.85
-        
-    return complexity, confidence
+    return DocumentView.of(content).stats.complexity()
 
 
-def analyze_document_structure(content: str) -> Dict[str, Any]:
+def analyze_document_structure(content: Union[str, DocumentView]) -> Dict[str, Any]:
     """
-    Analyze document structure characteristics
+    Analyze document structure characteristics (see DocumentStats.structure)
     
     Args:
-        content: Document text content
+        content: Document text content (or a shared DocumentView)
         
     Returns:
         Dictionary with structure analysis
     """
-    return {
-        'has_headers': bool('##' in content or content.count('#') > 0),
-        'has_lists': bool('-' in content or '*' in content or content.count('\n•') > 0),
-        'has_structured_data': bool('{' in content and '}' in content),
-        'line_count': content.count('\n') + 1,
-        'paragraph_count': content.count('\n\n') + 1,
-        'avg_line_length': len(content) / max(1, content.count('\n') + 1),
-        'has_technical_formatting': bool('```' in content or '`' in content),
-    }
\ No newline at end of file
+    return DocumentView.of(content).stats.structure()
\ No newline at end of file
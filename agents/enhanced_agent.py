@@ -11,10 +11,34 @@ from pathlib import Path
 
 from .base_agent import BaseAgent, AgentDecision, AgentResult
 from orchestration.tool_orchestrator import ToolOrchestrator
+from orchestration.document_session import DocumentSession
+from tools.document_view import DocumentView
 from tools.enhanced_extraction_tool import EnhancedExtractionTool
 from rules.document_classifier import DocumentClassifierEngine
 
 
+def assess_complexity(context: Dict[str, Any]) -> str:
+    """
+    Complexity level of a document: simple, moderate or complex
+
+    Args:
+        context: Document context (word_count, has_headers, has_tables, technical_keyword_density)
+
+    Returns:
+        Complexity level
+    """
+    word_count = context.get('word_count', 0)
+    has_structure = context.get('has_headers', False) or context.get('has_tables', False)
+    technical_density = context.get('technical_keyword_density', 0)
+
+    if word_count > 2000 and (has_structure or technical_density > 0.01):
+        return 'complex'
+    elif word_count > 500 and (has_structure or technical_density > 0.005):
+        return 'moderate'
+    else:
+        return 'simple'
+
+
 class EnhancedAgent(BaseAgent):
     """
     Enhanced agent with rule engine integration
@@ -83,14 +107,17 @@ class EnhancedAgent(BaseAgent):
         if not document_content and pdf_file:
             document_content = f"[PDF FILE: {pdf_file}] - Content will be extracted during processing"
         
+        # Shared view: the classifier and the statistics pass reuse its cached forms
+        document_view = DocumentView.of(document_content)
+        
         # Use rule engine for document analysis
         try:
             # Filter out duplicate keys from inputs
             filtered_inputs = {k: v for k, v in inputs.items() 
-                             if k not in ['document_content', 'instructions', 'pdf_file']}
+                             if k not in ['document_content', 'instructions', 'pdf_file', 'document_session']}
             
             classification_result = self.rule_engine.classify_document(
-                document_content=document_content,
+                document_content=document_view,
                 instructions=instructions,
                 pdf_file=pdf_file,
                 **filtered_inputs  # Pass through additional parameters
@@ -131,6 +158,7 @@ class EnhancedAgent(BaseAgent):
                 'has_structured_content': classification_result['context']['has_headers'] or classification_result['context']['has_tables'],
                 'has_contact_info': classification_result['context']['has_emails'] or classification_result['context']['has_phone_numbers'],
                 'has_financial_data': classification_result['context']['has_financial_data'],
+                'document_stats': document_view.stats.to_dict(),
             }
             
             return analysis
@@ -138,7 +166,7 @@ class EnhancedAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"Rule engine analysis failed: {e}")
             # Fallback to simple analysis
-            return self._fallback_analysis(document_content, instructions, pdf_file)
+            return self._fallback_analysis(document_view, instructions, pdf_file)
     
     def _make_decision(self, decision_id: str, input_analysis: Dict[str, Any], inputs: Dict[str, Any]) -> AgentDecision:
         """
@@ -270,14 +298,13 @@ Rule Engine Results:
                 # Use enhanced extraction tool for source-driven analysis
                 result.add_audit_entry("Using enhanced source-driven extraction")
                 
-                # Get document content (extract from PDF if needed)
+                # Get document content (from the document session, extracting the PDF only once)
                 document_content = inputs.get('document_content', '')
-                if not document_content and inputs.get('pdf_file'):
-                    # Extract PDF content first
-                    from tools.pdf_tool import PDFTool
-                    pdf_tool = PDFTool()
-                    pdf_result = pdf_tool.execute(pdf_file=inputs['pdf_file'])
-                    document_content = pdf_result.data
+                session = inputs.get('document_session')
+                if not document_content and session is None and inputs.get('pdf_file'):
+                    session = DocumentSession(pdf_path=inputs['pdf_file'])
+                if not document_content and session is not None:
+                    document_content = session.get_text(consumer=f"{self.name}.source_driven")
                 
                 # Run enhanced extraction
                 extraction_result = self.enhanced_extraction_tool.execute(
@@ -304,7 +331,11 @@ Rule Engine Results:
                     pdf_file=inputs.get('pdf_file', ''),
                     instructions=enhanced_instructions,
                     output_dir=inputs.get('output_dir', '.'),
-                    simulate=inputs.get('simulate', True)  # Default to simulation for Stage 3
+                    simulate=inputs.get('simulate', True),  # Default to simulation for Stage 3
+                    ruleset_versions={
+                        name: ruleset.version for name, ruleset in self.rule_engine.rulesets.items()
+                    },
+                    session=inputs.get('document_session'),
                 )
             
             # Store tool results for audit trail
@@ -401,18 +432,9 @@ Enhanced by: {self.name} v{self.version}
     
     def _assess_complexity(self, context: Dict[str, Any]) -> str:
         """Assess document complexity from context"""
-        word_count = context.get('word_count', 0)
-        has_structure = context.get('has_headers', False) or context.get('has_tables', False)
-        technical_density = context.get('technical_keyword_density', 0)
-        
-        if word_count > 2000 and (has_structure or technical_density > 0.01):
-            return 'complex'
-        elif word_count > 500 and (has_structure or technical_density > 0.005):
-            return 'moderate'
-        else:
-            return 'simple'
+        return assess_complexity(context)
     
-    def _fallback_analysis(self, document_content: str, instructions: str, pdf_file: str) -> Dict[str, Any]:
+    def _fallback_analysis(self, document_view: DocumentView, instructions: str, pdf_file: str) -> Dict[str, Any]:
         """Fallback analysis when rule engine fails"""
         return {
             'document_type': 'general_analysis',
@@ -421,8 +443,9 @@ Enhanced by: {self.name} v{self.version}
             'complexity_confidence': 0.6,
             'rule_engine_failed': True,
             'fallback_used': True,
-            'content_length': len(document_content),
-            'has_pdf_file': bool(pdf_file)
+            'content_length': len(document_view),
+            'has_pdf_file': bool(pdf_file),
+            'document_stats': document_view.stats.to_dict(),
         }
     
     def _get_workflow_mapping(self) -> Dict[str, str]:
@@ -9,8 +9,21 @@ import time
 from typing import Any, Dict, List
 from pathlib import Path
 
-from .base_agent import BaseAgent, AgentDecision, AgentResult, analyze_document_type, analyze_document_complexity, analyze_document_structure
+from .base_agent import BaseAgent, AgentDecision, AgentResult
 from orchestration.tool_orchestrator import ToolOrchestrator
+from tools.document_view import DocumentView
+
+
+def categorize_file_size(size_bytes: int) -> str:
+    """Size class of a file: small, medium, large or very_large"""
+    if size_bytes < 100_000:  # < 100KB
+        return 'small'
+    elif size_bytes < 1_000_000:  # < 1MB
+        return 'medium'
+    elif size_bytes < 10_000_000:  # < 10MB
+        return 'large'
+    else:
+        return 'very_large'
 
 
 class SimpleAgent(BaseAgent):
@@ -58,14 +71,17 @@ class SimpleAgent(BaseAgent):
         # In a real implementation, this would extract PDF text first
         document_content = inputs.get('document_content', '') or instructions
         
+        # One statistics pass over the document feeds type, complexity and structure analysis
+        document_stats = DocumentView.of(document_content).stats
+        
         # Analyze document type
-        doc_type, type_confidence = analyze_document_type(document_content)
+        doc_type, type_confidence = document_stats.document_type()
         
         # Analyze complexity
-        complexity, complexity_confidence = analyze_document_complexity(document_content)
+        complexity, complexity_confidence = document_stats.complexity()
         
         # Analyze structure
-        structure_analysis = analyze_document_structure(document_content)
+        structure_analysis = document_stats.structure()
         
         # Analyze instructions
         instruction_analysis = self._analyze_instructions(instructions)
@@ -82,6 +98,7 @@ class SimpleAgent(BaseAgent):
             'instruction_analysis': instruction_analysis,
             'file_analysis': file_analysis,
             'content_length': len(document_content),
+            'document_stats': document_stats.to_dict(),
             'analysis_timestamp': time.time(),
         }
     
@@ -124,14 +141,7 @@ class SimpleAgent(BaseAgent):
     
     def _categorize_file_size(self, size_bytes: int) -> str:
         """Categorize file size for workflow selection"""
-        if size_bytes < 100_000:  # < 100KB
-            return 'small'
-        elif size_bytes < 1_000_000:  # < 1MB
-            return 'medium'
-        elif size_bytes < 10_000_000:  # < 10MB
-            return 'large'
-        else:
-            return 'very_large'
+        return categorize_file_size(size_bytes)
     
     def _make_decision(self, decision_id: str, input_analysis: Dict[str, Any], inputs: Dict[str, Any]) -> AgentDecision:
         """
@@ -261,7 +271,8 @@ Hardcoded Decision Tree Logic:
                 pdf_file=inputs.get('pdf_file', ''),
                 instructions=self._enhance_instructions_for_workflow(inputs.get('instructions', ''), workflow_name),
                 output_dir=inputs.get('output_dir', '.'),
-                simulate=inputs.get('simulate', True)  # Default to simulation for Stage 2
+                simulate=inputs.get('simulate', True),  # Default to simulation for Stage 2
+                session=inputs.get('document_session'),
             )
             
             # Store tool results for audit trail
@@ -12,6 +12,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from tools.intelligence_extractor import IntelligenceExtractor
+from tools.source_index import EvidenceIndex
 
 @dataclass
 class SourceAnalysisResult:
@@ -74,6 +75,7 @@ class SourceDrivenAgent:
     def _validate_against_source(self, intelligence: Dict[str, Any], source_content: str) -> Dict[str, bool]:
         """
         Validate that all extracted claims exist in source material.
+        Verified items are annotated with the offsets of their evidence.
         """
         validation_results = {
             "fraud_types_validated": True,
@@ -83,28 +85,11 @@ class SourceDrivenAgent:
             "all_claims_have_evidence": True
         }
         
-        # Check that all fraud types have source evidence
-        for fraud_type in intelligence.get('fraud_types', []):
-            if not fraud_type.get('source_evidence') or fraud_type['source_evidence'] == "not found in source":
-                validation_results["fraud_types_validated"] = False
-                validation_results["all_claims_have_evidence"] = False
-        
-        # Check financial impact evidence
-        for financial in intelligence.get('financial_impact', []):
-            if not financial.get('source_evidence') or financial['source_evidence'] == "not found in source":
-                validation_results["financial_impact_validated"] = False
-                validation_results["all_claims_have_evidence"] = False
-        
-        # Check operational methods evidence
-        for method in intelligence.get('operational_methods', []):
-            if not method.get('source_evidence') or method['source_evidence'] == "not found in source":
-                validation_results["operational_methods_validated"] = False
-                validation_results["all_claims_have_evidence"] = False
-        
-        # Check targeting analysis evidence  
-        for target in intelligence.get('targeting_analysis', []):
-            if not target.get('source_evidence') or target['source_evidence'] == "not found in source":
-                validation_results["targeting_analysis_validated"] = False
+        # Every claim's evidence must occur verbatim in the source
+        evidence_index = EvidenceIndex(source_content)
+        for category in ('fraud_types', 'financial_impact', 'operational_methods', 'targeting_analysis'):
+            if evidence_index.verify_items(intelligence.get(category, [])):
+                validation_results[f"{category}_validated"] = False
                 validation_results["all_claims_have_evidence"] = False
         
         return validation_results
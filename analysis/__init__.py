@@ -0,0 +1,15 @@
+"""
+Safety Sigma 2.0 Analysis Package
+
+Provides offline analysis of audit logs with:
+- Latency percentiles by workflow, stage, tool and document size
+- Size → latency models and capacity estimates (docs/hour/core)
+- Latency regression checks between date ranges
+"""
+
+from .perf_report import PerfReport, compare
+
+__all__ = [
+    'PerfReport',
+    'compare',
+]
@@ -0,0 +1,432 @@
+"""
+Performance Report for Safety Sigma 2.0
+
+Offline latency analysis of the daily audit logs, for capacity planning:
+
+- audit_<date>          tool executions (duration, input size)
+- orchestration_<date>  pipeline steps (per-stage execution time)
+- agent_decisions_<date> end-to-end workflow runs (execution time, document size)
+- workflow_jobs_<date>  distributed jobs (processing time, size class)
+
+Logs are streamed record by record (only the durations are kept, in
+compact arrays) and aggregated into latency percentiles by tool, workflow,
+stage and document size bucket, least-squares size → latency models, and a
+capacity estimate in documents per hour per core. Two date ranges can be
+compared to flag latency regressions.
+
+Usage:
+    safety-sigma perf-report --audit-dir audit_logs [--since 2026-10-01] [--until 2026-10-07] [--json]
+    safety-sigma perf-report --baseline 2026-10-01:2026-10-07 --compare 2026-10-08:2026-10-14
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from agents.simple_agent import categorize_file_size
+from audit.serialization import HAS_MSGPACK, HAS_ZSTD, iter_records
+
+
+LOG_FILE = re.compile(r'^(audit|orchestration|agent_decisions|workflow_jobs)_(\d{4}-\d{2}-\d{2})(?:\.\d+)?'
+                      r'\.(jsonl|msgpack)(?:\.gz|\.zst)?$')
+
+DIMENSIONS = ('workflow', 'stage', 'tool', 'size')
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Ratio of current / baseline p95 above which a group counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+# Groups with fewer samples in either range are not compared
+DEFAULT_MIN_SAMPLES = 5
+
+_TRUNCATED = re.compile(r'\(truncated, length=(\d+)\)$')
+
+# Input summary keys that hold document text
+_TEXT_INPUTS = ('text_content', 'content', 'document_content', 'text')
+
+
+@dataclass(frozen=True)
+class LatencySample:
+    """
+    One timed unit of work read from an audit log
+    """
+    kind: str  # 'workflow', 'stage' or 'tool'
+    name: str
+    duration_ms: float
+    size_bytes: Optional[int]
+    size_class: Optional[str]
+    success: bool
+
+
+def log_files(audit_dir: Union[str, Path], since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Tuple[str, str, Path]]:
+    """
+    Daily logs of an audit directory within a date range
+
+    Args:
+        audit_dir: Audit directory
+        since: First date (YYYY-MM-DD, inclusive)
+        until: Last date (YYYY-MM-DD, inclusive)
+
+    Returns:
+        (log kind, date, path) tuples sorted by date
+    """
+    files = []
+    for path in Path(audit_dir).iterdir():
+        match = LOG_FILE.match(path.name)
+        if match is None or (match.group(3) == 'msgpack' and not HAS_MSGPACK) \
+                or (path.suffix == '.zst' and not HAS_ZSTD):
+            continue
+        kind, date = match.group(1), match.group(2)
+        if (since and date < since) or (until and date > until):
+            continue
+        files.append((kind, date, path))
+    return sorted(files, key=lambda entry: (entry[1], entry[0]))
+
+
+def _input_size(summary: Dict[str, Any]) -> Optional[int]:
+    """Document text length recorded in a tool input summary"""
+    for key in _TEXT_INPUTS:
+        value = summary.get(key)
+        if isinstance(value, str):
+            truncated = _TRUNCATED.search(value)
+            return int(truncated.group(1)) if truncated else len(value)
+    return None
+
+
+def samples_from_record(log_kind: str, record: Dict[str, Any]) -> Iterator[LatencySample]:
+    """
+    Latency samples contained in one audit record
+
+    Args:
+        log_kind: 'audit', 'orchestration', 'agent_decisions' or 'workflow_jobs'
+        record: Decoded record
+
+    Returns:
+        Iterator of samples (records without a duration yield none)
+    """
+    if log_kind == 'orchestration':
+        if record.get('event') == 'step_success' and record.get('execution_time_ms') is not None:
+            yield LatencySample('stage', record['step_name'], record['execution_time_ms'], None, None, True)
+
+    elif log_kind == 'agent_decisions':
+        metadata = record.get('metadata') or {}
+        if metadata.get('execution_time_ms') is None:
+            return  # written before decisions recorded their execution time
+        analysis = record.get('input_analysis') or {}
+        size = (analysis.get('file_analysis') or {}).get('file_size_bytes') or analysis.get('content_length')
+        yield LatencySample('workflow', record.get('selected_workflow', 'unknown'), metadata['execution_time_ms'],
+                            size, None, bool(metadata.get('success', True)))
+
+    elif log_kind == 'workflow_jobs':
+        metadata = record.get('metadata') or {}
+        size_class = (metadata.get('job_class') or '').split('/')[0] or None
+        yield LatencySample('tool', record.get('tool_name', log_kind), record['duration_ms'], None, size_class,
+                            bool(record.get('success')))
+
+    elif record.get('duration_ms') is not None:
+        yield LatencySample('tool', record.get('tool_name', 'unknown'), record['duration_ms'],
+                            _input_size(record.get('input_summary') or {}), None, bool(record.get('success')))
+
+
+def iter_samples(audit_dir: Union[str, Path], since: Optional[str] = None,
+                 until: Optional[str] = None) -> Iterator[LatencySample]:
+    """Stream latency samples from the daily logs of an audit directory"""
+    for log_kind, _, path in log_files(audit_dir, since, until):
+        for record in iter_records(path):
+            if isinstance(record, dict):
+                yield from samples_from_record(log_kind, record)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Linearly interpolated percentile of sorted values"""
+    if not ordered:
+        return math.nan
+    position = (len(ordered) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class LatencyStats:
+    """
+    Durations of one group
+    """
+
+    def __init__(self):
+        self.durations = array('d')
+        self.failures = 0
+
+    def add(self, duration_ms: float, success: bool = True) -> None:
+        self.durations.append(duration_ms)
+        if not success:
+            self.failures += 1
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, percentiles, max and failure rate"""
+        ordered = sorted(self.durations)
+        summary = {'count': len(ordered), 'mean_ms': sum(ordered) / len(ordered) if ordered else math.nan}
+        summary.update({f"p{q}_ms": percentile(ordered, q) for q in PERCENTILES})
+        summary['max_ms'] = ordered[-1] if ordered else math.nan
+        summary['failure_rate'] = self.failures / len(ordered) if ordered else 0.0
+        return summary
+
+
+@dataclass
+class SizeModel:
+    """
+    Least-squares fit latency_ms = intercept_ms + ms_per_kb * size_kb
+    """
+    intercept_ms: float
+    ms_per_kb: float
+    r2: float
+    samples: int
+
+    def predict(self, size_bytes: int) -> float:
+        return self.intercept_ms + self.ms_per_kb * size_bytes / 1024.0
+
+
+def fit_size_model(sizes: Iterable[float], durations: Iterable[float]) -> Optional[SizeModel]:
+    """
+    Fit a size → latency line
+
+    Args:
+        sizes: Document sizes in bytes
+        durations: Matching latencies in milliseconds
+
+    Returns:
+        SizeModel, or None with fewer than two distinct sizes
+    """
+    xs = [size / 1024.0 for size in sizes]
+    ys = list(durations)
+    n = len(xs)
+    if n < 2:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    total = sum((y - mean_y) ** 2 for y in ys)
+    residual = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return SizeModel(intercept, slope, 1.0 - residual / total if total else 1.0, n)
+
+
+class PerfReport:
+    """
+    Latency aggregates over a set of audit logs
+    """
+
+    def __init__(self):
+        self.groups: Dict[Tuple[str, str], LatencyStats] = {}
+        self._sized: Dict[Tuple[str, str], Tuple[array, array]] = {}
+        self.samples = 0
+
+    def _stats(self, dimension: str, key: str) -> LatencyStats:
+        stats = self.groups.get((dimension, key))
+        if stats is None:
+            stats = self.groups[(dimension, key)] = LatencyStats()
+        return stats
+
+    def add(self, sample: LatencySample) -> None:
+        """Add one sample to its kind group and, when its size is known, its size bucket"""
+        self.samples += 1
+        self._stats(sample.kind, sample.name).add(sample.duration_ms, sample.success)
+        size_class = sample.size_class or (categorize_file_size(sample.size_bytes)
+                                           if sample.size_bytes is not None else None)
+        if size_class is not None:
+            self._stats('size', f"{sample.kind}:{size_class}").add(sample.duration_ms, sample.success)
+        if sample.size_bytes is not None and sample.success:
+            sizes, durations = self._sized.setdefault((sample.kind, sample.name), (array('d'), array('d')))
+            sizes.append(sample.size_bytes)
+            durations.append(sample.duration_ms)
+
+    @classmethod
+    def from_audit_dir(cls, audit_dir: Union[str, Path], since: Optional[str] = None,
+                       until: Optional[str] = None) -> 'PerfReport':
+        """Report over the daily logs of an audit directory within a date range"""
+        report = cls()
+        for sample in iter_samples(audit_dir, since, until):
+            report.add(sample)
+        return report
+
+    def latency(self, dimension: str) -> Dict[str, Dict[str, Any]]:
+        """Latency summaries of one dimension ('workflow', 'stage', 'tool' or 'size')"""
+        return {key: stats.summary() for (group_dimension, key), stats in sorted(self.groups.items())
+                if group_dimension == dimension}
+
+    def size_models(self) -> Dict[str, SizeModel]:
+        """Size → latency fits per workflow and tool ('<kind>:<name>')"""
+        models = {}
+        for (kind, name), (sizes, durations) in sorted(self._sized.items()):
+            model = fit_size_model(sizes, durations)
+            if model is not None:
+                models[f"{kind}:{name}"] = model
+        return models
+
+    def capacity(self, cores: int = 1) -> Dict[str, Any]:
+        """
+        Documents per hour from end-to-end workflow latency
+
+        One document occupies one core for its workflow's mean latency, so a
+        core processes 3,600,000 / mean_ms documents per hour.
+
+        Args:
+            cores: Cores available for the total estimate
+
+        Returns:
+            Per-workflow and overall docs/hour/core, and the total for cores
+        """
+        workflows = {key: stats for (dimension, key), stats in self.groups.items() if dimension == 'workflow'}
+        per_workflow = {key: 3_600_000.0 / (sum(stats.durations) / len(stats))
+                        for key, stats in sorted(workflows.items()) if len(stats) and sum(stats.durations)}
+        total_ms = sum(sum(stats.durations) for stats in workflows.values())
+        documents = sum(len(stats) for stats in workflows.values())
+        overall = 3_600_000.0 * documents / total_ms if total_ms else None
+        return {
+            'documents': documents,
+            'docs_per_hour_per_core': overall,
+            'cores': cores,
+            'docs_per_hour': overall * cores if overall is not None else None,
+            'by_workflow': per_workflow,
+        }
+
+    def to_dict(self, cores: int = 1) -> Dict[str, Any]:
+        return {
+            'samples': self.samples,
+            'latency': {dimension: self.latency(dimension) for dimension in DIMENSIONS},
+            'size_models': {key: asdict(model) for key, model in self.size_models().items()},
+            'capacity': self.capacity(cores),
+        }
+
+
+def compare(baseline: PerfReport, current: PerfReport, threshold: float = DEFAULT_THRESHOLD,
+            min_samples: int = DEFAULT_MIN_SAMPLES, metric: str = 'p95_ms') -> List[Dict[str, Any]]:
+    """
+    Compare the latency of every group present in both reports
+
+    Args:
+        baseline: Report over the baseline date range
+        current: Report over the compared date range
+        threshold: Ratio of current / baseline metric counted as a regression
+        min_samples: Minimum samples in both ranges
+        metric: Summary field compared
+
+    Returns:
+        Rows (dimension, key, baseline, current, ratio, regressed), worst ratio first
+    """
+    rows = []
+    for group, stats in baseline.groups.items():
+        other = current.groups.get(group)
+        if other is None or len(stats) < min_samples or len(other) < min_samples:
+            continue
+        before, after = stats.summary()[metric], other.summary()[metric]
+        ratio = after / before if before else math.inf
+        rows.append({'dimension': group[0], 'key': group[1], 'baseline': before, 'current': after,
+                     'ratio': ratio, 'regressed': ratio > threshold})
+    return sorted(rows, key=lambda row: row['ratio'], reverse=True)
+
+
+def _format_ms(value: Optional[float]) -> str:
+    if value is None or math.isnan(value):
+        return '-'
+    return f"{value / 1000.0:.2f}s" if value >= 1000 else f"{value:.1f}ms"
+
+
+def format_report(report: PerfReport, cores: int = 1) -> str:
+    """Plain-text capacity report"""
+    lines = [f"Samples: {report.samples}"]
+    for dimension in DIMENSIONS:
+        table = report.latency(dimension)
+        if not table:
+            continue
+        lines += ['', f"Latency by {dimension}",
+                  f"{'':<44} {'count':>7} " + ' '.join(f"{f'p{q}':>9}" for q in PERCENTILES) + f" {'fail':>6}"]
+        for key, summary in table.items():
+            lines.append(f"{key:<44} {summary['count']:>7} "
+                         + ' '.join(f"{_format_ms(summary[f'p{q}_ms']):>9}" for q in PERCENTILES)
+                         + f" {summary['failure_rate']:>6.1%}")
+
+    models = report.size_models()
+    if models:
+        lines += ['', 'Size → latency models (ms = intercept + slope × KB)']
+        for key, model in models.items():
+            lines.append(f"{key:<44} {model.intercept_ms:>10.1f}ms + {model.ms_per_kb:.3f}ms/KB  "
+                         f"r²={model.r2:.2f}  n={model.samples}")
+
+    capacity = report.capacity(cores)
+    lines += ['', 'Capacity']
+    if capacity['docs_per_hour_per_core'] is None:
+        lines.append('No end-to-end workflow runs recorded (agent decision logs with execution times)')
+    else:
+        lines.append(f"{'all workflows':<44} {capacity['docs_per_hour_per_core']:>10.1f} docs/hour/core "
+                     f"({capacity['docs_per_hour']:.1f} docs/hour on {cores} cores)")
+        for key, rate in capacity['by_workflow'].items():
+            lines.append(f"{key:<44} {rate:>10.1f} docs/hour/core")
+    return '\n'.join(lines)
+
+
+def _date_range(value: str) -> Tuple[str, str]:
+    since, _, until = value.partition(':')
+    return since, until or since
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='safety-sigma perf-report',
+                                     description='Latency and capacity report from Safety Sigma audit logs')
+    parser.add_argument('--audit-dir', default=None, help='Audit directory (default: SS2_AUDIT_DIR or audit_logs)')
+    parser.add_argument('--since', help='First log date, YYYY-MM-DD')
+    parser.add_argument('--until', help='Last log date, YYYY-MM-DD')
+    parser.add_argument('--cores', type=int, default=1, help='Cores for the total capacity estimate')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--baseline', type=_date_range, metavar='START[:END]', help='Baseline date range')
+    parser.add_argument('--compare', type=_date_range, metavar='START[:END]',
+                        help='Date range compared with --baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='p95 ratio reported as a regression (default: %(default)s)')
+    parser.add_argument('--min-samples', type=int, default=DEFAULT_MIN_SAMPLES,
+                        help='Minimum samples per group in both ranges (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    audit_dir = Path(args.audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+    if not audit_dir.is_dir():
+        print(f"ERROR: Audit directory not found: {audit_dir}")
+        return 2
+
+    if args.baseline or args.compare:
+        if not (args.baseline and args.compare):
+            parser.error('--baseline and --compare are used together')
+        baseline = PerfReport.from_audit_dir(audit_dir, *args.baseline)
+        current = PerfReport.from_audit_dir(audit_dir, *args.compare)
+        rows = compare(baseline, current, args.threshold, args.min_samples)
+        regressions = [row for row in rows if row['regressed']]
+        if args.json:
+            print(json.dumps({'baseline': list(args.baseline), 'compare': list(args.compare),
+                              'threshold': args.threshold, 'rows': rows}, indent=2))
+        else:
+            for row in rows:
+                flag = 'REGRESSED' if row['regressed'] else ''
+                print(f"{row['dimension'] + ' ' + row['key']:<52} {_format_ms(row['baseline']):>9} -> "
+                      f"{_format_ms(row['current']):>9} {row['ratio']:6.2f}x {flag}")
+            print(f"\n{len(rows)} groups compared (p95), {len(regressions)} regressed (threshold {args.threshold}x)")
+        return 1 if regressions else 0
+
+    report = PerfReport.from_audit_dir(audit_dir, args.since, args.until)
+    print(json.dumps(report.to_dict(args.cores), indent=2) if args.json else format_report(report, args.cores))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
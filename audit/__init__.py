@@ -0,0 +1,25 @@
+"""
+Safety Sigma 2.0 Audit Package
+
+Provides audit storage support with:
+- Content-addressed, compressed blob store for large audit payloads
+- Blob reference resolution for auditors
+- Encode-once audit record serialization (JSON or MessagePack) and conversion
+- SQLite offset index for key lookups, cross-log traces and time ranges
+- Log rotation into compressed, hash-chained segments and run-file compaction
+"""
+
+from .blob_store import BlobStore, resolve_blobs
+from .serialization import AuditSerializer, get_serializer, iter_records
+from .index import AuditIndex
+from .segments import SegmentManager
+
+__all__ = [
+    'BlobStore',
+    'resolve_blobs',
+    'AuditSerializer',
+    'get_serializer',
+    'iter_records',
+    'AuditIndex',
+    'SegmentManager',
+]
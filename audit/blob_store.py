@@ -0,0 +1,197 @@
+"""
+Audit Blob Store for Safety Sigma 2.0
+
+Content-addressed, gzip-compressed storage for large audit payloads such as
+full document text. Audit records keep a small reference instead of the
+payload itself:
+
+    {"$blob": "sha256:<hex>", "size": <characters>}
+
+Identical payloads are stored once, however many records reference them.
+Auditors resolve references back to the original values with
+BlobStore.get() or resolve_blobs().
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+BLOB_KEY = '$blob'
+DIGEST_PREFIX = 'sha256:'
+
+
+class BlobStore:
+    """
+    Deduplicated, compressed blob storage under an audit directory
+
+    Blobs are stored as <root>/<first two hex chars>/<remaining hex>.gz and
+    written atomically, so concurrent writers of the same payload are safe.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize blob store
+
+        Args:
+            root: Blob directory (usually <audit_dir>/blobs)
+        """
+        self.root = Path(root)
+
+    @classmethod
+    def for_audit_dir(cls, audit_dir: Union[str, Path]) -> 'BlobStore':
+        """Create blob store in the standard location under an audit directory"""
+        return cls(Path(audit_dir) / 'blobs')
+
+    def _path(self, digest: str) -> Path:
+        hex_digest = digest[len(DIGEST_PREFIX):] if digest.startswith(DIGEST_PREFIX) else digest
+        if len(hex_digest) != 64 or any(c not in '0123456789abcdef' for c in hex_digest):
+            raise ValueError(f"Invalid blob digest: {digest}")
+        return self.root / hex_digest[:2] / f"{hex_digest[2:]}.gz"
+
+    def put(self, data: Union[str, bytes]) -> str:
+        """
+        Store a payload
+
+        Args:
+            data: Text (stored as UTF-8) or bytes
+
+        Returns:
+            Digest of the payload ('sha256:<hex>')
+        """
+        raw = data.encode('utf-8') if isinstance(data, str) else data
+        digest = DIGEST_PREFIX + hashlib.sha256(raw).hexdigest()
+        path = self._path(digest)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(gzip.compress(raw, mtime=0))
+                os.replace(tmp_name, path)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                raise
+
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read a payload, verifying its digest
+
+        Args:
+            digest: Digest returned by put()
+
+        Returns:
+            Original payload bytes
+        """
+        path = self._path(digest)
+        if not path.exists():
+            raise FileNotFoundError(f"Blob not found: {digest}")
+
+        raw = gzip.decompress(path.read_bytes())
+        if DIGEST_PREFIX + hashlib.sha256(raw).hexdigest() != self._normalize(digest):
+            raise ValueError(f"Blob content does not match digest: {digest}")
+        return raw
+
+    def get_text(self, digest: str) -> str:
+        """Read a text payload"""
+        return self.get(digest).decode('utf-8')
+
+    def exists(self, digest: str) -> bool:
+        """Check whether a blob is stored"""
+        return self._path(digest).exists()
+
+    @staticmethod
+    def _normalize(digest: str) -> str:
+        return digest if digest.startswith(DIGEST_PREFIX) else DIGEST_PREFIX + digest
+
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        """Check whether a value is a blob reference"""
+        return isinstance(value, dict) and BLOB_KEY in value and len(value) <= 2
+
+    def externalize(self, value: Any, threshold: int) -> Any:
+        """
+        Replace large strings in a JSON-like structure with blob references
+
+        Args:
+            value: Dict/list/scalar structure to process (not modified)
+            threshold: Strings longer than this many characters are stored as blobs
+
+        Returns:
+            Copy of value with large strings replaced by references
+        """
+        if isinstance(value, str):
+            if len(value) > threshold:
+                return {BLOB_KEY: self.put(value), 'size': len(value)}
+            return value
+        if isinstance(value, dict):
+            return {k: self.externalize(v, threshold) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(v, threshold) for v in value]
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Replace blob references in a JSON-like structure with their text
+
+        Args:
+            value: Structure containing blob references
+
+        Returns:
+            Copy of value with references resolved
+        """
+        if self.is_ref(value):
+            return self.get_text(value[BLOB_KEY])
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+
+def resolve_blobs(record: Union[Dict[str, Any], str, Path],
+                  audit_dir: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """
+    Load an audit record and resolve its blob references
+
+    Args:
+        record: Parsed record, or path to a JSON audit record
+        audit_dir: Audit directory holding blobs/ (default: record's directory, or SS2_AUDIT_DIR)
+
+    Returns:
+        Record with all blob references replaced by the original values
+    """
+    if isinstance(record, (str, Path)):
+        record_path = Path(record)
+        audit_dir = audit_dir or record_path.parent
+        record = json.loads(record_path.read_text(encoding='utf-8'))
+
+    store = BlobStore.for_audit_dir(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+    return store.resolve(record)
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Print an audit record with blob references resolved"""
+    parser = argparse.ArgumentParser(description='Resolve blob references in a Safety Sigma audit record')
+    parser.add_argument('record', help='Path to a JSON audit record')
+    parser.add_argument('--audit-dir', help='Audit directory containing blobs/ (default: record directory)')
+    args = parser.parse_args(argv)
+
+    resolved = resolve_blobs(args.record, args.audit_dir)
+    json.dump(resolved, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,512 @@
+"""
+Audit Log Index for Safety Sigma 2.0
+
+A SQLite sidecar index over the append-only daily audit logs. Each record
+is stored once, in its log; the index maps run_id, orchestration_id,
+decision_id, document hashes, document session ids and timestamps to the
+record's byte offset, so a lookup reads only the matching records instead
+of scanning every log and *_<uuid>.json file.
+
+Indexing is incremental: logs only grow, so each update resumes at the
+byte offset where the previous one stopped (a log that shrank was replaced
+and is re-indexed). Sealed segments (audit.segments) keep their entries when
+they are renamed and compressed; offsets refer to the uncompressed records,
+and the index keeps the raw and stored offsets of each compressed block, so
+a lookup decompresses only the blocks holding its records.
+
+trace() follows the links between records: a tool run names its
+orchestration, an orchestration names its document session and hash, and
+an agent decision names the same session, so one identifier returns the
+whole history of a document.
+
+Usage:
+    python -m audit.index update
+    python -m audit.index trace <document hash | run/orchestration/decision/session id>
+    python -m audit.index get run_id <run id>
+    python -m audit.index range 2026-10-01 2026-10-02T12:00:00 [--kind tool]
+
+Configuration:
+    SS2_AUDIT_DIR - Audit directory (default: audit_logs)
+"""
+
+import argparse
+import calendar
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .serialization import (COMPRESSED_SUFFIXES, HAS_MSGPACK, HAS_ZSTD, LOG_NAME, decode_json, encode_json,
+                            log_format, open_log)
+
+if HAS_MSGPACK:
+    import msgpack
+
+
+INDEX_NAME = 'audit_index.sqlite'
+
+# Identifier kinds and where records carry them
+INDEX_KEYS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    'run_id': (('run_id',),),
+    'orchestration_id': (('orchestration_id',), ('input_summary', 'orchestration_id'),
+                         ('metadata', 'orchestration', 'orchestration_id')),
+    'decision_id': (('decision_id',),),
+    'document_hash': (('document_hash',), ('metadata', 'document', 'document_hash'),
+                      ('metadata', 'document_session', 'content_hash'),
+                      ('metadata', 'document_session', 'file_hash')),
+    'session_id': (('document_session_id',), ('metadata', 'document', 'document_session_id'),
+                   ('metadata', 'document_session', 'session_id')),
+}
+
+RECORD_KINDS = ('tool', 'job', 'decision', 'orchestration', 'orchestration_event', 'record')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    indexed_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    record_id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp REAL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_time ON records (timestamp);
+CREATE TABLE IF NOT EXISTS record_keys (
+    value TEXT NOT NULL,
+    key TEXT NOT NULL,
+    record_id INTEGER NOT NULL,
+    PRIMARY KEY (value, key, record_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS record_keys_record ON record_keys (record_id);
+CREATE TABLE IF NOT EXISTS blocks (
+    file_id INTEGER NOT NULL,
+    raw_offset INTEGER NOT NULL,
+    stored_offset INTEGER NOT NULL,
+    PRIMARY KEY (file_id, raw_offset)
+) WITHOUT ROWID;
+"""
+
+# Records inserted per executemany batch while indexing
+BATCH_SIZE = 5000
+
+
+def record_kind(record: Dict[str, Any]) -> str:
+    """Kind of an audit record (one of RECORD_KINDS)"""
+    if 'event' in record:
+        return 'orchestration' if record['event'] == 'orchestration_complete' else 'orchestration_event'
+    if 'decision_id' in record:
+        return 'decision'
+    if 'tool_name' in record:
+        return 'job' if record['tool_name'] == 'workflow_jobs' else 'tool'
+    if 'orchestration_id' in record:
+        return 'orchestration'
+    return 'record'
+
+
+def record_keys(record: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(key, value) identifiers carried by a record"""
+    keys = set()
+    for key, paths in INDEX_KEYS.items():
+        for path in paths:
+            value: Any = record
+            for part in path:
+                value = value.get(part) if isinstance(value, dict) else None
+            if isinstance(value, str) and value:
+                keys.add((key, value))
+    return sorted(keys)
+
+
+def record_timestamp(record: Dict[str, Any]) -> Optional[float]:
+    for field in ('start_time', 'timestamp'):
+        value = record.get(field)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return None
+
+
+def parse_time(value: Union[str, float]) -> float:
+    """Epoch seconds from a number or a UTC date / date-time (YYYY-MM-DD[THH:MM[:SS]])"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    value = value.rstrip('Z')
+    for fmt in ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d'):
+        try:
+            return float(calendar.timegm(time.strptime(value, fmt)))
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time: {value} (expected epoch seconds or YYYY-MM-DD[THH:MM[:SS]])")
+
+
+def _scan_jsonl(f, start: int) -> Iterator[Tuple[int, int, int, Any]]:
+    """(offset, length, end, bytes) of the complete lines from start"""
+    f.seek(start)
+    offset = start
+    for line in f:
+        if not line.endswith(b'\n'):
+            break  # record still being written; picked up by the next update
+        if line.strip():
+            yield offset, len(line) - 1, offset + len(line), line[:-1]
+        offset += len(line)
+
+
+def _scan_msgpack(f, start: int) -> Iterator[Tuple[int, int, int, Any]]:
+    """(offset, length, end, record) of the complete MessagePack records from start"""
+    f.seek(start)
+    unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+    offset = start
+    for record in unpacker:
+        end = start + unpacker.tell()
+        yield offset, end - offset, end, record
+        offset = end
+
+
+class AuditIndex:
+    """
+    Offset index over the logs of an audit directory
+    """
+
+    def __init__(self, audit_dir: Optional[Union[str, Path]] = None, index_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize index
+
+        Args:
+            audit_dir: Audit directory (default: SS2_AUDIT_DIR)
+            index_path: SQLite index file (default: <audit_dir>/audit_index.sqlite)
+        """
+        self.audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+        self.index_path = Path(index_path) if index_path else self.audit_dir / INDEX_NAME
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_path, timeout=60)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def log_files(self) -> List[Path]:
+        """Daily logs and sealed segments of the audit directory"""
+        if not self.audit_dir.is_dir():
+            return []
+        return sorted(path for path in self.audit_dir.iterdir() if LOG_NAME.match(path.name))
+
+    @contextmanager
+    def locked(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the index write lock (used by audit.segments while it renames logs)
+
+        Returns:
+            Connection in an open transaction, committed on exit
+        """
+        with self._connect() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+
+    @staticmethod
+    def move(conn: sqlite3.Connection, old_name: str, new_name: str,
+             blocks: Optional[Sequence[Tuple[int, int]]] = None) -> None:
+        """
+        Point the entries of a renamed log at its new name
+
+        Args:
+            conn: Connection holding the index write lock
+            old_name: Previous file name
+            new_name: New file name
+            blocks: (raw offset, stored offset) of each block, when the log was compressed
+        """
+        conn.execute("UPDATE files SET path = ? WHERE path = ?", (new_name, old_name))
+        if blocks:
+            row = conn.execute("SELECT file_id FROM files WHERE path = ?", (new_name,)).fetchone()
+            if row is not None:
+                AuditIndex._store_blocks(conn, row['file_id'], blocks)
+
+    @staticmethod
+    def _store_blocks(conn: sqlite3.Connection, file_id: int, blocks: Sequence[Tuple[int, int]]) -> None:
+        conn.executemany("INSERT OR REPLACE INTO blocks (file_id, raw_offset, stored_offset) VALUES (?, ?, ?)",
+                         [(file_id, raw_offset, stored_offset) for raw_offset, stored_offset in blocks])
+
+    def finish(self, conn: sqlite3.Connection, path: Path) -> None:
+        """Index the rest of a log that is about to be compressed (compressed segments are not re-read)"""
+        if conn.execute("SELECT 1 FROM files WHERE path = ?", (path.name,)).fetchone() is not None:
+            self._index_file(conn, path)
+
+    # ---------- Indexing ----------
+
+    def update(self) -> int:
+        """
+        Index records appended since the last update
+
+        Returns:
+            Number of records added
+        """
+        added = 0
+        with self._connect() as conn:
+            for path in self.log_files():
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    if path.exists():  # not rotated away since it was listed
+                        added += self._index_file(conn, path)
+            with conn:
+                self._prune(conn)
+        return added
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop the entries of logs that no longer exist"""
+        for row in conn.execute("SELECT file_id, path FROM files").fetchall():
+            if not (self.audit_dir / row['path']).exists():
+                self._drop(conn, row['file_id'])
+                conn.execute("DELETE FROM files WHERE file_id = ?", (row['file_id'],))
+
+    @staticmethod
+    def _drop(conn: sqlite3.Connection, file_id: int) -> None:
+        conn.execute("DELETE FROM record_keys WHERE record_id IN "
+                     "(SELECT record_id FROM records WHERE file_id = ?)", (file_id,))
+        conn.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+        conn.execute("DELETE FROM blocks WHERE file_id = ?", (file_id,))
+
+    def _index_file(self, conn: sqlite3.Connection, path: Path) -> int:
+        name = path.name
+        sealed = path.suffix in COMPRESSED_SUFFIXES  # compressed segments never change
+        size = None if sealed else path.stat().st_size
+        row = conn.execute("SELECT file_id, indexed_bytes FROM files WHERE path = ?", (name,)).fetchone()
+        if row is None:
+            file_id = conn.execute("INSERT INTO files (path) VALUES (?)", (name,)).lastrowid
+            start = 0
+        else:
+            file_id, start = row['file_id'], row['indexed_bytes']
+            if sealed:
+                return 0
+            if size < start:  # replaced, not appended to: index it again
+                self._drop(conn, file_id)
+                start = 0
+        if size == start:
+            return 0
+
+        fmt = log_format(path)
+        if (fmt == 'msgpack' and not HAS_MSGPACK) or (path.suffix == '.zst' and not HAS_ZSTD):
+            return 0
+        scan = _scan_jsonl if fmt == 'json' else _scan_msgpack
+
+        next_id = conn.execute("SELECT coalesce(max(record_id), 0) + 1 FROM records").fetchone()[0]
+        records: List[Tuple[Any, ...]] = []
+        keys: List[Tuple[str, str, int]] = []
+        added = 0
+        end = start
+        with open_log(path) as f:
+            for offset, length, end, data in scan(f, start):
+                try:
+                    record = data if isinstance(data, dict) else decode_json(data)
+                except ValueError:
+                    continue  # corrupt line: skipped, the rest of the log is still indexed
+                if not isinstance(record, dict):
+                    continue
+                record_id = next_id + added
+                records.append((record_id, file_id, offset, length, record_timestamp(record), record_kind(record)))
+                keys.extend((value, key, record_id) for key, value in record_keys(record))
+                added += 1
+                if len(records) >= BATCH_SIZE:
+                    self._insert(conn, records, keys)
+            if sealed:
+                self._store_blocks(conn, file_id, f.raw.blocks)  # found while reading the segment
+        self._insert(conn, records, keys)
+        conn.execute("UPDATE files SET indexed_bytes = ? WHERE file_id = ?", (end, file_id))
+        return added
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, records: List[Tuple[Any, ...]], keys: List[Tuple[str, str, int]]) -> None:
+        """Insert and clear a batch"""
+        conn.executemany("INSERT INTO records (record_id, file_id, offset, length, timestamp, kind) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", records)
+        conn.executemany("INSERT OR IGNORE INTO record_keys (value, key, record_id) VALUES (?, ?, ?)", keys)
+        records.clear()
+        keys.clear()
+
+    # ---------- Queries ----------
+
+    def _load(self, conn: sqlite3.Connection, rows: Sequence[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """Read records at their offsets, oldest first"""
+        paths = {row['file_id']: row['path'] for row in conn.execute("SELECT file_id, path FROM files")}
+        handles: Dict[int, Any] = {}
+        loaded = []
+        try:
+            # Read each file front to back (a compressed block is decompressed once for all its records)
+            for row in sorted(rows, key=lambda row: (row['file_id'], row['offset'])):
+                f = handles.get(row['file_id'])
+                if f is None:
+                    blocks = conn.execute("SELECT raw_offset, stored_offset FROM blocks WHERE file_id = ?",
+                                          (row['file_id'],)).fetchall()
+                    f = handles[row['file_id']] = open_log(self.audit_dir / paths[row['file_id']],
+                                                           [tuple(block) for block in blocks])
+                f.seek(row['offset'])
+                data = f.read(row['length'])
+                if log_format(paths[row['file_id']]) == 'msgpack':
+                    record = msgpack.unpackb(data, raw=False, strict_map_key=False)
+                else:
+                    record = decode_json(data)
+                record['_index'] = {'kind': row['kind'], 'path': paths[row['file_id']], 'offset': row['offset']}
+                loaded.append((row, record))
+        finally:
+            for f in handles.values():
+                f.close()
+        loaded.sort(key=lambda item: (item[0]['timestamp'] is None, item[0]['timestamp'] or 0, item[0]['record_id']))
+        return [record for _, record in loaded]
+
+    def get(self, key: str, value: str) -> List[Dict[str, Any]]:
+        """
+        Records carrying an identifier
+
+        Args:
+            key: One of INDEX_KEYS (run_id, orchestration_id, decision_id, document_hash, session_id)
+            value: Identifier value
+
+        Returns:
+            Matching records, oldest first
+        """
+        if key not in INDEX_KEYS:
+            raise ValueError(f"Unknown index key: {key} (expected one of {', '.join(INDEX_KEYS)})")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT r.* FROM record_keys k JOIN records r ON r.record_id = k.record_id "
+                "WHERE k.value = ? AND k.key = ?", (value, key)).fetchall()
+            return self._load(conn, rows)
+
+    def range(self, start: Union[str, float], end: Union[str, float], kind: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Records with a timestamp in [start, end)
+
+        Args:
+            start: Epoch seconds or UTC date / date-time
+            end: Epoch seconds or UTC date / date-time
+            kind: Restrict to one of RECORD_KINDS
+            limit: Maximum records (oldest first)
+
+        Returns:
+            Matching records, oldest first
+        """
+        query = "SELECT * FROM records WHERE timestamp >= ? AND timestamp < ?"
+        params: List[Any] = [parse_time(start), parse_time(end)]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY timestamp, record_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return self._load(conn, conn.execute(query, params).fetchall())
+
+    def trace(self, value: str, max_depth: int = 4) -> List[Dict[str, Any]]:
+        """
+        Every record linked to an identifier
+
+        Starts from the records carrying value under any key, then follows
+        the identifiers of those records (a tool run's orchestration, an
+        orchestration's document session, ...) until no new record is found.
+
+        Args:
+            value: Document hash, or a run, orchestration, decision or session id
+            max_depth: Maximum link hops
+
+        Returns:
+            Linked records, oldest first
+        """
+        with self._connect() as conn:
+            seen_values = {value}
+            frontier = [value]
+            record_ids: Dict[int, sqlite3.Row] = {}
+            for _ in range(max_depth + 1):
+                if not frontier:
+                    break
+                placeholders = ', '.join('?' * len(frontier))
+                rows = conn.execute(
+                    f"SELECT DISTINCT r.* FROM record_keys k JOIN records r ON r.record_id = k.record_id "
+                    f"WHERE k.value IN ({placeholders})", frontier).fetchall()
+                new_ids = [row['record_id'] for row in rows if row['record_id'] not in record_ids]
+                record_ids.update({row['record_id']: row for row in rows})
+                if not new_ids:
+                    break
+                placeholders = ', '.join('?' * len(new_ids))
+                linked = {row['value'] for row in conn.execute(
+                    f"SELECT DISTINCT value FROM record_keys WHERE record_id IN ({placeholders}) "
+                    f"AND key != 'run_id'", new_ids)}
+                frontier = sorted(linked - seen_values)
+                seen_values |= linked
+            return self._load(conn, list(record_ids.values()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed files, records per kind and identifiers per key"""
+        with self._connect() as conn:
+            return {
+                'files': conn.execute("SELECT count(*) FROM files").fetchone()[0],
+                'records': {row['kind']: row['n'] for row in
+                            conn.execute("SELECT kind, count(*) AS n FROM records GROUP BY kind")},
+                'keys': {row['key']: row['n'] for row in
+                         conn.execute("SELECT key, count(DISTINCT value) AS n FROM record_keys GROUP BY key")},
+            }
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Index and query audit logs"""
+    parser = argparse.ArgumentParser(description='Index and query Safety Sigma audit logs')
+    parser.add_argument('--audit-dir', help='Audit directory (default: SS2_AUDIT_DIR or audit_logs)')
+    parser.add_argument('--index', help=f'Index file (default: <audit dir>/{INDEX_NAME})')
+    parser.add_argument('--no-update', action='store_true', help='Query without indexing new records first')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('update', help='Index new records')
+    commands.add_parser('stats', help='Show index counts')
+    get = commands.add_parser('get', help='Records carrying an identifier')
+    get.add_argument('key', choices=list(INDEX_KEYS))
+    get.add_argument('value')
+    trace = commands.add_parser('trace', help='Every record linked to a document hash or id')
+    trace.add_argument('value')
+    between = commands.add_parser('range', help='Records in a time range [start, end)')
+    between.add_argument('start', help='Epoch seconds or UTC YYYY-MM-DD[THH:MM[:SS]]')
+    between.add_argument('end', help='Epoch seconds or UTC YYYY-MM-DD[THH:MM[:SS]]')
+    between.add_argument('--kind', choices=RECORD_KINDS)
+    between.add_argument('--limit', type=int)
+    args = parser.parse_args(argv)
+
+    index = AuditIndex(args.audit_dir, args.index)
+    start = time.perf_counter()
+    if args.command == 'update' or not args.no_update:
+        added = index.update()
+        if args.command == 'update':
+            print(f"Indexed {added} new records in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+            return 0
+    if args.command == 'stats':
+        print(json.dumps(index.stats(), indent=2))
+        return 0
+
+    query_start = time.perf_counter()
+    if args.command == 'get':
+        records = index.get(args.key, args.value)
+    elif args.command == 'trace':
+        records = index.trace(args.value)
+    else:
+        records = index.range(args.start, args.end, args.kind, args.limit)
+    for record in records:
+        sys.stdout.write(encode_json(record).decode('utf-8') + '\n')
+    print(f"{len(records)} records in {(time.perf_counter() - query_start) * 1000:.1f}ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,553 @@
+"""
+Audit Log Segments for Safety Sigma 2.0
+
+Bounds the growth of an audit directory without giving up its integrity:
+
+- Rotation: a daily log that reaches SS2_AUDIT_SEGMENT_MB is renamed to a
+  sealed segment (audit_2026-10-01.jsonl -> audit_2026-10-01.0001.jsonl)
+  and writers start a fresh log; logs of previous days are sealed by
+  maintain().
+- Compression: sealed segments are gzip (or zstd, when zstandard is
+  installed) compressed in BLOCK_BYTES blocks, each its own gzip member or
+  zstd frame, so a record is read back by decompressing only its block (the
+  audit index keeps the block offsets). Writers append to the active log only, and rotation
+  requested by a writer runs on a background thread, so no audit write ever
+  waits for compression.
+- Hash chain: every sealed segment gets a manifest entry with the SHA-256 of
+  its stored (compressed) and raw bytes, chained to the previous entry.
+  verify() checks the chain and the stored files without decompressing them.
+- Compaction (optional): per-run record files (<tool>_<run_id>.json,
+  agent_decision_<id>.json, ...) whose record is already in an indexed log
+  are removed.
+
+Sealed segments stay readable by iter_records(), audit.index and
+analysis.perf_report.
+
+Usage:
+    python -m audit.segments maintain [--compact] [--every 300]
+    python -m audit.segments verify [--deep]
+    python -m audit.segments status
+
+Configuration:
+    SS2_AUDIT_DIR - Audit directory (default: audit_logs)
+    SS2_AUDIT_SEGMENT_MB - Rotate daily logs at this size, 0 to disable (default: 64)
+    SS2_AUDIT_COMPRESSION - 'gzip', 'zstd' or 'none' (default: gzip)
+    SS2_AUDIT_SEAL_GRACE_SECONDS - Leave rotated segments this long for in-flight writes (default: 5)
+    SS2_AUDIT_COMPACT - Remove redundant per-run record files in maintain() (default: false)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .index import INDEX_NAME, AuditIndex
+from .serialization import HAS_ZSTD, LOG_NAME, encode_json, iter_records, log_format, open_log
+
+if HAS_ZSTD:
+    import zstandard
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+MANIFEST_NAME = 'segments_manifest.jsonl'
+LOCK_NAME = '.segments.lock'
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+COMPRESSED_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+# prev of the first manifest entry
+GENESIS = 'sha256:' + '0' * 64
+
+CHUNK_BYTES = 1024 * 1024
+
+# Uncompressed bytes per independently compressed block of a sealed segment
+BLOCK_BYTES = 1024 * 1024
+
+logger = logging.getLogger('safety_sigma.audit')
+
+_process_lock = threading.Lock()
+
+
+def resolve_compression(name: Optional[str] = None) -> str:
+    """
+    Determine the compression for sealed segments
+
+    Args:
+        name: Requested compression (default: SS2_AUDIT_COMPRESSION)
+
+    Returns:
+        'gzip', 'zstd' or 'none' ('gzip' if zstd was requested but is not installed)
+    """
+    name = (name or os.getenv('SS2_AUDIT_COMPRESSION', 'gzip')).lower()
+    if name not in COMPRESSIONS:
+        raise ValueError(f"Unknown audit compression: {name}. Supported: {COMPRESSIONS}")
+    if name == 'zstd' and not HAS_ZSTD:
+        logger.warning("SS2_AUDIT_COMPRESSION=zstd but zstandard is not installed; using gzip")
+        return 'gzip'
+    return name
+
+
+def chain_hash(prev: str, entry: Dict[str, Any]) -> str:
+    """Chain value of a manifest entry (its fields other than 'chain', and the previous chain value)"""
+    fields = {key: value for key, value in entry.items() if key != 'chain'}
+    payload = prev.encode('ascii') + json.dumps(fields, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return 'sha256:' + hashlib.sha256(payload).hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return 'sha256:' + digest.hexdigest()
+
+
+class SegmentManager:
+    """
+    Rotation, compression, hash chain and compaction for one audit directory
+    """
+
+    def __init__(self, audit_dir: Optional[Union[str, Path]] = None, compression: Optional[str] = None,
+                 grace_seconds: Optional[float] = None):
+        """
+        Initialize segment manager
+
+        Args:
+            audit_dir: Audit directory (default: SS2_AUDIT_DIR)
+            compression: 'gzip', 'zstd' or 'none' (default: SS2_AUDIT_COMPRESSION)
+            grace_seconds: Minimum age of a segment before it is compressed
+                (default: SS2_AUDIT_SEAL_GRACE_SECONDS)
+        """
+        self.audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+        self.compression = resolve_compression(compression)
+        self.grace_seconds = float(grace_seconds if grace_seconds is not None
+                                   else os.getenv('SS2_AUDIT_SEAL_GRACE_SECONDS', '5'))
+        self.manifest_path = self.audit_dir / MANIFEST_NAME
+
+    # ---------- Locking ----------
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Serialize maintenance between threads and processes (writers never take this lock)"""
+        with _process_lock:
+            if not HAS_FCNTL:
+                yield
+                return
+            self.audit_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.audit_dir / LOCK_NAME, 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[Tuple[Optional[AuditIndex], Any]]:
+        """Index write lock, so a concurrent index update never sees a log under two names"""
+        if (self.audit_dir / INDEX_NAME).exists():
+            index = AuditIndex(self.audit_dir)
+            with index.locked() as conn:
+                yield index, conn
+        else:
+            yield None, None
+
+    # ---------- Listing ----------
+
+    def _logs(self, sealed: bool) -> List[Path]:
+        if not self.audit_dir.is_dir():
+            return []
+        paths = []
+        for path in self.audit_dir.iterdir():
+            match = LOG_NAME.match(path.name)
+            if match and (match.group('seq') is not None) == sealed:
+                paths.append(path)
+        return sorted(paths)
+
+    def active_logs(self) -> List[Path]:
+        """Daily logs still being appended to"""
+        return self._logs(sealed=False)
+
+    def segments(self) -> List[Path]:
+        """Sealed segments, compressed or not"""
+        return self._logs(sealed=True)
+
+    def manifest(self) -> List[Dict[str, Any]]:
+        """Manifest entries, oldest first"""
+        if not self.manifest_path.exists():
+            return []
+        return list(iter_records(self.manifest_path))
+
+    def _next_name(self, log_path: Path) -> str:
+        match = LOG_NAME.match(log_path.name)
+        prefix = f"{match.group('stream')}_{match.group('date')}"
+        used = [path.name for path in self.segments()] + [entry['segment'] for entry in self.manifest()]
+        seq = 0
+        for name in used:
+            other = LOG_NAME.match(name)
+            if other and f"{other.group('stream')}_{other.group('date')}" == prefix \
+                    and other.group('extension') == match.group('extension'):
+                seq = max(seq, int(other.group('seq')))
+        return f"{prefix}.{seq + 1:04d}.{match.group('extension')}"
+
+    # ---------- Rotation ----------
+
+    def rotate(self, log_path: Union[str, Path], min_bytes: int = 0) -> Optional[Path]:
+        """
+        Seal an active log by renaming it; writers start a new log on their next write
+
+        Args:
+            log_path: Active daily log
+            min_bytes: Only rotate a log at least this large
+
+        Returns:
+            Path of the sealed segment, or None if the log was not rotated
+        """
+        log_path = Path(log_path)
+        with self._lock():
+            if not log_path.exists() or log_path.stat().st_size < max(min_bytes, 1):
+                return None  # already rotated by another writer
+            sealed = log_path.parent / self._next_name(log_path)
+            with self._index_lock() as (_, conn):
+                os.rename(log_path, sealed)
+                if conn is not None:
+                    AuditIndex.move(conn, log_path.name, sealed.name)
+        logger.info(f"Rotated audit log {log_path.name} -> {sealed.name}")
+        return sealed
+
+    def seal(self, today: Optional[str] = None) -> List[Path]:
+        """
+        Rotate the logs of previous days
+
+        Args:
+            today: Current date, YYYY-MM-DD (default: local date, as used in log names)
+
+        Returns:
+            Sealed segments
+        """
+        today = today or time.strftime('%Y-%m-%d')
+        sealed = []
+        for path in self.active_logs():
+            if LOG_NAME.match(path.name).group('date') < today and self._settled(path):
+                segment = self.rotate(path)
+                if segment is not None:
+                    sealed.append(segment)
+        return sealed
+
+    def _settled(self, path: Path) -> bool:
+        """No write has touched the file for the grace period"""
+        return time.time() - path.stat().st_mtime >= self.grace_seconds
+
+    # ---------- Compression and hash chain ----------
+
+    def compress_pending(self) -> List[Dict[str, Any]]:
+        """
+        Compress sealed segments and append them to the hash chain
+
+        Returns:
+            New manifest entries
+        """
+        entries = []
+        with self._lock():
+            recorded = {entry['segment'] for entry in self.manifest()}
+            for path in self.segments():
+                if path.name in recorded or log_format(path) is None:
+                    continue
+                if LOG_NAME.match(path.name).group('compression'):
+                    continue  # compressed but not recorded: its plain segment is still pending
+                compressed = path.with_name(path.name + COMPRESSED_EXTENSIONS[self.compression])
+                if compressed.name in recorded:
+                    path.unlink()  # interrupted after the manifest entry was written
+                    continue
+                if self._settled(path):
+                    entries.append(self._seal_segment(path, compressed))
+        return entries
+
+    def _seal_segment(self, path: Path, compressed: Path) -> Dict[str, Any]:
+        raw_digest = hashlib.sha256()
+        raw_bytes = records = 0
+        blocks: List[Tuple[int, int]] = []
+        tmp_name = None
+        if compressed != path:
+            fd, tmp_name = tempfile.mkstemp(dir=self.audit_dir, suffix='.tmp')
+            out = os.fdopen(fd, 'wb')
+            if self.compression == 'zstd':
+                compress = zstandard.ZstdCompressor(level=3).compress
+            else:
+                compress = partial(gzip.compress, mtime=0)
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(BLOCK_BYTES), b''):
+                    if tmp_name:
+                        blocks.append((raw_bytes, out.tell()))
+                        out.write(compress(chunk))  # one gzip member / zstd frame per block
+                    raw_digest.update(chunk)
+                    raw_bytes += len(chunk)
+                    records += chunk.count(b'\n')
+            if tmp_name:
+                out.close()
+        except BaseException:
+            if tmp_name:
+                out.close()
+                os.unlink(tmp_name)
+            raise
+
+        manifest = self.manifest()
+        match = LOG_NAME.match(path.name)
+        entry = {
+            'segment': compressed.name,
+            'stream': match.group('stream'),
+            'date': match.group('date'),
+            'seq': int(match.group('seq')),
+            'compression': self.compression,
+            'records': records if log_format(path) == 'json' else None,
+            'raw_bytes': raw_bytes,
+            'raw_sha256': 'sha256:' + raw_digest.hexdigest(),
+            'stored_bytes': os.path.getsize(tmp_name) if tmp_name else raw_bytes,
+            'stored_sha256': _file_sha256(Path(tmp_name)) if tmp_name else 'sha256:' + raw_digest.hexdigest(),
+            'sealed_at': time.time(),
+            'prev': manifest[-1]['chain'] if manifest else GENESIS,
+        }
+        entry['chain'] = chain_hash(entry['prev'], entry)
+
+        # Swap in the compressed segment, record it and drop the plain one as one step for index readers
+        with self._index_lock() as (index, conn):
+            if tmp_name:
+                if index is not None:
+                    index.finish(conn, path)
+                os.replace(tmp_name, compressed)
+            with open(self.manifest_path, 'ab') as f:
+                f.write(encode_json(entry) + b'\n')
+            if tmp_name:
+                if conn is not None:
+                    AuditIndex.move(conn, path.name, compressed.name, blocks)
+                path.unlink()
+        logger.info(f"Sealed audit segment {compressed.name} ({raw_bytes} -> {entry['stored_bytes']} bytes)")
+        return entry
+
+    def verify(self, deep: bool = False) -> List[str]:
+        """
+        Check the hash chain and the sealed segments it covers
+
+        Args:
+            deep: Also decompress each segment and check its raw SHA-256
+
+        Returns:
+            Problems found (empty if the chain is intact)
+        """
+        problems = []
+        prev = GENESIS
+        for number, entry in enumerate(self.manifest(), 1):
+            name = entry.get('segment')
+            if entry.get('prev') != prev:
+                problems.append(f"entry {number} ({name}): does not follow the previous entry")
+            if chain_hash(entry.get('prev', ''), entry) != entry.get('chain'):
+                problems.append(f"entry {number} ({name}): chain hash mismatch")
+            prev = entry.get('chain')
+
+            path = self.audit_dir / name
+            if not path.exists():
+                problems.append(f"{name}: missing")
+                continue
+            if _file_sha256(path) != entry['stored_sha256']:
+                problems.append(f"{name}: stored SHA-256 mismatch")
+            elif deep:
+                raw_digest = hashlib.sha256()
+                with open_log(path) as f:
+                    for chunk in iter(lambda: f.read(CHUNK_BYTES), b''):
+                        raw_digest.update(chunk)
+                if 'sha256:' + raw_digest.hexdigest() != entry['raw_sha256']:
+                    problems.append(f"{name}: raw SHA-256 mismatch")
+        return problems
+
+    # ---------- Compaction ----------
+
+    def compact(self, dry_run: bool = False) -> List[Path]:
+        """
+        Remove per-run record files whose record is in an indexed log
+
+        Args:
+            dry_run: Only report the files that would be removed
+
+        Returns:
+            Removed (or removable) files
+        """
+        index = AuditIndex(self.audit_dir)
+        index.update()
+        removed = []
+        for path in sorted(self.audit_dir.iterdir()):
+            if not path.is_file() or path.suffix not in ('.json', '.msgpack') or LOG_NAME.match(path.name):
+                continue
+            try:
+                record = next(iter_records(path))
+            except (ValueError, ImportError, StopIteration, OSError):
+                continue
+            if isinstance(record, dict) and self._logged(index, record):
+                removed.append(path)
+                if not dry_run:
+                    path.unlink()
+        return removed
+
+    @staticmethod
+    def _logged(index: AuditIndex, record: Dict[str, Any]) -> bool:
+        """The record appears, unchanged, in an indexed log"""
+        for key in ('run_id', 'decision_id', 'orchestration_id'):
+            value = record.get(key)
+            if isinstance(value, str) and value:
+                for candidate in index.get(key, value):
+                    candidate.pop('_index', None)
+                    if candidate == record:
+                        return True
+                return False
+        return False
+
+    # ---------- Maintenance ----------
+
+    def maintain(self, compact: Optional[bool] = None) -> Dict[str, List[str]]:
+        """
+        Seal previous days, compress sealed segments and optionally compact
+
+        Args:
+            compact: Remove redundant per-run record files (default: SS2_AUDIT_COMPACT)
+
+        Returns:
+            Names of the sealed, compressed and compacted files
+        """
+        if compact is None:
+            compact = os.getenv('SS2_AUDIT_COMPACT', 'false').lower() == 'true'
+        summary = {
+            'sealed': [path.name for path in self.seal()],
+            'compressed': [entry['segment'] for entry in self.compress_pending()],
+            'compacted': [],
+        }
+        if compact:
+            summary['compacted'] = [path.name for path in self.compact()]
+        return summary
+
+    def status(self) -> Dict[str, Any]:
+        """Sizes of the active logs and sealed segments"""
+        active = self.active_logs()
+        manifest = self.manifest()
+        recorded = {entry['segment'] for entry in manifest}
+        return {
+            'active_logs': len(active),
+            'active_bytes': sum(path.stat().st_size for path in active),
+            'segments': len(manifest),
+            'raw_bytes': sum(entry['raw_bytes'] for entry in manifest),
+            'stored_bytes': sum(entry['stored_bytes'] for entry in manifest),
+            'pending': [path.name for path in self.segments() if path.name not in recorded],
+        }
+
+
+# ---------- Background rotation ----------
+
+_rotation_queue: 'queue.Queue' = queue.Queue()
+_rotation_pending: Set[Path] = set()
+_rotation_guard = threading.Lock()
+_rotation_thread: Optional[threading.Thread] = None
+
+
+def request_rotation(log_path: Union[str, Path], min_bytes: int = 0) -> None:
+    """
+    Rotate and compress a full log on the background thread
+
+    Called by AuditSerializer.write() after an append reaches
+    SS2_AUDIT_SEGMENT_MB; returns immediately.
+
+    Args:
+        log_path: Active daily log
+        min_bytes: Skip the rotation if the log is smaller by then (another writer rotated it)
+    """
+    global _rotation_thread
+    log_path = Path(log_path)
+    with _rotation_guard:
+        if log_path in _rotation_pending:
+            return
+        _rotation_pending.add(log_path)
+        if _rotation_thread is None or not _rotation_thread.is_alive():
+            _rotation_thread = threading.Thread(target=_rotation_worker, name='audit-segments', daemon=True)
+            _rotation_thread.start()
+    _rotation_queue.put((log_path, min_bytes))
+
+
+def _rotation_worker() -> None:
+    while True:
+        log_path, min_bytes = _rotation_queue.get()
+        # Writes from here on request a new rotation (rotate() skips it if the log is small again)
+        with _rotation_guard:
+            _rotation_pending.discard(log_path)
+        try:
+            manager = SegmentManager(log_path.parent)
+            if manager.rotate(log_path, min_bytes) is not None:
+                time.sleep(manager.grace_seconds)
+                manager.compress_pending()
+        except Exception as e:
+            # Unsealed segments are picked up by the next rotation or maintain()
+            logger.error(f"Audit segment rotation failed for {log_path}: {e}")
+        finally:
+            _rotation_queue.task_done()
+
+
+def wait_for_rotations() -> None:
+    """Block until requested rotations have finished (for shutdown and tests)"""
+    _rotation_queue.join()
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Rotate, compress, verify and compact audit log segments"""
+    parser = argparse.ArgumentParser(description='Maintain Safety Sigma audit log segments')
+    parser.add_argument('--audit-dir', help='Audit directory (default: SS2_AUDIT_DIR or audit_logs)')
+    parser.add_argument('--compression', choices=COMPRESSIONS, help='Default: SS2_AUDIT_COMPRESSION or gzip')
+    commands = parser.add_subparsers(dest='command', required=True)
+    maintain = commands.add_parser('maintain', help='Seal previous days, compress sealed segments')
+    maintain.add_argument('--compact', action='store_true', help='Also remove redundant per-run record files')
+    maintain.add_argument('--every', type=float, help='Repeat every N seconds')
+    commands.add_parser('compress', help='Compress sealed segments only')
+    verify = commands.add_parser('verify', help='Check the hash chain and sealed segments')
+    verify.add_argument('--deep', action='store_true', help='Also decompress and check raw hashes')
+    compact = commands.add_parser('compact', help='Remove per-run record files already in indexed logs')
+    compact.add_argument('--dry-run', action='store_true')
+    commands.add_parser('status', help='Show active and sealed sizes')
+    args = parser.parse_args(argv)
+
+    manager = SegmentManager(args.audit_dir, compression=args.compression)
+    if args.command == 'maintain':
+        while True:
+            summary = manager.maintain(compact=args.compact or None)
+            print(json.dumps(summary), flush=True)
+            if not args.every:
+                return 0
+            time.sleep(args.every)
+    if args.command == 'compress':
+        print(json.dumps([entry['segment'] for entry in manager.compress_pending()]))
+    elif args.command == 'verify':
+        problems = manager.verify(deep=args.deep)
+        for problem in problems:
+            print(problem)
+        print(f"{len(manager.manifest())} segments, {len(problems)} problems", file=sys.stderr)
+        return 1 if problems else 0
+    elif args.command == 'compact':
+        for path in manager.compact(dry_run=args.dry_run):
+            print(path.name)
+    else:
+        print(json.dumps(manager.status(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
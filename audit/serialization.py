@@ -0,0 +1,409 @@
+"""
+Audit Record Serialization for Safety Sigma 2.0
+
+One encoding path for audit records: each record is encoded once to compact
+bytes and the same bytes are written to both sinks (the per-record file and
+the daily log).
+
+Formats:
+- json (default): compact UTF-8 JSON; the daily log is JSON Lines (.jsonl).
+  Uses orjson when installed, otherwise the standard library.
+- msgpack: MessagePack for high-volume deployments (requires msgpack); the
+  daily log is a stream of concatenated records (.msgpack).
+
+Records are read back, and converted to JSON, with iter_records() or the
+command line:
+
+    python -m audit.serialization audit_logs/audit_2025-01-01.msgpack --output audit.jsonl
+
+Daily logs larger than SS2_AUDIT_SEGMENT_MB are rotated into sealed,
+compressed segments in the background (see audit.segments); iter_records()
+reads sealed segments (.jsonl.gz, .jsonl.zst, ...) like any other log,
+decompressing them as it goes. A segment is a series of independently
+compressed blocks (gzip members or zstd frames), so a reader given the block
+offsets (SegmentReader) seeks to a record by decompressing only its block.
+
+Configuration:
+    SS2_AUDIT_FORMAT - 'json' or 'msgpack' (default: json)
+    SS2_AUDIT_SEGMENT_MB - Rotate daily logs at this size, 0 to disable (default: 64)
+"""
+
+import argparse
+import bisect
+import io
+import json
+import logging
+import os
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+AUDIT_FORMATS = ('json', 'msgpack')
+
+# File extensions per format: (single record, daily log)
+EXTENSIONS = {
+    'json': ('.json', '.jsonl'),
+    'msgpack': ('.msgpack', '.msgpack'),
+}
+
+# Suffixes of compressed (sealed) log segments
+COMPRESSED_SUFFIXES = ('.gz', '.zst')
+
+# Compressed bytes read from a segment per decompression step
+READ_BYTES = 64 * 1024
+
+# Daily logs (<stream>_YYYY-MM-DD.jsonl) and their sealed segments (<stream>_YYYY-MM-DD.0001.jsonl.gz)
+LOG_NAME = re.compile(r'^(?P<stream>[a-z_]+)_(?P<date>\d{4}-\d{2}-\d{2})(?:\.(?P<seq>\d+))?'
+                      r'\.(?P<extension>jsonl|msgpack)(?P<compression>\.gz|\.zst)?$')
+
+logger = logging.getLogger('safety_sigma.audit')
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values JSON/MessagePack cannot encode natively (matches json.dumps(default=str))"""
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def encode_json(record: Any) -> bytes:
+    """
+    Encode a record as compact UTF-8 JSON
+
+    Args:
+        record: JSON-like structure
+
+    Returns:
+        Encoded bytes (no trailing newline)
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(record, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            pass  # e.g. integers beyond 64 bits; the standard library handles them
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def decode_json(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text"""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def resolve_format(fmt: Optional[str] = None) -> str:
+    """
+    Determine the audit format to write
+
+    Args:
+        fmt: Requested format (default: SS2_AUDIT_FORMAT)
+
+    Returns:
+        'json' or 'msgpack' ('json' if msgpack was requested but is not installed)
+    """
+    fmt = (fmt or os.getenv('SS2_AUDIT_FORMAT', 'json')).lower()
+    if fmt not in AUDIT_FORMATS:
+        raise ValueError(f"Unknown audit format: {fmt}. Supported: {AUDIT_FORMATS}")
+    if fmt == 'msgpack' and not HAS_MSGPACK:
+        logger.warning("SS2_AUDIT_FORMAT=msgpack but msgpack is not installed; writing JSON audit records")
+        return 'json'
+    return fmt
+
+
+class AuditSerializer:
+    """
+    Encode audit records once and write them to the record file and daily log
+    """
+
+    def __init__(self, fmt: Optional[str] = None):
+        """
+        Initialize serializer
+
+        Args:
+            fmt: 'json' or 'msgpack' (default: SS2_AUDIT_FORMAT)
+        """
+        self.format = resolve_format(fmt)
+        self.record_extension, self.log_extension = EXTENSIONS[self.format]
+        self.segment_bytes = int(float(os.getenv('SS2_AUDIT_SEGMENT_MB', '64')) * 1024 * 1024)
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        """Encode one record"""
+        if self.format == 'msgpack':
+            return msgpack.packb(record, default=_default, use_bin_type=True)
+        return encode_json(record)
+
+    def record_path(self, directory: Path, name: str) -> Path:
+        """Path of a single-record file (name without extension)"""
+        return directory / f"{name}{self.record_extension}"
+
+    def log_path(self, directory: Path, name: str) -> Path:
+        """Path of a daily log (name without extension)"""
+        return directory / f"{name}{self.log_extension}"
+
+    def write(self, record: Dict[str, Any], record_path: Optional[Path] = None,
+              log_path: Optional[Path] = None) -> bytes:
+        """
+        Encode a record once and write it to either or both sinks
+
+        Args:
+            record: Record to write
+            record_path: Single-record file to (over)write
+            log_path: Daily log to append to
+
+        Returns:
+            Encoded record bytes
+        """
+        data = self.encode(record)
+        if record_path is not None:
+            record_path.write_bytes(data)
+        if log_path is not None:
+            with open(log_path, 'ab') as f:
+                f.write(data + b'\n' if self.format == 'json' else data)
+                full = self.segment_bytes and f.tell() >= self.segment_bytes
+            if full:
+                # Rotation and compression happen on a background thread; this write is not delayed
+                from .segments import request_rotation
+                request_rotation(log_path, min_bytes=self.segment_bytes)
+        return data
+
+
+_default_serializers: Dict[str, AuditSerializer] = {}
+
+
+def get_serializer(fmt: Optional[str] = None) -> AuditSerializer:
+    """Shared serializer for a format (default: SS2_AUDIT_FORMAT)"""
+    requested = (fmt or os.getenv('SS2_AUDIT_FORMAT', 'json')).lower()
+    serializer = _default_serializers.get(requested)
+    if serializer is None:
+        serializer = _default_serializers[requested] = AuditSerializer(requested)
+    return serializer
+
+
+def log_format(path: Union[str, Path]) -> Optional[str]:
+    """
+    Format of an audit log or log segment
+
+    Args:
+        path: Log path (.jsonl or .msgpack, optionally compressed)
+
+    Returns:
+        'json', 'msgpack', or None for anything that is not a log
+    """
+    path = Path(path)
+    suffix = path.suffix
+    if suffix in COMPRESSED_SUFFIXES:
+        suffix = Path(path.stem).suffix
+    return {'.jsonl': 'json', '.msgpack': 'msgpack'}.get(suffix)
+
+
+class SegmentReader(io.RawIOBase):
+    """
+    Streaming reader over a compressed segment (gzip members or zstd frames)
+
+    Decompresses as it is read, READ_BYTES of compressed input at a time;
+    tell() and seek() use uncompressed offsets. Each gzip member or zstd
+    frame is an independently decompressible block: blocks holds the
+    (raw offset, stored offset) of every block start known so far, from the
+    blocks argument or found while reading, and seek() restarts at the block
+    holding the target instead of at the start of the file.
+    """
+
+    def __init__(self, path: Union[str, Path], blocks: Optional[Sequence[Tuple[int, int]]] = None):
+        """
+        Initialize reader
+
+        Args:
+            path: .gz or .zst segment
+            blocks: (raw offset, stored offset) of the segment's blocks, if known
+        """
+        path = Path(path)
+        if path.suffix == '.zst' and not HAS_ZSTD:
+            raise ImportError("Reading .zst audit segments requires zstandard (pip install zstandard)")
+        self._zstd = path.suffix == '.zst'
+        self._file = open(path, 'rb')
+        self.blocks: List[Tuple[int, int]] = sorted(set(map(tuple, blocks or ())) | {(0, 0)})
+        self._restart(0, 0)
+
+    def _restart(self, raw_offset: int, stored_offset: int) -> None:
+        """Continue decompressing at the start of a block"""
+        self._file.seek(stored_offset)
+        self._stored = stored_offset  # stored offset of self._input
+        self._input = b''
+        self._output = b''
+        self._used = 0  # bytes of self._output already returned
+        self._position = raw_offset  # raw offset of self._output[self._used]
+        self._decompressor = None
+        self._eof = False
+
+    def _decompress_step(self) -> None:
+        data = self._input or self._file.read(READ_BYTES)
+        if not data:
+            if self._decompressor is not None:
+                raise EOFError("Compressed audit segment ended in the middle of a block")
+            self._eof = True
+            return
+        if self._decompressor is None:
+            block = (self._position + len(self._output) - self._used, self._stored)
+            if block[0] > self.blocks[-1][0]:
+                self.blocks.append(block)
+            self._decompressor = (zstandard.ZstdDecompressor().decompressobj() if self._zstd
+                                  else zlib.decompressobj(wbits=31))
+        self._output = self._output[self._used:] + self._decompressor.decompress(data)
+        self._used = 0
+        if self._decompressor.eof:
+            self._input = self._decompressor.unused_data
+            self._decompressor = None  # the next block starts here
+        else:
+            self._input = b''
+        self._stored += len(data) - len(self._input)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        while self._used == len(self._output) and not self._eof:
+            self._decompress_step()
+        size = min(len(buffer), len(self._output) - self._used)
+        buffer[:size] = self._output[self._used:self._used + size]
+        self._used += size
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("compressed segments can only seek from the start or current position")
+        block = self.blocks[bisect.bisect_right(self.blocks, (offset, float('inf'))) - 1]
+        if offset < self._position or block[0] > self._position:
+            self._restart(*block)
+        while self._position < offset:
+            if self._used == len(self._output):
+                self._decompress_step()
+                if self._eof:
+                    break
+            skip = min(offset - self._position, len(self._output) - self._used)
+            self._used += skip
+            self._position += skip
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_log(path: Union[str, Path], blocks: Optional[Sequence[Tuple[int, int]]] = None):
+    """
+    Open an audit log or sealed segment for binary reading
+
+    Compressed segments are decompressed as they are read; offsets and
+    seek() refer to the uncompressed records.
+
+    Args:
+        path: Log path
+        blocks: (raw offset, stored offset) of a compressed segment's blocks, so
+            seek() decompresses only the block holding the target
+
+    Returns:
+        Binary file object (buffered SegmentReader for compressed segments)
+    """
+    path = Path(path)
+    if path.suffix in COMPRESSED_SUFFIXES:
+        return io.BufferedReader(SegmentReader(path, blocks), READ_BYTES)
+    return open(path, 'rb')
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read audit records from a file in any supported format
+
+    Args:
+        path: .json record (single or pretty-printed), .jsonl log or .msgpack record/log,
+            or a compressed log segment (.jsonl.gz, .msgpack.zst, ...)
+
+    Returns:
+        Iterator of records in file order
+    """
+    path = Path(path)
+    fmt = log_format(path)
+    if fmt == 'msgpack':
+        if not HAS_MSGPACK:
+            raise ImportError("Reading .msgpack audit files requires msgpack (pip install msgpack)")
+        with open_log(path) as f:
+            yield from msgpack.Unpacker(f, raw=False, strict_map_key=False)
+    elif fmt == 'json':
+        with open_log(path) as f:
+            for line in f:
+                if line.strip():
+                    yield decode_json(line)
+    else:
+        yield decode_json(path.read_bytes())
+
+
+def convert(source: Union[str, Path], output, pretty: bool = False) -> int:
+    """
+    Convert audit records to JSON
+
+    Args:
+        source: Audit file in any supported format
+        output: Text stream to write to
+        pretty: Write one indented JSON document per record instead of JSON Lines
+
+    Returns:
+        Number of records converted
+    """
+    count = 0
+    for record in iter_records(source):
+        if pretty:
+            output.write(json.dumps(record, ensure_ascii=False, indent=2) + '\n')
+        else:
+            output.write(encode_json(record).decode('utf-8') + '\n')
+        count += 1
+    return count
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Convert audit records (JSON, JSONL or MessagePack) to JSON"""
+    parser = argparse.ArgumentParser(description='Convert Safety Sigma audit records to JSON')
+    parser.add_argument('source', help='Audit record, daily log or log segment (.json, .jsonl, .msgpack, .gz, .zst)')
+    parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    parser.add_argument('--pretty', action='store_true', help='Indented JSON instead of JSON Lines')
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            count = convert(args.source, f, args.pretty)
+        print(f"Converted {count} records to {args.output}", file=sys.stderr)
+    else:
+        convert(args.source, sys.stdout, args.pretty)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for Safety Sigma 2.0
+
+Run from the repository root, e.g.:
+    python -m benchmarks.runner [--filter 'document_stats.*']
+"""
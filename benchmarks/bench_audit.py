@@ -0,0 +1,41 @@
+"""
+Audit benchmarks: encoding tool audit records (pretty JSON twice vs encode once)
+"""
+
+import json
+import time
+
+from audit.serialization import AuditSerializer
+from benchmarks.corpus import generate_report
+from benchmarks.registry import benchmark
+from tools.base_tool import ToolExecutionRecord
+
+
+def _record() -> ToolExecutionRecord:
+    report = generate_report('fraud', 10_000)
+    now = time.time()
+    return ToolExecutionRecord(
+        tool_name='extraction_tool', tool_version='1.0.0', run_id='bench', start_time=now, end_time=now,
+        duration_ms=1.0, success=True,
+        input_summary={'text_content': report.text[:100]},
+        output_summary={'type': 'str', 'preview': report.text[:200]},
+        metadata={'source_traceability': {'indicators': report.indicators}},
+    )
+
+
+@benchmark("audit.encode[to_json-twice]", group='audit')
+def encode_to_json_twice():
+    record = _record()
+    return lambda: (record.to_json(), record.to_json().replace('\n', ''))
+
+
+@benchmark("audit.encode[serializer-json]", group='audit')
+def encode_serializer_json():
+    record, serializer = _record(), AuditSerializer('json')
+    return lambda: serializer.encode(record.to_dict())
+
+
+@benchmark("audit.encode[stdlib-compact]", group='audit')
+def encode_stdlib_compact():
+    record = _record()
+    return lambda: json.dumps(record.to_dict(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,33 @@
+"""
+Document statistics benchmarks: one DocumentStats pass against the frozen
+pre-DocumentStats analyze_document_* helpers (benchmarks.reference_document_analysis),
+which scan the text separately for each result
+"""
+
+from benchmarks import reference_document_analysis as reference
+from benchmarks.corpus import generate_report
+from benchmarks.registry import benchmark
+from tools.document_stats import DocumentStats
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def _register(label: str, size: int) -> None:
+    @benchmark(f"document_stats.compute[fraud-{label}]", group='document', kind='fraud', size=size)
+    def compute():
+        text = generate_report('fraud', size).text
+
+        def run():
+            stats = DocumentStats.compute(text)
+            return stats.document_type(), stats.complexity(), stats.structure()
+        return run
+
+    @benchmark(f"document_stats.reference_helpers[fraud-{label}]", group='document', kind='fraud', size=size)
+    def reference_helpers():
+        text = generate_report('fraud', size).text
+        return lambda: (reference.analyze_document_type(text), reference.analyze_document_complexity(text),
+                        reference.analyze_document_structure(text))
+
+
+for _label, _size in SIZES.items():
+    _register(_label, _size)
@@ -0,0 +1,29 @@
+"""
+Extraction benchmarks: IntelligenceExtractor and DynamicRuleGenerator
+"""
+
+from benchmarks.corpus import REPORT_KINDS, generate_report
+from benchmarks.registry import benchmark
+from tools.dynamic_rule_generator import DynamicRuleGenerator
+from tools.intelligence_extractor import IntelligenceExtractor
+
+SIZES = {'10k': 10_000, '100k': 100_000}
+
+
+def _register(kind: str, label: str, size: int) -> None:
+    @benchmark(f"extractor.extract_intelligence[{kind}-{label}]", group='extraction', kind=kind, size=size)
+    def extract_intelligence():
+        report = generate_report(kind, size)
+        extractor = IntelligenceExtractor()
+        return lambda: extractor.extract_intelligence(report.text)
+
+    @benchmark(f"rule_generator.generate_rules[{kind}-{label}]", group='extraction', kind=kind, size=size)
+    def generate_rules():
+        report = generate_report(kind, size)
+        generator = DynamicRuleGenerator()
+        return lambda: generator.generate_rules_from_document(report.text, report.name)
+
+
+for _kind in REPORT_KINDS:
+    for _label, _size in SIZES.items():
+        _register(_kind, _label, _size)
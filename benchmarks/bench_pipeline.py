@@ -0,0 +1,41 @@
+"""
+End-to-end benchmark: orchestrator pipeline in simulate mode
+
+The PDF step is replaced by a document session holding the synthetic text,
+so the case measures orchestration, extraction (simulated) and validation.
+Skipped when the Safety Sigma 1.0 backend is not importable.
+"""
+
+import tempfile
+
+from benchmarks.corpus import generate_report
+from benchmarks.registry import SkipBenchmark, benchmark
+from orchestration.document_session import DocumentSession
+from orchestration.tool_orchestrator import ToolOrchestrator
+from tools.extraction_tool import ExtractionTool
+
+INSTRUCTIONS = "Extract all fraud indicators, amounts and links from the report"
+
+
+@benchmark("orchestrator.pipeline[fraud-10k-simulate]", group='pipeline', kind='fraud', size=10_000)
+def orchestrator_pipeline():
+    try:
+        ExtractionTool()
+    except ImportError as e:
+        raise SkipBenchmark(f"Safety Sigma 1.0 backend unavailable: {e}")
+
+    report = generate_report('fraud', 10_000)
+    orchestrator = ToolOrchestrator(audit_dir=tempfile.mkdtemp(prefix='ss2-bench-'))
+
+    def run():
+        result = orchestrator.execute_safety_sigma_pipeline(
+            pdf_file=f"{report.name}.pdf",
+            instructions=INSTRUCTIONS,
+            simulate=True,
+            session=DocumentSession.from_text(report.text),
+        )
+        if not result.success:
+            raise RuntimeError(result.error)
+        return result
+
+    return run
@@ -0,0 +1,79 @@
+"""
+Rule benchmarks: document classification, RuleSet.evaluate, compile_rules and
+applying compiled rules to a transaction stream (regex artifact vs python target,
+and amount indicators via the amounts target)
+"""
+
+import random
+import re
+
+from benchmarks.corpus import generate_report
+from benchmarks.registry import benchmark
+from rules.document_classifier import DocumentClassifierEngine
+from src.pdf_processor.amounts import AmountIndex, amount_rules
+from src.pdf_processor.pymatcher import load_matcher
+from src.pdf_processor.rules import CompileOptions, compile_rules
+
+
+def _classifier() -> DocumentClassifierEngine:
+    engine = DocumentClassifierEngine()
+    engine.load_rules('document_classification')
+    return engine
+
+
+for _label, _size in (('10k', 10_000), ('100k', 100_000)):
+    @benchmark(f"classifier.classify_document[threat-{_label}]", group='rules', kind='threat', size=_size)
+    def classify_document(size=_size):
+        report = generate_report('threat', size)
+        engine = _classifier()
+        return lambda: engine.classify_document(report.text, "Extract threat indicators")
+
+
+@benchmark("ruleset.evaluate[document_classification]", group='rules')
+def ruleset_evaluate():
+    engine = _classifier()
+    context = engine.analyze_document_context(generate_report('fraud', 10_000).text, "Extract fraud indicators")
+    ruleset = engine.rulesets['document_classification']
+    return lambda: ruleset.evaluate(context)
+
+
+for _label, _density in (('sparse', 0.05), ('dense', 0.5)):
+    @benchmark(f"compile_rules[fraud-100k-{_label}]", group='rules', size=100_000, density=_density)
+    def compile_rules_case(density=_density):
+        ir = generate_report('fraud', 100_000, density).to_ir()
+        return lambda: compile_rules(ir)
+
+
+def _transaction_stream():
+    """~800 memo strings and the rules compiled from the indicators planted in them"""
+    report = generate_report('fraud', 200_000, density=0.3)
+    stream = [memo for memo in report.text.split('. ') if memo]
+    return stream, compile_rules(report.to_ir(), CompileOptions(targets=['regex', 'python']))
+
+
+@benchmark("apply_rules[regex-loop]", group='rules')
+def apply_rules_regex():
+    stream, artifacts = _transaction_stream()
+    compiled = [(k, re.compile(rule['pattern'])) for k, rule in enumerate(artifacts['regex'])]
+
+    def run():
+        return [(t, m.start(), m.end(), k) for t, text in enumerate(stream)
+                for k, pattern in compiled for m in pattern.finditer(text)]
+    return run
+
+
+@benchmark("apply_rules[python-target]", group='rules')
+def apply_rules_python():
+    stream, artifacts = _transaction_stream()
+    module = load_matcher(artifacts['python'])
+    return lambda: module.match_many(stream)
+
+
+@benchmark("apply_amounts[amount-index]", group='rules', indicators=2000, size=100_000)
+def apply_amounts_index():
+    rng = random.Random(0)
+    indicators = [{"kind": "amount", "verbatim": f"${n}", "numeric": round(rng.uniform(1, 10_000), 2),
+                   "category_id": "payments", "span_id": f"s{n}"} for n in range(2000)]
+    index = AmountIndex(amount_rules(indicators), tolerance=0.01)
+    column = [round(rng.uniform(1, 10_000), 2) for _ in range(100_000)]
+    return lambda: sum(1 for _ in index.matches(column))
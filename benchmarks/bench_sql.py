@@ -0,0 +1,138 @@
+"""
+SQL target benchmarks: the generated set-based queries against a synthetic
+SQLite transactions table, with and without the recommended indexes, versus
+the naive one-query-per-indicator baseline (instr plus the same boundary
+GLOB for text, = for links and amounts).
+
+The registered cases use 100k rows; for the million-row harness run
+
+    python -m benchmarks.bench_sql --rows 1000000
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import generate_report
+from benchmarks.registry import benchmark
+from src.pdf_processor.rules import CompileOptions, compile_rules
+from src.pdf_processor.sql import (INDICATOR_TABLE, boundary_pattern, generate_sql, load_indicators, run_query,
+                                   verify_indexes)
+
+_WORDS = ('payment', 'transfer', 'invoice', 'refund', 'gift', 'card', 'wire', 'order', 'fee', 'deposit')
+
+
+def build_database(rows: int, hit_rate: float = 0.01, indexed: bool = True, text_index: Optional[str] = None,
+                   seed: int = 0) -> Tuple[sqlite3.Connection, Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Create an in-memory transactions table seeded with report indicators
+
+    Args:
+        rows: Number of transactions
+        hit_rate: Fraction of rows carrying an indicator (amount, link or memo text)
+        indexed: Create the recommended indexes (only those EXPLAIN verifies are kept)
+        text_index: None or 'fts5' (trigram index for the text join; needs indexed=True)
+        seed: Random seed
+
+    Returns:
+        (connection, sql artifact with the generated queries, index verification results)
+    """
+    report = generate_report('fraud', 200_000, density=0.3, seed=seed)
+    sql = compile_rules(report.to_ir(), CompileOptions(targets=['sql']))['sql']
+    sql.update(generate_sql(sql, 'sqlite', text_index=text_index))
+    amounts = [r['numeric'] for r in sql['rows'] if r['kind'] == 'amount']
+    links = [r['literal'] for r in sql['rows'] if r['kind'] == 'link']
+    texts = [r['verbatim'] for r in sql['rows'] if r['kind'] == 'text']
+
+    rng = random.Random(seed)
+
+    def transaction(i: int) -> Tuple[Any, ...]:
+        amount = rng.randint(1, 500_000) / 100
+        link = f"shop-{rng.randint(0, 50_000)}.example"
+        memo = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8)))
+        if rng.random() < hit_rate:
+            which = rng.randrange(3)
+            if which == 0 and amounts:
+                amount = rng.choice(amounts)
+            elif which == 1 and links:
+                link = rng.choice(links)
+            elif texts:
+                memo = f"{memo} {rng.choice(texts)}"
+        return i, amount, link, memo
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount REAL, link TEXT, memo TEXT)")
+    conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?)", (transaction(i) for i in range(rows)))
+    load_indicators(conn, sql)
+    verified = verify_indexes(conn, sql) if indexed else []
+    return conn, sql, verified
+
+
+def naive_queries(conn: sqlite3.Connection, sql: Dict[str, Any]) -> Callable[[], List[Tuple[Any, ...]]]:
+    """One query per indicator, as written by hand"""
+    statements = []
+    for row in sql['rows']:
+        if row['kind'] == 'amount':
+            statements.append(("SELECT id FROM transactions WHERE amount = ?", (row['numeric'],)))
+        elif row['kind'] == 'link':
+            statements.append(("SELECT id FROM transactions WHERE link = ?", (row['literal'],)))
+        elif row.get('verbatim'):
+            statements.append(("SELECT id FROM transactions WHERE instr(memo, ?) > 0 AND (' ' || memo || ' ') GLOB ?",
+                               (row['verbatim'], boundary_pattern(row['verbatim'], 'sqlite'))))
+
+    def run():
+        return [hit for statement, params in statements for hit in conn.execute(statement, params)]
+    return run
+
+
+for _label, _indexed, _text_index in (('unindexed', False, None), ('indexed', True, None),
+                                      ('indexed-fts5', True, 'fts5')):
+    @benchmark(f"sql.match_all[sqlite-100k-{_label}]", group='sql', rows=100_000, indexed=_indexed,
+               text_index=_text_index)
+    def sql_match_all(indexed=_indexed, text_index=_text_index):
+        conn, sql, _ = build_database(100_000, indexed=indexed, text_index=text_index)
+        return lambda: run_query(conn, sql, 'match_all')
+
+
+@benchmark("sql.naive_per_indicator[sqlite-100k]", group='sql', rows=100_000)
+def sql_naive():
+    conn, sql, _ = build_database(100_000, indexed=False)
+    return naive_queries(conn, sql)
+
+
+def _time(func: Callable[[], Any]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, len(result)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the generated SQL against a synthetic SQLite table')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--hit-rate', type=float, default=0.01, help='Fraction of rows carrying an indicator')
+    parser.add_argument('--skip-naive', action='store_true', help='Skip the per-indicator baseline')
+    args = parser.parse_args(argv)
+
+    for label, indexed, text_index in (('off', False, None), ('on', True, None), ('on+fts5', True, 'fts5')):
+        start = time.perf_counter()
+        conn, sql, verified = build_database(args.rows, args.hit_rate, indexed, text_index)
+        n_indicators = conn.execute(f"SELECT count(*) FROM {INDICATOR_TABLE}").fetchone()[0]
+        print(f"\n{args.rows:,} rows, {n_indicators} indicators, indexes={label} "
+              f"(built in {time.perf_counter() - start:.1f}s)")
+        for index in verified:
+            print(f"  index {index['name']:<24} {'used' if index['verified'] else 'unused (dropped)'}")
+        for name in sql['queries']:
+            elapsed, hits = _time(lambda: run_query(conn, sql, name))
+            print(f"  {name:<16} {elapsed * 1000:10.1f} ms  {hits:>8,} hits")
+        if not args.skip_naive:
+            elapsed, hits = _time(naive_queries(conn, sql))
+            print(f"  {'naive':<16} {elapsed * 1000:10.1f} ms  {hits:>8,} hits")
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
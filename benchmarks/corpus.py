@@ -0,0 +1,208 @@
+"""
+Synthetic Report Corpus for Safety Sigma 2.0 Benchmarks
+
+Deterministic generator of fraud, threat intelligence and policy reports
+of configurable size and indicator density. The same (kind, size, density,
+seed) always produces the same text and indicators, so benchmark results
+are comparable across runs and machines.
+
+Each report also carries the indicators it contains in the IR shape that
+src.pdf_processor.rules.compile_rules accepts.
+
+Usage:
+    python -m benchmarks.corpus --output corpus/ --kinds fraud threat --sizes 10000 100000
+"""
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+REPORT_KINDS = ('fraud', 'threat', 'policy')
+
+# Filler vocabulary per report kind (no indicators)
+_VOCABULARY: Dict[str, Tuple[str, ...]] = {
+    'fraud': (
+        'victims', 'reported', 'payments', 'scam', 'fraud', 'accounts', 'customers', 'suspicious',
+        'transfers', 'phishing', 'messages', 'invoices', 'fake', 'refund', 'bank', 'losses',
+        'investigators', 'the', 'a', 'of', 'to', 'and', 'were', 'with', 'after', 'using',
+    ),
+    'threat': (
+        'attackers', 'malware', 'campaign', 'threat', 'exploit', 'vulnerability', 'infrastructure',
+        'network', 'payload', 'breach', 'actors', 'coordinated', 'domains', 'servers', 'attack',
+        'operators', 'the', 'a', 'of', 'to', 'and', 'was', 'with', 'through', 'across', 'using',
+    ),
+    'policy': (
+        'policy', 'compliance', 'regulation', 'standard', 'guideline', 'controls', 'requirements',
+        'providers', 'reporting', 'customers', 'review', 'obligations', 'audit', 'oversight',
+        'the', 'a', 'of', 'to', 'and', 'must', 'should', 'under', 'within', 'for', 'by', 'each',
+    ),
+}
+
+_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    'fraud': ('Summary', 'Victim Impact', 'Payment Flows', 'Indicators', 'Recommendations'),
+    'threat': ('Executive Summary', 'Infrastructure', 'Techniques', 'Targeting', 'Indicators'),
+    'policy': ('Scope', 'Requirements', 'Controls', 'Reporting Obligations', 'Enforcement'),
+}
+
+_PLATFORMS = ('Facebook', 'Instagram', 'TikTok', 'WhatsApp', 'Telegram', 'Threads', 'Twitter')
+_COUNTRIES = ('China', 'UK', 'United States', 'Beijing', 'London')
+_PHRASES = (
+    'information laundering',
+    'coordinated network',
+    'AI tools to translate and summarize',
+    'Alibaba Cloud as the domain registrar',
+    'DALL-E generated images',
+    'Facebook ads',
+)
+
+
+@dataclass
+class SyntheticReport:
+    """
+    Generated report with the indicators planted in it
+    """
+    kind: str
+    size: int
+    density: float
+    seed: int
+    text: str
+    indicators: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}_{self.size}_{self.density:g}_{self.seed}"
+
+    def to_ir(self) -> Dict[str, Any]:
+        """IR for compile_rules: indicators plus categories grounded in their span ids"""
+        categories: Dict[str, Dict[str, List[str]]] = {}
+        for indicator in self.indicators:
+            categories.setdefault(indicator['category_id'], {'spans': []})['spans'].append(indicator['span_id'])
+        return {'indicators': [dict(indicator) for indicator in self.indicators], 'categories': categories}
+
+
+def _indicator(rng: random.Random, index: int) -> Tuple[str, Dict[str, Any]]:
+    """Pick one indicator; returns (text to embed, IR indicator)"""
+    span_id = f"s_{index}"
+    choice = rng.randrange(6)
+
+    if choice == 0:
+        amount = rng.randint(100, 250_000) + rng.randint(0, 99) / 100
+        verbatim = f"${amount:,.2f}"
+        return verbatim, {'kind': 'amount', 'verbatim': verbatim, 'numeric': amount,
+                          'category_id': 'payments', 'span_id': span_id}
+    if choice == 1:
+        literal = f"wa.me/{rng.randint(10**9, 10**10 - 1)}"
+        return literal, {'kind': 'link', 'literal': literal, 'category_id': 'comm', 'span_id': span_id}
+    if choice == 2:
+        literal = f"{rng.choice(('secure', 'verify', 'refund', 'login'))}-{rng.randint(100, 999)}.com"
+        return literal, {'kind': 'link', 'literal': literal, 'category_id': 'infrastructure', 'span_id': span_id}
+    if choice == 3:
+        verbatim = f"VOID {rng.randint(1000, 9999)}"
+        return verbatim, {'kind': 'text', 'verbatim': verbatim, 'category_id': 'fraud_marker', 'span_id': span_id}
+    if choice == 4:
+        verbatim = f"{rng.choice(_PLATFORMS)} accounts targeting {rng.choice(_COUNTRIES)}"
+        return verbatim, {'kind': 'text', 'verbatim': verbatim, 'category_id': 'targeting', 'span_id': span_id}
+
+    verbatim = rng.choice(_PHRASES)
+    return verbatim, {'kind': 'text', 'verbatim': verbatim, 'category_id': 'techniques', 'span_id': span_id}
+
+
+def generate_report(kind: str = 'fraud', size: int = 10_000, density: float = 0.2,
+                    seed: int = 0) -> SyntheticReport:
+    """
+    Generate a synthetic report
+
+    Args:
+        kind: 'fraud', 'threat' or 'policy'
+        size: Approximate length in characters (the text never exceeds it)
+        density: Fraction of sentences (0-1) that contain an indicator
+        seed: Random seed; equal arguments always produce equal reports
+
+    Returns:
+        SyntheticReport with the text and its planted indicators
+    """
+    if kind not in REPORT_KINDS:
+        raise ValueError(f"Unknown report kind: {kind}. Supported: {REPORT_KINDS}")
+    if not 0.0 <= density <= 1.0:
+        raise ValueError(f"density must be between 0 and 1, got {density}")
+
+    rng = random.Random(f"{kind}:{size}:{density}:{seed}")
+    vocabulary = _VOCABULARY[kind]
+    headings = _HEADINGS[kind]
+
+    parts: List[str] = [f"# {kind.title()} Report {seed}\n\n"]
+    length = len(parts[0])
+    indicators: List[Dict[str, Any]] = []
+    sentence_index = 0
+
+    while True:
+        indicator = None
+        if sentence_index % 12 == 0 and sentence_index:
+            block = f"\n\n## {headings[(sentence_index // 12) % len(headings)]}\n\n"
+        else:
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 22))]
+            if rng.random() < density:
+                embedded, indicator = _indicator(rng, len(indicators))
+                words.insert(rng.randint(1, len(words)), embedded)
+            sentence = ' '.join(words)
+            block = sentence[0].upper() + sentence[1:] + rng.choice(('. ', '. ', '. ', '.\n', '! ', '? '))
+            if len(parts) % 9 == 0:
+                block = '- ' + block.rstrip() + '\n'
+
+        if length + len(block) > size:
+            break
+        if indicator is not None:
+            indicators.append(indicator)
+        parts.append(block)
+        length += len(block)
+        sentence_index += 1
+
+    return SyntheticReport(kind=kind, size=size, density=density, seed=seed,
+                           text=''.join(parts), indicators=indicators)
+
+
+def generate_corpus(kinds: Tuple[str, ...] = REPORT_KINDS, sizes: Tuple[int, ...] = (10_000,),
+                    density: float = 0.2, seed: int = 0) -> List[SyntheticReport]:
+    """Generate one report per (kind, size) combination"""
+    return [generate_report(kind, size, density, seed) for kind in kinds for size in sizes]
+
+
+def write_corpus(reports: List[SyntheticReport], output_dir: Path) -> List[Path]:
+    """
+    Write reports as <name>.txt with a <name>.ir.json alongside
+
+    Returns:
+        Paths of the written text files
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for report in reports:
+        text_path = output_dir / f"{report.name}.txt"
+        text_path.write_text(report.text, encoding='utf-8')
+        (output_dir / f"{report.name}.ir.json").write_text(json.dumps(report.to_ir(), indent=2), encoding='utf-8')
+        written.append(text_path)
+    return written
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a synthetic Safety Sigma report corpus')
+    parser.add_argument('--output', required=True, help='Output directory')
+    parser.add_argument('--kinds', nargs='+', choices=REPORT_KINDS, default=list(REPORT_KINDS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000])
+    parser.add_argument('--density', type=float, default=0.2, help='Fraction of sentences with an indicator')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    reports = generate_corpus(tuple(args.kinds), tuple(args.sizes), args.density, args.seed)
+    for path in write_corpus(reports, Path(args.output)):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Benchmark Registry for Safety Sigma 2.0
+
+Benchmark modules register cases here with the @benchmark decorator; the
+runner (benchmarks.runner) discovers and times them.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark setup when the case cannot run in this environment"""
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    Registered benchmark: setup() returns the zero-argument callable to time
+    """
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    group: str = 'default'
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+_REGISTRY: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, group: str = 'default', **params) -> Callable:
+    """
+    Register a benchmark setup function
+
+    Args:
+        name: Unique case name (e.g. 'extractor.extract_intelligence[fraud-100k]')
+        group: Group for reporting
+        **params: Parameters recorded with the result
+
+    Returns:
+        Decorator registering the setup function unchanged
+    """
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        if name in _REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        _REGISTRY[name] = BenchmarkCase(name=name, setup=setup, group=group, params=params)
+        return setup
+    return decorator
+
+
+def registered_cases() -> Dict[str, BenchmarkCase]:
+    """All cases registered so far, by name"""
+    return dict(_REGISTRY)
@@ -0,0 +1,252 @@
+"""
+Benchmark Runner for Safety Sigma 2.0
+
+Small asv-style runner. Benchmark modules (benchmarks/bench_*.py) register
+cases with benchmarks.registry.benchmark; each case is a setup function that
+returns the callable to time (or raises SkipBenchmark). Results are written
+as JSON so that runs can be compared and regressions gated in CI.
+
+Usage:
+    python -m benchmarks.runner --output results.json [--filter extractor] [--quick]
+    python -m benchmarks.runner --compare baseline.json results.json [--threshold 1.25]
+    python -m benchmarks.runner --filter 'extractor.*' --profile [sample|cprofile]
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import platform
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.registry import BenchmarkCase, SkipBenchmark, registered_cases
+
+
+RESULTS_VERSION = 1
+
+# Default ratio of current / baseline median above which a case counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timing statistics for one case (seconds per call)
+    """
+    name: str
+    group: str
+    params: Dict[str, Any]
+    status: str  # 'ok', 'skipped' or 'failed'
+    number: int = 0
+    repeat: int = 0
+    min: Optional[float] = None
+    median: Optional[float] = None
+    mean: Optional[float] = None
+    stdev: Optional[float] = None
+    reason: Optional[str] = None
+
+
+def discover(package: str = 'benchmarks') -> Dict[str, BenchmarkCase]:
+    """Import every <package>.bench_* module so their cases register"""
+    module = importlib.import_module(package)
+    for info in pkgutil.iter_modules(module.__path__):
+        if info.name.startswith('bench_'):
+            importlib.import_module(f"{package}.{info.name}")
+    return registered_cases()
+
+
+def _calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """Number of calls per repeat so that one repeat takes at least min_time"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+
+def run_case(case: BenchmarkCase, repeat: int = 5, min_time: float = 0.1) -> BenchmarkResult:
+    """
+    Time one case
+
+    Args:
+        case: Registered case
+        repeat: Number of timed repeats
+        min_time: Minimum seconds per repeat (sets calls per repeat)
+
+    Returns:
+        BenchmarkResult with per-call statistics
+    """
+    result = BenchmarkResult(name=case.name, group=case.group, params=case.params, status='ok')
+    try:
+        func = case.setup()
+        func()  # warm-up (imports, caches, lazy compilation)
+        number = _calibrate(func, min_time)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / number)
+    except SkipBenchmark as e:
+        result.status, result.reason = 'skipped', str(e)
+        return result
+    except Exception as e:
+        result.status, result.reason = 'failed', f"{type(e).__name__}: {e}"
+        return result
+
+    result.number, result.repeat = number, repeat
+    result.min = min(timings)
+    result.median = statistics.median(timings)
+    result.mean = statistics.fmean(timings)
+    result.stdev = statistics.stdev(timings) if len(timings) > 1 else 0.0
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              timeout=10, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_all(pattern: str = '*', repeat: int = 5, min_time: float = 0.1,
+            progress: Optional[Callable[[BenchmarkResult], None]] = None) -> Dict[str, Any]:
+    """
+    Run all discovered cases matching a glob pattern
+
+    Returns:
+        Results document (machine info + per-case results)
+    """
+    cases = discover()
+    results = []
+    for name in sorted(cases):
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        result = run_case(cases[name], repeat=repeat, min_time=min_time)
+        results.append(result)
+        if progress:
+            progress(result)
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'commit': _git_commit(),
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+        },
+        'settings': {'repeat': repeat, 'min_time': min_time},
+        'results': [asdict(result) for result in results],
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare two results documents case by case
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: current/baseline median ratio above which a case regressed
+
+    Returns:
+        One row per case present in both with a median:
+        name, baseline, current, ratio and regressed flag
+    """
+    baseline_medians = {r['name']: r['median'] for r in baseline['results'] if r.get('median')}
+    rows = []
+    for result in current['results']:
+        before, after = baseline_medians.get(result['name']), result.get('median')
+        if before is None or after is None:
+            continue
+        ratio = after / before
+        rows.append({'name': result['name'], 'baseline': before, 'current': after,
+                     'ratio': ratio, 'regressed': ratio > threshold})
+    return rows
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f}{unit}"
+    return f"{value / 1e-9:.1f}ns"
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    if result.status == 'ok':
+        print(f"{result.name:<60} {_format_seconds(result.median):>12} ±{_format_seconds(result.stdev)}")
+    else:
+        print(f"{result.name:<60} {result.status.upper():>12}  {result.reason}")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run Safety Sigma benchmarks')
+    parser.add_argument('--output', '-o', help='Write results JSON to this file')
+    parser.add_argument('--filter', '-k', default='*', help='Glob on case names (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repeats per case')
+    parser.add_argument('--min-time', type=float, default=0.1, help='Minimum seconds per repeat')
+    parser.add_argument('--quick', action='store_true', help='Single short repeat (smoke run)')
+    parser.add_argument('--list', action='store_true', help='List cases and exit')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two results files instead of running')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Regression ratio for --compare (default: %(default)s)')
+    parser.add_argument('--profile', nargs='?', const='sample', choices=['sample', 'cprofile'],
+                        help='Profile the run and write profile files next to --output (or to the cwd)')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, case in sorted(discover().items()):
+            print(f"{name}  [{case.group}]")
+        return 0
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text(encoding='utf-8')) for path in args.compare)
+        rows = compare(baseline, current, args.threshold)
+        for row in rows:
+            flag = 'REGRESSED' if row['regressed'] else ''
+            print(f"{row['name']:<60} {_format_seconds(row['baseline']):>12} -> "
+                  f"{_format_seconds(row['current']):>12} {row['ratio']:6.2f}x {flag}")
+        regressions = [row for row in rows if row['regressed']]
+        print(f"\n{len(rows)} cases compared, {len(regressions)} regressed (threshold {args.threshold}x)")
+        return 1 if regressions else 0
+
+    repeat, min_time = (1, 0.01) if args.quick else (args.repeat, args.min_time)
+    profiler = None
+    if args.profile:
+        from metrics.profiling import Profiler
+        profiler = Profiler(args.profile)
+
+    with profiler or nullcontext():
+        document = run_all(args.filter, repeat=repeat, min_time=min_time, progress=_print_result)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2), encoding='utf-8')
+        print(f"\nResults written to: {args.output}")
+    if profiler:
+        profile_dir = Path(args.output).parent if args.output else Path('.')
+        for path in profiler.write(profile_dir, prefix='benchmark_profile').values():
+            print(f"Profile written to: {path}")
+    return 1 if any(r['status'] == 'failed' for r in document['results']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Safety Sigma 2.0 Metrics Package
+
+In-process performance instrumentation:
+- tracing: nested spans, counters and histograms with Prometheus/OpenMetrics export
+- profiling: sampling / cProfile profiles with per-stage attribution
+- memory: per-document peak memory tracking and budget enforcement
+"""
+
+from . import memory, profiling, tracing
+
+__all__ = ['memory', 'profiling', 'tracing']
@@ -0,0 +1,228 @@
+"""
+Memory Accounting for Safety Sigma 2.0
+
+Per-document memory tracking and budget enforcement:
+- MemoryTracker measures the peak memory of a block of work, either with
+  tracemalloc (Python allocations, exact, adds allocation overhead) or by
+  reading the process RSS (cheap, coarse)
+- check_budget() is the pre-flight test tools run before processing: the
+  estimated peak for a document is compared with SS2_MEMORY_BUDGET_MB so an
+  oversized document switches to chunked mode or fails fast instead of the
+  worker being OOM-killed
+
+Trackers nest (agent → tool): each reports the peak reached while it was
+active, including the peaks of trackers opened inside it.
+
+Configuration:
+    SS2_MEMORY_TRACKING        - 'tracemalloc', 'rss' or 'off' (default: off)
+    SS2_MEMORY_BUDGET_MB       - Per-document budget; 0 disables enforcement (default: 0)
+    SS2_MEMORY_BYTES_PER_CHAR  - Estimated peak bytes per character of text (default: 32)
+"""
+
+import os
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # not available on Windows
+    HAS_RESOURCE = False
+
+
+TRACKING_MODES = ('tracemalloc', 'rss', 'off')
+
+# Measured peak of view + stats + intelligence extraction is ~28-30 bytes per
+# character of ASCII text (the lowercase copy, word list and token offsets dominate)
+DEFAULT_BYTES_PER_CHAR = 32
+
+# Text extracted from a PDF is bounded by a small multiple of the file size
+PDF_BYTES_PER_FILE_BYTE = 4
+
+MB = 1024 * 1024
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when a document is estimated to exceed the memory budget"""
+
+    def __init__(self, estimated_bytes: int, budget_bytes: int, what: str = 'document'):
+        self.estimated_bytes = estimated_bytes
+        self.budget_bytes = budget_bytes
+        super().__init__(
+            f"Estimated memory for {what} {estimated_bytes / MB:.1f}MB exceeds budget {budget_bytes / MB:.1f}MB"
+        )
+
+
+def tracking_mode() -> str:
+    """Configured tracking mode (SS2_MEMORY_TRACKING)"""
+    mode = os.getenv('SS2_MEMORY_TRACKING', 'off').lower()
+    return mode if mode in TRACKING_MODES else 'off'
+
+
+def budget_bytes() -> int:
+    """Configured per-document budget in bytes (0 = unlimited)"""
+    return int(float(os.getenv('SS2_MEMORY_BUDGET_MB', '0') or 0) * MB)
+
+
+def estimate_text_bytes(char_count: int) -> int:
+    """
+    Estimate peak memory for processing text
+
+    Args:
+        char_count: Length of the text in characters
+
+    Returns:
+        Estimated peak bytes
+    """
+    return char_count * int(os.getenv('SS2_MEMORY_BYTES_PER_CHAR', str(DEFAULT_BYTES_PER_CHAR)))
+
+
+def current_rss() -> int:
+    """Current resident set size of this process in bytes (0 if unknown)"""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process so far in bytes (0 if unknown)"""
+    if not HAS_RESOURCE:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def check_budget(estimated_bytes: int, what: str = 'document', budget: Optional[int] = None) -> None:
+    """
+    Fail fast if an estimate exceeds the budget
+
+    Args:
+        estimated_bytes: Estimated peak bytes
+        what: Description used in the error message
+        budget: Budget in bytes (default: SS2_MEMORY_BUDGET_MB)
+
+    Raises:
+        MemoryBudgetExceeded: If a budget is set and the estimate exceeds it
+    """
+    budget = budget_bytes() if budget is None else budget
+    if budget and estimated_bytes > budget:
+        raise MemoryBudgetExceeded(estimated_bytes, budget, what)
+
+
+@dataclass
+class MemoryUsage:
+    """
+    Memory used by one tracked block
+    """
+    mode: str
+    peak_bytes: int
+    net_bytes: int
+    rss_bytes: int
+    budget_bytes: int = 0
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget_bytes) and self.peak_bytes > self.budget_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for audit metadata"""
+        data = asdict(self)
+        data['peak_mb'] = round(self.peak_bytes / MB, 3)
+        data['over_budget'] = self.over_budget
+        return data
+
+
+# Trackers currently measuring, outermost first
+_active: List['MemoryTracker'] = []
+
+
+class MemoryTracker:
+    """
+    Measure peak memory of a block
+
+    With tracemalloc the peak is the highest traced allocation total above
+    the level at entry. With RSS it is the growth of the process peak RSS
+    (or of the current RSS when the process peak was reached earlier).
+
+    Usage:
+        with MemoryTracker() as tracker:
+            process(document)
+        tracker.usage.peak_bytes
+    """
+
+    def __init__(self, mode: Optional[str] = None, budget: Optional[int] = None):
+        """
+        Create tracker
+
+        Args:
+            mode: 'tracemalloc', 'rss' or 'off' (default: SS2_MEMORY_TRACKING)
+            budget: Budget in bytes reported with the usage (default: SS2_MEMORY_BUDGET_MB)
+        """
+        self.mode = mode or tracking_mode()
+        if self.mode not in TRACKING_MODES:
+            raise ValueError(f"Unknown memory tracking mode: {self.mode}. Supported: {TRACKING_MODES}")
+        self.budget = budget_bytes() if budget is None else budget
+        self.usage: Optional[MemoryUsage] = None
+        self._started_tracemalloc = False
+        self._baseline = 0
+        self._peak = 0
+        self._rss_start = 0
+        self._peak_rss_start = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def __enter__(self) -> 'MemoryTracker':
+        if self.mode == 'tracemalloc':
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            _fold_peak()
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+            self._peak = self._baseline
+            _active.append(self)
+        elif self.mode == 'rss':
+            self._rss_start = current_rss()
+            self._peak_rss_start = peak_rss()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.mode == 'tracemalloc':
+            _fold_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            _active.remove(self)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            self.usage = MemoryUsage(mode=self.mode, peak_bytes=self._peak - self._baseline,
+                                     net_bytes=current - self._baseline, rss_bytes=current_rss(),
+                                     budget_bytes=self.budget)
+        elif self.mode == 'rss':
+            rss = current_rss()
+            process_peak = peak_rss()
+            peak = process_peak if process_peak > self._peak_rss_start else max(rss, self._rss_start)
+            self.usage = MemoryUsage(mode=self.mode, peak_bytes=max(0, peak - self._rss_start),
+                                     net_bytes=rss - self._rss_start, rss_bytes=rss, budget_bytes=self.budget)
+        return False
+
+
+def _fold_peak() -> None:
+    """Record the current tracemalloc peak in every active tracker before it is reset"""
+    if _active:
+        peak = tracemalloc.get_traced_memory()[1]
+        for tracker in _active:
+            if peak > tracker._peak:
+                tracker._peak = peak
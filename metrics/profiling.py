@@ -0,0 +1,421 @@
+"""
+Profiling for Safety Sigma 2.0
+
+Runs a block of work under either a statistical sampler or cProfile and
+writes the results next to the run's output:
+
+- sample (default): a background thread samples the profiled thread's
+  stack every few milliseconds. Writes collapsed stacks (flamegraph.pl /
+  speedscope input), a speedscope JSON profile and a hotspot summary.
+- cprofile: deterministic cProfile. Writes a .prof file (pstats, snakeviz)
+  and a hotspot summary.
+
+Both modes attribute time to pipeline stages. Samples are attributed by
+walking the stack for tool and agent classes (labelled with their existing
+tool/agent names), audit writes and the rule engine. Wall time per stage is
+also taken from the tracing spans (metrics.tracing), which are enabled for
+the duration of the profile.
+
+Only the thread that enters the profiler is sampled. Batch runs profile
+inside the processes doing the work: AgentProcessor.process_many(profile=...)
+writes one profile per document, and `workflow.distributed run-local
+--profile` one per worker process.
+
+Configuration:
+    SS2_PROFILE_INTERVAL_MS - Default sampling interval (default: 5)
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import tracing
+
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+DEFAULT_INTERVAL = float(os.getenv('SS2_PROFILE_INTERVAL_MS', '5')) / 1000.0
+DEFAULT_TOP = 25
+
+# Stack frame as recorded by the sampler: code object, module name and qualified name
+Frame = Tuple[CodeType, str, str]
+Stack = Tuple[Frame, ...]
+
+# Functions that write audit records
+_AUDIT_FUNCTIONS = frozenset({'_write_audit_record', '_write_decision_audit', 'log_audit', '_log_audit'})
+
+# Span names whose durations are reported per stage
+_STAGE_SPANS = {'tool.execute': 'tool', 'agent.execute': 'agent', 'tool.audit': 'tool', 'agent.audit': 'agent'}
+
+OTHER_STAGE = 'other'
+
+# code.co_qualname is new in Python 3.11; older versions resolve it from the frame
+_HAS_CO_QUALNAME = hasattr(CodeType, 'co_qualname')
+
+# (code, class) -> qualified name, for Pythons without code.co_qualname
+_qualnames: Dict[Tuple[CodeType, type], str] = {}
+
+
+def _component_names() -> Dict[str, str]:
+    """Map tool and agent class names to their stage labels (e.g. 'tool:extraction_tool')"""
+    labels: Dict[str, str] = {}
+    for module_name, base_name, kind in (('tools.base_tool', 'BaseTool', 'tool'),
+                                         ('agents.base_agent', 'BaseAgent', 'agent')):
+        module = sys.modules.get(module_name)
+        base = getattr(module, base_name, None) if module else None
+        if base is None:
+            continue
+        pending = list(base.__subclasses__())
+        while pending:
+            cls = pending.pop()
+            pending.extend(cls.__subclasses__())
+            labels[cls.__name__] = f"{kind}:{getattr(cls, 'name', None) or cls.__name__}"
+    return labels
+
+
+def _qualname(frame: FrameType) -> str:
+    """
+    Qualified name of a frame's function (e.g. 'ExtractionTool._run')
+
+    Uses code.co_qualname where available. Before Python 3.11 methods are
+    resolved through the class of their first argument ('self' or 'cls'),
+    naming the class in its MRO that defines the function; other functions
+    get their plain name.
+    """
+    code = frame.f_code
+    if _HAS_CO_QUALNAME:
+        return code.co_qualname
+    if not code.co_argcount or code.co_varnames[0] not in ('self', 'cls'):
+        return code.co_name
+    owner = frame.f_locals.get(code.co_varnames[0])
+    if owner is None:
+        return code.co_name
+    cls = owner if isinstance(owner, type) else type(owner)
+    key = (code, cls)
+    if key not in _qualnames:
+        defining = cls
+        for klass in cls.__mro__:
+            function = klass.__dict__.get(code.co_name)
+            function = getattr(function, '__func__', function)
+            if code in (getattr(function, '__code__', None),
+                        getattr(getattr(function, '__wrapped__', None), '__code__', None)):
+                defining = klass
+                break
+        _qualnames[key] = f"{defining.__name__}.{code.co_name}"
+    return _qualnames[key]
+
+
+def _frame_stage(frame: Frame, components: Dict[str, str]) -> Optional[str]:
+    """Stage label for one frame, if it belongs to a recognised stage"""
+    code, module, qualname = frame
+    if code.co_name in _AUDIT_FUNCTIONS or module == 'audit' or module.startswith('audit.'):
+        return 'audit'
+    if module == 'rules' or module.startswith('rules.') or module == 'src.pdf_processor.rules':
+        return 'rules'
+    if '.' in qualname:
+        return components.get(qualname.split('.', 1)[0])
+    return None
+
+
+def stage_of(stack: Stack, components: Optional[Dict[str, str]] = None) -> str:
+    """
+    Attribute a stack (root first) to a pipeline stage
+
+    Args:
+        stack: Sampled stack, outermost frame first
+        components: Class name to stage label map (default: current tool/agent classes)
+
+    Returns:
+        Stage path such as 'agent:simple_agent > tool:extraction_tool > audit', or 'other'
+    """
+    components = _component_names() if components is None else components
+    path: List[str] = []
+    for frame in stack:
+        stage = _frame_stage(frame, components)
+        if stage and (not path or path[-1] != stage):
+            path.append(stage)
+    return ' > '.join(path) if path else OTHER_STAGE
+
+
+def _frame_name(frame: Frame) -> str:
+    code, _, qualname = frame
+    return f"{qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling one thread's stack from a background thread
+
+    Each sample is weighted by the wall time since the previous sample, so
+    totals stay accurate when the sampler thread is delayed.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        """
+        Create sampler
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()  # Stack -> sample count
+        self.weights: Dict[Stack, float] = defaultdict(float)  # Stack -> seconds
+        self.duration = 0.0
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self, thread_id: Optional[int] = None) -> None:
+        """Start sampling a thread (default: the calling thread)"""
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name='ss2-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self._started
+
+    def _sample_loop(self) -> None:
+        last = time.perf_counter()
+        current_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self._target)
+            now = time.perf_counter()
+            if frame is not None:
+                stack = self._stack(frame)
+                self.samples[stack] += 1
+                self.weights[stack] += now - last
+            last = now
+
+    @staticmethod
+    def _stack(frame: Optional[FrameType]) -> Stack:
+        frames = []
+        while frame is not None:
+            frames.append((frame.f_code, frame.f_globals.get('__name__', '?'), _qualname(frame)))
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """
+        Collapsed stacks ('stage;frame;frame <count>' per line)
+
+        The stage is the root frame, so flamegraphs group by stage first.
+        """
+        components = _component_names()
+        lines = []
+        for stack, count in sorted(self.samples.items(), key=lambda item: -item[1]):
+            names = [f"[{stage_of(stack, components)}]"] + [_frame_name(frame) for frame in stack]
+            lines.append(f"{';'.join(name.replace(';', ':') for name in names)} {count}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def speedscope(self, name: str = 'safety-sigma') -> Dict[str, Any]:
+        """Profile in speedscope's file format (one sampled profile, weights in seconds)"""
+        components = _component_names()
+        frame_index: Dict[Any, int] = {}
+        frames: List[Dict[str, Any]] = []
+
+        def index(key: Any, entry: Dict[str, Any]) -> int:
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                frames.append(entry)
+            return frame_index[key]
+
+        samples, weights = [], []
+        for stack, weight in self.weights.items():
+            stage = stage_of(stack, components)
+            indices = [index(('stage', stage), {'name': f"[{stage}]"})]
+            for frame in stack:
+                code, _, qualname = frame
+                indices.append(index((code, qualname), {'name': qualname, 'file': code.co_filename,
+                                                        'line': code.co_firstlineno}))
+            samples.append(indices)
+            weights.append(weight)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+            'name': name,
+            'exporter': 'safety-sigma',
+        }
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> Dict[str, List[Tuple[str, float, float]]]:
+        """
+        Top functions and stages by sampled time
+
+        Returns:
+            {'self': [...], 'inclusive': [...], 'stages': [...]} with
+            (name, seconds, percent) rows, largest first
+        """
+        components = _component_names()
+        self_time: Dict[str, float] = defaultdict(float)
+        inclusive: Dict[str, float] = defaultdict(float)
+        stages: Dict[str, float] = defaultdict(float)
+        for stack, weight in self.weights.items():
+            if not stack:
+                continue
+            self_time[_frame_name(stack[-1])] += weight
+            for name in {_frame_name(frame) for frame in stack}:
+                inclusive[name] += weight
+            stages[stage_of(stack, components)] += weight
+
+        total = sum(self.weights.values()) or 1.0
+
+        def rows(times: Dict[str, float], limit: Optional[int]) -> List[Tuple[str, float, float]]:
+            ordered = sorted(times.items(), key=lambda item: -item[1])[:limit]
+            return [(name, seconds, 100.0 * seconds / total) for name, seconds in ordered]
+
+        return {'self': rows(self_time, top), 'inclusive': rows(inclusive, top), 'stages': rows(stages, None)}
+
+
+def _span_totals() -> Dict[Tuple[str, str], Tuple[int, float]]:
+    """Current (count, seconds) of stage spans keyed by (span, component)"""
+    totals = {}
+    for labels, count, seconds in tracing.registry.histogram_series(tracing.SPAN_DURATION_METRIC):
+        kind = _STAGE_SPANS.get(labels.get('span', ''))
+        if kind and labels.get(kind):
+            totals[(labels['span'], labels[kind])] = (count, seconds)
+    return totals
+
+
+class Profiler:
+    """
+    Profile a block of work
+
+    Usage:
+        with Profiler('sample') as profiler:
+            run_pipeline()
+        profiler.write(output_dir)
+    """
+
+    def __init__(self, mode: str = 'sample', interval: float = DEFAULT_INTERVAL, top: int = DEFAULT_TOP):
+        """
+        Create profiler
+
+        Args:
+            mode: 'sample' or 'cprofile'
+            interval: Sampling interval in seconds (sample mode)
+            top: Number of hotspots in the summary
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}. Supported: {PROFILE_MODES}")
+        self.mode = mode
+        self.top = top
+        self.sampler = SamplingProfiler(interval) if mode == 'sample' else None
+        self.cprofile = cProfile.Profile() if mode == 'cprofile' else None
+        self.wall_time = 0.0
+        self.span_times: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._spans_before: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._tracing_was_enabled = False
+        self._started = 0.0
+
+    def __enter__(self) -> 'Profiler':
+        self._tracing_was_enabled = tracing.is_enabled()
+        tracing.enable()
+        self._spans_before = _span_totals()
+        self._started = time.perf_counter()
+        if self.sampler:
+            self.sampler.start()
+        else:
+            self.cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.sampler:
+            self.sampler.stop()
+        else:
+            self.cprofile.disable()
+        self.wall_time = time.perf_counter() - self._started
+
+        self.span_times = {}
+        for key, (count, seconds) in _span_totals().items():
+            before_count, before_seconds = self._spans_before.get(key, (0, 0.0))
+            if count > before_count:
+                self.span_times[key] = (count - before_count, seconds - before_seconds)
+        if not self._tracing_was_enabled:
+            tracing.disable()
+        return False
+
+    def summary(self) -> str:
+        """Human-readable hotspot and stage summary"""
+        out = io.StringIO()
+        out.write(f"Safety Sigma profile ({self.mode}), wall time {self.wall_time:.3f}s\n")
+
+        if self.span_times:
+            out.write("\nStage wall time (tracing spans):\n")
+            for (span_name, component), (count, seconds) in sorted(self.span_times.items(),
+                                                                   key=lambda item: -item[1][1]):
+                out.write(f"  {seconds:10.4f}s  {count:6d}x  {span_name} [{component}]\n")
+
+        if self.sampler:
+            hotspots = self.sampler.hotspots(self.top)
+            out.write(f"\nSamples: {self.sampler.total_samples} every {self.sampler.interval * 1000:g}ms\n")
+            for title, key in (("Sampled time by stage", 'stages'),
+                               (f"Top {self.top} functions by self time", 'self'),
+                               (f"Top {self.top} functions by inclusive time", 'inclusive')):
+                out.write(f"\n{title}:\n")
+                for name, seconds, percent in hotspots[key]:
+                    out.write(f"  {seconds:10.4f}s  {percent:5.1f}%  {name}\n")
+        else:
+            for sort_key in ('tottime', 'cumulative'):
+                out.write(f"\nTop {self.top} functions by {sort_key}:\n")
+                stream = io.StringIO()
+                pstats.Stats(self.cprofile, stream=stream).sort_stats(sort_key).print_stats(self.top)
+                out.write(stream.getvalue())
+        return out.getvalue()
+
+    def write(self, output_dir: Union[str, Path], prefix: str = 'profile') -> Dict[str, Path]:
+        """
+        Write profile artifacts
+
+        Args:
+            output_dir: Directory to write into (created if missing)
+            prefix: File name prefix
+
+        Returns:
+            Artifact kind to path ('summary', plus 'collapsed' and 'speedscope'
+            in sample mode or 'pstats' in cprofile mode)
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {'summary': output_dir / f"{prefix}_hotspots.txt"}
+        paths['summary'].write_text(self.summary(), encoding='utf-8')
+
+        if self.sampler:
+            paths['collapsed'] = output_dir / f"{prefix}.collapsed"
+            paths['collapsed'].write_text(self.sampler.collapsed(), encoding='utf-8')
+            paths['speedscope'] = output_dir / f"{prefix}.speedscope.json"
+            paths['speedscope'].write_text(json.dumps(self.sampler.speedscope(prefix)), encoding='utf-8')
+        else:
+            paths['pstats'] = output_dir / f"{prefix}.prof"
+            self.cprofile.dump_stats(str(paths['pstats']))
+        return paths
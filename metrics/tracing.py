@@ -0,0 +1,460 @@
+"""
+Tracing and Metrics for Safety Sigma 2.0
+
+Lightweight in-process instrumentation:
+- Nested spans (processor → agent → orchestrator step → tool phase) timed
+  with a monotonic clock
+- Counters and histograms kept in memory
+- Export as Prometheus text (HTTP endpoint) or an OpenMetrics file
+
+Disabled unless SS2_METRICS=true (or enable() is called). When disabled,
+span() returns a shared no-op context manager and the metric functions
+return immediately, so instrumented code pays a single flag check.
+
+Configuration:
+    SS2_METRICS       - Enable instrumentation (default: false)
+    SS2_METRICS_PORT  - Serve /metrics on this port (see configure_from_env)
+    SS2_METRICS_FILE  - Write an OpenMetrics file at exit (see configure_from_env)
+"""
+
+import atexit
+import contextvars
+import functools
+import itertools
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+
+SPAN_DURATION_METRIC = 'ss2_span_duration_seconds'
+SPAN_COUNT_METRIC = 'ss2_spans'
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_enabled = os.getenv('SS2_METRICS', 'false').lower() == 'true'
+
+
+def enable() -> None:
+    """Turn instrumentation on for this process"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Turn instrumentation off for this process"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check whether instrumentation is on"""
+    return _enabled
+
+
+# ---------- Metrics registry ----------
+
+@dataclass
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets
+    """
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record one observation"""
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs"""
+        return list(zip(self.buckets, itertools.accumulate(self.counts)))
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms keyed by name and labels
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {
+            SPAN_DURATION_METRIC: 'Duration of instrumented spans',
+            SPAN_COUNT_METRIC: 'Completed spans by status',
+        }
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Set the HELP text exported for a metric"""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Increment a counter"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a histogram observation"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def counter_value(self, name: str, **labels) -> float:
+        """Current value of a counter series (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(name, {}).get(self._key(labels), 0.0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Histogram series, if any observations were recorded"""
+        with self._lock:
+            return self._histograms.get(name, {}).get(self._key(labels))
+
+    def histogram_series(self, name: str) -> List[Tuple[Dict[str, str], int, float]]:
+        """Snapshot of every series of a histogram as (labels, count, sum)"""
+        with self._lock:
+            return [(dict(key), histogram.count, histogram.total)
+                    for key, histogram in self._histograms.get(name, {}).items()]
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ---------- Exposition ----------
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ''
+        escaped = (
+            f'{k}="' + v.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') + '"'
+            for k, v in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if value == math.inf:
+            return '+Inf'
+        return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+    def render(self, openmetrics: bool = False) -> str:
+        """
+        Render all metrics in text exposition format
+
+        Args:
+            openmetrics: Use OpenMetrics format (counter samples suffixed _total, trailing # EOF)
+                         instead of the Prometheus 0.0.4 text format
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+        fmt_labels = self._format_labels
+        fmt_value = self._format_value
+
+        with self._lock:
+            for name in sorted(self._counters):
+                family = name[:-len('_total')] if name.endswith('_total') else name
+                sample = f"{family}_total"
+                if self._help.get(name):
+                    lines.append(f"# HELP {family if openmetrics else sample} {self._help[name]}")
+                lines.append(f"# TYPE {family if openmetrics else sample} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{sample}{fmt_labels(key)} {fmt_value(value)}")
+
+            for name in sorted(self._histograms):
+                if self._help.get(name):
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    for bound, cumulative in histogram.cumulative():
+                        lines.append(f"{name}_bucket{fmt_labels(key, (('le', fmt_value(bound)),))} {cumulative}")
+                    lines.append(f"{name}_count{fmt_labels(key)} {histogram.count}")
+                    lines.append(f"{name}_sum{fmt_labels(key)} {fmt_value(histogram.total)}")
+
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    """Increment a counter (no-op when disabled)"""
+    if _enabled:
+        registry.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record a histogram observation (no-op when disabled)"""
+    if _enabled:
+        registry.observe(name, value, **labels)
+
+
+# ---------- Spans ----------
+
+@dataclass
+class SpanRecord:
+    """
+    Finished span
+    """
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    trace_id: int
+    start_ns: int
+    duration_ns: int
+    status: str
+    labels: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1_000_000.0
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('ss2_current_span', default=None)
+_span_ids = itertools.count(1)
+
+# Most recent finished spans, for inspection and tests
+finished_spans: Deque[SpanRecord] = deque(maxlen=int(os.getenv('SS2_METRICS_SPAN_BUFFER', '1000')))
+
+
+class Span:
+    """
+    Timed, nested unit of work
+
+    Use as a context manager. The duration is recorded in the
+    ss2_span_duration_seconds histogram and the span is counted in
+    ss2_spans_total, both labelled with the span name, the given labels and
+    (for the counter) the outcome status. Labels must be low-cardinality
+    (tool, agent, step names), never document content or IDs.
+    """
+
+    __slots__ = ('name', 'labels', 'span_id', 'parent_id', 'trace_id', 'start_ns', '_token')
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        _current_span.reset(self._token)
+        status = 'ok' if exc_type is None else 'error'
+
+        registry.observe(SPAN_DURATION_METRIC, duration_ns / 1e9, span=self.name, **self.labels)
+        registry.inc(SPAN_COUNT_METRIC, span=self.name, status=status, **self.labels)
+        finished_spans.append(SpanRecord(
+            name=self.name,
+            span_id=self.span_id,
+            parent_id=self.parent_id,
+            trace_id=self.trace_id,
+            start_ns=self.start_ns,
+            duration_ns=duration_ns,
+            status=status,
+            labels=dict(self.labels),
+        ))
+        return False
+
+
+class _NoopSpan:
+    """Shared span used when instrumentation is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **labels) -> Union[Span, _NoopSpan]:
+    """
+    Start a span
+
+    Args:
+        name: Dotted span name (e.g. 'tool.run')
+        **labels: Low-cardinality metric labels (e.g. tool='extraction_tool')
+
+    Returns:
+        Context manager timing the enclosed block
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, labels)
+
+
+def traced_method(name: str, **label_attrs: str) -> Callable:
+    """
+    Decorator running a method inside span(name)
+
+    Args:
+        name: Dotted span name (e.g. 'tool.execute')
+        **label_attrs: Metric label -> instance attribute holding its value
+                       (e.g. tool='name' labels the span tool=self.name)
+
+    Returns:
+        Decorator wrapping the method without changing its body
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return method(self, *args, **kwargs)
+            with Span(name, {label: getattr(self, attr) for label, attr in label_attrs.items()}):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Innermost active span in this context, if any"""
+    return _current_span.get()
+
+
+# ---------- Export ----------
+
+def render_prometheus() -> str:
+    """Metrics in Prometheus text format 0.0.4"""
+    return registry.render(openmetrics=False)
+
+
+def render_openmetrics() -> str:
+    """Metrics in OpenMetrics text format"""
+    return registry.render(openmetrics=True)
+
+
+def write_openmetrics(path: Union[str, Path]) -> Path:
+    """
+    Write metrics to an OpenMetrics file (atomically)
+
+    Args:
+        path: Destination file
+
+    Returns:
+        Path written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_openmetrics())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics in Prometheus (or OpenMetrics, if accepted) format"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+
+        if 'application/openmetrics-text' in self.headers.get('Accept', ''):
+            body = render_openmetrics().encode('utf-8')
+            content_type = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+        else:
+            body = render_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, addr: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Serve metrics over HTTP from a daemon thread
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        addr: Address to bind (default: localhost only)
+
+    Returns:
+        Running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='ss2-metrics', daemon=True)
+    thread.start()
+    return server
+
+
+def configure_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    Apply SS2_METRICS_PORT / SS2_METRICS_FILE when instrumentation is enabled
+
+    Starts the HTTP endpoint if a port is configured and registers an exit
+    hook that writes the OpenMetrics file if a path is configured.
+
+    Returns:
+        HTTP server, if one was started
+    """
+    if not _enabled:
+        return None
+
+    metrics_file = os.getenv('SS2_METRICS_FILE')
+    if metrics_file:
+        atexit.register(write_openmetrics, metrics_file)
+
+    port = os.getenv('SS2_METRICS_PORT')
+    if port:
+        return start_http_server(int(port), os.getenv('SS2_METRICS_ADDR', '127.0.0.1'))
+    return None
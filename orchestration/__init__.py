@@ -5,9 +5,11 @@ Provides orchestration capabilities for sequential tool execution.
 """
 
 from .tool_orchestrator import ToolOrchestrator, OrchestrationResult, OrchestrationStep
+from .document_session import DocumentSession
 
 __all__ = [
     'ToolOrchestrator',
     'OrchestrationResult', 
     'OrchestrationStep',
+    'DocumentSession',
 ]
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Document Session for Safety Sigma 2.0
+
+Carries one document's extracted text, hashes and metadata through
+processor → agent → orchestrator so the PDF is parsed exactly once per run.
+Every consumer that reads the text is recorded for the audit trail.
+"""
+
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class DocumentSession:
+    """
+    Per-run document state shared by all processing layers
+
+    The text is extracted lazily on first use (via PDFTool unless a text
+    was supplied) and served from the session afterwards.
+    """
+    pdf_path: Optional[str] = None
+    text: Optional[str] = None
+    file_hash: Optional[str] = None
+    content_hash: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    extraction_count: int = 0
+    reuse_log: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.text is not None and self.content_hash is None:
+            self.content_hash = self._hash(self.text.encode('utf-8'))
+
+    @classmethod
+    def from_text(cls, text: str, pdf_path: Optional[str] = None,
+                  metadata: Optional[Dict[str, Any]] = None) -> 'DocumentSession':
+        """
+        Create a session for already extracted text
+
+        Args:
+            text: Extracted document text
+            pdf_path: Source PDF path, if known
+            metadata: Additional document metadata
+
+        Returns:
+            DocumentSession holding the text
+        """
+        return cls(pdf_path=pdf_path, text=text, metadata=dict(metadata or {}, text_source='provided'))
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def matches(self, text: str) -> bool:
+        """Check whether the session holds exactly this text"""
+        return self.text is not None and len(self.text) == len(text) and self.text == text
+
+    def get_text(self, consumer: str, extractor: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        Get the document text, extracting it from the PDF on first use
+
+        Args:
+            consumer: Name of the component reading the text (for the audit trail)
+            extractor: Callable taking a PDF path and returning a ToolResult
+                       (default: PDFTool().execute)
+
+        Returns:
+            Extracted document text
+        """
+        if self.text is not None:
+            self.reuse_log.append({'consumer': consumer, 'event': 'reused', 'timestamp': time.time()})
+            return self.text
+
+        if not self.pdf_path:
+            raise ValueError("Document session has neither text nor a PDF path")
+
+        if extractor is None:
+            from tools.pdf_tool import PDFTool
+            tool_result = PDFTool().execute(pdf_path=self.pdf_path)
+        else:
+            tool_result = extractor(self.pdf_path)
+        if not tool_result.success:
+            raise RuntimeError(f"PDF extraction failed: {tool_result.error}")
+
+        self.set_text(tool_result.data, consumer=consumer, source='pdf_tool')
+        self.metadata['extraction_time_ms'] = tool_result.execution_time_ms
+        return self.text
+
+    def set_text(self, text: str, consumer: str, source: str = 'pdf_tool') -> None:
+        """
+        Record text extracted outside the session (e.g. by an orchestration step)
+
+        Args:
+            text: Extracted document text
+            consumer: Name of the component that extracted the text
+            source: How the text was obtained
+        """
+        self.text = text
+        self.content_hash = self._hash(text.encode('utf-8'))
+        if self.pdf_path and Path(self.pdf_path).is_file():
+            self.file_hash = self._hash(Path(self.pdf_path).read_bytes())
+        self.extraction_count += 1
+        self.metadata.update({'text_source': source, 'extracted_by': consumer})
+        self.reuse_log.append({'consumer': consumer, 'event': 'extracted', 'timestamp': time.time()})
+
+    def to_audit(self) -> Dict[str, Any]:
+        """
+        Summarize the session for audit records (without the text)
+
+        Returns:
+            Session identifiers, hashes and reuse information
+        """
+        return {
+            'session_id': self.session_id,
+            'pdf_path': self.pdf_path,
+            'file_hash': self.file_hash,
+            'content_hash': self.content_hash,
+            'content_length': len(self.text) if self.text is not None else None,
+            'text_source': self.metadata.get('text_source'),
+            'extraction_count': self.extraction_count,
+            'reuse_count': sum(1 for entry in self.reuse_log if entry['event'] == 'reused'),
+            'consumers': [entry['consumer'] for entry in self.reuse_log],
+        }
@@ -5,7 +5,6 @@ Manages sequential execution of tools with comprehensive audit logging.
 Maintains compatibility with Safety Sigma 1.0 processing pipeline.
 """
 
-import json
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -14,8 +13,11 @@ from typing import Any, Dict, List, Optional, Tuple, Type
 import os
 
 from tools.base_tool import BaseTool, ToolResult
+from metrics import tracing
+from audit.serialization import get_serializer
 from tools.pdf_tool import PDFTool
 from tools.extraction_tool import ExtractionTool
+from .document_session import DocumentSession
 
 
 @dataclass
@@ -29,6 +31,7 @@ class OrchestrationStep:
     output_key: str  # Key to store output in orchestration context
     required: bool = True
     depends_on: List[str] = field(default_factory=list)  # Dependencies on previous steps
+    reuse_existing: bool = False  # Serve output from the run's document session when it holds the text
 
 
 @dataclass
@@ -61,18 +64,23 @@ class ToolOrchestrator:
     - Pipeline validation and compliance checking
     """
     
-    def __init__(self, audit_dir: Optional[str] = None):
+    def __init__(self, audit_dir: Optional[str] = None, reuse_tools: bool = False):
         """
         Initialize tool orchestrator
         
         Args:
             audit_dir: Directory for audit logs (default: from env)
+            reuse_tools: Keep one tool instance per tool class across runs
+                         (backends stay connected between documents)
         """
         self.audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
         self.audit_dir.mkdir(parents=True, exist_ok=True)
         
         # Define Safety Sigma processing pipeline
         self.ss_pipeline = self._define_safety_sigma_pipeline()
+        
+        self.reuse_tools = reuse_tools
+        self._tool_instances: Dict[Type[BaseTool], BaseTool] = {}
     
     def _define_safety_sigma_pipeline(self) -> List[OrchestrationStep]:
         """
@@ -88,6 +96,7 @@ class ToolOrchestrator:
                 input_mapping={"pdf_path": "pdf_file"},
                 output_key="extracted_text",
                 required=True,
+                reuse_existing=True,
             ),
             OrchestrationStep(
                 step_name="ai_analysis", 
@@ -108,6 +117,8 @@ class ToolOrchestrator:
         instructions: str,
         output_dir: Optional[str] = None,
         simulate: bool = False,
+        ruleset_versions: Optional[Dict[str, str]] = None,
+        session: Optional[DocumentSession] = None,
     ) -> OrchestrationResult:
         """
         Execute the complete Safety Sigma processing pipeline
@@ -117,6 +128,9 @@ class ToolOrchestrator:
             instructions: Processing instructions
             output_dir: Output directory for results
             simulate: Run in simulation mode
+            ruleset_versions: Versions of rulesets that shaped the instructions
+            session: Document session; its text replaces the pdf_extraction step,
+                     which otherwise stores the text it extracts in the session
             
         Returns:
             OrchestrationResult with complete execution information
@@ -127,9 +141,16 @@ class ToolOrchestrator:
             "output_dir": output_dir or ".",
             "simulate": simulate,
         }
+        if ruleset_versions:
+            orchestration_context["ruleset_versions"] = ruleset_versions
+        if session is not None:
+            orchestration_context["document_session"] = session
+            orchestration_context["document_session_id"] = session.session_id
+            orchestration_context["document_hash"] = session.content_hash
         
         return self.execute_pipeline(self.ss_pipeline, orchestration_context)
     
+    @tracing.traced_method('orchestrator.pipeline')
     def execute_pipeline(
         self, 
         pipeline: List[OrchestrationStep], 
@@ -173,14 +194,33 @@ class ToolOrchestrator:
                     self._log_orchestration_error(orchestration_id, error_msg)
                     break
                 
+                # Reuse text the run's document session already holds
+                session = result.context.get('document_session')
+                if step.reuse_existing and session is not None and session.text is not None:
+                    step_result = ToolResult(
+                        data=session.get_text(consumer=f"tool_orchestrator.{step.step_name}"),
+                        metadata={'reused': True, 'output_key': step.output_key},
+                    )
+                    step_result.add_audit_entry(f"Step {step.step_name} skipped: reused existing '{step.output_key}'")
+                    result.step_results[step.step_name] = step_result
+                    result.steps_successful += 1
+                    result.context[step.output_key] = step_result.data
+                    self._log_step_reused(orchestration_id, step.step_name, step.output_key, result.context)
+                    tracing.inc('ss2_orchestrator_steps_reused', step=step.step_name)
+                    continue
+                
                 # Execute step
-                step_result = self._execute_step(step, result.context, orchestration_id)
+                with tracing.span('orchestrator.step', step=step.step_name):
+                    step_result = self._execute_step(step, result.context, orchestration_id)
                 result.step_results[step.step_name] = step_result
                 
                 if step_result.success:
                     result.steps_successful += 1
                     # Update context with step output
                     result.context[step.output_key] = step_result.data
+                    if step.reuse_existing and session is not None and isinstance(step_result.data, str):
+                        session.set_text(step_result.data, consumer=f"tool_orchestrator.{step.step_name}")
+                        result.context["document_hash"] = session.content_hash
                     self._log_step_success(orchestration_id, step.step_name, step_result)
                 else:
                     # Handle step failure
@@ -264,8 +304,12 @@ class ToolOrchestrator:
         if context.get('simulate', False):
             tool_inputs['simulate'] = True
         
+        # Ruleset versions are part of the result cache fingerprint
+        if context.get('ruleset_versions'):
+            tool_inputs['ruleset_versions'] = context['ruleset_versions']
+        
         # Initialize and execute tool
-        tool = step.tool_class()
+        tool = self._get_tool(step.tool_class)
         result = tool.execute(**tool_inputs)
         
         # Add orchestration metadata to result
@@ -277,6 +321,38 @@ class ToolOrchestrator:
         
         return result
     
+    def _get_tool(self, tool_class: Type[BaseTool]) -> BaseTool:
+        """Get a tool instance (shared across runs when reuse_tools is enabled)"""
+        if not self.reuse_tools:
+            return tool_class()
+        tool = self._tool_instances.get(tool_class)
+        if tool is None:
+            tool = self._tool_instances[tool_class] = tool_class()
+        return tool
+    
+    def warm_up(self) -> Dict[str, str]:
+        """
+        Instantiate pipeline tools and connect their backends ahead of the first run
+        
+        Enables tool reuse so the warmed instances serve later executions.
+        Backends that cannot be connected are reported, not raised; they
+        fail (or simulate) as usual when the tool runs.
+        
+        Returns:
+            Mapping of tool class name to 'ready' or the connection error
+        """
+        self.reuse_tools = True
+        status = {}
+        for step in self.ss_pipeline:
+            try:
+                tool = self._get_tool(step.tool_class)
+                if hasattr(tool, '_import_ss1') and getattr(tool, '_ss1_processor', None) is None:
+                    tool._import_ss1()
+                status[step.tool_class.__name__] = 'ready'
+            except ImportError as e:
+                status[step.tool_class.__name__] = f"backend unavailable: {e}"
+        return status
+    
     def save_results(self, result: OrchestrationResult, output_dir: str) -> str:
         """
         Save orchestration results to file (compatibility with SS1)
@@ -349,7 +425,15 @@ Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 "audit_logging": True,
                 "tool_abstraction": True,
                 "ss1_compatibility": True,
-            }
+            },
+            "document": {
+                "document_session_id": result.context.get("document_session_id"),
+                "document_hash": result.context.get("document_hash"),
+                "reused_steps": [
+                    name for name, step_result in result.step_results.items()
+                    if step_result.metadata.get('reused')
+                ],
+            },
         }
     
     # ---------- Audit Logging Methods ----------
@@ -386,6 +470,25 @@ Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}
         }
         self._write_audit_log(log_entry)
     
+    def _log_step_reused(
+        self, 
+        orchestration_id: str, 
+        step_name: str, 
+        output_key: str,
+        context: Dict[str, Any]
+    ) -> None:
+        """Log step skipped because its output was already available"""
+        log_entry = {
+            "event": "step_reused",
+            "orchestration_id": orchestration_id,
+            "step_name": step_name,
+            "output_key": output_key,
+            "timestamp": time.time(),
+            "document_session_id": context.get("document_session_id"),
+            "document_hash": context.get("document_hash"),
+        }
+        self._write_audit_log(log_entry)
+    
     def _log_step_failure(
         self, 
         orchestration_id: str, 
@@ -416,9 +519,8 @@ Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}
         """Write audit log entry"""
         try:
             # Write to daily orchestration log
-            daily_log = self.audit_dir / f"orchestration_{time.strftime('%Y-%m-%d')}.jsonl"
-            with open(daily_log, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            serializer = get_serializer()
+            serializer.write(log_entry, log_path=serializer.log_path(self.audit_dir, f"orchestration_{time.strftime('%Y-%m-%d')}"))
         except Exception:
             pass  # Don't fail orchestration due to audit logging issues
     
@@ -426,6 +528,7 @@ Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}
         """Write comprehensive orchestration audit record"""
         try:
             audit_record = {
+                "event": "orchestration_complete",
                 "orchestration_id": result.orchestration_id,
                 "start_time": result.start_time,
                 "end_time": result.end_time, 
@@ -438,9 +541,11 @@ Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 "timestamp_iso": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(result.start_time)),
             }
             
-            # Write individual orchestration record
-            audit_file = self.audit_dir / f"orchestration_{result.orchestration_id}.json"
-            audit_file.write_text(json.dumps(audit_record, indent=2, ensure_ascii=False), encoding='utf-8')
+            # Write individual orchestration record and append it to the daily orchestration log
+            serializer = get_serializer()
+            serializer.write(audit_record,
+                             record_path=serializer.record_path(self.audit_dir, f"orchestration_{result.orchestration_id}"),
+                             log_path=serializer.log_path(self.audit_dir, f"orchestration_{time.strftime('%Y-%m-%d')}"))
             
         except Exception:
             pass  # Don't fail orchestration due to audit logging issues
\ No newline at end of file
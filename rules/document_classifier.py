@@ -6,8 +6,9 @@ Extends the base rule engine with document-specific analysis capabilities.
 """
 
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from .base_rule_engine import BaseRuleEngine, RuleSet
+from tools.document_view import DocumentView
 
 
 class DocumentClassifierEngine(BaseRuleEngine):
@@ -29,13 +30,13 @@ class DocumentClassifierEngine(BaseRuleEngine):
         """Get list of supported ruleset names"""
         return self.supported_rulesets_list
     
-    def analyze_document_context(self, document_content: str, instructions: str = "", 
+    def analyze_document_context(self, document_content: Union[str, DocumentView], instructions: str = "", 
                                pdf_file: str = "", **kwargs) -> Dict[str, Any]:
         """
         Create analysis context from document inputs for rule evaluation
         
         Args:
-            document_content: Document text content
+            document_content: Document text content (or a shared DocumentView)
             instructions: Processing instructions
             pdf_file: PDF file path
             **kwargs: Additional context parameters
@@ -43,15 +44,18 @@ class DocumentClassifierEngine(BaseRuleEngine):
         Returns:
             Context dictionary for rule evaluation
         """
+        view = DocumentView.of(document_content)
+        document_content = view.text
+        
         context = {
             # Basic document characteristics
             'document_length': len(document_content),
-            'word_count': len(document_content.split()),
-            'line_count': document_content.count('\\n') + 1,
-            'paragraph_count': document_content.count('\\n\\n') + 1,
+            'word_count': view.word_count,
+            'line_count': view.line_count,
+            'paragraph_count': view.paragraph_count,
             
             # Content analysis
-            'content_lower': document_content.lower(),
+            'content_lower': view.lower,
             'instructions_lower': instructions.lower(),
             
             # File characteristics
@@ -59,10 +63,10 @@ class DocumentClassifierEngine(BaseRuleEngine):
             'pdf_filename': pdf_file,
             
             # Keyword density analysis
-            'fraud_keyword_count': self._count_keywords(document_content, self._get_fraud_keywords()),
-            'threat_keyword_count': self._count_keywords(document_content, self._get_threat_keywords()),
-            'policy_keyword_count': self._count_keywords(document_content, self._get_policy_keywords()),
-            'technical_keyword_count': self._count_keywords(document_content, self._get_technical_keywords()),
+            'fraud_keyword_count': self._count_keywords(view, self._get_fraud_keywords()),
+            'threat_keyword_count': self._count_keywords(view, self._get_threat_keywords()),
+            'policy_keyword_count': self._count_keywords(view, self._get_policy_keywords()),
+            'technical_keyword_count': self._count_keywords(view, self._get_technical_keywords()),
             
             # Structure indicators
             'has_headers': self._has_headers(document_content),
@@ -99,13 +103,13 @@ class DocumentClassifierEngine(BaseRuleEngine):
         
         return context
     
-    def classify_document(self, document_content: str, instructions: str = "", 
+    def classify_document(self, document_content: Union[str, DocumentView], instructions: str = "", 
                          pdf_file: str = "", **kwargs) -> Dict[str, Any]:
         """
         Classify document using advanced rule engine
         
         Args:
-            document_content: Document text content
+            document_content: Document text content (or a shared DocumentView)
             instructions: Processing instructions
             pdf_file: PDF file path
             **kwargs: Additional parameters
@@ -150,9 +154,9 @@ class DocumentClassifierEngine(BaseRuleEngine):
         
         return enhanced_result
     
-    def _count_keywords(self, text: str, keywords: List[str]) -> int:
+    def _count_keywords(self, text: Union[str, DocumentView], keywords: List[str]) -> int:
         """Count occurrences of keywords in text"""
-        text_lower = text.lower()
+        text_lower = DocumentView.of(text).lower
         count = 0
         for keyword in keywords:
             count += text_lower.count(keyword.lower())
@@ -9,12 +9,22 @@ while supporting staged evolution through feature toggles.
 import argparse
 import os
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Optional
 
 from safety_sigma import get_version_info, FEATURE_TOGGLES
 
 
+# Commands with their own arguments: safety-sigma <command> [args] runs <module>.main(args)
+SUBCOMMANDS = {
+    'perf-report': 'analysis.perf_report',
+    'audit-index': 'audit.index',
+    'audit-segments': 'audit.segments',
+    'scan': 'src.pdf_processor.scan',
+}
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create command-line argument parser"""
     parser = argparse.ArgumentParser(
@@ -38,6 +48,32 @@ Feature Toggles:
   SS2_DYNAMIC_WORKFLOWS - Dynamic workflow selection (Stage 4)
   SS2_MULTI_AGENT       - Multi-agent coordination (Stage 5)
   SS2_SELF_IMPROVE      - Self-improvement loop (Stage 6)
+
+Instrumentation:
+  SS2_METRICS           - Enable spans, counters and histograms
+  SS2_METRICS_PORT      - Serve Prometheus metrics on http://127.0.0.1:<port>/metrics
+  SS2_METRICS_FILE      - Write OpenMetrics text to this file at exit
+  SS2_MEMORY_TRACKING   - Record peak memory per tool: tracemalloc, rss or off
+  SS2_MEMORY_BUDGET_MB  - Per-document budget (chunk or fail fast when exceeded)
+  SS2_AUDIT_FORMAT      - Audit record format: json (default) or msgpack
+
+Profiling:
+  # Sample the run and write profile.collapsed, profile.speedscope.json
+  # and profile_hotspots.txt to the output directory
+  safety-sigma --pdf report.pdf --instructions prompt.md --profile
+  safety-sigma --pdf report.pdf --instructions prompt.md --profile cprofile
+
+Commands:
+  # Apply compiled rules to a JSONL/CSV event stream on all cores
+  safety-sigma scan rules.json transactions.jsonl --field memo --output hits.jsonl
+  # Latency percentiles, size models, capacity and regressions from audit logs
+  safety-sigma perf-report --audit-dir audit_logs
+  safety-sigma perf-report --baseline 2026-10-01:2026-10-07 --compare 2026-10-08:2026-10-14
+  # Find every audit record linked to a run, orchestration, decision or document
+  safety-sigma audit-index trace <orchestration_id>
+  # Compress sealed audit log segments and check their hash chain
+  safety-sigma audit-segments maintain --compact
+  safety-sigma audit-segments verify
         """
     )
     
@@ -82,6 +118,28 @@ Feature Toggles:
         help="Simulate processing without API calls (for testing)"
     )
     
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=["sample", "cprofile"],
+        help="Profile the run (default: sample) and write results to the output directory"
+    )
+    
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        help="Sampling interval in milliseconds for --profile sample (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Number of hotspots in the profile summary (default: 25)"
+    )
+    
     # Information and debugging
     parser.add_argument(
         "--version",
@@ -121,6 +179,11 @@ def get_processor_class():
 
 def main() -> None:
     """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        import importlib
+        command = importlib.import_module(SUBCOMMANDS[sys.argv[1]])
+        sys.exit(command.main(sys.argv[2:]))
+    
     parser = create_argument_parser()
     
     # Check for version flag before full parsing
@@ -143,6 +206,12 @@ def main() -> None:
     # Load configuration if specified
     load_configuration(args.config)
     
+    # Metrics endpoint / OpenMetrics file (only when SS2_METRICS=true)
+    if os.getenv('SS2_METRICS', 'false').lower() == 'true':
+        from metrics import tracing
+        tracing.enable()
+        tracing.configure_from_env()
+    
     # Validate required files
     pdf_path = Path(args.pdf)
     instructions_path = Path(args.instructions)
@@ -169,6 +238,13 @@ def main() -> None:
             print(f"Running Safety Sigma {version_info['version']}")
             print(f"Active Stage: {version_info['active_stage']}")
         
+        profiler = None
+        profiling = ExitStack()
+        if args.profile:
+            from metrics.profiling import Profiler
+            profiler = profiling.enter_context(
+                Profiler(args.profile, interval=args.profile_interval / 1000.0, top=args.profile_top))
+        
         # Process the document (v1.0 compatible interface)
         print("🔍 Reading instruction file...")
         instructions = processor.read_instruction_file(str(instructions_path))
@@ -187,6 +263,12 @@ def main() -> None:
         
         print("💾 Saving results...")
         processor.save_results(results, str(output_path))
+        profiling.close()
+        
+        if profiler:
+            print("⏱️  Writing profile...")
+            for path in profiler.write(output_path).values():
+                print(f"   {path}")
         
         print("✅ Processing complete!")
         
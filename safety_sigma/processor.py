@@ -93,9 +93,11 @@ class SafetySigmaProcessor:
         if FEATURE_TOGGLES['SS2_ENABLE_TOOLS']:
             # Stage 1+: Use tool abstraction
             from tools import PDFTool
+            from metrics import tracing
             
-            pdf_tool = PDFTool()
-            result = pdf_tool.execute(pdf_path=pdf_path)
+            with tracing.span('processor.extract_pdf_text', processor='tools'):
+                pdf_tool = PDFTool()
+                result = pdf_tool.execute(pdf_path=pdf_path)
             
             if not result.success:
                 raise RuntimeError(f"PDF extraction failed: {result.error}")
@@ -147,12 +149,14 @@ class SafetySigmaProcessor:
         if FEATURE_TOGGLES['SS2_ENABLE_TOOLS']:
             # Stage 1+: Use tool abstraction
             from tools import ExtractionTool
+            from metrics import tracing
             
-            extraction_tool = ExtractionTool()
-            result = extraction_tool.execute(
-                instructions=instructions,
-                text_content=report_content
-            )
+            with tracing.span('processor.process_report', processor='tools'):
+                extraction_tool = ExtractionTool()
+                result = extraction_tool.execute(
+                    instructions=instructions,
+                    text_content=report_content
+                )
             
             if not result.success:
                 raise RuntimeError(f"Report processing failed: {result.error}")
@@ -0,0 +1,150 @@
+"""
+"amounts" compile target: amount indicators as a sorted numeric index.
+
+The regex target matches amounts by their verbatim text ("$1,998.88"), one
+pattern per indicator. Transaction data usually carries amounts as numbers,
+so this target keeps the IR's `numeric` values sorted, and AmountIndex
+answers "which amount indicators equal this value (within a tolerance)" by
+binary search: O(log n) per value, vectorized over a whole column with
+NumPy's searchsorted when NumPy is installed (bisect otherwise).
+
+Tolerance bands are [v - band, v + band] with band = max(tolerance,
+rel_tolerance * |v|); both default to 0 (exact match). Band edges are
+inclusive, with a few ulps of slack so that 1998.87 +/- 0.01 reaches
+1998.88 despite float rounding. Zero inference: only
+indicators whose `numeric` is a number are indexed; nothing is parsed from
+the verbatim text.
+"""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import math
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Float rounding slack on non-zero tolerance bands, in units in the last place of the value
+_ULP_SLACK = 4
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def amount_rules(indicators: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    "amounts" artifact for IR (or json/sql target) indicators.
+
+    Returns:
+      {"values": [numeric, ...] ascending, "indicators": [...] in the same order}
+    """
+    entries = []
+    for ind in indicators:
+        numeric = _number(ind.get("numeric")) if ind.get("kind") == "amount" else None
+        if numeric is None:
+            continue
+        entry = {"numeric": numeric, "verbatim": ind.get("verbatim"), "category_id": ind["category_id"],
+                 "span_id": ind["span_id"]}
+        entry["source_span"] = {"category_id": ind["category_id"], "span_id": ind["span_id"]}
+        entry["provenance"] = {"stage": "compile", "version": "v0.2"}
+        entries.append(entry)
+    entries.sort(key=lambda entry: entry["numeric"])  # stable: equal amounts keep IR order
+    return {"values": [entry["numeric"] for entry in entries], "indicators": entries}
+
+
+class AmountIndex:
+    """
+    Sorted amount indicators with exact and tolerance-band lookups.
+    """
+
+    def __init__(self, artifact: Dict[str, Any], tolerance: float = 0.0, rel_tolerance: float = 0.0):
+        """
+        Args:
+          artifact: compile_rules(...)["amounts"] (see amount_rules)
+          tolerance: default absolute band
+          rel_tolerance: default band as a fraction of the looked-up value
+        """
+        self.indicators: List[Dict[str, Any]] = list(artifact["indicators"])
+        values = [float(v) for v in artifact["values"]]
+        if any(b < a for a, b in zip(values, values[1:])):
+            raise ValueError("amounts artifact values must be sorted ascending")
+        self.values = np.asarray(values, dtype=np.float64) if HAS_NUMPY else values
+        self.tolerance = tolerance
+        self.rel_tolerance = rel_tolerance
+
+    @classmethod
+    def from_artifacts(cls, artifacts: Dict[str, Any], **kwargs: Any) -> "AmountIndex":
+        """Index from a compile_rules() result: its "amounts" target, else the json or sql target."""
+        if isinstance(artifacts.get("amounts"), dict):
+            return cls(artifacts["amounts"], **kwargs)
+        if isinstance(artifacts.get("json"), dict):
+            return cls(amount_rules(artifacts["json"].get("indicators") or []), **kwargs)
+        if isinstance(artifacts.get("sql"), dict):
+            return cls(amount_rules(artifacts["sql"].get("rows") or []), **kwargs)
+        raise ValueError("No amount rules found: expected an amounts, json or sql target")
+
+    def __len__(self) -> int:
+        return len(self.indicators)
+
+    def _band(self, value: float, tolerance: Optional[float], rel_tolerance: Optional[float]) -> float:
+        tolerance = self.tolerance if tolerance is None else tolerance
+        rel_tolerance = self.rel_tolerance if rel_tolerance is None else rel_tolerance
+        band = max(tolerance, rel_tolerance * abs(value))
+        return band + _ULP_SLACK * math.ulp(value) if band > 0 else band
+
+    def span(self, value: float, tolerance: Optional[float] = None,
+             rel_tolerance: Optional[float] = None) -> Tuple[int, int]:
+        """[lo, hi) positions of the indicators within the band around value."""
+        if math.isnan(value):
+            return 0, 0
+        band = self._band(value, tolerance, rel_tolerance)
+        if HAS_NUMPY:
+            return (int(np.searchsorted(self.values, value - band, side="left")),
+                    int(np.searchsorted(self.values, value + band, side="right")))
+        return bisect_left(self.values, value - band), bisect_right(self.values, value + band)
+
+    def lookup(self, value: float, tolerance: Optional[float] = None,
+               rel_tolerance: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Amount indicators matching value, ascending by amount."""
+        lo, hi = self.span(value, tolerance, rel_tolerance)
+        return self.indicators[lo:hi]
+
+    def spans(self, values: Sequence[float], tolerance: Optional[float] = None,
+              rel_tolerance: Optional[float] = None) -> Tuple[Sequence[int], Sequence[int]]:
+        """
+        span() for a column of values, vectorized with NumPy.
+
+        Returns:
+          (lo, hi) sequences, one entry per value
+        """
+        if not HAS_NUMPY:
+            pairs = [self.span(value, tolerance, rel_tolerance) for value in values]
+            return [lo for lo, _ in pairs], [hi for _, hi in pairs]
+        column = np.asarray(values, dtype=np.float64)
+        tolerance = self.tolerance if tolerance is None else tolerance
+        rel_tolerance = self.rel_tolerance if rel_tolerance is None else rel_tolerance
+        band = np.maximum(tolerance, rel_tolerance * np.abs(column))
+        band = np.where(band > 0, band + _ULP_SLACK * np.spacing(np.abs(column)), band)
+        return (np.searchsorted(self.values, column - band, side="left"),
+                np.searchsorted(self.values, column + band, side="right"))
+
+    def matches(self, values: Sequence[float], tolerance: Optional[float] = None,
+                rel_tolerance: Optional[float] = None) -> Iterator[Tuple[int, int]]:
+        """(value position, indicator position) for every match in a column of values."""
+        lo, hi = self.spans(values, tolerance, rel_tolerance)
+        if HAS_NUMPY:
+            hit = np.nonzero(hi > lo)[0]
+            lo, hi = lo[hit].tolist(), hi[hit].tolist()
+            positions = hit.tolist()
+        else:
+            positions = [t for t in range(len(lo)) if hi[t] > lo[t]]
+            lo, hi = [lo[t] for t in positions], [hi[t] for t in positions]
+        for t, first, last in zip(positions, lo, hi):
+            for k in range(first, last):
+                yield t, k
@@ -0,0 +1,237 @@
+"""
+"python" compile target: generate a specialized matcher module from rules.
+
+The generated module is self-contained (stdlib only) and importable:
+  - RULES: provenance table, one entry per regex-target rule, same meta
+  - one match function per category, scanning each distinct literal once with
+    str.find and applying precomputed boundary checks
+  - match(text) / match_many(texts): all categories in a single call
+
+Hits are (start, end, rule_index) and equal, per rule, the non-overlapping
+matches of the regex target's pattern (zero inference: literals only).
+
+Loaded modules are cached by IR hash in-process and, with a cache directory
+(SS2_RULE_CACHE_DIR), as importable <module>.py source with its bytecode in
+__pycache__, so later processes load the matcher without recompiling it.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hashlib
+import importlib.util
+import json
+import os
+import py_compile
+import re
+import tempfile
+import types
+
+CODEGEN_VERSION = "2"
+
+# Boundary checks equivalent to the lookarounds emitted by rules._escape_literal
+_LEFT_CHECKS = {
+    "word": "(i == 0 or not _isword(text[i - 1]))",        # \b before a word char / (?<!\w)
+    "space": "(i == 0 or text[i - 1].isspace())",          # (?<!\S)
+}
+_RIGHT_CHECKS = {
+    "word": "(j == n or not _isword(text[j]))",            # \b after a word char / (?!\w)
+    "space": "(j == n or text[j].isspace())",              # (?!\S)
+}
+
+_MODULES: Dict[str, types.ModuleType] = {}
+
+
+def boundaries(literal: str) -> Tuple[str, str]:
+    r"""
+    Left/right boundary kinds for a literal, mirroring rules._escape_literal.
+
+    Whenever the literal starts or ends with a word character, both sides
+    reduce to "not adjacent to a word character" (\b next to a word char is
+    equivalent to the (?<!\w) / (?!\w) used on the other side). Otherwise
+    the literal must be delimited by whitespace or the text edges.
+    """
+    if literal and (literal[0].isalnum() or literal[-1].isalnum()):
+        return "word", "word"
+    return "space", "space"
+
+
+def ir_hash(rules: List[Dict[str, Any]], categories: Dict[str, Any]) -> str:
+    """Stable hash of the compiled rules (literal, kind, provenance) and categories."""
+    canonical = json.dumps({"v": CODEGEN_VERSION, "rules": rules, "categories": sorted(map(str, categories))},
+                           sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _identifier(value: Any) -> str:
+    return re.sub(r"\W", "_", str(value)).strip("_")[:40] or "category"
+
+
+def _scan_block(literal: str, rule_indexes: List[int], pattern: str, fallback_index: Optional[int]) -> List[str]:
+    """Generated lines appending the hits of one distinct literal to `hits`."""
+    appends = [f"hits.append((i, j, {k}))" for k in rule_indexes]
+    if fallback_index is not None:
+        # Literal without a str.find equivalent (empty): use the regex target's pattern
+        lines = [f"for m in _FALLBACK[{fallback_index}].finditer(text):"]
+        lines += [f"    hits.append((m.start(), m.end(), {k}))" for k in rule_indexes]
+        return lines
+
+    left, right = boundaries(literal)
+    lines = [
+        f"# {pattern!r}",  # repr: literals may contain newlines or quotes
+        f"i = find({literal!r})",
+        "while i >= 0:",
+        f"    j = i + {len(literal)}",
+        f"    if {_LEFT_CHECKS[left]} and {_RIGHT_CHECKS[right]}:",
+    ]
+    lines += [f"        {line}" for line in appends]
+    lines += [
+        f"        i = find({literal!r}, j)",
+        "    else:",
+        f"        i = find({literal!r}, i + 1)",
+    ]
+    return lines
+
+
+def generate_source(rules: List[Dict[str, Any]], categories: Dict[str, Any]) -> Tuple[str, Dict[str, str], str]:
+    """
+    Generate matcher module source.
+
+    Args:
+      rules: regex-target rules ({"pattern", "meta"}) in rule order
+      categories: IR categories (a function is emitted for each, plus any used by rules)
+
+    Returns:
+      (source, {category_id: function name}, ir_hash)
+    """
+    digest = ir_hash(rules, categories)
+
+    by_category: Dict[Any, Dict[str, List[int]]] = {}
+    for cat in categories:
+        by_category.setdefault(cat, {})
+    for index, rule in enumerate(rules):
+        cat = rule["meta"]["source_span"]["category_id"]
+        by_category.setdefault(cat, {}).setdefault(rule["meta"]["name"], []).append(index)
+
+    fallbacks: List[str] = []
+    functions: Dict[str, str] = {}
+    body: List[str] = []
+    for position, (cat, literals) in enumerate(by_category.items()):
+        name = f"match_{position}_{_identifier(cat)}"
+        functions[cat] = name
+        body += ["", "", f"def {name}(text):", f"    # category: {cat!r}, hits as (start, end, rule_index)"]
+        body += ["    hits = []", "    n = len(text)", "    find = text.find"]
+        for literal, indexes in literals.items():
+            fallback = None
+            if not literal:
+                fallback = len(fallbacks)
+                fallbacks.append(rules[indexes[0]]["pattern"])
+            body += [f"    {line}" for line in _scan_block(literal, indexes, rules[indexes[0]]["pattern"], fallback)]
+        body.append("    return hits")
+
+    header = [
+        f'"""Generated Safety Sigma rule matcher (IR {digest[:16]}, codegen v{CODEGEN_VERSION}). Do not edit."""',
+        "import re",
+        "",
+        f"IR_HASH = {digest!r}",
+        f"RULES = {tuple(rule['meta'] for rule in rules)!r}",
+        f"PATTERNS = {tuple(rule['pattern'] for rule in rules)!r}",
+        f"_FALLBACK = {tuple(fallbacks)!r}",
+        "_FALLBACK = tuple(re.compile(p) for p in _FALLBACK)",
+        "",
+        "",
+        "def _isword(c):",
+        "    return c.isalnum() or c == '_'",
+    ]
+    footer = [
+        "",
+        "",
+        f"CATEGORIES = {{{', '.join(f'{cat!r}: {name}' for cat, name in functions.items())}}}",
+        "_MATCHERS = tuple(CATEGORIES.values())",
+        "",
+        "",
+        "def match(text):",
+        '    """All hits in text as (start, end, rule_index), ordered by start then rule."""',
+        "    hits = []",
+        "    for matcher in _MATCHERS:",
+        "        hits.extend(matcher(text))",
+        "    hits.sort()",
+        "    return hits",
+        "",
+        "",
+        "def match_many(texts):",
+        '    """Hits for a stream of texts as (text_index, start, end, rule_index)."""',
+        "    out = []",
+        "    for t, text in enumerate(texts):",
+        "        for start, end, rule in match(text):",
+        "            out.append((t, start, end, rule))",
+        "    return out",
+        "",
+    ]
+    return "\n".join(header + body + footer), functions, digest
+
+
+def build_artifact(rules: List[Dict[str, Any]], categories: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    "python" artifact (as produced by compile_rules) for regex-target rules.
+
+    Args:
+      rules: regex-target rules ({"pattern", "meta"}) in rule order
+      categories: IR categories
+
+    Returns:
+      {"module_name", "ir_hash", "source", "functions", "rule_count"}
+    """
+    source, functions, digest = generate_source(rules, categories)
+    return {
+        "module_name": f"ss2_rules_{digest[:16]}",
+        "ir_hash": digest,
+        "source": source,
+        "functions": functions,
+        "rule_count": len(rules),
+    }
+
+
+def load_matcher(artifact: Dict[str, Any], cache_dir: Optional[Union[str, os.PathLike]] = None) -> types.ModuleType:
+    """
+    Load the matcher module for a "python" artifact (cached by IR hash).
+
+    Args:
+      artifact: compile_rules(...)["python"]
+      cache_dir: directory for importable source + bytecode (default: SS2_RULE_CACHE_DIR; unset = in-memory)
+
+    Returns:
+      Module exposing RULES, CATEGORIES, match() and match_many()
+    """
+    digest = artifact["ir_hash"]
+    module = _MODULES.get(digest)
+    if module is not None:
+        return module
+
+    module_name = artifact["module_name"]
+    cache_dir = cache_dir or os.getenv("SS2_RULE_CACHE_DIR")
+    if cache_dir:
+        path = os.path.join(os.fspath(cache_dir), f"{module_name}.py")
+        if not os.path.exists(path):
+            os.makedirs(os.fspath(cache_dir), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.fspath(cache_dir), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(artifact["source"])
+            os.replace(tmp, path)
+        if not os.path.exists(importlib.util.cache_from_source(path)):
+            # Compile explicitly so bytecode is cached even under PYTHONDONTWRITEBYTECODE
+            py_compile.compile(path, doraise=True)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # loads the cached __pycache__ bytecode
+        if getattr(module, "IR_HASH", None) != digest:
+            raise ValueError(f"Cached matcher {path} does not match IR hash {digest}")
+    else:
+        module = types.ModuleType(module_name)
+        exec(compile(artifact["source"], f"<{module_name}>", "exec"), module.__dict__)
+
+    _MODULES[digest] = module
+    return module
+
+
+def clear_cache() -> None:
+    """Drop in-process matcher modules."""
+    _MODULES.clear()
@@ -11,7 +11,8 @@ class RuleCompileError(Exception):
 
 @dataclass
 class CompileOptions:
-    targets: Optional[List[str]] = None  # ["regex","sql","json"]; None = all
+    targets: Optional[List[str]] = None  # ["regex","sql","json","python","amounts"]; None = regex, sql, json
+    sql_dialect: Optional[str] = None  # "sqlite" | "duckdb" | "postgres": add set-based queries to the sql target
 
 
 # ---- internal helpers -------------------------------------------------------
@@ -53,17 +54,49 @@ def _provenance_meta(cat: str, span: str) -> Dict[str, Any]:
     }
 
 def _targets_all(options: Optional[CompileOptions]) -> List[str]:
+    # "python" and "amounts" are opt-in: they derive matchers, so they are never part of the default set
     wanted = (options.targets if options and options.targets else ["regex", "sql", "json"])
     # maintain stable order
-    order = ["regex", "sql", "json"]
+    order = ["regex", "sql", "json", "python", "amounts"]
     return [t for t in order if t in wanted]
 
+def _regex_rules(indicators: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    regex_rules: List[Dict[str, Any]] = []
+    for ind in indicators:
+        kind = ind["kind"]
+        cat, span = ind["category_id"], ind["span_id"]
+        if kind == "amount":
+            lit = ind["verbatim"]
+        elif kind == "link":
+            lit = ind["literal"]
+        else:  # "text" or others that have verbatim
+            lit = ind.get("verbatim")
+        if not isinstance(lit, str):
+            # Skip impossible cases; unit tests expect strict failure on missing before this point.
+            continue
+        pattern = _escape_literal(lit)
+        rule = {
+            "pattern": pattern,
+            "meta": {"name": lit, "kind": kind, **_provenance_meta(cat, span)},
+        }
+        regex_rules.append(rule)
+    return regex_rules
+
 
 # ---- public API -------------------------------------------------------------
 
 def compile_rules(ir: Dict[str, Any], options: Optional[CompileOptions] = None) -> Dict[str, Any]:
     """
-    Compile IR into rule artifacts (regex / SQL / JSON) without mutating IR.
+    Compile IR into rule artifacts (regex / SQL / JSON / Python / amounts) without mutating IR.
+
+    The "python" target (opt-in) emits a specialized matcher module; load it
+    with pymatcher.load_matcher(artifacts["python"]).
+
+    The "amounts" target (opt-in) sorts amount indicators by their `numeric`
+    value for numeric lookups; load it with amounts.AmountIndex(artifacts["amounts"]).
+
+    With options.sql_dialect, the "sql" target also carries parameterized
+    set-based queries and index recommendations (see sql.generate_sql).
 
     Guardrails:
       - Zero-inference, exact indicator preservation (amounts, tokens, links).
@@ -130,26 +163,7 @@ def compile_rules(ir: Dict[str, Any], options: Optional[CompileOptions] = None)
     artifacts: Dict[str, Any] = {}
     for target in _targets_all(options):
         if target == "regex":
-            regex_rules: List[Dict[str, Any]] = []
-            for ind in indicators:
-                kind = ind["kind"]
-                cat, span = ind["category_id"], ind["span_id"]
-                if kind == "amount":
-                    lit = ind["verbatim"]
-                elif kind == "link":
-                    lit = ind["literal"]
-                else:  # "text" or others that have verbatim
-                    lit = ind.get("verbatim")
-                if not isinstance(lit, str):
-                    # Skip impossible cases; unit tests expect strict failure on missing before this point.
-                    continue
-                pattern = _escape_literal(lit)
-                rule = {
-                    "pattern": pattern,
-                    "meta": {"name": lit, "kind": kind, **_provenance_meta(cat, span)},
-                }
-                regex_rules.append(rule)
-            artifacts["regex"] = regex_rules
+            artifacts["regex"] = _regex_rules(indicators)
 
         elif target == "sql":
             rows: List[Dict[str, Any]] = []
@@ -170,6 +184,12 @@ def compile_rules(ir: Dict[str, Any], options: Optional[CompileOptions] = None)
                 row.update(_provenance_meta(ind["category_id"], ind["span_id"]))
                 rows.append(row)
             artifacts["sql"] = {"table": "indicators", "rows": rows}
+            if options and options.sql_dialect:
+                from .sql import generate_sql
+                generated = generate_sql(artifacts["sql"], options.sql_dialect)
+                artifacts["sql"].update(dialect=generated["dialect"], ddl=generated["ddl"],
+                                        insert=generated["insert"], queries=generated["queries"],
+                                        indexes=generated["indexes"])
 
         elif target == "json":
             # Mirror categories and keep indicators with preserved fields
@@ -190,6 +210,15 @@ def compile_rules(ir: Dict[str, Any], options: Optional[CompileOptions] = None)
                 inds_out.append(kept)
             artifacts["json"] = {"categories": categories, "indicators": inds_out}
 
+        elif target == "python":
+            # Specialized matcher module; same literals and provenance as the regex target
+            from .pymatcher import build_artifact
+            artifacts["python"] = build_artifact(artifacts.get("regex") or _regex_rules(indicators), categories)
+
+        elif target == "amounts":
+            from .amounts import amount_rules
+            artifacts["amounts"] = amount_rules(indicators)
+
     # Category diff ==  (compiled JSON vs IR)
     if "json" in artifacts:
         compiled_cats = set((artifacts["json"].get("categories") or {}).keys())
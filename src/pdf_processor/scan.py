@@ -0,0 +1,458 @@
+"""
+Streaming scanner: apply compiled rules to a JSONL/CSV event stream.
+
+Rules are a saved compile_rules() result (its "regex" target, or the "json"
+target's indicators); they are turned into the specialized "python" matcher
+(pymatcher) once, and each worker process loads it once.
+
+The event file is memory-mapped and cut into chunks of whole lines
+(SS2_SCAN_CHUNK_MB); chunks are matched on a process pool (SS2_WORKERS) and
+their hits are yielded in file order. Only a bounded number of chunks is in
+flight, so memory stays flat however large the file is.
+
+Each hit carries the event's byte offset (and id, with id_field), the
+field and span it matched, and the rule's provenance (span_id, category_id).
+CSV fields must not contain quoted newlines that cross a chunk boundary.
+
+With amount_field, the numeric value of that field is also looked up in an
+AmountIndex built from the rules' amount indicators (one vectorized lookup
+per chunk); those hits carry "value" instead of a span.
+
+Usage:
+  safety-sigma scan rules.json events.jsonl [--field memo] [--workers 8] [--output hits.jsonl]
+  safety-sigma scan rules.json events.csv --amount-field amount --amount-tolerance 0.01
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from bisect import bisect_right
+import argparse
+import csv
+import json
+import mmap
+import os
+import sys
+import time
+import types
+
+from .amounts import AmountIndex
+from .pymatcher import build_artifact, load_matcher
+from .rules import _regex_rules
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+FORMATS = ("jsonl", "csv")
+
+_SUFFIX_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".csv": "csv"}
+
+DEFAULT_CHUNK_MB = 8.0
+
+
+@dataclass
+class ScanStats:
+    events: int = 0
+    bytes: int = 0
+    hits: int = 0
+    errors: int = 0  # lines that are not valid events
+    chunks: int = 0
+    workers: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"events": self.events, "bytes": self.bytes, "hits": self.hits, "errors": self.errors,
+                "chunks": self.chunks, "workers": self.workers, "seconds": round(self.seconds, 6),
+                "events_per_sec": round(self.events_per_sec, 1), "mb_per_sec": round(self.mb_per_sec, 3)}
+
+
+@dataclass
+class _Chunk:
+    start: int
+    events: int = 0
+    errors: int = 0
+    hits: List[Dict[str, Any]] = field(default_factory=list)
+
+
+RuleSource = Union[str, os.PathLike, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def read_rules(source: RuleSource) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Saved rules (a path is read as JSON; anything else is returned as is)."""
+    if isinstance(source, (str, os.PathLike)):
+        return json.loads(Path(source).read_text(encoding="utf-8"))
+    return source
+
+
+def load_rules(source: RuleSource) -> Dict[str, Any]:
+    """
+    "python" matcher artifact for saved rules.
+
+    Args:
+      source: compile_rules() result (or its path), a "regex" rule list, or a "json" target
+
+    Returns:
+      Artifact for pymatcher.load_matcher (the saved "python" target when present)
+    """
+    source = read_rules(source)
+    if isinstance(source, list):
+        return build_artifact(source, {})
+    if isinstance(source.get("python"), dict) and "ir_hash" in source["python"]:
+        return source["python"]
+    json_target = source.get("json") if isinstance(source.get("json"), dict) else source
+    categories = json_target.get("categories") or {}
+    if isinstance(source.get("regex"), list):
+        return build_artifact(source["regex"], categories)
+    if isinstance(json_target.get("indicators"), list):
+        return build_artifact(_regex_rules(json_target["indicators"]), categories)
+    raise ValueError("No rules found: expected a compile_rules result with a regex or json target")
+
+
+def detect_format(path: Union[str, os.PathLike]) -> str:
+    fmt = _SUFFIX_FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the format of {path}; pass fmt ({' or '.join(FORMATS)})")
+    return fmt
+
+
+def plan_chunks(mm: Any, start: int, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) byte ranges of whole lines, about chunk_bytes each."""
+    size = len(mm)
+    while start < size:
+        end = start + chunk_bytes
+        if end >= size:
+            end = size
+        else:
+            newline = mm.find(b"\n", end - 1)
+            end = size if newline < 0 else newline + 1
+        yield start, end
+        start = end
+
+
+def _lines(data: bytes, base: int, keep_ends: bool = False) -> Tuple[List[str], List[int]]:
+    """
+    Decoded lines and their file offsets.
+
+    By default blank lines are dropped and line endings stripped (JSONL).
+    With keep_ends every line is kept with its ending, so csv.reader sees
+    quoted fields, blank lines included, exactly as in the file.
+    """
+    lines: List[str] = []
+    offsets: List[int] = []
+    position = 0
+    for raw in data.split(b"\n"):
+        if keep_ends:
+            if position < len(data):
+                line = raw + b"\n" if position + len(raw) < len(data) else raw
+                lines.append(line.decode("utf-8", errors="replace"))
+                offsets.append(base + position)
+        elif raw.strip():
+            lines.append(raw.rstrip(b"\r").decode("utf-8", errors="replace"))
+            offsets.append(base + position)
+        position += len(raw) + 1
+    return lines, offsets
+
+
+class _Batch:
+    """Field texts of a chunk, matched in a single call."""
+
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self.sources: List[Tuple[int, str, Any]] = []  # (event offset, field, event id) per text
+        self.amounts: List[float] = []
+        self.amount_sources: List[Tuple[int, Any]] = []  # (event offset, event id) per amount
+
+    def add_amount(self, offset: int, value: Any, event_id: Any) -> None:
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                return
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.amounts.append(float(value))
+            self.amount_sources.append((offset, event_id))
+
+    def match_amounts(self, index: AmountIndex, name: str) -> List[Dict[str, Any]]:
+        hits = []
+        for t, k in index.matches(self.amounts):
+            offset, event_id = self.amount_sources[t]
+            indicator = index.indicators[k]
+            hit = {"offset": offset, "field": name, "value": self.amounts[t], "literal": indicator["verbatim"],
+                   "kind": "amount", "numeric": indicator["numeric"], "span_id": indicator["span_id"],
+                   "category_id": indicator["category_id"]}
+            if event_id is not None:
+                hit["event_id"] = event_id
+            hits.append(hit)
+        return hits
+
+    def add(self, offset: int, values: Sequence[Tuple[str, Any]], event_id: Any) -> None:
+        for name, text in values:
+            if isinstance(text, str) and text:
+                self.texts.append(text)
+                self.sources.append((offset, name, event_id))
+
+    def match(self, matcher: types.ModuleType) -> List[Dict[str, Any]]:
+        # A whitespace separator no literal contains acts as a text edge for every boundary
+        # check and can never be part of a hit, so matching the joined texts once gives each
+        # text's own hits while scanning every literal once per chunk.
+        separator = _separator(matcher)
+        if separator is None:
+            found = [(t, start, end, k) for t, text in enumerate(self.texts) for start, end, k in matcher.match(text)]
+        else:
+            starts = []
+            position = 0
+            for text in self.texts:
+                starts.append(position)
+                position += len(text) + 1
+            found = []
+            for start, end, k in matcher.match(separator.join(self.texts)):
+                t = bisect_right(starts, start) - 1
+                found.append((t, start - starts[t], end - starts[t], k))
+        rules = matcher.RULES
+        hits = []
+        for t, start, end, k in found:
+            offset, name, event_id = self.sources[t]
+            meta = rules[k]
+            hit = {"offset": offset, "field": name, "start": start, "end": end,
+                   "literal": meta["name"], "kind": meta["kind"], "rule": k,
+                   "span_id": meta["source_span"]["span_id"], "category_id": meta["source_span"]["category_id"]}
+            if event_id is not None:
+                hit["event_id"] = event_id
+            hits.append(hit)
+        return hits
+
+
+# Whitespace, non-word characters usable as text separators, most likely absent from literals first
+_SEPARATORS = ("\x1e", "\x1f", "\x1d", "\x1c", "\u2029", "\u2028", "\x85", "\n")
+_SEPARATOR_BY_HASH: Dict[str, Optional[str]] = {}
+
+
+def _separator(matcher: types.ModuleType) -> Optional[str]:
+    """Separator no rule literal contains (None: every candidate occurs, match texts one by one)."""
+    digest = matcher.IR_HASH
+    if digest not in _SEPARATOR_BY_HASH:
+        literals = [meta["name"] for meta in matcher.RULES]
+        _SEPARATOR_BY_HASH[digest] = next(
+            (sep for sep in _SEPARATORS if not any(sep in literal for literal in literals)), None)
+    return _SEPARATOR_BY_HASH[digest]
+
+
+def scan_chunk(matcher: types.ModuleType, path: Union[str, os.PathLike], start: int, end: int, fmt: str,
+               fields: Optional[Sequence[str]] = None, id_field: Optional[str] = None,
+               header: Optional[Sequence[str]] = None, amount_field: Optional[str] = None,
+               amounts: Optional[AmountIndex] = None) -> _Chunk:
+    """Match the events in bytes [start, end) of a file."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines, offsets = _lines(mm[start:end], start, keep_ends=fmt == "csv")
+    chunk = _Chunk(start)
+    batch = _Batch()
+
+    if fmt == "jsonl":
+        for line, offset in zip(lines, offsets):
+            try:
+                event = _loads(line)
+            except ValueError:
+                chunk.errors += 1
+                continue
+            if not isinstance(event, dict):
+                chunk.errors += 1
+                continue
+            chunk.events += 1
+            values = [(name, event.get(name)) for name in fields] if fields else list(event.items())
+            event_id = event.get(id_field) if id_field else None
+            batch.add(offset, values, event_id)
+            if amounts is not None:
+                batch.add_amount(offset, event.get(amount_field), event_id)
+        return _finish(chunk, batch, matcher, amount_field, amounts)
+
+    columns = list(header or [])
+    wanted = [(name, index) for index, name in enumerate(columns) if not fields or name in fields]
+    id_index = columns.index(id_field) if id_field and id_field in columns else None
+    amount_index = columns.index(amount_field) if amounts is not None and amount_field in columns else None
+    reader = csv.reader(lines)
+    line_number = 0
+    for row in reader:
+        offset = offsets[line_number]
+        line_number = reader.line_num  # a quoted newline spans several lines
+        if not row or (len(row) == 1 and not row[0].strip()):
+            continue  # blank line between records
+        chunk.events += 1
+        values = [(name, row[index]) for name, index in wanted if index < len(row)]
+        event_id = row[id_index] if id_index is not None and id_index < len(row) else None
+        batch.add(offset, values, event_id)
+        if amount_index is not None and amount_index < len(row):
+            batch.add_amount(offset, row[amount_index], event_id)
+    return _finish(chunk, batch, matcher, amount_field, amounts)
+
+
+def _finish(chunk: _Chunk, batch: _Batch, matcher: types.ModuleType, amount_field: Optional[str],
+            amounts: Optional[AmountIndex]) -> _Chunk:
+    chunk.hits = batch.match(matcher)
+    if amounts is not None and batch.amounts:
+        chunk.hits += batch.match_amounts(amounts, amount_field)
+        chunk.hits.sort(key=lambda hit: hit["offset"])  # stable: text hits stay in span order
+    return chunk
+
+
+# Matcher and amount index loaded once by each pool worker process
+_worker_matcher: Optional[types.ModuleType] = None
+_worker_amounts: Optional[AmountIndex] = None
+
+
+def _init_worker(artifact: Dict[str, Any], amounts: Optional[AmountIndex]) -> None:
+    global _worker_matcher, _worker_amounts
+    _worker_matcher = load_matcher(artifact)
+    _worker_amounts = amounts
+
+
+def _scan_in_worker(*args: Any) -> _Chunk:
+    return scan_chunk(_worker_matcher, *args, amounts=_worker_amounts)
+
+
+class Scanner:
+    """
+    Applies compiled rules to JSONL/CSV event files.
+    """
+
+    def __init__(self, rules: RuleSource, workers: Optional[int] = None, chunk_mb: Optional[float] = None,
+                 fields: Optional[Sequence[str]] = None, id_field: Optional[str] = None,
+                 amount_field: Optional[str] = None, amount_tolerance: float = 0.0,
+                 amount_rel_tolerance: float = 0.0):
+        """
+        Args:
+          rules: see load_rules()
+          workers: worker processes (default: SS2_WORKERS or CPU count); 0 scans in this process
+          chunk_mb: chunk size in MB (default: SS2_SCAN_CHUNK_MB or 8)
+          fields: event fields / CSV columns to match (default: every string field)
+          id_field: event field copied into hits as event_id
+          amount_field: numeric field / CSV column looked up in the rules' AmountIndex
+          amount_tolerance, amount_rel_tolerance: AmountIndex tolerance band (default: exact)
+        """
+        source = read_rules(rules)
+        self.artifact = load_rules(source)
+        self.amount_field = amount_field
+        self.amounts = None
+        if amount_field:
+            if not isinstance(source, dict):
+                raise ValueError("amount_field needs a compile_rules result with an amounts, json or sql target")
+            self.amounts = AmountIndex.from_artifacts(source, tolerance=amount_tolerance,
+                                                      rel_tolerance=amount_rel_tolerance)
+        if workers is None:
+            workers = int(os.getenv("SS2_WORKERS", "0") or 0) or os.cpu_count() or 1
+        self.workers = max(0, workers)
+        self.chunk_bytes = max(1, int(float(chunk_mb or os.getenv("SS2_SCAN_CHUNK_MB", DEFAULT_CHUNK_MB))
+                                      * 1024 * 1024))
+        self.fields = list(fields) if fields else None
+        self.id_field = id_field
+        self.stats = ScanStats()
+
+    def scan(self, path: Union[str, os.PathLike], fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Hits in a file, in file order; self.stats is complete once the iterator is exhausted.
+
+        Args:
+          path: JSONL or CSV event file
+          fmt: "jsonl" or "csv" (default: from the file suffix)
+        """
+        fmt = fmt or detect_format(path)
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown event format: {fmt}. Supported: {FORMATS}")
+        self.stats = stats = ScanStats()
+        began = time.perf_counter()
+        if os.path.getsize(path) == 0:
+            return
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, header = 0, None
+            if fmt == "csv":
+                start = mm.find(b"\n") + 1 or len(mm)
+                header = next(csv.reader([mm[:start].decode("utf-8-sig").rstrip("\r\n")]), [])
+            stats.bytes = len(mm) - start
+            chunks = list(plan_chunks(mm, start, self.chunk_bytes))
+        stats.workers = self.workers if len(chunks) > 1 else 0
+        options = (fmt, self.fields, self.id_field, header, self.amount_field)
+
+        for chunk in self._run(path, chunks, options):
+            stats.chunks += 1
+            stats.events += chunk.events
+            stats.errors += chunk.errors
+            stats.hits += len(chunk.hits)
+            yield from chunk.hits
+            stats.seconds = time.perf_counter() - began
+        stats.seconds = time.perf_counter() - began
+
+    def _run(self, path: Union[str, os.PathLike], chunks: List[Tuple[int, int]],
+             options: Tuple[Any, ...]) -> Iterator[_Chunk]:
+        if self.workers == 0 or len(chunks) <= 1:
+            matcher = load_matcher(self.artifact)
+            for start, end in chunks:
+                yield scan_chunk(matcher, path, start, end, *options, amounts=self.amounts)
+            return
+
+        # Results in submission order; at most two chunks per worker in flight
+        remaining = deque(chunks)
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.artifact, self.amounts)) as executor:
+            while remaining or pending:
+                while remaining and len(pending) < self.workers * 2:
+                    start, end = remaining.popleft()
+                    pending.append(executor.submit(_scan_in_worker, path, start, end, *options))
+                yield pending.popleft().result()
+
+
+def format_stats(stats: ScanStats) -> str:
+    return (f"Scanned {stats.events:,} events ({stats.bytes / 1e6:.1f} MB) in {stats.seconds:.2f}s: "
+            f"{stats.events_per_sec:,.0f} events/s, {stats.mb_per_sec:.1f} MB/s, {stats.hits:,} hits, "
+            f"{stats.errors} invalid lines, {stats.workers} workers")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Scan an event file with compiled rules; hits as JSONL, throughput on stderr."""
+    parser = argparse.ArgumentParser(prog="safety-sigma scan",
+                                     description="Apply compiled rules to a JSONL/CSV event stream")
+    parser.add_argument("rules", help="compile_rules() result saved as JSON (regex or json target)")
+    parser.add_argument("events", help="JSONL or CSV event file")
+    parser.add_argument("--format", choices=FORMATS, help="Event format (default: from the file suffix)")
+    parser.add_argument("--field", action="append", dest="fields",
+                        help="Field/column to match (repeatable; default: every string field)")
+    parser.add_argument("--id-field", help="Field copied into each hit as event_id")
+    parser.add_argument("--amount-field", help="Numeric field/column matched against the amount indicators")
+    parser.add_argument("--amount-tolerance", type=float, default=0.0, help="Absolute amount band (default: exact)")
+    parser.add_argument("--amount-rel-tolerance", type=float, default=0.0,
+                        help="Amount band as a fraction of the value, e.g. 0.001")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: SS2_WORKERS or CPU count)")
+    parser.add_argument("--chunk-mb", type=float, help=f"Chunk size (default: SS2_SCAN_CHUNK_MB or {DEFAULT_CHUNK_MB:g})")
+    parser.add_argument("--output", "-o", help="Hits file (default: stdout)")
+    parser.add_argument("--stats-json", action="store_true", help="Print throughput as JSON on stderr")
+    args = parser.parse_args(argv)
+
+    scanner = Scanner(args.rules, workers=args.workers, chunk_mb=args.chunk_mb, fields=args.fields,
+                      id_field=args.id_field, amount_field=args.amount_field,
+                      amount_tolerance=args.amount_tolerance, amount_rel_tolerance=args.amount_rel_tolerance)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for hit in scanner.scan(args.events, args.format):
+            out.write(json.dumps(hit, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            out.close()
+    print(json.dumps(scanner.stats.to_dict()) if args.stats_json else format_stats(scanner.stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+Set-based SQL for the "sql" compile target.
+
+Turns the compiled indicator rows into parameterized queries for SQLite,
+DuckDB and PostgreSQL that match a transactions table in a few set-based
+statements instead of one predicate per indicator:
+  - amounts: exact IN list (plus a BETWEEN range so the amount index is
+    range-seeked), joined back to the indicator table for provenance
+  - links: equality join on the literal (a hash join in DuckDB/PostgreSQL)
+  - text: containment join on the memo column, confirmed by a boundary
+    pattern (GLOB in SQLite, a regular expression in DuckDB/PostgreSQL)
+
+Every result row carries category_id and span_id of the indicator it
+matched (zero inference: only exact IR literals/amounts are used). Text
+hits follow the regex target's boundaries: a literal starting or ending
+with an alphanumeric character must not touch a word character, any other
+literal must be surrounded by whitespace or the ends of the memo, so
+"scam" does not match "scammer". SQLite's GLOB only knows ASCII word
+characters, so there a non-ASCII letter or digit next to a literal counts
+as a boundary; the match_text query states this in its header comment.
+
+Index recommendations are emitted per dialect; verify_indexes() keeps only
+those SQLite's EXPLAIN QUERY PLAN actually uses. For SQLite, text_index="fts5"
+routes the text join through an FTS5 trigram index over the memo column
+(SQLite >= 3.34), turning the rows x literals containment scan into index
+lookups; literals shorter than a trigram still use the scan.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import re
+
+DIALECTS = ("sqlite", "duckdb", "postgres")
+
+INDICATOR_TABLE = "ss2_indicators"
+
+# Above this many amounts the IN list is dropped and the indicator join alone drives the lookup
+MAX_IN_LIST = 1000
+
+_PLACEHOLDERS = {"sqlite": "?", "duckdb": "?", "postgres": "%s"}
+
+_CONTAINS = {
+    "sqlite": "instr({memo}, i.verbatim) > 0",
+    "duckdb": "contains({memo}, i.verbatim)",
+    "postgres": "strpos({memo}, i.verbatim) > 0",
+}
+
+# Memo matches the indicator's boundary pattern (see boundary_pattern)
+_BOUNDED = {
+    "sqlite": "(' ' || {memo} || ' ') GLOB i.pattern",
+    "duckdb": "regexp_matches({memo}, i.pattern)",
+    "postgres": "{memo} ~ i.pattern",
+}
+
+_TEXT_HEADERS = {
+    "sqlite": "-- text: literal with the regex target's boundaries; word characters are ASCII [0-9A-Za-z_]\n",
+    "duckdb": "-- text: literal with the regex target's boundaries\n",
+    "postgres": "-- text: literal with the regex target's boundaries\n",
+}
+
+# Python's \s, which the regex target's whitespace boundaries test against
+_WHITESPACE = ("\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006"
+               "\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000")
+
+TEXT_INDEXES = (None, "fts5")
+
+# Trigram tokenizer: shorter literals cannot be looked up in the index
+FTS_MIN_LENGTH = 3
+
+FTS_TABLE = "ss2_tx_memo_fts"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SqlGenerationError(ValueError):
+    """Raised for unknown dialects or unsafe identifiers."""
+
+
+@dataclass
+class TransactionSchema:
+    """Names of the transactions table and the columns matched against indicators."""
+    table: str = "transactions"
+    id: str = "id"
+    amount: str = "amount"
+    link: str = "link"
+    memo: str = "memo"
+
+    def validate(self) -> None:
+        for name in (self.table, self.id, self.amount, self.link, self.memo):
+            if not _IDENTIFIER.match(name):
+                raise SqlGenerationError(f"Unsafe SQL identifier: {name!r}")
+
+
+def boundary_pattern(literal: str, dialect: str) -> str:
+    """
+    Pattern matching a memo that contains literal with the regex target's boundaries.
+
+    SQLite patterns are GLOBs over the memo padded with a space on each side;
+    DuckDB (RE2) and PostgreSQL patterns are regular expressions.
+    """
+    word = bool(literal) and (literal[0].isalnum() or literal[-1].isalnum())
+    if dialect == "sqlite":
+        edge = "[^0-9A-Za-z_]" if word else f"[{_WHITESPACE}]"
+        escaped = re.sub(r"[*?[]", lambda m: f"[{m.group()}]", literal)
+        return f"*{edge}{escaped}{edge}*"
+    if dialect == "duckdb":
+        edge = r"[^\pL\pN_]" if word else "[" + "".join(f"\\x{{{ord(c):x}}}" for c in _WHITESPACE) + "]"
+    else:
+        edge = "[^[:alnum:]_]" if word else f"[{_WHITESPACE}]"
+    escaped = re.sub(r"[\\.^$|?*+()[\]{}]", r"\\\g<0>", literal)
+    return f"(^|{edge}){escaped}($|{edge})"
+
+
+def _indicator_ddl(dialect: str) -> str:
+    real = "DOUBLE" if dialect == "duckdb" else ("DOUBLE PRECISION" if dialect == "postgres" else "REAL")
+    return (
+        f"CREATE TABLE IF NOT EXISTS {INDICATOR_TABLE} (\n"
+        "  kind TEXT NOT NULL,\n"
+        "  category_id TEXT NOT NULL,\n"
+        "  span_id TEXT NOT NULL,\n"
+        "  verbatim TEXT,\n"
+        f"  numeric {real},\n"
+        "  literal TEXT,\n"
+        "  pattern TEXT\n"
+        ")"
+    )
+
+
+def _index_recommendations(dialect: str, s: TransactionSchema, text_index: Optional[str]) -> List[Dict[str, Any]]:
+    if dialect == "duckdb":
+        # Hash joins and min/max zone maps; ART indexes do not help these scans
+        return []
+    link_method = " USING hash" if dialect == "postgres" else ""
+    specs = [
+        ("ss2_tx_amount", s.table, f"({s.amount})", "", ["match_amounts"]),
+        ("ss2_tx_link", s.table, f"({s.link})", link_method, ["match_links"]),
+        ("ss2_ind_kind_numeric", INDICATOR_TABLE, "(kind, numeric)", "", ["match_amounts"]),
+        ("ss2_ind_kind_literal", INDICATOR_TABLE, "(kind, literal)", "", ["match_links"]),
+    ]
+    indexes = [
+        {
+            "name": name,
+            "table": table,
+            "sql": f"CREATE INDEX IF NOT EXISTS {name} ON {table}{method} {columns}",
+            "used_by": used_by,
+            "verified": None,
+        }
+        for name, table, columns, method, used_by in specs
+    ]
+    if text_index == "fts5":
+        # External-content index over a snapshot: re-run "populate" after loading transactions
+        indexes.append({
+            "name": FTS_TABLE,
+            "table": s.table,
+            "sql": (f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                    f"{s.memo}, content='{s.table}', content_rowid='{s.id}', tokenize='trigram')"),
+            "populate": f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')",
+            "used_by": ["match_text"],
+            "verified": None,
+            "required": True,
+        })
+    return indexes
+
+
+def generate_sql(sql_artifact: Dict[str, Any], dialect: str = "sqlite",
+                 schema: Optional[TransactionSchema] = None, text_index: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate set-based SQL from a compiled "sql" artifact.
+
+    Args:
+      sql_artifact: compile_rules(...)["sql"] ({"table", "rows"})
+      dialect: "sqlite", "duckdb" or "postgres"
+      schema: transactions table/column names (default: TransactionSchema())
+      text_index: None, or "fts5" (SQLite only) to match text through a trigram index
+
+    Returns:
+      {"dialect", "schema", "ddl", "insert": {"sql", "params"}, "queries": {name: {"sql", "params"}},
+       "indexes": [...]}. Query result columns: transaction_id, kind, category_id, span_id, indicator.
+    """
+    if dialect not in DIALECTS:
+        raise SqlGenerationError(f"Unknown SQL dialect: {dialect}. Supported: {DIALECTS}")
+    if text_index not in TEXT_INDEXES or (text_index and dialect != "sqlite"):
+        raise SqlGenerationError(f"Unsupported text index {text_index!r} for dialect {dialect}")
+    s = schema or TransactionSchema()
+    s.validate()
+    ph = _PLACEHOLDERS[dialect]
+    rows = sql_artifact.get("rows", [])
+
+    def pattern(r: Dict[str, Any]) -> Optional[str]:
+        verbatim = r.get("verbatim")
+        if r["kind"] in ("text", "memo") and isinstance(verbatim, str) and verbatim:
+            return boundary_pattern(verbatim, dialect)
+        return None
+
+    insert_params = [
+        (r["kind"], str(r["category_id"]), str(r["span_id"]), r.get("verbatim"), r.get("numeric"), r.get("literal"),
+         pattern(r))
+        for r in rows
+    ]
+    insert_sql = (f"INSERT INTO {INDICATOR_TABLE} (kind, category_id, span_id, verbatim, numeric, literal, pattern) "
+                  f"VALUES ({', '.join([ph] * 7)})")
+
+    select = f"SELECT t.{s.id} AS transaction_id, i.kind, i.category_id, i.span_id"
+
+    # Amounts: exact IN list + bounding range on the transactions side, join for provenance
+    amounts = sorted({float(r["numeric"]) for r in rows
+                      if r["kind"] == "amount" and isinstance(r.get("numeric"), (int, float))})
+    amount_sql = (f"{select}, i.verbatim AS indicator\n"
+                  f"FROM {s.table} t\n"
+                  f"JOIN {INDICATOR_TABLE} i ON i.kind = 'amount' AND i.numeric = t.{s.amount}")
+    amount_params: List[Any] = []
+    if amounts:
+        amount_sql += f"\nWHERE t.{s.amount} BETWEEN {ph} AND {ph}"
+        amount_params += [amounts[0], amounts[-1]]
+        if len(amounts) <= MAX_IN_LIST:
+            amount_sql += f" AND t.{s.amount} IN ({', '.join([ph] * len(amounts))})"
+            amount_params += amounts
+    else:
+        amount_sql += "\nWHERE 1 = 0"
+
+    # Links: equality join on the literal (hash-join key)
+    link_sql = (f"{select}, i.literal AS indicator\n"
+                f"FROM {INDICATOR_TABLE} i\n"
+                f"JOIN {s.table} t ON t.{s.link} = i.literal\n"
+                "WHERE i.kind = 'link'")
+
+    # Text: containment join on the memo, then the boundary pattern (cheap test first)
+    contains = (f"{_CONTAINS[dialect].format(memo=f't.{s.memo}')} "
+                f"AND {_BOUNDED[dialect].format(memo=f't.{s.memo}')}")
+    text_sql = (f"{select}, i.verbatim AS indicator\n"
+                f"FROM {INDICATOR_TABLE} i\n"
+                f"JOIN {s.table} t ON {contains}\n"
+                "WHERE i.kind IN ('text', 'memo') AND i.verbatim <> ''")
+    if text_index == "fts5":
+        # Phrase lookup in the trigram index, confirmed by the containment test
+        phrase = "'\"' || replace(i.verbatim, '\"', '\"\"') || '\"'"
+        text_sql = (f"{select}, i.verbatim AS indicator\n"
+                    f"FROM {INDICATOR_TABLE} i\n"
+                    f"JOIN {FTS_TABLE} ON {FTS_TABLE}.{s.memo} MATCH {phrase}\n"
+                    f"JOIN {s.table} t ON t.{s.id} = {FTS_TABLE}.rowid AND {contains}\n"
+                    f"WHERE i.kind IN ('text', 'memo') AND length(i.verbatim) >= {FTS_MIN_LENGTH}\n"
+                    "UNION ALL\n"
+                    + text_sql + f" AND length(i.verbatim) < {FTS_MIN_LENGTH}")
+    text_sql = _TEXT_HEADERS[dialect] + text_sql
+
+    queries = {
+        "match_amounts": {"sql": amount_sql, "params": amount_params},
+        "match_links": {"sql": link_sql, "params": []},
+        "match_text": {"sql": text_sql, "params": []},
+    }
+    queries["match_all"] = {
+        "sql": "\nUNION ALL\n".join(q["sql"] for q in queries.values()),
+        "params": amount_params,
+    }
+
+    return {
+        "dialect": dialect,
+        "schema": s.__dict__.copy(),
+        "ddl": _indicator_ddl(dialect),
+        "insert": {"sql": insert_sql, "params": insert_params},
+        "queries": queries,
+        "indexes": _index_recommendations(dialect, s, text_index),
+    }
+
+
+def load_indicators(conn: Any, generated: Dict[str, Any]) -> None:
+    """Create and fill the indicator table through a DB-API connection."""
+    cur = conn.cursor()
+    cur.execute(f"DROP TABLE IF EXISTS {INDICATOR_TABLE}")
+    cur.execute(generated["ddl"])
+    cur.executemany(generated["insert"]["sql"], generated["insert"]["params"])
+    conn.commit()
+
+
+def query_plan(conn: Any, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """SQLite EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()]
+
+
+def verify_indexes(conn: Any, generated: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Create the recommended indexes on a SQLite connection and keep those the planner uses.
+
+    An index is verified when EXPLAIN QUERY PLAN of a query listed in its
+    used_by looks it up. Unused indexes are dropped again, except "required"
+    ones (the FTS5 table) that the generated queries reference.
+
+    Returns:
+      Recommendations with "verified" set and the "plans" that were checked
+    """
+    if generated["dialect"] != "sqlite":
+        raise SqlGenerationError("EXPLAIN verification is implemented for SQLite connections only")
+    for index in generated["indexes"]:
+        conn.execute(index["sql"])
+        if index.get("populate"):
+            conn.execute(index["populate"])
+    conn.execute("ANALYZE")
+
+    plans = {name: query_plan(conn, q["sql"], q["params"]) for name, q in generated["queries"].items()}
+    verified = []
+    for index in generated["indexes"]:
+        name_pattern = re.escape(index["name"])
+        used = any(re.search(rf"\bINDEX {name_pattern}\b|\b{name_pattern} VIRTUAL TABLE INDEX \d+:M", line)
+                   for name in index["used_by"] for line in plans[name])
+        if not used and not index.get("required"):
+            conn.execute(f"DROP INDEX IF EXISTS {index['name']}")
+        verified.append({**index, "verified": used, "plans": {name: plans[name] for name in index["used_by"]}})
+    conn.commit()
+    return verified
+
+
+def run_query(conn: Any, generated: Dict[str, Any], name: str = "match_all") -> List[Tuple[Any, ...]]:
+    """Execute one generated query and return its rows."""
+    query = generated["queries"][name]
+    return conn.execute(query["sql"], tuple(query["params"])).fetchall()
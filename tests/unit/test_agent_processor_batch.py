@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from agents.agent_processor import AgentProcessor, ProcessResult
+from orchestration.tool_orchestrator import ToolOrchestrator
+from tools.extraction_tool import ExtractionTool
+from tools.pdf_tool import PDFTool
+
+DOCUMENTS = [(f"Extract indicators from report {i}", f"Report {i} content") for i in range(6)]
+
+fork_only = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                               reason="patched methods reach workers only with the fork start method")
+
+# (event, index of the document that sets it or None for the test): document 0 waits for the
+# event, so it completes after a later document whatever the scheduling
+_hold = None
+
+
+def _fake_process_report(self, instructions, report_content):
+    index = int(report_content.split()[1])
+    if index == 3:
+        raise RuntimeError("backend unavailable")
+    if _hold is not None:
+        event, releaser = _hold
+        if index == 0:
+            event.wait(timeout=30)
+        elif index == releaser:
+            event.set()
+    return f"analysis of {report_content}"
+
+
+def _hold_first_document(monkeypatch, releaser=None):
+    event = multiprocessing.Event()  # inherited by the forked workers
+    monkeypatch.setattr(sys.modules[__name__], '_hold', (event, releaser))
+    return event
+
+
+def test_in_process_batch_captures_failures(tmp_path):
+    processor = AgentProcessor(audit_dir=str(tmp_path))
+    with patch.object(AgentProcessor, 'process_report', _fake_process_report):
+        results = list(processor.process_many(DOCUMENTS, workers=0))
+
+    assert [r.index for r in results] == list(range(len(DOCUMENTS)))
+    assert results[0].result == "analysis of Report 0 content"
+    assert not results[3].success and "backend unavailable" in results[3].error
+    assert all(r.worker_pid == os.getpid() for r in results)
+
+
+@fork_only
+def test_ordered_results_follow_submission_order(tmp_path, monkeypatch):
+    _hold_first_document(monkeypatch, releaser=2)  # within the first max_in_flight documents
+    processor = AgentProcessor(audit_dir=str(tmp_path))
+    with patch.object(AgentProcessor, 'process_report', _fake_process_report):
+        results = list(processor.process_many(DOCUMENTS, workers=2, ordered=True, max_in_flight=3))
+
+    assert [r.index for r in results] == list(range(len(DOCUMENTS)))
+    assert all(isinstance(r, ProcessResult) for r in results)
+    assert {r.worker_pid for r in results} - {os.getpid()}
+    assert [r.success for r in results] == [True, True, True, False, True, True]
+
+
+@fork_only
+def test_unordered_results_stream_as_completed(tmp_path, monkeypatch):
+    release = _hold_first_document(monkeypatch)
+    processor = AgentProcessor(audit_dir=str(tmp_path))
+    with patch.object(AgentProcessor, 'process_report', _fake_process_report):
+        results = processor.process_many(DOCUMENTS, workers=3)
+        first = next(results)  # document 0 cannot finish before it is released
+        release.set()
+        results = [first] + list(results)
+
+    assert first.index != 0
+    assert sorted(r.index for r in results) == list(range(len(DOCUMENTS)))
+
+
+
+@pytest.mark.parametrize("workers", [0, pytest.param(2, marks=fork_only)])
+def test_batch_profiles_each_document(tmp_path, workers):
+    processor = AgentProcessor(audit_dir=str(tmp_path))
+    with patch.object(AgentProcessor, 'process_report', _fake_process_report):
+        results = list(processor.process_many(DOCUMENTS[:2], workers=workers, ordered=True,
+                                              profile='cprofile', profile_dir=str(tmp_path / "profiles")))
+
+    for result in results:
+        assert set(result.profile_paths) == {'summary', 'pstats'}
+        assert result.profile_paths['pstats'].endswith(f"profile_doc{result.index:05d}.prof")
+        assert os.path.getsize(result.profile_paths['pstats']) > 0
+
+def _connect(tool):
+    tool._ss1_processor = object()
+
+
+def test_warm_up_reuses_tool_instances(tmp_path):
+    orchestrator = ToolOrchestrator(audit_dir=str(tmp_path))
+    with patch.object(PDFTool, '_import_ss1', autospec=True, side_effect=_connect), \
+         patch.object(ExtractionTool, '_import_ss1', autospec=True, side_effect=_connect):
+        status = orchestrator.warm_up()
+
+    assert status == {'PDFTool': 'ready', 'ExtractionTool': 'ready'}
+    assert orchestrator._get_tool(ExtractionTool) is orchestrator._get_tool(ExtractionTool)
+
+
+def test_warm_up_reports_missing_backend(tmp_path):
+    orchestrator = ToolOrchestrator(audit_dir=str(tmp_path))
+    with patch.object(PDFTool, '_import_ss1', side_effect=ImportError("no backend")):
+        status = orchestrator.warm_up()
+
+    assert status['PDFTool'] == "backend unavailable: no backend"
@@ -0,0 +1,77 @@
+import json
+import math
+import random
+
+import pytest
+
+from src.pdf_processor import amounts
+from src.pdf_processor.amounts import AmountIndex
+from src.pdf_processor.rules import CompileOptions, compile_rules
+from src.pdf_processor.scan import Scanner
+
+
+IR = {
+    "indicators": [
+        {"kind": "amount", "verbatim": "$1,998.88", "numeric": 1998.88, "category_id": "payments", "span_id": "s1"},
+        {"kind": "amount", "verbatim": "$500", "numeric": 500, "category_id": "payments", "span_id": "s2"},
+        {"kind": "amount", "verbatim": "500 USD", "numeric": 500.0, "category_id": "refunds", "span_id": "s3"},
+        {"kind": "amount", "verbatim": "about $20", "numeric": "20", "category_id": "payments", "span_id": "s4"},
+        {"kind": "link", "literal": "wa.me/123456789", "category_id": "comm", "span_id": "s5"},
+    ],
+    "categories": {"payments": {}, "refunds": {}, "comm": {}},
+}
+
+
+@pytest.fixture(params=["numpy", "bisect"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and not amounts.HAS_NUMPY:
+        pytest.skip("numpy is not installed")
+    monkeypatch.setattr(amounts, "HAS_NUMPY", request.param == "numpy")
+    return request.param
+
+
+def test_amounts_target_sorts_numeric_indicators():
+    artifact = compile_rules(IR, CompileOptions(targets=["amounts"]))["amounts"]
+    assert artifact["values"] == [500.0, 500.0, 1998.88]  # "20" is text: not indexed (zero inference)
+    assert [entry["span_id"] for entry in artifact["indicators"]] == ["s2", "s3", "s1"]
+    assert artifact["indicators"][2]["source_span"] == {"category_id": "payments", "span_id": "s1"}
+    assert "amounts" not in compile_rules(IR)
+
+
+def test_exact_and_tolerance_lookups(backend):
+    index = AmountIndex.from_artifacts(compile_rules(IR))  # built from the json target
+    assert [entry["span_id"] for entry in index.lookup(500)] == ["s2", "s3"]
+    assert index.lookup(1998.88)[0]["verbatim"] == "$1,998.88"
+    assert index.lookup(1998.87) == [] and index.lookup(math.nan) == []
+    assert [entry["span_id"] for entry in index.lookup(1998.87, tolerance=0.01)] == ["s1"]
+    assert [entry["span_id"] for entry in index.lookup(505, rel_tolerance=0.01)] == ["s2", "s3"]
+    assert AmountIndex.from_artifacts(compile_rules(IR), tolerance=1.0).span(499.5) == (0, 2)
+    with pytest.raises(ValueError):
+        AmountIndex({"values": [2.0, 1.0], "indicators": [{}, {}]})
+
+
+def test_column_lookups_match_scalar_lookups(backend):
+    rng = random.Random(3)
+    indicators = [{"kind": "amount", "verbatim": f"${n}", "numeric": round(rng.uniform(0, 1000), 2),
+                   "category_id": "payments", "span_id": f"s{n}"} for n in range(2000)]
+    index = AmountIndex(amounts.amount_rules(indicators), tolerance=0.005)
+    column = [indicator["numeric"] for indicator in rng.sample(indicators, 200)] + \
+        [round(rng.uniform(0, 1000), 3) for _ in range(800)]
+    expected = [(t, k) for t, value in enumerate(column)
+                for k in range(*index.span(value))]
+    assert list(index.matches(column)) == expected
+    assert len({t for t, _ in expected}) >= 200
+
+
+def test_scanner_matches_amount_column(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps(compile_rules(IR, CompileOptions(targets=["regex", "json", "amounts"]))))
+    events = tmp_path / "events.csv"
+    events.write_text("id,memo,amount\n1,paid $500 today,500.00\n2,wa.me/123456789,1998.875\n3,x,n/a\n")
+
+    hits = list(Scanner(rules, workers=0, id_field="id", amount_field="amount").scan(events))
+    assert [(h["event_id"], h["span_id"], h.get("value")) for h in hits] == [
+        ("1", "s2", None), ("1", "s2", 500.0), ("1", "s3", 500.0), ("2", "s5", None)]
+
+    scanner = Scanner(rules, workers=0, fields=["memo"], amount_field="amount", amount_tolerance=0.01)
+    assert [h["span_id"] for h in scanner.scan(events) if "value" in h] == ["s2", "s3", "s1"]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from audit.index import AuditIndex, main, parse_time
+from audit.serialization import get_serializer
+
+
+DOCUMENT_HASH = "ab" * 32
+T0 = parse_time("2026-10-01T12:00:00")
+
+
+def _log(audit_dir, name, record):
+    serializer = get_serializer("json")
+    serializer.write(record, log_path=serializer.log_path(audit_dir, name))
+
+
+def _document_run(audit_dir, n, document_hash=DOCUMENT_HASH, day="2026-10-01"):
+    orchestration_id, session_id = f"orch-{n}", f"session-{n}"
+    _log(audit_dir, f"orchestration_{day}", {"event": "orchestration_start", "orchestration_id": orchestration_id,
+                                              "timestamp": T0 + n})
+    _log(audit_dir, f"audit_{day}", {"tool_name": "extraction_tool", "run_id": f"run-{n}", "start_time": T0 + n + 0.1,
+                                     "duration_ms": 5.0, "success": True,
+                                     "input_summary": {"orchestration_id": orchestration_id}})
+    _log(audit_dir, f"orchestration_{day}", {
+        "event": "orchestration_complete", "orchestration_id": orchestration_id, "start_time": T0 + n,
+        "metadata": {"document": {"document_hash": document_hash, "document_session_id": session_id}}})
+    _log(audit_dir, f"agent_decisions_{day}", {
+        "decision_id": f"decision-{n}", "timestamp": T0 + n + 0.2, "selected_workflow": "fraud_analysis_workflow",
+        "metadata": {"document_session": {"session_id": session_id, "content_hash": document_hash}}})
+
+
+def test_get_and_trace_linked_records(tmp_path):
+    _document_run(tmp_path, 1)
+    _document_run(tmp_path, 2, document_hash="cd" * 32)
+    index = AuditIndex(tmp_path)
+    assert index.update() == 8
+
+    (tool,) = index.get("run_id", "run-1")
+    assert tool["input_summary"]["orchestration_id"] == "orch-1"
+    assert tool["_index"]["kind"] == "tool"
+
+    traced = index.trace(DOCUMENT_HASH)
+    assert [record["_index"]["kind"] for record in traced] == ["orchestration_event", "orchestration", "tool",
+                                                                "decision"]
+    assert {record.get("run_id") for record in index.trace("run-1")} == {None, "run-1"}
+    assert len(index.trace("decision-2")) == 4
+    with pytest.raises(ValueError, match="Unknown index key"):
+        index.get("pdf_file", "x")
+
+
+def test_update_is_incremental(tmp_path):
+    _document_run(tmp_path, 1)
+    index = AuditIndex(tmp_path)
+    assert index.update() == 4
+    assert index.update() == 0
+
+    log = tmp_path / "audit_2026-10-01.jsonl"
+    with open(log, "ab") as f:
+        f.write(b'{"tool_name": "pdf_tool", "run_id": "partial"')  # record still being written
+    assert index.update() == 0
+    with open(log, "ab") as f:
+        f.write(b', "start_time": 1}\nnot json\n')
+    assert index.update() == 1
+    assert index.get("run_id", "partial")[0]["tool_name"] == "pdf_tool"
+
+    log.write_text(json.dumps({"tool_name": "pdf_tool", "run_id": "rotated", "start_time": T0}) + "\n")
+    assert index.update() == 1
+    assert index.get("run_id", "run-1") == []
+    assert index.stats()["records"]["tool"] == 1
+
+
+def test_time_range_and_cli(tmp_path, capsys):
+    _document_run(tmp_path, 1)
+    _document_run(tmp_path, 7200, day="2026-10-02")
+
+    assert main(["--audit-dir", str(tmp_path), "range", "2026-10-01", "2026-10-01T13:00", "--kind", "decision"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["decision_id"] for line in lines] == ["decision-1"]
+
+    assert main(["--audit-dir", str(tmp_path), "trace", "orch-7200"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 8  # both runs processed the same document
+    assert parse_time("1792358568.5") == 1792358568.5
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
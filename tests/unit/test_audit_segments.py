@@ -0,0 +1,133 @@
+import json
+import sqlite3
+
+import pytest
+
+from analysis.perf_report import log_files
+from audit.index import AuditIndex
+from audit import segments
+from audit.segments import SegmentManager, main, wait_for_rotations
+from audit.serialization import HAS_ZSTD, AuditSerializer, SegmentReader, get_serializer, iter_records
+
+
+def _tool_record(index, day="2026-10-01"):
+    return {"tool_name": "extraction_tool", "run_id": f"run-{day}-{index}", "start_time": 1_790_000_000.0 + index,
+            "duration_ms": 12.5, "success": True, "input_summary": {"orchestration_id": f"orch-{index % 3}"}}
+
+
+def _read_all(audit_dir, pattern):
+    return [record for path in sorted(audit_dir.glob(pattern)) for record in iter_records(path)]
+
+
+def test_full_logs_rotate_and_compress_in_background(tmp_path, monkeypatch):
+    monkeypatch.setenv("SS2_AUDIT_SEGMENT_MB", "0.002")  # ~2 KB segments
+    monkeypatch.setenv("SS2_AUDIT_SEAL_GRACE_SECONDS", "0.05")  # in-flight appends land before compression
+    serializer = AuditSerializer('json')
+    log_path = serializer.log_path(tmp_path, "audit_2026-10-01")
+    index = AuditIndex(tmp_path)
+    for i in range(60):
+        serializer.write(_tool_record(i), log_path=log_path)
+        if i == 20:
+            index.update()  # entries must follow the log through rotation and compression
+    wait_for_rotations()
+    SegmentManager(tmp_path, grace_seconds=0).compress_pending()
+
+    manager = SegmentManager(tmp_path)
+    segments = [path.name for path in manager.segments()]
+    assert segments and all(name.endswith(".jsonl.gz") for name in segments)
+    assert segments[0] == "audit_2026-10-01.0001.jsonl.gz"
+    assert not log_path.exists() or log_path.stat().st_size < serializer.segment_bytes + 1024
+
+    records = sorted(_read_all(tmp_path, "audit_2026-10-01*"), key=lambda record: record["start_time"])
+    assert [record["run_id"] for record in records] == [f"run-2026-10-01-{i}" for i in range(60)]
+    index.update()
+    assert index.stats()["records"]["tool"] == 60
+    assert index.get("run_id", "run-2026-10-01-3")[0]["_index"]["path"] == segments[0]
+    assert len(index.get("orchestration_id", "orch-1")) == 20
+    assert len(log_files(tmp_path)) == len(segments) + log_path.exists()
+
+    assert manager.verify(deep=True) == []
+    assert manager.status()["segments"] == len(segments) and manager.status()["pending"] == []
+
+
+def test_hash_chain_detects_tampering(tmp_path):
+    serializer = get_serializer('json')
+    for day in ("2026-10-01", "2026-10-02"):
+        for i in range(5):
+            serializer.write(_tool_record(i, day), log_path=serializer.log_path(tmp_path, f"audit_{day}"))
+    manager = SegmentManager(tmp_path, compression='gzip', grace_seconds=0)
+    summary = manager.maintain(compact=False)
+    assert summary["compressed"] == ["audit_2026-10-01.0001.jsonl.gz", "audit_2026-10-02.0001.jsonl.gz"]
+    entries = manager.manifest()
+    assert entries[1]["prev"] == entries[0]["chain"] and entries[0]["records"] == 5
+    assert main(["--audit-dir", str(tmp_path), "verify"]) == 0
+
+    segment = tmp_path / "audit_2026-10-01.0001.jsonl.gz"
+    data = bytearray(segment.read_bytes())
+    data[-10] ^= 0xFF
+    segment.write_bytes(bytes(data))
+    assert manager.verify() == ["audit_2026-10-01.0001.jsonl.gz: stored SHA-256 mismatch"]
+
+    lines = manager.manifest_path.read_text().splitlines()
+    first = json.loads(lines[0])
+    first["records"] = 4
+    manager.manifest_path.write_text("\n".join([json.dumps(first)] + lines[1:]) + "\n")
+    problems = manager.verify()
+    assert "entry 1 (audit_2026-10-01.0001.jsonl.gz): chain hash mismatch" in problems
+    assert main(["--audit-dir", str(tmp_path), "verify"]) == 1
+
+
+def test_seal_previous_days_and_compact_run_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("SS2_AUDIT_SEAL_GRACE_SECONDS", "0")
+    serializer = get_serializer('json')
+    for i in range(3):
+        record = _tool_record(i)
+        serializer.write(record, record_path=serializer.record_path(tmp_path, f"extraction_tool_{record['run_id']}"),
+                         log_path=serializer.log_path(tmp_path, "audit_2026-10-01"))
+    (tmp_path / "extraction_tool_unlogged.json").write_text(json.dumps(_tool_record(99)))
+    (tmp_path / "extraction_tool_changed.json").write_text(json.dumps(dict(_tool_record(1), success=False)))
+    today = serializer.log_path(tmp_path, "audit_2999-01-01")
+    serializer.write(_tool_record(0, "2999-01-01"), log_path=today)
+
+    manager = SegmentManager(tmp_path)
+    assert manager.seal(today="2999-01-01") == [tmp_path / "audit_2026-10-01.0001.jsonl"]
+    assert today.exists()  # the current day stays active
+    manager.compress_pending()
+
+    removable = manager.compact(dry_run=True)
+    assert sorted(path.name for path in removable) == [f"extraction_tool_run-2026-10-01-{i}.json" for i in range(3)]
+    assert all(path.exists() for path in removable)
+    manager.compact()
+    assert sorted(path.name for path in tmp_path.glob("extraction_tool_*")) == [
+        "extraction_tool_changed.json", "extraction_tool_unlogged.json"]
+    assert [record["run_id"] for record in AuditIndex(tmp_path).trace("orch-1")] == ["run-2026-10-01-1"]
+
+
+@pytest.mark.parametrize("compression", ["gzip", pytest.param("zstd", marks=pytest.mark.skipif(
+    not HAS_ZSTD, reason="zstandard not installed"))])
+def test_segments_are_compressed_in_seekable_blocks(tmp_path, monkeypatch, compression):
+    monkeypatch.setattr(segments, "BLOCK_BYTES", 2048)
+    serializer = get_serializer('json')
+    for i in range(200):
+        serializer.write(_tool_record(i), log_path=serializer.log_path(tmp_path, "audit_2026-10-01"))
+    index = AuditIndex(tmp_path)
+    index.update()
+    manager = SegmentManager(tmp_path, compression=compression, grace_seconds=0)
+    manager.maintain(compact=False)
+    assert manager.verify(deep=True) == []
+
+    def blocks(audit_index):
+        with sqlite3.connect(audit_index.index_path) as conn:
+            return conn.execute("SELECT raw_offset, stored_offset FROM blocks ORDER BY raw_offset").fetchall()
+
+    sealed = blocks(index)  # recorded when the segment was compressed
+    assert len(sealed) > 5 and sealed[0] == (0, 0)
+    rebuilt = AuditIndex(tmp_path, tmp_path / "rebuilt.sqlite")
+    rebuilt.update()
+    assert blocks(rebuilt) == sealed  # found while indexing the compressed segment
+
+    restarts = []
+    original = SegmentReader._restart
+    monkeypatch.setattr(SegmentReader, "_restart", lambda self, *block: (restarts.append(block), original(self, *block)))
+    assert [record["run_id"] for record in index.get("run_id", "run-2026-10-01-199")] == ["run-2026-10-01-199"]
+    assert restarts == [(0, 0), sealed[-1]]  # only the last block is decompressed
@@ -0,0 +1,110 @@
+import gzip
+import io
+import json
+import time
+
+import pytest
+
+from agents.base_agent import AgentDecision
+from audit import serialization
+from audit.serialization import AuditSerializer, SegmentReader, iter_records, open_log
+from tools.base_tool import ToolExecutionRecord
+
+
+def _record():
+    return ToolExecutionRecord(
+        tool_name="echo_tool", tool_version="1.0", run_id="run-1", start_time=0.0, end_time=1.0,
+        duration_ms=1000.0, success=True, input_summary={"text": "Zahlung €1.000 – ünïcode"},
+        output_summary={"type": "str"}, metadata={"tags": ("a", "b"), 1: "non-string key"},
+    )
+
+
+def test_encode_is_compact_and_matches_to_json():
+    data = AuditSerializer('json').encode(_record().to_dict())
+    assert b"\n" not in data
+    decoded = json.loads(data)
+    assert decoded == json.loads(json.dumps(_record().to_dict(), default=str, ensure_ascii=False))
+    assert json.loads(_record().to_json())["input_summary"] == decoded["input_summary"]
+
+
+def test_stdlib_fallback_produces_same_record(monkeypatch):
+    fast = json.loads(serialization.encode_json(_record().to_dict()))
+    monkeypatch.setattr(serialization, 'HAS_ORJSON', False)
+    assert json.loads(serialization.encode_json(_record().to_dict())) == fast
+
+
+def test_write_reuses_bytes_for_both_sinks(tmp_path):
+    serializer = AuditSerializer('json')
+    record_path = serializer.record_path(tmp_path, "echo_tool_run-1")
+    log_path = serializer.log_path(tmp_path, "audit_2025-01-01")
+
+    first = serializer.write(_record().to_dict(), record_path=record_path, log_path=log_path)
+    serializer.write({"event": "second"}, log_path=log_path)
+
+    assert record_path.name == "echo_tool_run-1.json" and record_path.read_bytes() == first
+    assert log_path.read_bytes().splitlines()[0] == first
+    assert [r.get("event") for r in iter_records(log_path)] == [None, "second"]
+
+
+def test_agent_decision_round_trips(tmp_path):
+    decision = AgentDecision(decision_id="d1", agent_name="simple_agent", agent_version="1.0",
+                             timestamp=time.time(), input_analysis={"document_type": "fraud"},
+                             decision_logic="rule", selected_workflow="fraud_workflow", confidence_score=0.85)
+    path = tmp_path / "agent_decision_d1.json"
+    AuditSerializer('json').write(decision.to_dict(), record_path=path)
+    assert next(iter_records(path)) == json.loads(decision.to_json())
+
+
+def test_msgpack_requested_without_msgpack_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(serialization, 'HAS_MSGPACK', False)
+    assert AuditSerializer('msgpack').format == 'json'
+    with pytest.raises(ValueError):
+        AuditSerializer('xml')
+
+
+def test_msgpack_round_trip_and_convert(tmp_path):
+    pytest.importorskip("msgpack")
+    serializer = AuditSerializer('msgpack')
+    log_path = serializer.log_path(tmp_path, "audit_2025-01-01")
+    for index in range(3):
+        serializer.write({"index": index, "text": "ünïcode"}, log_path=log_path)
+
+    assert log_path.suffix == ".msgpack"
+    assert [r["index"] for r in iter_records(log_path)] == [0, 1, 2]
+
+    output = io.StringIO()
+    assert serialization.convert(log_path, output) == 3
+    assert json.loads(output.getvalue().splitlines()[2]) == {"index": 2, "text": "ünïcode"}
+
+
+def test_convert_cli(tmp_path):
+    log_path = tmp_path / "audit.jsonl"
+    AuditSerializer('json').write({"a": 1}, log_path=log_path)
+    output = tmp_path / "out.json"
+
+    assert serialization.main([str(log_path), "--output", str(output), "--pretty"]) == 0
+    assert json.loads(output.read_text()) == {"a": 1}
+
+
+def test_segment_reader_seeks_within_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(serialization, "READ_BYTES", 64)
+    raw = [b"".join(b'{"n":%d}\n' % (block * 100 + i) for i in range(30)) for block in range(3)]
+    members = [gzip.compress(data, mtime=0) for data in raw]
+    path = tmp_path / "audit_2026-10-01.0001.jsonl.gz"
+    path.write_bytes(b"".join(members))
+    blocks = [(0, 0), (len(raw[0]), len(members[0])), (len(raw[0]) + len(raw[1]), len(members[0]) + len(members[1]))]
+
+    with open_log(path) as f:
+        assert f.read() == b"".join(raw)
+        assert f.raw.blocks == blocks  # found while reading
+
+    restarts = []
+    original = SegmentReader._restart
+    monkeypatch.setattr(SegmentReader, "_restart", lambda self, *block: (restarts.append(block), original(self, *block)))
+    with open_log(path, blocks) as f:
+        f.seek(blocks[2][0] + 10)
+        assert f.readline() == b'{"n":201}\n'
+        f.seek(5)
+        assert f.read(4) == b'0}\n{'
+    assert restarts == [(0, 0), blocks[2], (0, 0)]
+    assert [record["n"] for record in iter_records(path)][-1] == 229
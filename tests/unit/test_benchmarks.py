@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from benchmarks import registry, runner
+from benchmarks.corpus import REPORT_KINDS, generate_report, write_corpus
+from benchmarks.registry import BenchmarkCase, SkipBenchmark
+from src.pdf_processor.rules import compile_rules
+
+
+@pytest.mark.parametrize("kind", REPORT_KINDS)
+def test_report_is_deterministic_and_bounded(kind):
+    first = generate_report(kind, size=5000, density=0.3, seed=7)
+    second = generate_report(kind, size=5000, density=0.3, seed=7)
+    assert first.text == second.text
+    assert first.indicators == second.indicators
+    assert len(first.text) <= 5000
+    assert generate_report(kind, size=5000, density=0.3, seed=8).text != first.text
+
+
+def test_indicators_are_planted_in_text():
+    report = generate_report('fraud', size=20_000, density=0.5, seed=1)
+    assert report.indicators
+    for indicator in report.indicators:
+        assert (indicator.get('verbatim') or indicator['literal']) in report.text
+
+
+def test_density_controls_indicator_count():
+    sparse = generate_report('threat', size=20_000, density=0.05)
+    dense = generate_report('threat', size=20_000, density=0.9)
+    assert len(generate_report('threat', size=20_000, density=0.0).indicators) == 0
+    assert len(sparse.indicators) < len(dense.indicators)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        generate_report('unknown')
+    with pytest.raises(ValueError):
+        generate_report('fraud', density=1.5)
+
+
+def test_ir_compiles(tmp_path):
+    report = generate_report('fraud', size=10_000, density=0.4)
+    compiled = compile_rules(report.to_ir())
+    assert compiled
+
+    (text_path,) = write_corpus([report], tmp_path / 'corpus')
+    assert text_path.read_text(encoding='utf-8') == report.text
+    assert json.loads(text_path.with_name(f"{report.name}.ir.json").read_text()) == report.to_ir()
+
+
+def test_run_case_ok_skip_and_failure():
+    calls = []
+    ok = runner.run_case(BenchmarkCase('ok', lambda: (lambda: calls.append(1))), repeat=2, min_time=0.001)
+    assert ok.status == 'ok' and ok.repeat == 2 and ok.median is not None
+    assert len(calls) >= 3  # warm-up + timed calls
+
+    def skipped():
+        raise SkipBenchmark('no backend')
+    assert runner.run_case(BenchmarkCase('skip', skipped)).status == 'skipped'
+
+    def broken():
+        return lambda: 1 / 0
+    failed = runner.run_case(BenchmarkCase('broken', broken))
+    assert failed.status == 'failed' and 'ZeroDivisionError' in failed.reason
+
+
+def test_registry_rejects_duplicates(monkeypatch):
+    monkeypatch.setattr(registry, '_REGISTRY', {})
+    registry.benchmark('case')(lambda: (lambda: None))
+    with pytest.raises(ValueError):
+        registry.benchmark('case')(lambda: (lambda: None))
+    assert list(registry.registered_cases()) == ['case']
+
+
+def test_discover_finds_suite():
+    cases = runner.discover()
+    assert any(name.startswith('extractor.') for name in cases)
+    assert any(name.startswith('compile_rules') for name in cases)
+    assert any(name.startswith('document_stats.compute') for name in cases)
+
+
+def test_compare_flags_regressions():
+    def document(medians):
+        return {'results': [{'name': name, 'median': median} for name, median in medians.items()]}
+
+    rows = runner.compare(document({'a': 1.0, 'b': 1.0, 'gone': 1.0}),
+                          document({'a': 1.1, 'b': 2.0, 'new': 1.0}), threshold=1.25)
+    by_name = {row['name']: row for row in rows}
+    assert set(by_name) == {'a', 'b'}
+    assert not by_name['a']['regressed']
+    assert by_name['b']['regressed'] and by_name['b']['ratio'] == pytest.approx(2.0)
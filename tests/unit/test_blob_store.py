@@ -0,0 +1,67 @@
+import gzip
+import json
+
+import pytest
+
+from agents.base_agent import AgentDecision
+from agents.simple_agent import SimpleAgent
+from audit.blob_store import BlobStore, resolve_blobs
+
+DOCUMENT = "wire transfer to account 12345 via wa.me/123456789. " * 200
+
+
+def test_blob_store_deduplicates_and_verifies(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    digest = store.put(DOCUMENT)
+
+    assert store.put(DOCUMENT) == digest
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert store.get_text(digest) == DOCUMENT
+
+    path = next((tmp_path / "blobs").rglob("*.gz"))
+    path.write_bytes(gzip.compress(b"tampered"))
+    with pytest.raises(ValueError):
+        store.get(digest)
+
+
+def test_externalize_only_replaces_large_strings(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    value = {"content_lower": DOCUMENT, "doc_type": "fraud", "rules": [{"context": {"content_lower": DOCUMENT}}]}
+
+    externalized = store.externalize(value, threshold=1000)
+
+    assert externalized["doc_type"] == "fraud"
+    assert externalized["content_lower"] == externalized["rules"][0]["context"]["content_lower"]
+    assert externalized["content_lower"]["size"] == len(DOCUMENT)
+    assert store.resolve(externalized) == value
+    assert value["content_lower"] == DOCUMENT
+
+
+def test_decision_audit_references_document_by_hash(tmp_path):
+    agent = SimpleAgent(audit_dir=str(tmp_path))
+    decision = AgentDecision(
+        decision_id="blob-test",
+        agent_name=agent.name,
+        agent_version=agent.version,
+        timestamp=1234567890.0,
+        input_analysis={"content_lower": DOCUMENT, "doc_type": "fraud"},
+        decision_logic="Test logic",
+        selected_workflow="fraud_analysis",
+        confidence_score=0.9,
+        metadata={"rule_context": {"content_lower": DOCUMENT}},
+    )
+
+    agent._write_decision_audit(decision)
+
+    record_path = tmp_path / "agent_decision_blob-test.json"
+    record_text = record_path.read_text(encoding="utf-8")
+    assert DOCUMENT not in record_text
+    assert len(record_text) < len(DOCUMENT) // 4
+    assert decision.input_analysis["content_lower"] == DOCUMENT
+
+    resolved = resolve_blobs(record_path)
+    assert resolved["input_analysis"]["content_lower"] == DOCUMENT
+    assert resolved["metadata"]["rule_context"]["content_lower"] == DOCUMENT
+
+    daily = next(tmp_path.glob("agent_decisions_*.jsonl")).read_text(encoding="utf-8")
+    assert json.loads(daily.splitlines()[-1])["input_analysis"] == json.loads(record_text)["input_analysis"]
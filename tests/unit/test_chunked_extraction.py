@@ -0,0 +1,72 @@
+import threading
+import time
+from unittest.mock import patch
+
+from tools.chunking import split_into_chunks
+from tools.extraction_tool import ExtractionTool
+
+INSTRUCTIONS = "Extract all indicators from the report"
+
+
+class FakeBackend:
+    """Local stand-in for SafetySigmaProcessor that echoes each chunk's first line"""
+
+    def __init__(self):
+        self.calls = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def process_report(self, instructions, report_content):
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        # Later chunks finish first to exercise deterministic merging
+        time.sleep(0.05 if report_content.startswith("Section 0") else 0.01)
+        with self._lock:
+            self._active -= 1
+        return report_content.splitlines()[0]
+
+
+def _document(sections=6):
+    return "\n\n".join(f"Section {i}\n" + "Indicator line for this section.\n" * 20 for i in range(sections))
+
+
+def test_split_prefers_paragraph_boundaries_and_covers_text():
+    text = _document()
+    chunks = split_into_chunks(text, 1000)
+
+    assert "".join(chunk.text for chunk in chunks) == text
+    assert all(len(chunk.text) <= 1000 for chunk in chunks)
+    assert all(chunk.text.endswith("\n\n") for chunk in chunks[:-1])
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+
+
+def test_split_hard_cuts_text_without_boundaries():
+    chunks = split_into_chunks("x" * 25, 10)
+    assert [(c.start, c.end) for c in chunks] == [(0, 10), (10, 20), (20, 25)]
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_chunked_mode_merges_chunks_in_document_order(mock_import, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("SS2_CHUNK_SIZE", "700")
+    monkeypatch.setenv("SS2_CHUNK_WORKERS", "3")
+    monkeypatch.setenv("SS2_MAX_CONTENT_SIZE", "1000")
+    backend = FakeBackend()
+    text = _document()
+
+    tool = ExtractionTool(audit=False, zero_inference=False)
+    tool._ss1_processor = backend
+    result = tool.execute(instructions=INSTRUCTIONS, text_content=text, chunked=True)
+
+    assert len(text) > 1000
+    assert result.data == "\n\n".join(f"Section {i}" for i in range(6))
+    assert backend.calls == 6
+    assert 1 < backend.max_concurrent <= 3
+
+    chunks = result.metadata["source_traceability"]["chunks"]
+    assert [c["index"] for c in chunks] == list(range(6))
+    assert chunks[0]["start"] == 0 and chunks[-1]["end"] == len(text)
+    assert all(text[c["start"]:c["end"]].startswith(f"Section {c['index']}") for c in chunks)
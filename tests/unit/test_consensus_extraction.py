@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+
+from tools.chunking import split_into_chunks
+from tools.consensus_extraction_tool import (CallableBackend, ConsensusExtractionTool, IntelligenceBackend,
+                                             SS1Backend, ground_fragments, merge_votes, Span)
+
+
+TEXT = "Victims paid $1,500.00 via secure-login.com after Facebook ads. Later $200 moved to refund-help.net."
+INSTRUCTIONS = "Extract fraud indicators from the report"
+
+
+def _find(text, literal):
+    start = text.find(literal)
+    return start, start + len(literal)
+
+
+def _stub(name, literals, delay=0.0, weight=1.0):
+    def extract(instructions, text):
+        time.sleep(delay)
+        return [_find(text, literal) for literal in literals if literal in text]
+    return CallableBackend(name, extract, weight)
+
+
+def _tool(backends, **kwargs):
+    return ConsensusExtractionTool(backends=backends, audit=False, **kwargs)
+
+
+def _texts(result):
+    return [span['text'] for span in result.data['spans']]
+
+
+def test_strategies():
+    backends = [_stub("a", ["$1,500.00", "secure-login.com"]), _stub("b", ["$1,500.00", "$200"]),
+                _stub("c", ["$1,500.00", "secure-login.com", "refund-help.net"])]
+    assert _texts(_tool(backends, strategy="intersection").execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)) == ["$1,500.00"]
+    assert _texts(_tool(backends, strategy="union").execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)) == ["$1,500.00", "secure-login.com", "$200", "refund-help.net"]
+    assert _texts(_tool(backends, strategy="weighted", threshold=0.5).execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)) == ["$1,500.00", "secure-login.com"]
+
+
+def test_weights_decide_weighted_vote():
+    votes = {"a": [Span(0, 3, "x", "abc")], "b": [Span(4, 7, "x", "def")]}
+    kept = merge_votes(votes, {"a": 3.0, "b": 1.0}, "weighted", threshold=0.5)
+    assert [(span["start"], span["score"], span["voters"]) for span in kept] == [(0, 0.75, ["a"])]
+
+
+def test_voters_run_concurrently_and_slow_voter_times_out():
+    backends = [_stub("fast1", ["$200"], delay=0.2), _stub("fast2", ["$200"], delay=0.2),
+                _stub("slow", ["$200"], delay=2.0)]
+    start = time.perf_counter()
+    result = _tool(backends, strategy="intersection", timeout=0.5).execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert result.success
+    assert _texts(result) == ["$200"]
+    voters = result.data["voters"]
+    assert voters["slow"]["status"] == "timeout"
+    assert voters["fast1"]["status"] == voters["fast2"]["status"] == "ok"
+
+
+def test_failing_voter_is_excluded():
+    def broken(instructions, text):
+        raise ConnectionError("backend down")
+
+    result = _tool([_stub("a", ["$200"]), CallableBackend("broken", broken)], strategy="intersection").execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)
+    assert _texts(result) == ["$200"]
+    assert result.data["voters"]["broken"]["status"] == "error"
+
+
+def test_no_voter_answering_fails():
+    result = _tool([_stub("slow", ["$200"], delay=1.0)], timeout=0.1).execute(
+        instructions=INSTRUCTIONS, text_content=TEXT)
+    assert not result.success
+    assert "No consensus voter answered" in result.error
+
+
+def test_chunked_spans_use_document_offsets(monkeypatch):
+    monkeypatch.setenv("SS2_CHUNK_SIZE", "40")
+
+    def record(instructions, text):
+        return [_find(text, "$200")] if "$200" in text else []
+
+    result = _tool([CallableBackend("a", record), IntelligenceBackend()], strategy="intersection").execute(
+        instructions=INSTRUCTIONS, text_content=TEXT, chunked=True)
+    assert [(span["start"], span["end"]) for span in result.data["spans"]] == [_find(TEXT, "$200")]
+
+
+def test_chunked_voting_is_parallel_and_bounded(monkeypatch):
+    monkeypatch.setenv("SS2_CHUNK_SIZE", "40")
+    monkeypatch.setenv("SS2_WORKERS", "2")
+    pieces = len(split_into_chunks(TEXT, 40))
+    assert pieces > 2
+    barrier = threading.Barrier(pieces, timeout=5)  # breaks unless every chunk is voted on at once
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def together(instructions, text):
+        barrier.wait()
+        return [_find(text, "$200")] if "$200" in text else []
+
+    def tracked(instructions, text):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return [_find(text, "$200")] if "$200" in text else []
+
+    result = _tool([CallableBackend("parallel", together), CallableBackend("limited", tracked, max_concurrency=1)],
+                   strategy="intersection", max_workers=pieces).execute(
+        instructions=INSTRUCTIONS, text_content=TEXT, chunked=True)
+    assert result.data["voters"]["parallel"]["status"] == result.data["voters"]["limited"]["status"] == "ok"
+    assert _texts(result) == ["$200"]
+    assert active["peak"] == 1
+
+    active["peak"] = 0
+    tool = _tool([CallableBackend("limited", tracked)])
+    assert tool.max_workers == 2
+    assert tool.execute(instructions=INSTRUCTIONS, text_content=TEXT, chunked=True).success
+    assert active["peak"] <= 2
+
+
+def test_ss1_backend_grounds_quoted_fragments():
+    class Processor:
+        def process_report(self, instructions, report_content):
+            return ('## Indicators\n- **Amount:** $1,500.00\n- Domain: "secure-login.com"\n'
+                    '- Likely part of a larger campaign\n')
+
+    spans = SS1Backend(Processor()).extract(INSTRUCTIONS, TEXT)
+    assert sorted(span.text for span in spans) == ["$1,500.00", "secure-login.com"]
+    assert all(TEXT[span.start:span.end] == span.text for span in spans)
+    assert ground_fragments("nothing here", TEXT) == []
+
+
+def test_default_backends_without_ss1(tmp_path):
+    tool = ConsensusExtractionTool(ss1_path=str(tmp_path), audit=False)
+    assert [backend.name for backend in tool.backends] == ["intelligence_extractor"]
+    assert "ss1" in tool.unavailable
+    result = tool.execute(instructions=INSTRUCTIONS, text_content=TEXT)
+    assert result.data["voters"]["ss1"]["status"] == "unavailable"
+    assert "$1,500.00" in _texts(result)
+
+
+def test_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        _tool([_stub("a", [])], strategy="majority")
@@ -0,0 +1,144 @@
+import time
+
+import pytest
+
+from workflow.broker import SQLiteBroker, connect_broker, serve_broker, shard_for
+from workflow.content_store import CachedContentStore, ContentStore
+from workflow.coordinator import Coordinator, JobFailed
+from workflow.distributed import main as distributed_main
+from workflow.worker import Worker
+
+
+INSTRUCTIONS = "Extract all fraud indicators from the report"
+
+
+def _setup(tmp_path, **broker_kwargs):
+    broker = SQLiteBroker(tmp_path / "broker.db", **broker_kwargs)
+    store = ContentStore(tmp_path / "content")
+    return broker, store, Coordinator(broker, store, shards=4)
+
+
+def _upper(job, document, instructions, options):
+    return document.decode("utf-8").upper()
+
+
+def test_submit_is_idempotent_and_sharded(tmp_path):
+    broker, store, coordinator = _setup(tmp_path)
+    first = coordinator.submit(b"report one", INSTRUCTIONS, name="one")
+    assert coordinator.submit(b"report one", INSTRUCTIONS, name="one") == first
+    coordinator.submit(b"report two", INSTRUCTIONS, name="two")
+
+    jobs = broker.jobs()
+    assert len(jobs) == 2
+    assert all(job["shard"] == shard_for(job["document_digest"], 4) for job in jobs)
+    assert broker.stats()["jobs"]["queued"] == 2
+
+
+def test_worker_processes_jobs_and_results_are_stored(tmp_path):
+    broker, store, coordinator = _setup(tmp_path)
+    job_ids = [coordinator.submit(f"report {i}".encode(), INSTRUCTIONS) for i in range(3)]
+
+    worker = Worker(broker, store, handler=_upper, heartbeat_interval=0.05)
+    assert worker.run(idle_timeout=0) == 3
+
+    rows = coordinator.wait(job_ids, timeout=1)
+    assert [row["status"] for row in rows] == ["done"] * 3
+    assert coordinator.result(job_ids[1]) == "REPORT 1"
+    assert broker.stats()["workers"][0]["jobs_done"] == 3
+
+
+def test_failed_attempts_are_requeued_until_max_attempts(tmp_path):
+    broker, store, coordinator = _setup(tmp_path, max_attempts=2)
+    job_id = coordinator.submit(b"report", INSTRUCTIONS)
+    calls = []
+
+    def flaky(job, document, instructions, options):
+        calls.append(job["attempts"])
+        raise RuntimeError("backend unavailable")
+
+    worker = Worker(broker, store, handler=flaky)
+    assert worker.run_one() == "queued"
+    assert worker.run_one() == "failed"
+    assert worker.run_one() is None
+    assert calls == [1, 2]
+    with pytest.raises(JobFailed, match="backend unavailable"):
+        coordinator.result(job_id)
+
+    assert broker.retry(job_id)
+    Worker(broker, store, handler=_upper).run_one()
+    assert coordinator.result(job_id) == "REPORT"
+
+
+def test_expired_lease_is_requeued_for_another_worker(tmp_path):
+    broker, store, coordinator = _setup(tmp_path, lease_seconds=0.1)
+    job_id = coordinator.submit(b"report", INSTRUCTIONS)
+
+    assert broker.lease("dead-worker")["job_id"] == job_id  # leased, then the worker never reports back
+    assert broker.lease("other") is None
+    time.sleep(0.15)
+
+    assert Worker(broker, store, worker_id="other", handler=_upper).run_one() == "done"
+    row = broker.jobs([job_id])[0]
+    assert (row["worker_id"], row["attempts"]) == ("other", 2)
+    assert not broker.complete(job_id, "dead-worker", "sha256:" + "0" * 64)
+
+
+def test_heartbeat_keeps_lease(tmp_path):
+    broker, store, coordinator = _setup(tmp_path, lease_seconds=0.2)
+    coordinator.submit(b"report", INSTRUCTIONS)
+
+    def slow(job, document, instructions, options):
+        time.sleep(0.5)
+        return "ok"
+
+    worker = Worker(broker, store, handler=slow, heartbeat_interval=0.05)
+    assert worker.run(max_jobs=1) == 1
+    assert broker.jobs()[0]["attempts"] == 1
+
+
+def test_shard_preference_and_stealing(tmp_path):
+    broker, store, coordinator = _setup(tmp_path)
+    for i in range(12):
+        coordinator.submit(f"report {i}".encode(), INSTRUCTIONS)
+    own = broker.jobs()[-1]["shard"]
+
+    leased = broker.lease("w", shards=[own])
+    assert leased["shard"] == own
+    while broker.lease("strict", shards=[own], steal=False):
+        pass
+    assert broker.lease("w", shards=[own]) is not None  # steals from other shards
+
+
+def test_tcp_broker_with_cached_content(tmp_path):
+    broker, store, coordinator = _setup(tmp_path)
+    server = serve_broker(broker, store, "127.0.0.1:0", authkey="secret", background=True)
+    address = f"tcp://127.0.0.1:{server.address[1]}"
+
+    remote_broker, remote_store = connect_broker(address, authkey="secret")
+    remote_coordinator = Coordinator(remote_broker, remote_store, shards=4)
+    job_ids = [remote_coordinator.submit(b"same document", f"{INSTRUCTIONS} {i}") for i in range(3)]
+
+    cache = CachedContentStore(remote_store, tmp_path / "cache")
+    Worker(remote_broker, cache, handler=_upper, heartbeat_interval=0.05).run(idle_timeout=0)
+
+    assert [coordinator.result(job_id) for job_id in job_ids] == ["SAME DOCUMENT"] * 3
+    assert cache.fetched == 4  # the document once, plus three instruction texts
+
+
+def test_run_local_end_to_end(tmp_path, capsys):
+    documents = []
+    for i in range(4):
+        path = tmp_path / f"report_{i}.txt"
+        path.write_text(f"Report {i}: victims paid ${i},000 via secure-{i}.com", encoding="utf-8")
+        documents.append(str(path))
+    instructions = tmp_path / "prompt.md"
+    instructions.write_text(INSTRUCTIONS, encoding="utf-8")
+    output = tmp_path / "out"
+
+    assert distributed_main(["run-local", "--workers", "2", "--simulate", "--timeout", "30", "--profile",
+                             "-i", str(instructions), "-o", str(output)] + documents) == 0
+    results = sorted(output.glob("*.md"))
+    assert len(results) == 4
+    assert "SIMULATED" in results[0].read_text(encoding="utf-8")
+    assert sorted(path.name for path in output.glob("profile_*_hotspots.txt")) == [
+        "profile_ss2-worker-0_hotspots.txt", "profile_ss2-worker-1_hotspots.txt"]
@@ -0,0 +1,87 @@
+import json
+from unittest.mock import Mock, patch
+
+from agents.agent_processor import AgentProcessor
+from orchestration import DocumentSession, OrchestrationStep, ToolOrchestrator
+from tools.extraction_tool import ExtractionTool
+from tools.pdf_tool import PDFTool
+
+REPORT_TEXT = "Fraud advisory: victims were asked to send gift cards to account 12345.\n" * 5
+
+
+def _backend(tool_class, backend):
+    """Patch a tool's SS1 import so new instances use the given backend"""
+    return patch.object(tool_class, '_import_ss1', autospec=True,
+                        side_effect=lambda tool: setattr(tool, '_ss1_processor', backend))
+
+
+def test_orchestrator_reuses_session_text(tmp_path):
+    orchestrator = ToolOrchestrator(audit_dir=str(tmp_path))
+    session = DocumentSession.from_text(REPORT_TEXT)
+
+    with _backend(ExtractionTool, Mock()):
+        result = orchestrator.execute_safety_sigma_pipeline(
+            pdf_file="", instructions="Extract all indicators from the report", simulate=True, session=session
+        )
+
+    assert result.success
+    assert result.step_results["pdf_extraction"].metadata["reused"] is True
+    assert result.context["extracted_text"] == REPORT_TEXT
+    assert result.metadata["document"]["document_hash"] == session.content_hash
+    assert result.metadata["document"]["reused_steps"] == ["pdf_extraction"]
+
+    events = [json.loads(line) for line in next(tmp_path.glob("orchestration_*.jsonl")).read_text().splitlines()]
+    reused = [e for e in events if e["event"] == "step_reused"]
+    assert reused and reused[0]["document_hash"] == session.content_hash
+
+
+def test_agent_processor_parses_pdf_once_per_run(tmp_path):
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\nFraud advisory")
+    pdf_backend = Mock()
+    pdf_backend.extract_pdf_text.return_value = REPORT_TEXT
+
+    with _backend(PDFTool, pdf_backend), _backend(ExtractionTool, Mock()):
+        processor = AgentProcessor(agent_type="simple", audit_dir=str(tmp_path / "audit"))
+        text = processor.extract_pdf_text(str(pdf_path))
+        processor.process_report("Extract all indicators from the report", text)
+
+    assert text == REPORT_TEXT
+    assert pdf_backend.extract_pdf_text.call_count == 1
+
+    session = processor.document_session
+    audit = session.to_audit()
+    assert audit["extraction_count"] == 1
+    assert audit["file_hash"] is not None
+    assert audit["reuse_count"] >= 2
+
+    decisions = [json.loads(p.read_text()) for p in (tmp_path / "audit").glob("agent_decision_*.json")]
+    assert len(decisions) == 2
+    assert {d["metadata"]["document_session"]["content_hash"] for d in decisions} == {session.content_hash}
+
+
+def test_session_extraction_failure_returns_failed_result(tmp_path):
+    orchestrator = ToolOrchestrator(audit_dir=str(tmp_path))
+    session = DocumentSession(pdf_path=str(tmp_path / "missing.pdf"))
+
+    with _backend(PDFTool, Mock()):
+        result = orchestrator.execute_safety_sigma_pipeline(
+            pdf_file=session.pdf_path, instructions="Extract all indicators from the report", session=session
+        )
+
+    assert not result.success and result.error.startswith("Step pdf_extraction failed")
+    assert session.text is None
+    assert (tmp_path / f"orchestration_{result.orchestration_id}.json").exists()
+
+
+def test_only_session_steps_reuse_existing_output(tmp_path):
+    orchestrator = ToolOrchestrator(audit_dir=str(tmp_path))
+    pipeline = [OrchestrationStep(step_name="pdf_extraction", tool_class=PDFTool,
+                                  input_mapping={"pdf_path": "pdf_file"}, output_key="extracted_text")]
+
+    with _backend(PDFTool, Mock()):
+        result = orchestrator.execute_pipeline(pipeline, {"pdf_file": str(tmp_path / "missing.pdf"),
+                                                          "extracted_text": REPORT_TEXT})
+
+    assert not result.success and result.steps_successful == 0
+    assert "reused" not in result.step_results["pdf_extraction"].metadata
@@ -0,0 +1,75 @@
+import pytest
+
+from agents.base_agent import analyze_document_complexity, analyze_document_structure, analyze_document_type
+from agents.simple_agent import SimpleAgent
+from benchmarks import reference_document_analysis as reference
+from tools.document_stats import DocumentStats
+from tools.document_view import DocumentView
+
+SAMPLES = [
+    "",
+    "Fraud alert: scam and phishing reported.",
+    "Threat actors launched an attack with malware exploiting a vulnerability!",
+    "# Policy\n\nCompliance with regulation, guideline and standard.\n- item\n* item",
+    "Uses an API, a URL, an IP address, a hash, encryption and a protocol. " * 200,
+    "Plain words without any of the terms. {\"key\": `value`}\n\n• bullet\n• bullet",
+    ("Suspicious fake deception. " + "filler " * 60) * 3,
+]
+
+
+EXPECTED = [
+    ("general_analysis", "simple"), ("fraud_analysis", "simple"), ("threat_intelligence", "simple"),
+    ("policy_analysis", "simple"), ("general_analysis", "complex"), ("general_analysis", "simple"),
+    ("general_analysis", "simple"),
+]
+
+
+@pytest.mark.parametrize("text,expected", list(zip(SAMPLES, EXPECTED)))
+def test_helpers_wrap_stats(text, expected):
+    stats = DocumentStats.compute(text)
+    assert (stats.document_type()[0], stats.complexity()[0]) == expected
+    assert stats.document_type() == analyze_document_type(text)
+    assert stats.complexity() == analyze_document_complexity(text)
+    assert stats.structure() == analyze_document_structure(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_stats_match_reference_helpers(text):
+    # The frozen pre-DocumentStats helpers the benchmark measures against
+    stats = DocumentStats.compute(text)
+    assert stats.document_type() == reference.analyze_document_type(text)
+    assert stats.complexity() == reference.analyze_document_complexity(text)
+    assert stats.structure() == reference.analyze_document_structure(text)
+
+
+def test_helpers_share_the_view_stats():
+    view = DocumentView(SAMPLES[3])
+    analyze_document_type(view)
+    stats = view.stats
+    analyze_document_complexity(view)
+    analyze_document_structure(view)
+    assert view.stats is stats
+
+
+def test_counts_and_hits():
+    text = "Fraud! Is it a scam?\nYes.\n\nAPI hash"
+    stats = DocumentStats.compute(text)
+    assert stats.word_count == 8
+    assert stats.sentence_count == 3
+    assert stats.line_count == 4
+    assert stats.paragraph_count == 2
+    assert stats.keyword_hits['fraud_analysis'] == ('fraud', 'scam')
+    assert stats.technical_hits == ('api', 'hash')
+    assert stats.to_dict()['keyword_hits']['threat_intelligence'] == []
+
+
+def test_view_caches_stats():
+    view = DocumentView("Phishing scam report")
+    assert view.stats is view.stats
+
+
+def test_simple_agent_uses_stats(tmp_path):
+    agent = SimpleAgent(audit_dir=str(tmp_path))
+    analysis = agent._analyze_inputs({'document_content': SAMPLES[1], 'instructions': 'Extract indicators'})
+    assert analysis['document_type'] == 'fraud_analysis'
+    assert analysis['document_stats']['keyword_hits']['fraud_analysis'] == ['fraud', 'scam', 'phishing']
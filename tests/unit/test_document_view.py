@@ -0,0 +1,73 @@
+import re
+
+from agents.base_agent import analyze_document_complexity, analyze_document_structure, analyze_document_type
+from rules.document_classifier import DocumentClassifierEngine
+from tools.document_view import DocumentView
+from tools.dynamic_rule_generator import DynamicRuleGenerator
+from tools.intelligence_extractor import IntelligenceExtractor
+from tools.source_index import ShingleIndex
+
+REPORT = (
+    "# Fraud Report\n\n"
+    "Scammers used AI tools to translate and summarize articles. This information laundering "
+    "operation ran a coordinated network of 11 domains.\n"
+    "Victims lost $25,000 via phishing and fake invoices.\n\n"
+    "- Domain registrar: Alibaba Cloud\n"
+    "- Contact: fraud@example.com"
+)
+
+
+def _regex_context(text, phrase, context_length):
+    match = re.search(re.escape(phrase), text, re.IGNORECASE)
+    return text[max(0, match.start() - context_length // 2):match.end() + context_length // 2].strip()
+
+
+def test_view_caches_derived_forms_and_counts():
+    view = DocumentView(REPORT)
+    assert view.lower is view.lower
+    assert view.word_count == len(REPORT.split())
+    assert view.line_count == REPORT.count('\n') + 1
+    assert view.paragraph_count == REPORT.count('\n\n') + 1
+    assert DocumentView.of(view) is view
+
+
+def test_offsets_map_to_lines_and_paragraphs():
+    view = DocumentView("one\ntwo\n\nthree")
+    assert view.line_number(view.text.index("two")) == 2
+    assert view.line_number(view.text.index("three")) == 4
+    assert view.paragraph_index(view.text.index("two")) == 0
+    assert view.paragraph_index(view.text.index("three")) == 1
+
+
+def test_context_around_is_case_insensitive_with_original_offsets():
+    view = DocumentView("İstanbul office reported INFORMATION LAUNDERING activity")
+    assert not view.lower_aligned
+    assert view.context_around("information laundering", 10) == _regex_context(view.text, "information laundering", 10)
+    assert view.context_around("information laundering", 10).startswith("rted INFORMATION")
+    assert view.context_around("missing", 10) is None
+
+
+def test_analyzers_give_same_results_for_view_and_string():
+    view = DocumentView(REPORT)
+    assert analyze_document_type(view) == analyze_document_type(REPORT)
+    assert analyze_document_complexity(view) == analyze_document_complexity(REPORT)
+    assert analyze_document_structure(view) == analyze_document_structure(REPORT)
+
+    extractor = IntelligenceExtractor()
+    assert extractor.extract_intelligence(view) == extractor.extract_intelligence(REPORT)
+
+    assert len(ShingleIndex(view)) == len(ShingleIndex(REPORT))
+
+
+def test_classifier_counts_real_lines_and_paragraphs():
+    context = DocumentClassifierEngine().analyze_document_context(DocumentView(REPORT))
+    assert context['line_count'] == REPORT.count('\n') + 1
+    assert context['paragraph_count'] == REPORT.count('\n\n') + 1
+    assert context['content_lower'] == REPORT.lower()
+
+
+def test_rule_generator_context_uses_shared_view():
+    generator = DynamicRuleGenerator()
+    generator.generate_rules_from_document(DocumentView(REPORT), "report")
+    assert generator._find_context_around_phrase(REPORT, "alibaba cloud", 20) == _regex_context(REPORT, "alibaba cloud", 20)
+    assert generator._find_context_around_phrase(REPORT, "absent", 20) == "Context not found for: absent"
@@ -0,0 +1,117 @@
+import json
+import re
+
+from src.pdf_processor.rules import CompileOptions, compile_rules
+from src.pdf_processor.scan import Scanner, load_rules, main
+
+
+IR = {
+    "indicators": [
+        {"kind": "amount", "verbatim": "$1,998.88", "numeric": 1998.88, "category_id": "payments", "span_id": "s1"},
+        {"kind": "link", "literal": "wa.me/123456789", "category_id": "comm", "span_id": "s2"},
+        {"kind": "text", "verbatim": "VOID 2000", "category_id": "fraud_marker", "span_id": "s3"},
+    ],
+    "categories": {"payments": {"spans": ["s1"]}, "comm": {"spans": ["s2"]}, "fraud_marker": {"spans": ["s3"]}},
+}
+
+MEMOS = ["refund $1,998.88 via wa.me/123456789", "VOID 2000 VOID 20000", "nothing here", "paid $1,998.888",
+         "xVOID 2000 and VOID 2000"]
+
+
+def _rules_file(tmp_path, targets=("regex", "sql", "json")):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(compile_rules(IR, CompileOptions(targets=list(targets)))))
+    return path
+
+
+def _events(tmp_path, count=400):
+    path = tmp_path / "events.jsonl"
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"tx{i}", "memo": MEMOS[i % len(MEMOS)], "amount": i}) + "\n")
+            if i == 7:
+                f.write("{not json\n\n")
+    return path
+
+
+def _expected(rules, events_path):
+    expected = []
+    with open(events_path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.startswith(b"{\"id\""):
+                memo = json.loads(line)["memo"]
+                expected += sorted((offset, m.start(), m.end(), k) for k, rule in enumerate(rules)
+                                   for m in re.finditer(rule["pattern"], memo))
+            offset += len(line)
+    return expected
+
+
+def test_chunked_parallel_scan_matches_regex_target(tmp_path):
+    rules_path, events_path = _rules_file(tmp_path), _events(tmp_path)
+    rules = json.loads(rules_path.read_text())["regex"]
+
+    inline = Scanner(rules_path, workers=0)
+    hits = list(inline.scan(events_path))
+    assert [(h["offset"], h["start"], h["end"], h["rule"]) for h in hits] == _expected(rules, events_path)
+    assert inline.stats.events == 400 and inline.stats.errors == 1 and inline.stats.hits == len(hits)
+
+    parallel = Scanner(rules_path, workers=2, chunk_mb=0.002, fields=["memo"], id_field="id")
+    assert [(h["offset"], h["start"], h["rule"]) for h in parallel.scan(events_path)] == \
+        [(h["offset"], h["start"], h["rule"]) for h in hits]
+    assert parallel.stats.chunks > 4 and parallel.stats.events == 400
+
+    first = next(Scanner(rules_path, workers=0, id_field="id").scan(events_path))
+    assert first == {"offset": 0, "field": "memo", "start": 7, "end": 16, "literal": "$1,998.88", "kind": "amount",
+                     "rule": 0, "span_id": "s1", "category_id": "payments", "event_id": "tx0"}
+
+
+def test_rules_from_json_target_and_csv_events(tmp_path):
+    artifact = load_rules(compile_rules(IR, CompileOptions(targets=["json"])))
+    assert artifact["rule_count"] == 3
+    assert load_rules(_rules_file(tmp_path, ("regex", "python")))["ir_hash"] == artifact["ir_hash"]
+
+    events = tmp_path / "events.csv"
+    events.write_text('id,memo,note\r\n1,"refund $1,998.88, thanks",VOID 2000\r\n2,"multi\nline VOID 2000",x\r\n')
+    scanner = Scanner(compile_rules(IR), workers=0, fields=["memo"], id_field="id")
+    hits = [(h["event_id"], h["literal"], h["offset"]) for h in scanner.scan(events)]
+    assert hits == [("1", "$1,998.88", 14), ("2", "VOID 2000", 54)]
+    assert scanner.stats.events == 2
+
+
+def test_csv_quoted_blank_lines_are_kept(tmp_path):
+    data = 'id,memo\n1,"first\n\nVOID 2000"\n\n2,VOID 2000\n   \n3,"\n\n\nVOID 2000"\n'
+    events = tmp_path / "events.csv"
+    events.write_bytes(data.encode())
+    scanner = Scanner(compile_rules(IR), workers=0, fields=["memo"], id_field="id")
+    hits = [(h["event_id"], h["offset"], h["start"]) for h in scanner.scan(events)]
+    assert hits == [("1", data.index("1,"), 7), ("2", data.index("2,"), 0), ("3", data.index("3,"), 3)]
+    assert scanner.stats.events == 3
+
+
+def test_multiline_indicators_match_within_fields_only(tmp_path):
+    ir = {"indicators": [{"kind": "text", "verbatim": "2000\n2000", "category_id": "fraud_marker", "span_id": "m1"},
+                         {"kind": "text", "verbatim": "VOID\x1e2000", "category_id": "fraud_marker", "span_id": "m2"}],
+          "categories": {"fraud_marker": {"spans": ["m1", "m2"]}}}
+    events = tmp_path / "events.jsonl"
+    rows = [{"a": "2000", "b": "2000\n2000"}, {"a": "x VOID", "b": "2000\n2000 VOID\x1e2000"}, {"a": "2000\n20000"}]
+    events.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    rules = compile_rules(ir)["regex"]
+    hits = [(h["offset"], h["field"], h["start"], h["end"], h["rule"])
+            for h in Scanner(compile_rules(ir), workers=0).scan(events)]
+    offsets = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(json.dumps(row)) + 1)
+    expected = [(offsets[i], name, m.start(), m.end(), k) for i, row in enumerate(rows) for name, text in row.items()
+                for k, rule in enumerate(rules) for m in re.finditer(rule["pattern"], text)]
+    assert sorted(hits) == sorted(expected)
+    assert [(field, start, end) for _, field, start, end, _ in hits] == [("b", 0, 9), ("b", 0, 9), ("b", 10, 19)]
+
+
+def test_cli_writes_hits_and_throughput(tmp_path, capsys):
+    rules_path, events_path = _rules_file(tmp_path), _events(tmp_path, count=10)
+    output = tmp_path / "hits.jsonl"
+    assert main([str(rules_path), str(events_path), "--workers", "0", "--output", str(output), "--stats-json"]) == 0
+    stats = json.loads(capsys.readouterr().err)
+    assert stats["events"] == 10 and stats["hits"] == len(output.read_text().splitlines()) > 0
+    assert stats["events_per_sec"] > 0
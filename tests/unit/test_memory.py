@@ -0,0 +1,129 @@
+from unittest.mock import patch
+
+import pytest
+
+from metrics import memory
+from metrics.memory import MemoryBudgetExceeded, MemoryTracker
+from tools.base_tool import BaseTool
+from tools.extraction_tool import ExtractionTool
+from tools.pdf_tool import PDFTool
+
+INSTRUCTIONS = "Extract all indicators from the report"
+
+
+class AllocatingTool(BaseTool):
+    name = "allocating_tool"
+
+    def _run(self, size: int = 0, **kwargs):
+        buffer = bytearray(size)
+        return len(buffer)
+
+
+class EchoBackend:
+    def process_report(self, instructions, report_content):
+        return report_content.splitlines()[0]
+
+
+def _document(sections=6):
+    return "\n\n".join(f"Section {i}\n" + "Indicator line for this section.\n" * 20 for i in range(sections))
+
+
+def test_tracemalloc_tracker_measures_peak_and_nests():
+    with MemoryTracker('tracemalloc', budget=0) as outer:
+        with MemoryTracker('tracemalloc', budget=0) as inner:
+            data = bytearray(4 * memory.MB)
+            del data
+        small = bytearray(1024)
+
+    assert 4 * memory.MB <= inner.usage.peak_bytes < 5 * memory.MB
+    assert inner.usage.net_bytes < memory.MB
+    assert outer.usage.peak_bytes >= inner.usage.peak_bytes
+    assert not outer.usage.over_budget
+    del small
+
+
+def test_off_and_invalid_modes():
+    with MemoryTracker('off') as tracker:
+        pass
+    assert tracker.usage is None
+    with pytest.raises(ValueError):
+        MemoryTracker('heap')
+
+
+def test_rss_tracker_reports_usage():
+    with MemoryTracker('rss', budget=memory.MB) as tracker:
+        pass
+    assert tracker.usage.mode == 'rss' and tracker.usage.rss_bytes > 0
+    assert tracker.usage.to_dict()['budget_bytes'] == memory.MB
+
+
+def test_rss_without_platform_support(monkeypatch):
+    monkeypatch.setattr(memory, 'HAS_RESOURCE', False)
+    monkeypatch.setattr(memory, 'HAS_PSUTIL', False)
+    monkeypatch.delattr(memory.os, 'sysconf')  # no /proc page size either
+    assert memory.peak_rss() == 0
+    assert memory.current_rss() == 0
+
+
+def test_tool_records_peak_in_metadata(monkeypatch):
+    monkeypatch.setenv('SS2_MEMORY_TRACKING', 'tracemalloc')
+    monkeypatch.setenv('SS2_MEMORY_BUDGET_MB', '1')
+    tool = AllocatingTool(audit=False)
+
+    result = tool.execute(size=2 * memory.MB)
+
+    usage = result.metadata['memory']
+    assert usage['peak_bytes'] >= 2 * memory.MB
+    assert usage['over_budget'] is True
+    assert any('exceeded budget' in entry for entry in result.audit_trail)
+
+
+def test_check_budget():
+    memory.check_budget(10, budget=0)
+    memory.check_budget(10, budget=10)
+    with pytest.raises(MemoryBudgetExceeded):
+        memory.check_budget(11, budget=10)
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_extraction_switches_to_chunked_mode_over_budget(mock_import, monkeypatch):
+    monkeypatch.setenv('SS2_CHUNK_SIZE', '700')
+    monkeypatch.setenv('SS2_CHUNK_WORKERS', '2')
+    monkeypatch.setenv('SS2_MAX_CONTENT_SIZE', '1000')
+    monkeypatch.setenv('SS2_MEMORY_BYTES_PER_CHAR', '100')
+    monkeypatch.setenv('SS2_MEMORY_BUDGET_MB', str(200_000 / memory.MB))  # fits 2 x 700-char chunks
+    text = _document()
+
+    tool = ExtractionTool(audit=False, zero_inference=False)
+    tool._ss1_processor = EchoBackend()
+    result = tool.execute(instructions=INSTRUCTIONS, text_content=text)
+
+    assert result.success
+    assert result.metadata['memory_budget_action'] == 'chunked'
+    assert result.data == "\n\n".join(f"Section {i}" for i in range(6))
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_extraction_fails_fast_when_chunks_exceed_budget(mock_import, monkeypatch):
+    monkeypatch.setenv('SS2_MEMORY_BYTES_PER_CHAR', '100')
+    monkeypatch.setenv('SS2_MEMORY_BUDGET_MB', str(1000 / memory.MB))
+    backend = EchoBackend()
+
+    tool = ExtractionTool(audit=False, zero_inference=False)
+    tool._ss1_processor = backend
+    result = tool.execute(instructions=INSTRUCTIONS, text_content=_document())
+
+    assert not result.success
+    assert result.error.startswith('MemoryBudgetExceeded')
+
+
+@patch.object(PDFTool, '_import_ss1')
+def test_pdf_fails_fast_over_budget(mock_import, monkeypatch, tmp_path):
+    monkeypatch.setenv('SS2_MEMORY_BUDGET_MB', '1')
+    pdf = tmp_path / 'large.pdf'
+    pdf.write_bytes(b'%PDF' + b'0' * memory.MB)
+
+    result = PDFTool(audit=False).execute(pdf_path=str(pdf))
+
+    assert not result.success
+    assert 'exceeds budget' in result.error
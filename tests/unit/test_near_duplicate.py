@@ -0,0 +1,50 @@
+from unittest.mock import Mock, patch
+
+from tools.extraction_tool import ExtractionTool
+from tools.near_duplicate import NearDuplicateIndex, summarize_diff
+
+INSTRUCTIONS = "Extract all indicators from the report"
+REPORT = "\n".join(
+    f"Line {i}: the campaign used domain site{i}.example and wallet number {1000 + i} for payments."
+    for i in range(40)
+)
+EDITED = REPORT.replace("Line 7: the campaign", "Line 7: this campaign")
+UNRELATED = "\n".join(f"Entry {i}: quarterly budget review for team {i} covering travel." for i in range(40))
+
+
+def test_index_finds_edited_copy_but_not_unrelated_document():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("original", REPORT, "result")
+
+    match = index.find(EDITED)
+    assert match is not None
+    assert match.document.doc_id == "original"
+    assert match.similarity >= 0.8
+    assert index.find(UNRELATED) is None
+    assert index.find(EDITED, scope="other-instructions") is None
+
+
+def test_summarize_diff_counts_changed_lines():
+    diff = summarize_diff(REPORT, EDITED)
+    assert diff["lines_added"] == 1
+    assert diff["lines_removed"] == 1
+    assert diff["added_sample"][0].startswith("Line 7: this campaign")
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_extraction_tool_reuses_near_duplicate_result(mock_import, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    processor = Mock()
+    processor.process_report.return_value = "The campaign used domain site3.example for payments."
+
+    tool = ExtractionTool(audit=False, near_duplicate_index=NearDuplicateIndex(threshold=0.8))
+    tool._ss1_processor = processor
+
+    first = tool.execute(instructions=INSTRUCTIONS, text_content=REPORT)
+    second = tool.execute(instructions=INSTRUCTIONS, text_content=EDITED)
+
+    assert processor.process_report.call_count == 1
+    assert second.data == first.data
+    assert second.metadata["near_duplicate"]["reused"] is True
+    assert second.metadata["near_duplicate"]["diff"]["lines_added"] == 1
+    assert any("reused from near-duplicate" in entry for entry in second.audit_trail)
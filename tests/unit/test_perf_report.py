@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from analysis.perf_report import PerfReport, compare, fit_size_model, log_files, main, percentile
+from audit.serialization import get_serializer
+
+
+def _write_day(audit_dir, date, tool_ms, workflow_ms, sizes=(1_000, 50_000, 200_000, 2_000_000)):
+    serializer = get_serializer('json')
+    for index, size in enumerate(sizes):
+        serializer.write({"tool_name": "extraction_tool", "run_id": f"{date}-{index}", "duration_ms": tool_ms,
+                          "success": True, "input_summary": {"text_content": f"x... (truncated, length={size})"}},
+                         log_path=serializer.log_path(audit_dir, f"audit_{date}"))
+        serializer.write({"decision_id": f"{date}-{index}", "selected_workflow": "fraud_analysis_workflow",
+                          "input_analysis": {"file_analysis": {"file_size_bytes": size}, "content_length": 10},
+                          "metadata": {"execution_time_ms": workflow_ms + size / 1024.0, "success": True}},
+                         log_path=serializer.log_path(audit_dir, f"agent_decisions_{date}"))
+        serializer.write({"event": "step_success", "orchestration_id": "o", "step_name": "pdf_extraction",
+                          "execution_time_ms": tool_ms / 2},
+                         log_path=serializer.log_path(audit_dir, f"orchestration_{date}"))
+    serializer.write({"decision_id": "old", "selected_workflow": "fraud_analysis_workflow", "metadata": {}},
+                     log_path=serializer.log_path(audit_dir, f"agent_decisions_{date}"))
+
+
+def test_percentile_and_size_model():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+
+    model = fit_size_model([1024, 2048, 4096], [110.0, 120.0, 140.0])
+    assert model.intercept_ms == pytest.approx(100.0)
+    assert model.ms_per_kb == pytest.approx(10.0)
+    assert model.r2 == pytest.approx(1.0)
+    assert fit_size_model([1024, 1024], [1.0, 2.0]) is None
+
+
+def test_report_groups_models_and_capacity(tmp_path):
+    _write_day(tmp_path, "2026-10-01", tool_ms=10.0, workflow_ms=1000.0)
+    (tmp_path / "audit_2026-10-01.json").write_text("{}")  # single records are not daily logs
+    report = PerfReport.from_audit_dir(tmp_path)
+
+    assert report.latency("tool")["extraction_tool"]["count"] == 4
+    assert report.latency("stage")["pdf_extraction"]["p50_ms"] == 5.0
+    assert set(report.latency("size")) == {"tool:small", "tool:medium", "tool:large", "workflow:small",
+                                           "workflow:medium", "workflow:large"}
+
+    model = report.size_models()["workflow:fraud_analysis_workflow"]
+    assert model.intercept_ms == pytest.approx(1000.0)
+    assert model.ms_per_kb == pytest.approx(1.0)
+
+    capacity = report.capacity(cores=4)
+    mean_ms = sum(1000.0 + size / 1024.0 for size in (1_000, 50_000, 200_000, 2_000_000)) / 4
+    assert capacity["documents"] == 4
+    assert capacity["docs_per_hour_per_core"] == pytest.approx(3_600_000 / mean_ms)
+    assert capacity["docs_per_hour"] == pytest.approx(4 * 3_600_000 / mean_ms)
+
+
+def test_date_ranges_and_regressions(tmp_path, capsys):
+    _write_day(tmp_path, "2026-10-01", tool_ms=10.0, workflow_ms=1000.0)
+    _write_day(tmp_path, "2026-10-08", tool_ms=30.0, workflow_ms=1010.0)
+    assert [date for _, date, _ in log_files(tmp_path, since="2026-10-02")] == ["2026-10-08"] * 3
+
+    baseline = PerfReport.from_audit_dir(tmp_path, "2026-10-01", "2026-10-01")
+    current = PerfReport.from_audit_dir(tmp_path, "2026-10-08", "2026-10-08")
+    rows = {(row["dimension"], row["key"]): row for row in compare(baseline, current, min_samples=4)}
+    assert rows[("tool", "extraction_tool")]["regressed"]
+    assert rows[("tool", "extraction_tool")]["ratio"] == pytest.approx(3.0)
+    assert not rows[("workflow", "fraud_analysis_workflow")]["regressed"]
+
+    assert main(["--audit-dir", str(tmp_path), "--baseline", "2026-10-01", "--compare", "2026-10-08",
+                 "--min-samples", "4"]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
+    assert main(["--audit-dir", str(tmp_path), "--json", "--until", "2026-10-01"]) == 0
+    assert json.loads(capsys.readouterr().out)["capacity"]["documents"] == 4
@@ -0,0 +1,122 @@
+import json
+import sys
+import time
+
+import pytest
+
+from metrics import profiling, tracing
+from safety_sigma.main import create_argument_parser
+from tools.base_tool import BaseTool
+
+
+class BusyTool(BaseTool):
+    name = "busy_tool"
+
+    def _run(self, seconds: float = 0.1, **kwargs):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+        return "done"
+
+
+@pytest.fixture(autouse=True)
+def tracing_off():
+    tracing.disable()
+    yield
+    tracing.disable()
+
+
+def test_sampler_attributes_time_to_tool(tmp_path):
+    with profiling.Profiler('sample', interval=0.002) as profiler:
+        BusyTool(audit=False).execute(seconds=0.2)
+
+    assert not tracing.is_enabled()  # restored after profiling
+    hotspots = profiler.sampler.hotspots()
+    stages = {name: seconds for name, seconds, _ in hotspots['stages']}
+    assert stages.get('tool:busy_tool', 0) > 0.1
+    assert any('BusyTool._run' in name for name, _, _ in hotspots['self'])
+    assert ('tool.execute', 'busy_tool') in profiler.span_times
+
+    paths = profiler.write(tmp_path)
+    collapsed = paths['collapsed'].read_text().splitlines()
+    assert any(line.startswith('[tool:busy_tool];') for line in collapsed)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in collapsed)
+
+    speedscope = json.loads(paths['speedscope'].read_text())
+    profile = speedscope['profiles'][0]
+    assert profile['type'] == 'sampled'
+    assert len(profile['samples']) == len(profile['weights'])
+    assert all(0 <= i < len(speedscope['shared']['frames']) for sample in profile['samples'] for i in sample)
+    assert 'tool:busy_tool' in paths['summary'].read_text()
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    with profiling.Profiler('cprofile') as profiler:
+        BusyTool(audit=False).execute(seconds=0.01)
+
+    paths = profiler.write(tmp_path, prefix='run')
+    assert paths['pstats'].name == 'run.prof' and paths['pstats'].stat().st_size > 0
+    summary = paths['summary'].read_text()
+    assert 'tool.execute [busy_tool]' in summary
+    assert '_run' in summary
+
+
+def test_stage_path_nests_components():
+    def frame(qualname, module):
+        namespace = {}
+        exec(f"class {qualname.split('.')[0]}:\n    def {qualname.split('.')[1]}(self): pass", namespace)
+        return getattr(namespace[qualname.split('.')[0]], qualname.split('.')[1]).__code__, module, qualname
+
+    components = {'SimpleAgent': 'agent:simple_agent', 'ExtractionTool': 'tool:extraction_tool'}
+    stack = (
+        frame('SimpleAgent.execute', 'agents.simple_agent'),
+        frame('ExtractionTool._run', 'tools.extraction_tool'),
+        frame('ExtractionTool._write_audit_record', 'tools.base_tool'),
+    )
+    assert profiling.stage_of(stack, components) == 'agent:simple_agent > tool:extraction_tool > audit'
+    assert profiling.stage_of(stack[:0], components) == profiling.OTHER_STAGE
+
+
+@pytest.mark.parametrize("has_co_qualname", [True, False])
+def test_qualname_without_co_qualname(monkeypatch, has_co_qualname):
+    # Python < 3.11 has no code.co_qualname; names come from the frame's self/cls
+    if has_co_qualname and not profiling._HAS_CO_QUALNAME:
+        pytest.skip("code.co_qualname needs Python 3.11+")
+    monkeypatch.setattr(profiling, '_HAS_CO_QUALNAME', has_co_qualname)
+    monkeypatch.setattr(profiling, '_qualnames', {})
+    seen = {}
+
+    class RecordingTool(BusyTool):
+        name = "recording_tool"
+
+        def _run(self, **kwargs):
+            frame = sys._getframe()
+            seen['run'] = profiling._qualname(frame)
+            seen['execute'] = profiling._qualname(frame.f_back)
+            return "done"
+
+        @classmethod
+        def build(cls):
+            seen['build'] = profiling._qualname(sys._getframe())
+            return cls(audit=False)
+
+    RecordingTool.build().execute()
+    assert seen['run'].endswith('RecordingTool._run')
+    assert seen['execute'] == 'BaseTool.execute'
+    assert seen['build'].endswith('RecordingTool.build')
+
+    with profiling.Profiler('sample', interval=0.002) as profiler:
+        BusyTool(audit=False).execute(seconds=0.1)
+    stages = {name for name, _, _ in profiler.sampler.hotspots()['stages']}
+    assert 'tool:busy_tool' in stages
+
+
+def test_invalid_mode_and_cli_option():
+    with pytest.raises(ValueError):
+        profiling.Profiler('perf')
+
+    parser = create_argument_parser()
+    args = parser.parse_args(['--pdf', 'a.pdf', '--instructions', 'b.md', '--profile'])
+    assert args.profile == 'sample'
+    args = parser.parse_args(['--pdf', 'a.pdf', '--instructions', 'b.md', '--profile', 'cprofile'])
+    assert args.profile == 'cprofile'
@@ -0,0 +1,111 @@
+import random
+import re
+
+import pytest
+
+from benchmarks.corpus import generate_report
+from src.pdf_processor import pymatcher
+from src.pdf_processor.rules import CompileOptions, compile_rules
+
+
+EDGE_IR = {
+    "indicators": [
+        {"kind": "amount", "verbatim": "$1,998.88", "numeric": 1998.88, "category_id": "payments", "span_id": "s1"},
+        {"kind": "link", "literal": "wa.me/123456789", "category_id": "comm", "span_id": "s2"},
+        {"kind": "text", "verbatim": "VOID 2000", "category_id": "fraud_marker", "span_id": "s3"},
+        {"kind": "text", "verbatim": "VOID 2000", "category_id": "fraud_marker", "span_id": "s4"},
+        {"kind": "text", "verbatim": "_token", "category_id": "fraud_marker", "span_id": "s5"},
+        {"kind": "text", "verbatim": "-->", "category_id": "fraud_marker", "span_id": "s6"},
+        {"kind": "text", "verbatim": "Zahlung über", "category_id": "fraud_marker", "span_id": "s7"},
+        {"kind": "text", "verbatim": "", "category_id": "fraud_marker", "span_id": "s8"},
+    ],
+    "categories": {"payments": {"spans": ["s1"]}, "comm": {"spans": ["s2"]},
+                   "fraud_marker": {"spans": ["s3", "s4", "s5", "s6", "s7", "s8"]}, "unused": {"spans": []}},
+}
+
+PIECES = ["$1,998.88", "$1,998.888", "a$1,998.88", "wa.me/123456789", "wa.me/1234567890", "VOID 2000",
+          "VOID 20000", "xVOID 2000", "_token", "__token", "-->", "a-->", "--> ", "Zahlung über", "Zahlung überall",
+          " ", "\n", "\t", ".", ",", "_", "x", "9", "ü"]
+
+
+# Literals and category ids that must not leak into the generated source unescaped
+QUOTED_IR = {
+    "indicators": [
+        {"kind": "text", "verbatim": "VOID\n2000", "category_id": 'say """hi"""', "span_id": "q1"},
+        {"kind": "text", "verbatim": "C:\\temp\\", "category_id": "back\\slash'", "span_id": "q2"},
+        {"kind": "text", "verbatim": "line\r\nbreak", "category_id": 'say """hi"""', "span_id": "q3"},
+        {"kind": "text", "verbatim": '"""; import os', "category_id": "back\\slash'", "span_id": "q4"},
+    ],
+    "categories": {'say """hi"""': {"spans": ["q1", "q3"]}, "back\\slash'": {"spans": ["q2", "q4"]}},
+}
+QUOTED_PIECES = ["VOID\n2000", "VOID 2000", "C:\\temp\\", "line\r\nbreak", '"""; import os', " ", "\n", "x"]
+
+
+def _regex_hits(rules, text):
+    return sorted((m.start(), m.end(), k) for k, rule in enumerate(rules) for m in re.finditer(rule["pattern"], text))
+
+
+def _compile(ir):
+    artifacts = compile_rules(ir, CompileOptions(targets=["regex", "python"]))
+    return artifacts["regex"], artifacts["python"]
+
+
+def test_python_target_is_opt_in():
+    assert "python" not in compile_rules(EDGE_IR)
+
+
+def test_matches_regex_target_on_edge_cases():
+    rules, artifact = _compile(EDGE_IR)
+    module = pymatcher.load_matcher(artifact)
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+        assert module.match(text) == _regex_hits(rules, text), text
+
+
+def test_multiline_literals_and_quoted_categories():
+    rules, artifact = _compile(QUOTED_IR)
+    module = pymatcher.load_matcher(artifact)
+    assert set(module.CATEGORIES) == set(QUOTED_IR["categories"])
+    assert [k for _, _, k in module.CATEGORIES['say """hi"""']("VOID\n2000")] == [0]
+    rng = random.Random(1)
+    for _ in range(300):
+        text = "".join(rng.choice(QUOTED_PIECES) for _ in range(rng.randint(0, 8)))
+        assert module.match(text) == _regex_hits(rules, text), text
+
+
+@pytest.mark.parametrize("kind", ["fraud", "threat"])
+def test_matches_regex_target_on_corpus(kind):
+    report = generate_report(kind, 50_000, density=0.4)
+    rules, artifact = _compile(report.to_ir())
+    module = pymatcher.load_matcher(artifact)
+    hits = module.match(report.text)
+    assert hits == _regex_hits(rules, report.text)
+    assert {module.RULES[k]["source_span"]["span_id"] for _, _, k in hits} == {i["span_id"] for i in report.indicators}
+
+
+def test_provenance_tables_and_categories():
+    rules, artifact = _compile(EDGE_IR)
+    module = pymatcher.load_matcher(artifact)
+    assert list(module.RULES) == [rule["meta"] for rule in rules]
+    assert list(module.PATTERNS) == [rule["pattern"] for rule in rules]
+    assert set(module.CATEGORIES) == set(EDGE_IR["categories"])
+    assert module.CATEGORIES["unused"]("VOID 2000") == []
+    assert [k for _, _, k in module.CATEGORIES["fraud_marker"]("VOID 2000")] == [2, 3]
+    assert module.match_many(["VOID 2000", "none", "$1,998.88"]) == [(0, 0, 9, 2), (0, 0, 9, 3), (2, 0, 9, 0)]
+
+
+def test_hash_is_stable_and_cache_dir_writes_importable_module(tmp_path):
+    _, first = _compile(EDGE_IR)
+    _, second = _compile(EDGE_IR)
+    assert first["ir_hash"] == second["ir_hash"] and first["source"] == second["source"]
+
+    changed = {**EDGE_IR, "indicators": EDGE_IR["indicators"][:-1]}
+    assert _compile(changed)[1]["ir_hash"] != first["ir_hash"]
+
+    pymatcher.clear_cache()
+    module = pymatcher.load_matcher(first, cache_dir=tmp_path)
+    assert (tmp_path / f"{first['module_name']}.py").exists()
+    assert list((tmp_path / "__pycache__").glob(f"{first['module_name']}.*.pyc"))
+    assert pymatcher.load_matcher(first) is module
+    pymatcher.clear_cache()
@@ -0,0 +1,58 @@
+from unittest.mock import Mock, patch
+
+from tools.extraction_tool import ExtractionTool
+from tools.result_cache import ResultCache
+
+INSTRUCTIONS = "Extract all indicators from the report"
+CONTENT = "Graphika identified a network of 11 domains and 16 companion accounts."
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "A", {})
+    cache.put("b", "B", {})
+    assert cache.get("a").output == "A"
+    cache.put("c", "C", {})
+
+    assert cache.get("b") is None
+    assert cache.get("a").output == "A"
+    assert len(cache) == 2
+
+
+def test_cache_expires_entries_after_ttl():
+    cache = ResultCache(max_entries=4, ttl_seconds=10)
+    with patch("tools.result_cache.time.time", return_value=1000.0):
+        cache.put("a", "A", {})
+    with patch("tools.result_cache.time.time", return_value=1011.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_key_depends_on_every_fingerprint_field():
+    base = {"content_hash": "c1", "instructions_hash": "i1", "ruleset_versions": {"fraud": "1.0"}}
+    changed = dict(base, ruleset_versions={"fraud": "1.1"})
+    assert ResultCache.make_key(base) == ResultCache.make_key(dict(base))
+    assert ResultCache.make_key(base) != ResultCache.make_key(changed)
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_extraction_tool_reuses_cached_backend_result(mock_import, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    processor = Mock()
+    processor.process_report.return_value = "Graphika identified a network of 11 domains."
+    cache = ResultCache(max_entries=8, ttl_seconds=60)
+
+    tool = ExtractionTool(audit=False, result_cache=cache)
+    tool._ss1_processor = processor
+
+    first = tool.execute(instructions=INSTRUCTIONS, text_content=CONTENT)
+    second = tool.execute(instructions=INSTRUCTIONS, text_content=CONTENT)
+    third = tool.execute(instructions=INSTRUCTIONS, text_content=CONTENT,
+                         ruleset_versions={"fraud_detection": "2.0"})
+
+    assert processor.process_report.call_count == 2
+    assert second.data == first.data
+    assert first.metadata["result_cache"]["hit"] is False
+    assert second.metadata["result_cache"]["hit"] is True
+    assert third.metadata["result_cache"]["hit"] is False
+    assert any("Result served from cache" in entry for entry in second.audit_trail)
@@ -0,0 +1,120 @@
+import sqlite3
+
+from workflow.broker import SQLiteBroker
+from workflow.content_store import ContentStore
+from workflow.coordinator import Coordinator
+from workflow.scheduler import (LatencyModel, Scheduler, count_pdf_pages, pool_environment, profile_document,
+                                record_job_latency)
+from workflow.worker import Worker
+
+
+INSTRUCTIONS = "Extract all fraud indicators from the report"
+
+
+def _pdf(pages, padding=0):
+    kids = ' '.join(f"{i + 3} 0 R" for i in range(pages))
+    return (b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+            + f"2 0 obj << /Type /Pages /Kids [{kids}] /Count {pages} >> endobj\n".encode()
+            + b" " * padding)
+
+
+def _text(words):
+    return ("# Scam report\n" + "victims paid via api hash " * (words // 5)).encode()
+
+
+def _scheduler(tmp_path, **kwargs):
+    return Scheduler(LatencyModel(min_samples=2), audit_dir=tmp_path, **kwargs)
+
+
+def test_profiles_use_agent_classes_and_page_counts():
+    small = profile_document(b"Victims paid $500 via secure-pay.com")
+    assert (small.size_class, small.complexity, small.pages, small.is_pdf) == ("small", "simple", 1, False)
+
+    report = profile_document(_text(3000))
+    assert report.complexity == "complex"
+    assert report.pages == 7  # 3003 words
+
+    pdf = profile_document(_pdf(250, padding=2_000_000))
+    assert (pdf.size_class, pdf.pages, pdf.job_class) == ("large", 250, "large/complex")
+
+
+def test_count_pdf_pages_falls_back_to_page_objects_and_size():
+    assert count_pdf_pages(_pdf(3)) == 3
+    assert count_pdf_pages(b"%PDF-1.4\n<< /Type /Page >> << /Type /Page >> << /Type /Pages2 >>") == 2
+    assert count_pdf_pages(b"%PDF-1.5\n" + b"x" * 500_000) == 10
+
+
+def test_routing_and_expected_latency(tmp_path):
+    scheduler = _scheduler(tmp_path, bulk_pages=100)
+    assert scheduler.place(_text(100)).pool == "interactive"
+    assert scheduler.place(_pdf(120)).pool == "bulk"
+    huge = scheduler.place(_pdf(500, padding=10_000_000))
+    assert (huge.pool, huge.profile.size_class) == ("bulk", "very_large")
+    assert scheduler.place(_pdf(2)).expected_ms < scheduler.place(_pdf(40)).expected_ms
+    assert pool_environment("bulk")["SS2_CHUNKED_EXTRACTION"] == "true"
+    assert pool_environment("interactive") == {}
+
+
+def test_latency_model_learns_from_audit_history(tmp_path):
+    job = {"job_id": "j", "name": "r.pdf", "job_class": "small/simple", "pool": "interactive", "pages": 4,
+           "expected_ms": 1200.0, "attempts": 1}
+    record_job_latency(job, "w1", 100.0, 102.0, True, audit_dir=tmp_path)
+    assert LatencyModel.from_audit_dir(tmp_path, min_samples=2).ms_per_page("small/simple") == 300.0  # default
+
+    record_job_latency(job, "w1", 100.0, 104.0, True, audit_dir=tmp_path)
+    record_job_latency(job, "w1", 100.0, 190.0, False, audit_dir=tmp_path)  # failed attempts are ignored
+    model = LatencyModel.from_audit_dir(tmp_path, min_samples=2)
+    assert model.ms_per_page("small/simple") == 750.0
+    assert model.to_dict()["small/simple"]["samples"] == 2
+
+
+def test_queue_is_shortest_expected_job_first_within_pools(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.db")
+    coordinator = Coordinator(broker, ContentStore(tmp_path / "content"), shards=4,
+                              scheduler=_scheduler(tmp_path, bulk_pages=100))
+    coordinator.submit(_pdf(500), INSTRUCTIONS, name="huge")
+    coordinator.submit(_pdf(40), INSTRUCTIONS, name="medium")
+    coordinator.submit(_pdf(150), INSTRUCTIONS, name="big")
+    coordinator.submit(_pdf(2), INSTRUCTIONS, name="tiny")
+    coordinator.submit(b"Victims paid $500", INSTRUCTIONS, name="note")
+    broker.enqueue("legacy", "legacy", 0, "sha256:" + "0" * 64, "sha256:" + "1" * 64)
+    assert broker.stats()["pools"]["bulk"]["queued"] == 2
+
+    interactive = [broker.lease("fast", pools=["interactive"])["name"] for _ in range(4)]
+    assert interactive == ["note", "tiny", "medium", "legacy"]  # jobs without a pool go to any worker, last
+    assert broker.lease("fast", pools=["interactive"]) is None
+    assert [broker.lease("slow", pools=["bulk", "interactive"])["name"] for _ in range(2)] == ["big", "huge"]
+
+
+def test_empty_pool_list_serves_any_pool(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.db")
+    broker.enqueue("bulk", "bulk", 0, "sha256:a", "sha256:b", pool="bulk", expected_ms=20.0)
+    broker.enqueue("interactive", "interactive", 0, "sha256:c", "sha256:b", pool="interactive", expected_ms=10.0)
+
+    assert [broker.lease("w", pools=[])["name"] for _ in range(2)] == ["interactive", "bulk"]
+    assert broker.lease("w", pools=[]) is None
+
+
+def test_worker_records_latency_for_scheduled_jobs(tmp_path, monkeypatch):
+    monkeypatch.setenv("SS2_AUDIT_DIR", str(tmp_path / "audit"))
+    broker = SQLiteBroker(tmp_path / "broker.db")
+    store = ContentStore(tmp_path / "content")
+    coordinator = Coordinator(broker, store, scheduler=_scheduler(tmp_path))
+    job_ids = [coordinator.submit(f"report {i}".encode(), INSTRUCTIONS) for i in range(2)]
+
+    Worker(broker, store, handler=lambda *args: "ok", pools=["interactive"]).run(idle_timeout=0)
+    assert [row["status"] for row in coordinator.wait(job_ids, timeout=1)] == ["done", "done"]
+    assert LatencyModel.from_audit_dir(min_samples=1).to_dict()["small/simple"]["samples"] == 2
+
+
+def test_older_broker_database_is_migrated(tmp_path):
+    path = tmp_path / "broker.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE jobs (job_id TEXT PRIMARY KEY, name TEXT NOT NULL, shard INTEGER NOT NULL, "
+                     "document_digest TEXT NOT NULL, instructions_digest TEXT NOT NULL, options TEXT NOT NULL "
+                     "DEFAULT '{}', status TEXT NOT NULL DEFAULT 'queued', attempts INTEGER NOT NULL DEFAULT 0, "
+                     "max_attempts INTEGER NOT NULL, worker_id TEXT, lease_expires REAL, enqueued_at REAL NOT NULL, "
+                     "started_at REAL, finished_at REAL, result_digest TEXT, error TEXT)")
+    broker = SQLiteBroker(path)
+    assert broker.enqueue("j", "j", 0, "sha256:a", "sha256:b", pool="bulk", expected_ms=10.0)
+    assert broker.lease("w", pools=["bulk"])["pool"] == "bulk"
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from agents.source_driven_agent import SourceDrivenAgent
+from tools.extraction_tool import ExtractionTool
+from tools.source_index import EvidenceIndex, ShingleIndex
+
+SOURCE = (
+    "Graphika identified a network of 11 domains and 16 companion accounts. "
+    "The domain registrar for all 11 domains is Alibaba Cloud Computing Ltd."
+)
+
+
+def test_shingle_index_phrase_lookup():
+    index = ShingleIndex(SOURCE)
+    assert index.contains_phrase(["identified", "a", "network"])
+    assert not index.contains_phrase(["identified", "a", "botnet"])
+    # Shingles never span a sentence boundary
+    assert not index.contains_phrase(["accounts", "the", "domain"])
+
+
+def test_uncovered_sentences_checks_every_sentence():
+    index = ShingleIndex(SOURCE)
+    traced = "The report says the domain registrar for all 11 domains was reused"
+    synthetic = "Operators were funded by an undisclosed government agency in several regions"
+    sentences = [traced] * 10 + [synthetic]
+
+    # The synthetic sentence is last, past the old first-5-sentence cutoff
+    assert index.uncovered_sentences(sentences) == [synthetic]
+
+
+@patch.object(ExtractionTool, '_import_ss1')
+def test_zero_inference_compliance_uses_full_output(mock_import):
+    tool = ExtractionTool(audit=False)
+    output = ". ".join(
+        ["Graphika identified a network of 11 domains and 16 companion accounts"] * 6
+        + ["Operators were funded by an undisclosed government agency in several regions"]
+    )
+
+    violations = tool._check_zero_inference_compliance(output, SOURCE)
+
+    assert len(violations) == 1
+    assert violations[0].startswith("Potentially synthetic content: Operators were funded")
+
+
+def test_evidence_index_returns_exact_offsets():
+    index = EvidenceIndex(SOURCE)
+    start, end = index.locate("Alibaba Cloud Computing Ltd")
+    assert SOURCE[start:end] == "Alibaba Cloud Computing Ltd"
+    assert index.locate("Alibaba Cloud Computing Inc") is None
+    assert index.locate("") is None
+
+
+def test_source_driven_validation_rejects_non_verbatim_evidence():
+    agent = SourceDrivenAgent()
+    intelligence = {
+        "fraud_types": [{"type": "Coordinated network", "source_evidence": "identified a network of 11 domains"}],
+        "financial_impact": [{"value": "11", "source_evidence": "Phrase not found in source"}],
+    }
+
+    validation = agent._validate_against_source(intelligence, SOURCE)
+
+    assert validation["fraud_types_validated"]
+    assert not validation["financial_impact_validated"]
+    assert not validation["all_claims_have_evidence"]
+    offsets = intelligence["fraud_types"][0]["source_offsets"]
+    assert SOURCE[offsets["start"]:offsets["end"]] == "identified a network of 11 domains"
+    assert "source_offsets" not in intelligence["financial_impact"][0]
@@ -0,0 +1,138 @@
+import re
+import sqlite3
+
+import pytest
+
+from src.pdf_processor.rules import CompileOptions, compile_rules
+from src.pdf_processor.sql import (SqlGenerationError, TransactionSchema, generate_sql, load_indicators,
+                                   run_query, verify_indexes)
+
+
+IR = {
+    "indicators": [
+        {"kind": "amount", "verbatim": "$1,998.88", "numeric": 1998.88, "category_id": "payments", "span_id": "s1"},
+        {"kind": "amount", "verbatim": "$250.00", "numeric": 250.0, "category_id": "payments", "span_id": "s2"},
+        {"kind": "link", "literal": "wa.me/123456789", "category_id": "comm", "span_id": "s3"},
+        {"kind": "text", "verbatim": "VOID 2000", "category_id": "fraud_marker", "span_id": "s4"},
+        {"kind": "text", "verbatim": 'say "hi"', "category_id": "fraud_marker", "span_id": "s5"},
+        {"kind": "text", "verbatim": "GC", "category_id": "fraud_marker", "span_id": "s6"},
+    ],
+    "categories": {"payments": {"spans": ["s1", "s2"]}, "comm": {"spans": ["s3"]},
+                   "fraud_marker": {"spans": ["s4", "s5", "s6"]}},
+}
+
+TRANSACTIONS = [
+    (1, 1998.88, "shop.example", "invoice"),
+    (2, 1998.8, "shop.example", "invoice"),
+    (3, 10.0, "wa.me/123456789", "refund"),
+    (4, 10.0, "wa.me/1234567890", "refund"),
+    (5, 10.0, "shop.example", "order VOID 2000 paid"),
+    (6, 10.0, "shop.example", 'they say "hi" twice'),
+    (7, 250.0, "shop.example", "GC code"),
+    (8, 10.0, "shop.example", "void 2000"),
+]
+
+EXPECTED = {(1, "amount", "s1"), (3, "link", "s3"), (5, "text", "s4"), (6, "text", "s5"),
+            (7, "amount", "s2"), (7, "text", "s6")}
+
+
+def _database(generated):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount REAL, link TEXT, memo TEXT)")
+    conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?)", TRANSACTIONS)
+    load_indicators(conn, generated)
+    return conn
+
+
+def _sql(dialect="sqlite", **kwargs):
+    return generate_sql(compile_rules(IR, CompileOptions(targets=["sql"]))["sql"], dialect, **kwargs)
+
+
+def test_default_sql_artifact_is_unchanged():
+    artifact = compile_rules(IR)["sql"]
+    assert set(artifact) == {"table", "rows"}
+
+
+def test_sql_dialect_option_adds_queries():
+    artifact = compile_rules(IR, CompileOptions(targets=["sql"], sql_dialect="postgres"))["sql"]
+    assert artifact["dialect"] == "postgres"
+    assert len(artifact["rows"]) == len(IR["indicators"])
+    assert {"match_amounts", "match_links", "match_text", "match_all"} <= set(artifact["queries"])
+
+
+@pytest.mark.parametrize("text_index", [None, "fts5"])
+def test_sqlite_queries_match_with_provenance(text_index):
+    generated = _sql(text_index=text_index)
+    conn = _database(generated)
+    if text_index:
+        verify_indexes(conn, generated)
+    rows = run_query(conn, generated, "match_all")
+    assert {(tx, kind, span) for tx, kind, _, span, _ in rows} == EXPECTED
+    assert len(rows) == len(EXPECTED)
+
+
+BOUNDARY_IR = {
+    "indicators": [
+        {"kind": "text", "verbatim": "scam", "category_id": "fraud_marker", "span_id": "b1"},
+        {"kind": "text", "verbatim": "$5 fee", "category_id": "fraud_marker", "span_id": "b2"},
+        {"kind": "text", "verbatim": "[*]?", "category_id": "fraud_marker", "span_id": "b3"},
+        {"kind": "text", "verbatim": "go", "category_id": "fraud_marker", "span_id": "b4"},
+    ],
+    "categories": {"fraud_marker": {"spans": ["b1", "b2", "b3", "b4"]}},
+}
+
+BOUNDARY_MEMOS = ["scammer", "a scam.", "scam", "xscam", "scammer then scam", "(scam)", "scam_1", "pay $5 fee",
+                  "pay$5 fee", "$5 fees", "$5 fee\tnow", "tag [*]? here", "tag [*]?x", "x[*]?", "[*]?",
+                  "go-go", "ago", "go\u2028", "gogo go"]
+
+
+@pytest.mark.parametrize("text_index", [None, "fts5"])
+def test_text_hits_follow_regex_boundaries(text_index):
+    artifacts = compile_rules(BOUNDARY_IR, CompileOptions(targets=["regex", "sql"]))
+    generated = generate_sql(artifacts["sql"], "sqlite", text_index=text_index)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount REAL, link TEXT, memo TEXT)")
+    conn.executemany("INSERT INTO transactions VALUES (?, 0, '', ?)", list(enumerate(BOUNDARY_MEMOS)))
+    load_indicators(conn, generated)
+    if text_index:
+        verify_indexes(conn, generated)
+
+    expected = {(tx, rule["meta"]["source_span"]["span_id"]) for tx, memo in enumerate(BOUNDARY_MEMOS)
+                for rule in artifacts["regex"] if re.search(rule["pattern"], memo)}
+    assert {(tx, span) for tx, _, _, span, _ in run_query(conn, generated, "match_text")} == expected
+    assert (0, "b1") not in expected and (4, "b1") in expected  # "scammer" alone does not match
+    assert generated["queries"]["match_text"]["sql"].startswith("-- text: literal with the regex target's boundaries")
+
+
+def test_queries_are_parameterized():
+    generated = _sql()
+    amounts = generated["queries"]["match_amounts"]
+    assert "1998.88" not in amounts["sql"]
+    assert amounts["params"] == [250.0, 1998.88, 250.0, 1998.88]
+    assert amounts["sql"].count("?") == len(amounts["params"])
+    assert "%s" in _sql("postgres")["queries"]["match_amounts"]["sql"]
+
+
+def test_verify_indexes_keeps_used_indexes():
+    generated = _sql()
+    conn = _database(generated)
+    verified = {index["name"]: index for index in verify_indexes(conn, generated)}
+    assert verified["ss2_tx_amount"]["verified"]
+    assert verified["ss2_tx_link"]["verified"]
+    existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert existing == {name for name, index in verified.items() if index["verified"]}
+
+
+def test_dialect_specific_output():
+    assert _sql("duckdb")["indexes"] == []
+    assert "contains(" in _sql("duckdb")["queries"]["match_text"]["sql"]
+    assert any("USING hash" in index["sql"] for index in _sql("postgres")["indexes"])
+
+
+def test_rejects_unknown_dialect_and_unsafe_identifiers():
+    with pytest.raises(SqlGenerationError):
+        _sql("mysql")
+    with pytest.raises(SqlGenerationError):
+        _sql("postgres", text_index="fts5")
+    with pytest.raises(SqlGenerationError):
+        _sql(schema=TransactionSchema(table="tx; DROP TABLE x"))
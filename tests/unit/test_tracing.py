@@ -0,0 +1,101 @@
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from metrics import tracing
+from tools.base_tool import BaseTool, audit_timestamp
+
+
+class EchoTool(BaseTool):
+    name = "echo_tool"
+
+    def _run(self, text: str = "", **kwargs):
+        return text
+
+
+@pytest.fixture
+def enabled():
+    tracing.registry.reset()
+    tracing.finished_spans.clear()
+    tracing.enable()
+    yield tracing
+    tracing.disable()
+    tracing.registry.reset()
+    tracing.finished_spans.clear()
+
+
+def test_disabled_spans_are_noops():
+    tracing.disable()
+    with tracing.span("tool.run", tool="x") as span:
+        assert tracing.current_span() is None
+    assert span is tracing.span("other")
+    tracing.inc("ss2_test_events")
+    assert tracing.registry.counter_value("ss2_test_events") == 0
+
+
+def test_spans_nest_and_record_metrics(enabled):
+    with tracing.span("agent.execute", agent="a") as outer:
+        with tracing.span("agent.analyze", agent="a") as inner:
+            assert tracing.current_span() is inner
+    with pytest.raises(RuntimeError):
+        with tracing.span("agent.decide", agent="a"):
+            raise RuntimeError("boom")
+
+    records = {record.name: record for record in tracing.finished_spans}
+    assert records["agent.analyze"].parent_id == outer.span_id
+    assert records["agent.analyze"].trace_id == records["agent.execute"].trace_id
+    assert records["agent.decide"].status == "error"
+    assert tracing.registry.counter_value("ss2_spans", span="agent.decide", agent="a", status="error") == 1
+    assert tracing.registry.histogram("ss2_span_duration_seconds", span="agent.execute", agent="a").count == 1
+
+
+def test_tool_execution_emits_phase_spans(enabled, tmp_path):
+    tool = EchoTool(audit=False)
+    with patch.object(BaseTool, "_validate_source_traceability"):
+        assert tool.execute(text="hello").data == "hello"
+
+    spans = [record for record in tracing.finished_spans if record.labels.get("tool") == "echo_tool"]
+    parent = next(record for record in spans if record.name == "tool.execute")
+    assert [record.name for record in spans if record.parent_id == parent.span_id] == [
+        "tool.validate_inputs", "tool.run", "tool.validate_outputs", "tool.validate_traceability",
+    ]
+
+
+def test_exposition_formats(enabled):
+    tracing.inc("ss2_cache_requests", result="hit")
+    tracing.observe("ss2_span_duration_seconds", 0.02, span="tool.run")
+
+    prometheus = tracing.render_prometheus()
+    assert "# TYPE ss2_cache_requests_total counter" in prometheus
+    assert 'ss2_cache_requests_total{result="hit"} 1' in prometheus
+    assert 'ss2_span_duration_seconds_bucket{span="tool.run",le="0.025"} 1' in prometheus
+    assert 'ss2_span_duration_seconds_bucket{span="tool.run",le="+Inf"} 1' in prometheus
+
+    openmetrics = tracing.render_openmetrics()
+    assert "# TYPE ss2_cache_requests counter" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+
+def test_http_endpoint_and_file_export(enabled, tmp_path):
+    tracing.inc("ss2_documents", stage="test")
+    server = tracing.start_http_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'ss2_documents_total{stage="test"} 1' in body
+
+    path = tracing.write_openmetrics(tmp_path / "metrics.prom")
+    assert path.read_text().endswith("# EOF\n")
+
+
+def test_audit_timestamp_formats_once_per_second():
+    with patch("tools.base_tool.time.time", return_value=1_700_000_000.2), \
+         patch("tools.base_tool.time.strftime", wraps=__import__("time").strftime) as strftime:
+        first = audit_timestamp()
+        second = audit_timestamp()
+    assert first == second
+    assert strftime.call_count <= 1
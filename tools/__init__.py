@@ -12,8 +12,13 @@ from .base_tool import BaseTool, ToolResult, ToolExecutionRecord
 from .pdf_tool import PDFTool
 from .extraction_tool import ExtractionTool
 from .enhanced_extraction_tool import EnhancedExtractionTool
+from .consensus_extraction_tool import ConsensusExtractionTool
 from .intelligence_extractor import IntelligenceExtractor
 from .dynamic_rule_generator import DynamicRuleGenerator
+from .result_cache import ResultCache
+from .near_duplicate import NearDuplicateIndex
+from .document_view import DocumentView
+from .document_stats import DocumentStats
 
 __all__ = [
     'BaseTool',
@@ -22,6 +27,11 @@ __all__ = [
     'PDFTool',
     'ExtractionTool',
     'EnhancedExtractionTool',
+    'ConsensusExtractionTool',
     'IntelligenceExtractor',
     'DynamicRuleGenerator',
+    'ResultCache',
+    'NearDuplicateIndex',
+    'DocumentView',
+    'DocumentStats',
 ]
\ No newline at end of file
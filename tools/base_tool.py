@@ -19,6 +19,10 @@ from typing import Any, Dict, Optional, List
 import os
 import logging
 
+from metrics import tracing
+from metrics.memory import MemoryTracker, budget_bytes, tracking_mode
+from audit.serialization import get_serializer
+
 # Configure audit logging
 AUDIT_DIR = Path(os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
 AUDIT_DIR.mkdir(parents=True, exist_ok=True)
@@ -27,6 +31,26 @@ AUDIT_DIR.mkdir(parents=True, exist_ok=True)
 logger = logging.getLogger('safety_sigma.tools')
 logger.setLevel(os.getenv('SS2_LOG_LEVEL', 'INFO'))
 
+# Last formatted audit timestamp: (epoch second, text)
+_audit_timestamp_cache = (-1, '')
+
+
+def audit_timestamp() -> str:
+    """
+    Timestamp for audit trail entries (HH:MM:SS, local time)
+    
+    Entries have one-second resolution, so the string is formatted once per
+    second and reused for every entry written within that second.
+    """
+    global _audit_timestamp_cache
+    now = int(time.time())
+    second, text = _audit_timestamp_cache
+    if second != now:
+        text = time.strftime('%H:%M:%S', time.localtime(now))
+        _audit_timestamp_cache = (now, text)
+    return text
+
+
 @dataclass
 class ToolExecutionRecord:
     """
@@ -45,9 +69,9 @@ class ToolExecutionRecord:
     metadata: Dict[str, Any] = field(default_factory=dict)
     compliance_flags: Dict[str, bool] = field(default_factory=dict)
     
-    def to_json(self) -> str:
-        """Serialize record to JSON for audit logging"""
-        return json.dumps({
+    def to_dict(self) -> Dict[str, Any]:
+        """Record as a JSON-compatible dictionary"""
+        return {
             "tool_name": self.tool_name,
             "tool_version": self.tool_version,
             "run_id": self.run_id,
@@ -61,7 +85,11 @@ class ToolExecutionRecord:
             "metadata": self.metadata,
             "compliance_flags": self.compliance_flags,
             "timestamp_iso": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.start_time)),
-        }, ensure_ascii=False, indent=2)
+        }
+    
+    def to_json(self) -> str:
+        """Serialize record to JSON for audit logging"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
 
 
 @dataclass
@@ -79,8 +107,7 @@ class ToolResult:
     
     def add_audit_entry(self, entry: str) -> None:
         """Add entry to audit trail"""
-        timestamp = time.strftime('%H:%M:%S.%f')[:-3]
-        self.audit_trail.append(f"[{timestamp}] {entry}")
+        self.audit_trail.append(f"[{audit_timestamp()}] {entry}")
 
 
 class BaseTool(abc.ABC):
@@ -112,9 +139,14 @@ class BaseTool(abc.ABC):
         self.source_traceability = os.getenv('SS2_REQUIRE_SOURCE_TRACEABILITY', 'true').lower() == 'true'
         self.fail_on_validation = os.getenv('SS2_FAIL_ON_VALIDATION_ERROR', 'true').lower() == 'true'
         
+        # Memory accounting (peak per execution) and per-document budget
+        self.memory_tracking = tracking_mode()
+        self.memory_budget = budget_bytes()
+        
         # Set up tool-specific logger
         self.logger = logging.getLogger(f'safety_sigma.tools.{self.name}')
         
+    @tracing.traced_method('tool.execute', tool='name')
     def execute(self, **kwargs) -> ToolResult:
         """
         Execute the tool with comprehensive audit logging and validation
@@ -132,13 +164,15 @@ class BaseTool(abc.ABC):
         
         # Create result object for audit trail
         result = ToolResult(data=None)
+        memory = MemoryTracker(self.memory_tracking, self.memory_budget)
         result.add_audit_entry(f"Tool execution started: {self.name} v{self.version}")
         result.add_audit_entry(f"Run ID: {run_id}")
         
         try:
             # Pre-execution validation
             result.add_audit_entry("Validating inputs...")
-            self._validate_inputs(kwargs, result)
+            with tracing.span('tool.validate_inputs', tool=self.name):
+                self._validate_inputs(kwargs, result)
             
             if self.zero_inference:
                 result.add_audit_entry("Zero-inference mode: ENABLED")
@@ -146,19 +180,22 @@ class BaseTool(abc.ABC):
             
             # Execute the tool
             result.add_audit_entry("Executing tool logic...")
-            result_data = self._run(**kwargs)
+            with tracing.span('tool.run', tool=self.name), memory:
+                result_data = self._run(**kwargs)
             
             # Store kwargs metadata for tools that need it
             result.metadata.update({k: v for k, v in kwargs.items() if k.endswith('_mode')})
             
             # Post-execution validation
             result.add_audit_entry("Validating outputs...")
-            self._validate_outputs(result_data, result)
+            with tracing.span('tool.validate_outputs', tool=self.name):
+                self._validate_outputs(result_data, result)
             
             # Check compliance requirements
             if self.source_traceability:
                 result.add_audit_entry("Checking source traceability...")
-                self._validate_source_traceability(kwargs, result_data, result)
+                with tracing.span('tool.validate_traceability', tool=self.name):
+                    self._validate_source_traceability(kwargs, result_data, result)
                 result.compliance_status['source_traceability'] = True
             
             result.data = result_data
@@ -181,6 +218,14 @@ class BaseTool(abc.ABC):
             end = time.time()
             result.execution_time_ms = (end - start) * 1000.0
             
+            if memory.usage:
+                result.metadata['memory'] = memory.usage.to_dict()
+                if memory.usage.over_budget:
+                    result.add_audit_entry(
+                        f"Warning: peak memory {memory.usage.peak_bytes / (1024*1024):.1f}MB "
+                        f"exceeded budget {memory.usage.budget_bytes / (1024*1024):.1f}MB"
+                    )
+            
             # Create comprehensive audit record
             if self.audit:
                 record = ToolExecutionRecord(
@@ -197,7 +242,10 @@ class BaseTool(abc.ABC):
                     metadata=self._get_metadata(kwargs, result_data),
                     compliance_flags=result.compliance_status
                 )
-                self._write_audit_record(record)
+                if memory.usage:
+                    record.metadata['memory'] = result.metadata['memory']
+                with tracing.span('tool.audit', tool=self.name):
+                    self._write_audit_record(record)
                 result.add_audit_entry(f"Audit record written: {record.run_id}")
         
         return result
@@ -359,14 +407,13 @@ class BaseTool(abc.ABC):
             record: Execution record to log
         """
         try:
-            # Write individual tool audit record
-            audit_file = AUDIT_DIR / f"{record.tool_name}_{record.run_id}.json"
-            audit_file.write_text(record.to_json(), encoding="utf-8")
-            
-            # Also append to daily audit log
-            daily_log = AUDIT_DIR / f"audit_{time.strftime('%Y-%m-%d')}.jsonl"
-            with open(daily_log, 'a', encoding='utf-8') as f:
-                f.write(record.to_json().replace('\n', '') + '\n')
+            # Encode once; write the individual tool audit record and append to the daily audit log
+            serializer = get_serializer()
+            serializer.write(
+                record.to_dict(),
+                record_path=serializer.record_path(AUDIT_DIR, f"{record.tool_name}_{record.run_id}"),
+                log_path=serializer.log_path(AUDIT_DIR, f"audit_{time.strftime('%Y-%m-%d')}"),
+            )
                 
         except Exception as e:
             self.logger.error(f"Failed to write audit record: {e}")
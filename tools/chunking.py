@@ -0,0 +1,67 @@
+"""
+Text Chunking for Safety Sigma 2.0
+
+Splits long documents into bounded chunks on structural boundaries so they
+can be processed independently. Chunks keep their character offsets into
+the original text for provenance.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+
+# Boundaries tried in order of preference when closing a chunk
+CHUNK_BOUNDARIES = ('\n\n', '\n', '. ', ' ')
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """
+    Contiguous slice of a source document
+    """
+    index: int
+    start: int
+    end: int
+    text: str
+
+    def to_dict(self) -> dict:
+        """Provenance record for the chunk (without its text)"""
+        return {'index': self.index, 'start': self.start, 'end': self.end, 'length': self.end - self.start}
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[TextChunk]:
+    """
+    Split text into chunks of at most max_chars characters
+
+    Each chunk ends at the last paragraph break within the limit, falling back
+    to a line break, a sentence end, a space and finally a hard cut. Chunks
+    cover the text exactly: concatenating them reproduces the original.
+
+    Args:
+        text: Source text
+        max_chars: Maximum chunk length in characters
+
+    Returns:
+        Chunks in document order
+    """
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+
+    chunks: List[TextChunk] = []
+    start = 0
+    length = len(text)
+
+    while start < length:
+        end = min(start + max_chars, length)
+
+        if end < length:
+            for boundary in CHUNK_BOUNDARIES:
+                cut = text.rfind(boundary, start, end)
+                if cut > start:
+                    end = cut + len(boundary)
+                    break
+
+        chunks.append(TextChunk(index=len(chunks), start=start, end=end, text=text[start:end]))
+        start = end
+
+    return chunks
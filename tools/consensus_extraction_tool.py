@@ -0,0 +1,416 @@
+"""
+Consensus Extraction Tool for Safety Sigma 2.0
+
+Phase 3.0 consensus: the same text is sent to several extraction backends
+("voters") concurrently and their results are merged by source span offsets.
+
+Voters:
+- SS1Backend: Safety Sigma 1.0 processor; its output is grounded by locating
+  the verbatim fragments it quotes in the source
+- IntelligenceBackend: regex-only IntelligenceExtractor patterns
+- CallableBackend: any local function returning spans (stubs, small models)
+
+Strategies:
+- intersection: spans reported by every voter that answered
+- union: spans reported by any voter
+- weighted: spans whose voters' weights reach a threshold share of the
+  total weight of the voters that answered
+
+Voters run in parallel with a shared deadline, so latency is that of the
+slowest voter that answers in time; slower voters are recorded as timed out
+and left out of the vote instead of blocking it. Each voter gets its own
+thread pool, bounded by SS2_WORKERS and the voter's max_concurrency, so a
+chunked document never sends more than that many calls at once to a backend.
+
+Configuration:
+    SS2_CONSENSUS_STRATEGY  - 'intersection', 'union' or 'weighted' (default: weighted)
+    SS2_CONSENSUS_TIMEOUT   - Seconds to wait for voters (default: 30)
+    SS2_CONSENSUS_THRESHOLD - Weighted-vote share required to keep a span (default: 0.5)
+    SS2_WORKERS             - Concurrent calls per voter (default: CPU count)
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .base_tool import BaseTool, ToolResult
+from .chunking import split_into_chunks
+from .intelligence_extractor import IntelligenceExtractor
+
+
+CONSENSUS_STRATEGIES = ('intersection', 'union', 'weighted')
+
+# Fragments shorter than this are too ambiguous to ground SS1 output in the source
+MIN_FRAGMENT_LENGTH = 4
+
+# Quoted text, or the value after a markdown bullet / "**Label:**" prefix
+_QUOTED = re.compile(r'"([^"\n]+)"|`([^`\n]+)`|“([^”\n]+)”')
+_LINE_PREFIX = re.compile(r'^\s*(?:[-*+]|\d+\.)?\s*(?:\*\*[^*]+\*\*:?\s*|[A-Za-z][\w /-]{0,40}:\s+)?')
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    Extracted source span reported by a voter
+    """
+    start: int
+    end: int
+    kind: str
+    text: str
+
+    def shifted(self, offset: int) -> 'Span':
+        """Same span with offsets moved by offset (chunk to document coordinates)"""
+        return Span(self.start + offset, self.end + offset, self.kind, self.text)
+
+
+class ConsensusBackend:
+    """
+    Extraction backend taking part in the vote
+
+    Subclasses implement extract() and return spans with offsets into the
+    text they were given. max_concurrency limits the calls in flight to
+    this backend (e.g. an API rate limit); None uses the tool's limit.
+    """
+    name: str = "backend"
+
+    def __init__(self, weight: float = 1.0, max_concurrency: Optional[int] = None):
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+
+    def extract(self, instructions: str, text: str) -> List[Span]:
+        raise NotImplementedError(f"Backend {self.name} must implement extract")
+
+
+class IntelligenceBackend(ConsensusBackend):
+    """Regex-only backend: every IntelligenceExtractor pattern match is a span"""
+    name = "intelligence_extractor"
+
+    def __init__(self, weight: float = 1.0, extractor: Optional[IntelligenceExtractor] = None,
+                 max_concurrency: Optional[int] = None):
+        super().__init__(weight, max_concurrency)
+        self.extractor = extractor or IntelligenceExtractor()
+        self._patterns = [(kind, re.compile(pattern)) for kind, pattern in self.extractor.patterns.items()]
+
+    def extract(self, instructions: str, text: str) -> List[Span]:
+        return [Span(m.start(), m.end(), kind, m.group())
+                for kind, pattern in self._patterns for m in pattern.finditer(text)]
+
+
+class SS1Backend(ConsensusBackend):
+    """
+    Safety Sigma 1.0 processor as a voter
+
+    SS1 returns free text, so it votes for the source spans of the fragments
+    it quotes: quoted strings and the values of bullet / label lines that
+    occur verbatim in the source. Anything not found verbatim casts no vote.
+    """
+    name = "ss1"
+
+    def __init__(self, processor: Any, weight: float = 1.0, max_concurrency: Optional[int] = None):
+        super().__init__(weight, max_concurrency)
+        self.processor = processor
+
+    @classmethod
+    def from_path(cls, ss1_path: Union[str, Path], weight: float = 1.0,
+                  max_concurrency: Optional[int] = None) -> 'SS1Backend':
+        """Import the SS1 processor from an installation path (raises ImportError if unavailable)"""
+        ss1_path = str(Path(ss1_path).resolve())
+        if ss1_path not in sys.path:
+            sys.path.insert(0, ss1_path)
+        from safety_sigma_processor import SafetySigmaProcessor
+        return cls(SafetySigmaProcessor(api_key=os.getenv('OPENAI_API_KEY', 'mock-key-for-testing')), weight,
+                   max_concurrency)
+
+    def extract(self, instructions: str, text: str) -> List[Span]:
+        return ground_fragments(self.processor.process_report(instructions, text), text, kind=self.name)
+
+
+class CallableBackend(ConsensusBackend):
+    """
+    Local function as a voter
+
+    The function takes (instructions, text) and returns Span objects or
+    (start, end[, kind]) tuples.
+    """
+
+    def __init__(self, name: str, func: Callable[[str, str], Iterable[Any]], weight: float = 1.0,
+                 max_concurrency: Optional[int] = None):
+        super().__init__(weight, max_concurrency)
+        self.name = name
+        self.func = func
+
+    def extract(self, instructions: str, text: str) -> List[Span]:
+        spans = []
+        for item in self.func(instructions, text):
+            if not isinstance(item, Span):
+                start, end, kind = (tuple(item) + (self.name,))[:3]
+                item = Span(start, end, kind, text[start:end])
+            spans.append(item)
+        return spans
+
+
+def ground_fragments(output: str, source: str, kind: str = 'ss1') -> List[Span]:
+    """
+    Source spans of the fragments an extraction output quotes
+
+    Args:
+        output: Free-text backend output
+        source: Text the backend was given
+        kind: Kind assigned to the spans
+
+    Returns:
+        One span per occurrence in source of each distinct fragment
+    """
+    fragments = set()
+    for line in output.splitlines():
+        for match in _QUOTED.finditer(line):
+            fragments.add(next(group for group in match.groups() if group).strip())
+        fragments.add(_LINE_PREFIX.sub('', line).strip().rstrip('.'))
+
+    spans = []
+    for fragment in fragments:
+        if len(fragment) < MIN_FRAGMENT_LENGTH:
+            continue
+        start = source.find(fragment)
+        while start >= 0:
+            spans.append(Span(start, start + len(fragment), kind, fragment))
+            start = source.find(fragment, start + len(fragment))
+    return spans
+
+
+def merge_votes(votes: Dict[str, List[Span]], weights: Dict[str, float], strategy: str,
+                threshold: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    Merge voter spans by (start, end) offsets
+
+    Args:
+        votes: Spans per voter that answered
+        weights: Weight per voter
+        strategy: 'intersection', 'union' or 'weighted'
+        threshold: Share of the answering voters' weight a span needs (weighted)
+
+    Returns:
+        Kept spans in document order with the voters, kinds and score of each
+    """
+    if strategy not in CONSENSUS_STRATEGIES:
+        raise ValueError(f"Unknown consensus strategy: {strategy}. Supported: {CONSENSUS_STRATEGIES}")
+
+    total = sum(weights[name] for name in votes) or 1.0
+    merged: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for name, spans in votes.items():
+        for span in spans:
+            entry = merged.setdefault((span.start, span.end), {
+                'start': span.start, 'end': span.end, 'text': span.text, 'kinds': set(), 'voters': set(),
+            })
+            entry['kinds'].add(span.kind)
+            entry['voters'].add(name)
+
+    kept = []
+    for key in sorted(merged):
+        entry = merged[key]
+        score = sum(weights[name] for name in entry['voters']) / total
+        if strategy == 'intersection':
+            keep = len(entry['voters']) == len(votes)
+        elif strategy == 'union':
+            keep = True
+        else:
+            keep = score >= threshold
+        if keep:
+            entry.update(kinds=sorted(entry['kinds']), voters=sorted(entry['voters']), score=round(score, 4))
+            kept.append(entry)
+    return kept
+
+
+class ConsensusExtractionTool(BaseTool):
+    """
+    Cross-validated extraction over several concurrent backends
+
+    Output is a dictionary with the kept spans (document offsets) and a
+    per-voter status: 'ok', 'timeout' or 'error', with latency and span count.
+    """
+
+    name = "consensus_extraction_tool"
+    version = "1.0.0"
+    required_params = ["instructions", "text_content"]
+    allow_none_output = False
+
+    def __init__(self, backends: Optional[List[ConsensusBackend]] = None, strategy: Optional[str] = None,
+                 timeout: Optional[float] = None, threshold: Optional[float] = None,
+                 ss1_path: Optional[str] = None, max_workers: Optional[int] = None, **kwargs):
+        """
+        Initialize consensus tool
+
+        Args:
+            backends: Voters (default: SS1 if importable, plus the regex IntelligenceExtractor)
+            strategy: Merge strategy (default: SS2_CONSENSUS_STRATEGY)
+            timeout: Seconds to wait for voters (default: SS2_CONSENSUS_TIMEOUT)
+            threshold: Weighted-vote threshold (default: SS2_CONSENSUS_THRESHOLD)
+            ss1_path: Path to Safety Sigma 1.0 installation for the default SS1 voter
+            max_workers: Concurrent calls per voter (default: SS2_WORKERS or CPU count)
+            **kwargs: Additional base tool arguments
+        """
+        super().__init__(**kwargs)
+
+        self.strategy = (strategy or os.getenv('SS2_CONSENSUS_STRATEGY', 'weighted')).lower()
+        if self.strategy not in CONSENSUS_STRATEGIES:
+            raise ValueError(f"Unknown consensus strategy: {self.strategy}. Supported: {CONSENSUS_STRATEGIES}")
+        self.timeout = timeout if timeout is not None else float(os.getenv('SS2_CONSENSUS_TIMEOUT', '30'))
+        self.threshold = threshold if threshold is not None else \
+                         float(os.getenv('SS2_CONSENSUS_THRESHOLD', '0.5'))
+        self.chunk_size = int(os.getenv('SS2_CHUNK_SIZE', '100000'))
+        if max_workers is None:
+            max_workers = int(os.getenv('SS2_WORKERS', '0') or 0) or os.cpu_count() or 1
+        self.max_workers = max(1, max_workers)
+
+        self.unavailable: Dict[str, str] = {}
+        if backends is None:
+            backends = [IntelligenceBackend()]
+            ss1_path = ss1_path or os.getenv('SS1_PATH', '../Desktop/safety_sigma/phase_1')
+            try:
+                backends.insert(0, SS1Backend.from_path(ss1_path))
+            except ImportError as e:
+                self.unavailable['ss1'] = str(e)
+                self.logger.info(f"SS1 voter unavailable: {e}")
+        names = [backend.name for backend in backends]
+        if not backends or len(set(names)) != len(names):
+            raise ValueError(f"Consensus needs at least one backend with unique names, got {names}")
+        self.backends = backends
+
+    def _validate_inputs(self, inputs: Dict[str, Any], result: ToolResult) -> None:
+        """
+        Validate consensus input parameters
+
+        Args:
+            inputs: Input parameters including instructions and text_content
+            result: Result object for audit trail
+        """
+        super()._validate_inputs(inputs, result)
+
+        text_content = inputs.get('text_content')
+        if not isinstance(text_content, str) or not text_content.strip():
+            error_msg = "Text content must be a non-empty string"
+            result.add_audit_entry(f"Content validation failed: {error_msg}")
+            raise ValueError(error_msg)
+
+        result.metadata.update({
+            'consensus_strategy': self.strategy,
+            'consensus_voters': [backend.name for backend in self.backends],
+            'content_length': len(text_content),
+        })
+        result.add_audit_entry(f"Input validation passed: {len(self.backends)} voters, strategy {self.strategy}")
+
+    def _validate_outputs(self, output: Any, result: ToolResult) -> None:
+        """
+        Check every kept span is verbatim source text
+
+        Args:
+            output: Consensus result
+            result: Result object for audit trail
+        """
+        super()._validate_outputs(output, result)
+
+        source = getattr(self, '_current_source_content', '')
+        ungrounded = [span for span in output['spans'] if source[span['start']:span['end']] != span['text']]
+        if ungrounded:
+            error_msg = f"{len(ungrounded)} consensus spans do not match the source text"
+            result.add_audit_entry(f"Output validation failed: {error_msg}")
+            raise ValueError(error_msg)
+
+        result.metadata['consensus'] = {'voters': output['voters'], 'span_count': len(output['spans'])}
+        result.add_audit_entry(f"Output validation passed: {len(output['spans'])} spans kept by {self.strategy} vote")
+
+    def _run(self, instructions: str, text_content: str, **kwargs) -> Dict[str, Any]:
+        """
+        Fan the text (or its chunks) out to all voters and merge their spans
+
+        Args:
+            instructions: Extraction instructions
+            text_content: Source text
+            **kwargs: chunked (split into SS2_CHUNK_SIZE chunks first)
+
+        Returns:
+            {'strategy', 'spans', 'voters'}
+        """
+        self._current_source_content = text_content
+        chunks = split_into_chunks(text_content, self.chunk_size) if kwargs.get('chunked') else None
+        pieces = [(chunk.start, chunk.text) for chunk in chunks] if chunks else [(0, text_content)]
+
+        statuses = {backend.name: {'status': 'ok', 'latency_ms': 0.0, 'span_count': 0, 'weight': backend.weight}
+                    for backend in self.backends}
+        statuses.update({name: {'status': 'unavailable', 'error': error} for name, error in self.unavailable.items()})
+        votes: Dict[str, List[Span]] = {backend.name: [] for backend in self.backends}
+
+        def vote(backend: ConsensusBackend, text: str) -> Tuple[List[Span], float]:
+            start = time.perf_counter()
+            spans = backend.extract(instructions, text)
+            return spans, (time.perf_counter() - start) * 1000.0
+
+        # One pool per voter, so a rate-limited voter never holds up the others.
+        # Not context managers: leaving them would wait for voters that timed out
+        executors = {
+            backend.name: ThreadPoolExecutor(
+                max_workers=min(len(pieces), backend.max_concurrency or self.max_workers, self.max_workers),
+                thread_name_prefix=f"{self.name}-{backend.name}")
+            for backend in self.backends
+        }
+        try:
+            futures = {executors[backend.name].submit(vote, backend, text): (backend, offset)
+                       for offset, text in pieces for backend in self.backends}
+            done, _ = wait(futures, timeout=self.timeout)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        for future, (backend, offset) in futures.items():
+            status = statuses[backend.name]
+            if status['status'] != 'ok':
+                continue
+            if future not in done:
+                status.update(status='timeout', latency_ms=self.timeout * 1000.0)
+            elif future.exception() is not None:
+                status.update(status='error', error=f"{type(future.exception()).__name__}: {future.exception()}")
+            else:
+                spans, latency_ms = future.result()
+                votes[backend.name].extend(span.shifted(offset) for span in spans)
+                status['latency_ms'] = max(status['latency_ms'], round(latency_ms, 3))
+
+        answered = {name: spans for name, spans in votes.items() if statuses[name]['status'] == 'ok'}
+        for name, spans in answered.items():
+            statuses[name]['span_count'] = len(spans)
+        if not answered:
+            raise RuntimeError(f"No consensus voter answered within {self.timeout}s: "
+                               f"{ {name: s['status'] for name, s in statuses.items()} }")
+
+        weights = {backend.name: backend.weight for backend in self.backends}
+        return {
+            'strategy': self.strategy,
+            'spans': merge_votes(answered, weights, self.strategy, self.threshold),
+            'voters': statuses,
+        }
+
+    def _get_metadata(self, inputs: Dict[str, Any], output: Any) -> Dict[str, Any]:
+        """
+        Generate consensus-specific metadata
+
+        Args:
+            inputs: Input parameters
+            output: Consensus result
+
+        Returns:
+            Tool metadata with voter outcomes
+        """
+        metadata = super()._get_metadata(inputs, output)
+        metadata["tool_specific"] = {
+            "strategy": self.strategy,
+            "threshold": self.threshold if self.strategy == 'weighted' else None,
+            "timeout_s": self.timeout,
+            "max_workers": self.max_workers,
+            "voters": output['voters'] if isinstance(output, dict) else
+                      {backend.name: {'weight': backend.weight} for backend in self.backends},
+        }
+        return metadata
@@ -0,0 +1,141 @@
+"""
+Document Statistics for Safety Sigma 2.0
+
+One statistics pass over a document: word, sentence, paragraph and line
+counts, keyword hits and structural flags. The result is a typed, immutable
+DocumentStats that agents consume instead of rescanning (and re-lowercasing
+or re-splitting) the text for every check.
+
+The keyword groups and scoring are defined here only; the analyze_document_*
+helpers in agents.base_agent are thin wrappers over DocumentStats.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Tuple, Union
+
+from .document_view import DocumentView
+
+
+# Keyword groups used for document type detection, in priority order
+TYPE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'fraud_analysis': ('fraud', 'scam', 'phishing', 'deception', 'fake', 'suspicious'),
+    'threat_intelligence': ('threat', 'attack', 'malware', 'vulnerability', 'exploit', 'breach'),
+    'policy_analysis': ('policy', 'compliance', 'regulation', 'guideline', 'standard'),
+}
+
+# Technical terminology used for complexity assessment
+TECHNICAL_TERMS: Tuple[str, ...] = ('api', 'url', 'ip address', 'hash', 'encryption', 'protocol')
+
+SENTENCE_TERMINATORS = ('.', '!', '?')
+
+
+@dataclass(frozen=True)
+class DocumentStats:
+    """
+    Precomputed statistics for one document
+    """
+    char_count: int
+    word_count: int
+    sentence_count: int
+    paragraph_count: int
+    line_count: int
+    keyword_hits: Dict[str, Tuple[str, ...]]
+    technical_hits: Tuple[str, ...]
+    has_headers: bool
+    has_lists: bool
+    has_structured_data: bool
+    has_technical_formatting: bool
+
+    @classmethod
+    def compute(cls, content: Union[str, DocumentView]) -> 'DocumentStats':
+        """
+        Compute statistics for a document
+
+        The text is lowercased and split once (cached on the view, so other
+        consumers of the same view reuse them); every keyword and
+        structural check then runs over those shared forms.
+
+        Args:
+            content: Document text or shared DocumentView
+
+        Returns:
+            DocumentStats for the document
+        """
+        view = DocumentView.of(content)
+        text = view.text
+        lower = view.lower
+
+        keyword_hits = {
+            group: tuple(keyword for keyword in keywords if keyword in lower)
+            for group, keywords in TYPE_KEYWORDS.items()
+        }
+
+        return cls(
+            char_count=len(text),
+            word_count=view.word_count,
+            sentence_count=sum(text.count(terminator) for terminator in SENTENCE_TERMINATORS),
+            paragraph_count=view.paragraph_count,
+            line_count=view.line_count,
+            keyword_hits=keyword_hits,
+            technical_hits=tuple(term for term in TECHNICAL_TERMS if term in lower),
+            has_headers='#' in text,
+            has_lists='-' in text or '*' in text or '\n•' in text,
+            has_structured_data='{' in text and '}' in text,
+            has_technical_formatting='`' in text,
+        )
+
+    @property
+    def avg_line_length(self) -> float:
+        """Average characters per line"""
+        return self.char_count / self.line_count
+
+    def document_type(self) -> Tuple[str, float]:
+        """
+        Determine document type from keyword hits
+
+        Returns:
+            Tuple of (document_type, confidence_score)
+        """
+        word_threshold = max(2, self.word_count * 0.02)  # At least 2% or 2 words minimum
+
+        for document_type, hits in self.keyword_hits.items():
+            if len(hits) >= word_threshold:
+                return document_type, min(0.95, len(hits) / word_threshold)
+        return "general_analysis", 0.7
+
+    def complexity(self) -> Tuple[str, float]:
+        """
+        Determine complexity level from word count and technical terms
+
+        Returns:
+            Tuple of (complexity_level, confidence_score)
+        """
+        if self.word_count < 500:
+            return "simple", 0.9
+        if self.word_count < 2000 and len(self.technical_hits) < 5:
+            return "moderate", 0.8
+        return "complex", 0.85
+
+    def structure(self) -> Dict[str, Any]:
+        """
+        Structure characteristics (same keys as analyze_document_structure)
+
+        Returns:
+            Dictionary with structure analysis
+        """
+        return {
+            'has_headers': self.has_headers,
+            'has_lists': self.has_lists,
+            'has_structured_data': self.has_structured_data,
+            'line_count': self.line_count,
+            'paragraph_count': self.paragraph_count,
+            'avg_line_length': self.avg_line_length,
+            'has_technical_formatting': self.has_technical_formatting,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize statistics for audit records"""
+        data = asdict(self)
+        data['keyword_hits'] = {group: list(hits) for group, hits in self.keyword_hits.items()}
+        data['technical_hits'] = list(self.technical_hits)
+        return data
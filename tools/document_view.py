@@ -0,0 +1,178 @@
+"""
+Document View for Safety Sigma 2.0
+
+Read-only view over one document's text, shared by the agent analyzers,
+the document classifier, the intelligence extractor, the rule generator and
+the zero-inference check. Derived forms (lowercase text, tokens, line and
+paragraph offsets) are computed on first use and cached, so each analyzer
+reuses them instead of re-lowercasing, re-splitting and copying the text.
+"""
+
+import re
+from bisect import bisect_right
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .document_stats import DocumentStats
+
+
+_TOKEN_RE = re.compile(r'\S+')
+_PARAGRAPH_BREAK = '\n\n'
+
+
+class DocumentView:
+    """
+    Lazily indexed view over document text
+
+    The original string is held by reference (never copied). Every derived
+    property is computed at most once per view.
+    """
+
+    def __init__(self, text: str):
+        """
+        Create view over document text
+
+        Args:
+            text: Document text
+        """
+        self.text = text
+
+    @classmethod
+    def of(cls, content: Union[str, 'DocumentView']) -> 'DocumentView':
+        """
+        Get a view for content that may already be a view
+
+        Args:
+            content: Document text or existing view
+
+        Returns:
+            The same view, or a new view over the text
+        """
+        return content if isinstance(content, DocumentView) else cls(content or '')
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"DocumentView(length={len(self.text)})"
+
+    # ---------- Cached forms ----------
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text"""
+        return self.text.lower()
+
+    @cached_property
+    def lower_aligned(self) -> bool:
+        """True if offsets in the lowercased text match offsets in the original"""
+        return len(self.lower) == len(self.text)
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Whitespace-separated words (same as text.split())"""
+        return self.text.split()
+
+    @cached_property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words"""
+        return len(self.words)
+
+    @cached_property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of every whitespace-separated token"""
+        return [match.span() for match in _TOKEN_RE.finditer(self.text)]
+
+    @cached_property
+    def line_offsets(self) -> List[int]:
+        """Start offset of every line"""
+        offsets = [0]
+        find = self.text.find
+        position = find('\n')
+        while position >= 0:
+            offsets.append(position + 1)
+            position = find('\n', position + 1)
+        return offsets
+
+    @cached_property
+    def line_count(self) -> int:
+        """Number of lines (newline count + 1)"""
+        return len(self.line_offsets)
+
+    @cached_property
+    def paragraph_offsets(self) -> List[int]:
+        """Start offset of every paragraph (text following each blank-line break)"""
+        offsets = [0]
+        find = self.text.find
+        position = find(_PARAGRAPH_BREAK)
+        while position >= 0:
+            offsets.append(position + len(_PARAGRAPH_BREAK))
+            position = find(_PARAGRAPH_BREAK, position + len(_PARAGRAPH_BREAK))
+        return offsets
+
+    @cached_property
+    def paragraph_count(self) -> int:
+        """Number of paragraphs (count of '\\n\\n' + 1)"""
+        return len(self.paragraph_offsets)
+
+    @cached_property
+    def stats(self) -> 'DocumentStats':
+        """Precomputed document statistics"""
+        from .document_stats import DocumentStats
+        return DocumentStats.compute(self)
+
+    # ---------- Lookups ----------
+
+    def contains_ci(self, phrase: str) -> bool:
+        """Case-insensitive substring test"""
+        return phrase.lower() in self.lower
+
+    def count_ci(self, phrase: str) -> int:
+        """Case-insensitive count of non-overlapping occurrences"""
+        return self.lower.count(phrase.lower())
+
+    def find_ci(self, phrase: str, start: int = 0) -> int:
+        """
+        Case-insensitive search for a phrase
+
+        Args:
+            phrase: Phrase to find
+            start: Offset to start searching from
+
+        Returns:
+            Offset of the first occurrence in the original text, or -1
+        """
+        if self.lower_aligned:
+            return self.lower.find(phrase.lower(), start)
+
+        match = re.compile(re.escape(phrase), re.IGNORECASE).search(self.text, start)
+        return match.start() if match else -1
+
+    def context_around(self, phrase: str, context_length: int) -> Optional[str]:
+        """
+        Text surrounding the first case-insensitive occurrence of a phrase
+
+        Args:
+            phrase: Phrase to find
+            context_length: Total characters of context around the phrase
+
+        Returns:
+            Stripped context, or None if the phrase does not occur
+        """
+        start = self.find_ci(phrase)
+        if start < 0:
+            return None
+        end = start + len(phrase)
+        return self.text[max(0, start - context_length // 2):min(len(self.text), end + context_length // 2)].strip()
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number containing a character offset"""
+        return bisect_right(self.line_offsets, offset)
+
+    def paragraph_index(self, offset: int) -> int:
+        """0-based paragraph index containing a character offset"""
+        return bisect_right(self.paragraph_offsets, offset) - 1
@@ -7,12 +7,14 @@ for operational patterns, indicators, and techniques directly from source materi
 
 import re
 import json
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set, Union
 from collections import defaultdict, Counter
 from dataclasses import dataclass, asdict
 import hashlib
 from datetime import datetime
 
+from tools.document_view import DocumentView
+
 
 @dataclass
 class RuleCondition:
@@ -55,6 +57,7 @@ class DynamicRuleGenerator:
         self.generated_rules = []
         self.extraction_patterns = self._init_extraction_patterns()
         self.rule_templates = self._init_rule_templates()
+        self._current_view: Optional[DocumentView] = None
     
     def _init_extraction_patterns(self) -> Dict[str, Dict[str, str]]:
         """Initialize regex patterns for rule extraction"""
@@ -125,13 +128,13 @@ class DynamicRuleGenerator:
             }
         }
     
-    def generate_rules_from_document(self, document_content: str, document_name: str = "unknown", 
+    def generate_rules_from_document(self, document_content: Union[str, DocumentView], document_name: str = "unknown", 
                                    analyst_instructions: str = "") -> List[DetectionRule]:
         """
         Generate detection rules from document content
         
         Args:
-            document_content: Document text to analyze
+            document_content: Document text to analyze (or a shared DocumentView)
             document_name: Name/identifier for source document
             analyst_instructions: Additional context for rule generation
             
@@ -139,6 +142,8 @@ class DynamicRuleGenerator:
             List of generated detection rules
         """
         self.generated_rules = []
+        self._current_view = DocumentView.of(document_content)
+        document_content = self._current_view.text
         
         # Extract operational patterns
         infrastructure_patterns = self._extract_infrastructure_patterns(document_content)
@@ -621,15 +626,12 @@ class DynamicRuleGenerator:
         return json.dumps(yaml_data, indent=2)
     
     def _find_context_around_phrase(self, content: str, phrase: str, context_length: int) -> str:
-        """Find context around a phrase"""
-        match = re.search(re.escape(phrase), content, re.IGNORECASE)
-        if not match:
-            return f"Context not found for: {phrase}"
-        
-        start = max(0, match.start() - context_length // 2)
-        end = min(len(content), match.end() + context_length // 2)
-        
-        return content[start:end].strip()
+        """Find context around a phrase (using the shared view's cached lowercase text)"""
+        view = self._current_view
+        if view is None or view.text is not content:
+            view = DocumentView(content)
+        context = view.context_around(phrase, context_length)
+        return context if context is not None else f"Context not found for: {phrase}"
     
     def _find_context_around_match(self, content: str, match, context_length: int) -> str:
         """Find context around a regex match"""
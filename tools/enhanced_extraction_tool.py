@@ -12,7 +12,9 @@ from typing import Any, Dict, Optional, List
 from pathlib import Path
 
 from .base_tool import BaseTool, ToolResult
+from .document_view import DocumentView
 from .intelligence_extractor import IntelligenceExtractor
+from .source_index import EvidenceIndex
 
 
 class EnhancedExtractionTool(BaseTool):
@@ -121,7 +123,7 @@ class EnhancedExtractionTool(BaseTool):
         
         # Extract structured intelligence with source evidence
         intelligence = self.intelligence_extractor.extract_intelligence(
-            text_content, 
+            DocumentView.of(text_content), 
             instructions
         )
         
@@ -158,7 +160,9 @@ class EnhancedExtractionTool(BaseTool):
     
     def _validate_source_evidence(self, intelligence: Dict[str, Any], source_content: str) -> Dict[str, bool]:
         """
-        Validate that all extracted intelligence has source evidence
+        Validate that all extracted intelligence has verbatim source evidence
+        
+        Verified items are annotated with 'source_offsets' into the source.
         
         Args:
             intelligence: Extracted structured intelligence
@@ -175,17 +179,17 @@ class EnhancedExtractionTool(BaseTool):
             "all_claims_have_evidence": True
         }
         
-        # Check each category for source evidence
+        # Check each category for verbatim source evidence
+        evidence_index = EvidenceIndex(source_content)
         for category, items in intelligence.items():
             category_key = f"{category}_validated"
             if category_key not in validation:
                 continue
                 
-            for item in items:
-                if not item.get('source_evidence') or item['source_evidence'] == "not found in source":
-                    validation[category_key] = False
-                    validation["all_claims_have_evidence"] = False
-                    self.logger.warning(f"Missing source evidence in {category}: {item.get('type', 'unknown')}")
+            for item in evidence_index.verify_items(items):
+                validation[category_key] = False
+                validation["all_claims_have_evidence"] = False
+                self.logger.warning(f"Missing source evidence in {category}: {item.get('type', 'unknown')}")
         
         return validation
     
@@ -9,10 +9,26 @@ import os
 import sys
 import re
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Union
+
+from metrics.memory import MemoryBudgetExceeded, check_budget, estimate_text_bytes
 
 from .base_tool import BaseTool, ToolResult
+from .source_index import ShingleIndex
+from .result_cache import ResultCache, get_shared_result_cache
+from .near_duplicate import NearDuplicateIndex, get_shared_near_duplicate_index, summarize_diff
+from .chunking import split_into_chunks
+from .document_view import DocumentView
+
+
+# Language patterns indicating inferred rather than extracted content
+SYNTHETIC_PATTERNS = [
+    re.compile(r'\b(based on|according to|appears to|seems to|likely|probably|suggests)\b'),
+    re.compile(r'\b(inferred|concluded|assumed|estimated|approximately)\b'),
+    re.compile(r'\b(it can be|one could|this might|this could)\b'),
+]
 
 
 class ExtractionTool(BaseTool):
@@ -31,16 +47,31 @@ class ExtractionTool(BaseTool):
     required_params = ["instructions", "text_content"]
     allow_none_output = False
     
-    def __init__(self, ss1_path: Optional[str] = None, **kwargs):
+    def __init__(self, ss1_path: Optional[str] = None, result_cache: Optional[ResultCache] = None,
+                 near_duplicate_index: Optional[NearDuplicateIndex] = None, **kwargs):
         """
         Initialize extraction tool with Safety Sigma 1.0 backend
         
         Args:
             ss1_path: Path to Safety Sigma 1.0 installation
+            result_cache: Cache for reusing backend results (default: shared cache if SS2_RESULT_CACHE)
+            near_duplicate_index: Index for reusing near-duplicate results (default: shared index if SS2_NEAR_DUPLICATE_REUSE)
             **kwargs: Additional base tool arguments
         """
         super().__init__(**kwargs)
         
+        self.result_cache = result_cache if result_cache is not None else get_shared_result_cache()
+        self.near_duplicate_index = near_duplicate_index if near_duplicate_index is not None else \
+                                    get_shared_near_duplicate_index()
+        self._current_cache_status: Optional[Dict[str, Any]] = None
+        self._current_near_duplicate: Optional[Dict[str, Any]] = None
+        self._current_chunks: Optional[List[Dict[str, Any]]] = None
+        
+        # Chunked map-reduce extraction for long documents
+        self.chunked = os.getenv('SS2_CHUNKED_EXTRACTION', 'false').lower() == 'true'
+        self.chunk_size = int(os.getenv('SS2_CHUNK_SIZE', '100000'))
+        self.chunk_workers = int(os.getenv('SS2_CHUNK_WORKERS', '4'))
+        
         self.ss1_path = ss1_path or os.getenv('SS1_PATH', '../Desktop/safety_sigma/phase_1')
         self.ss1_path = Path(self.ss1_path).resolve()
         
@@ -88,9 +119,19 @@ class ExtractionTool(BaseTool):
             result.add_audit_entry(f"Content validation failed: {error_msg}")
             raise ValueError(error_msg)
         
-        # Check content size limits
+        # Memory budget pre-flight: switch to chunked mode, or fail fast if even chunks do not fit
+        if self.memory_budget:
+            self._apply_memory_budget(inputs, text_content, result)
+        
+        # Check content size limits (per chunk in chunked mode)
         max_content_size = int(os.getenv('SS2_MAX_CONTENT_SIZE', '1000000'))  # 1MB default
-        if len(text_content) > max_content_size:
+        if self._use_chunking(inputs):
+            if self.chunk_size > max_content_size:
+                error_msg = f"Chunk size too large: {self.chunk_size} > {max_content_size} characters"
+                result.add_audit_entry(f"Size validation failed: {error_msg}")
+                raise ValueError(error_msg)
+            result.metadata['chunked_mode'] = True
+        elif len(text_content) > max_content_size:
             error_msg = f"Content too large: {len(text_content)} > {max_content_size} characters"
             result.add_audit_entry(f"Size validation failed: {error_msg}")
             raise ValueError(error_msg)
@@ -126,7 +167,8 @@ class ExtractionTool(BaseTool):
         # Zero-inference compliance check (skip in simulation mode)
         if self.zero_inference and not is_simulation:
             result.add_audit_entry("Performing zero-inference compliance check...")
-            violations = self._check_zero_inference_compliance(output, result.metadata.get('original_content', ''))
+            source_content = result.metadata.get('original_content') or getattr(self, '_current_source_content', '')
+            violations = self._check_zero_inference_compliance(output, source_content)
             
             if violations:
                 result.compliance_status['zero_inference_violations'] = violations
@@ -151,46 +193,32 @@ class ExtractionTool(BaseTool):
         
         result.add_audit_entry(f"Output validation passed: {len(output)} characters extracted")
 
-    def _check_zero_inference_compliance(self, output: str, source_content: str) -> List[str]:
+    def _check_zero_inference_compliance(self, output: str, source_content: Union[str, DocumentView]) -> List[str]:
         """
         Check for zero-inference compliance violations
         
         Args:
             output: Extracted/generated content
-            source_content: Original source content
+            source_content: Original source content (or a shared DocumentView)
             
         Returns:
             List of compliance violations
         """
         violations = []
         
-        # Convert to lowercase for comparison
-        output_lower = output.lower()
-        source_lower = source_content.lower()
-        
         # Check for common synthetic indicators
-        synthetic_patterns = [
-            r'\b(based on|according to|appears to|seems to|likely|probably|suggests)\b',
-            r'\b(inferred|concluded|assumed|estimated|approximately)\b',
-            r'\b(it can be|one could|this might|this could)\b',
-        ]
-        
-        for pattern in synthetic_patterns:
-            matches = re.findall(pattern, output_lower)
+        output_lower = output.lower()
+        for pattern in SYNTHETIC_PATTERNS:
+            matches = pattern.findall(output_lower)
             if matches:
                 violations.append(f"Synthetic language detected: {matches}")
         
-        # Check for content not present in source (basic span checking)
-        # Extract potential facts/claims from output
+        # Check for content not present in source (span checking)
+        # Every output sentence is checked against a shingle index of the source
+        source_index = ShingleIndex(source_content)
         sentences = [s.strip() for s in output.split('.') if len(s.strip()) > 20]
-        for sentence in sentences[:5]:  # Check first 5 sentences
-            # Look for key phrases in source
-            words = sentence.lower().split()
-            key_phrases = [' '.join(words[i:i+3]) for i in range(len(words)-2)]
-            
-            found_in_source = any(phrase in source_lower for phrase in key_phrases if len(phrase) > 10)
-            if not found_in_source and len(sentence) > 50:
-                violations.append(f"Potentially synthetic content: {sentence[:100]}...")
+        for sentence in source_index.uncovered_sentences(sentences):
+            violations.append(f"Potentially synthetic content: {sentence[:100]}...")
         
         return violations
 
@@ -252,9 +280,34 @@ class ExtractionTool(BaseTool):
             }
         }
         
+        chunks = getattr(self, '_current_chunks', None)
+        if chunks:
+            result.metadata['source_traceability']['chunks'] = chunks
+            result.add_audit_entry(f"Merged {len(chunks)} chunk results in document order")
+        
         # Store original content for compliance checking
         result.metadata['original_content'] = inputs.get('text_content', '')
         
+        cache_status = getattr(self, '_current_cache_status', None)
+        if cache_status:
+            result.metadata['result_cache'] = dict(cache_status)
+            if cache_status['hit']:
+                result.add_audit_entry(f"Result served from cache: {cache_status['key'][:16]}")
+        
+        near_duplicate = getattr(self, '_current_near_duplicate', None)
+        if near_duplicate:
+            result.metadata['near_duplicate'] = dict(near_duplicate)
+            if near_duplicate['reused']:
+                result.add_audit_entry(
+                    f"Result reused from near-duplicate {near_duplicate['near_duplicate_of']} "
+                    f"(similarity {near_duplicate['similarity']:.2f}, "
+                    f"+{near_duplicate['diff']['lines_added']}/-{near_duplicate['diff']['lines_removed']} lines)"
+                )
+            else:
+                result.add_audit_entry(
+                    f"Near-duplicate {near_duplicate['near_duplicate_of']} not reused: {near_duplicate['reason']}"
+                )
+        
         result.add_audit_entry("Source traceability information recorded")
 
     def _hash_content(self, content: str) -> str:
@@ -262,6 +315,105 @@ class ExtractionTool(BaseTool):
         import hashlib
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def _result_fingerprint(self, instructions: str, text_content: str, **kwargs) -> Dict[str, Any]:
+        """
+        Build fingerprint identifying a backend result
+        
+        Args:
+            instructions: Extraction instructions
+            text_content: Source text to process
+            **kwargs: Additional parameters (ruleset_versions is included if given)
+            
+        Returns:
+            Fingerprint of hashes and versions used as result cache key
+        """
+        return {
+            'instructions_hash': self._hash_content(instructions),
+            'content_hash': self._hash_content(text_content),
+            'extraction_method': f"{self.name} v{self.version}",
+            'backend_processor': "safety_sigma_processor v1.0",
+            'zero_inference': self.zero_inference,
+            'ruleset_versions': kwargs.get('ruleset_versions') or {},
+            'chunk_size': self.chunk_size if self._use_chunking(kwargs) else None,
+        }
+
+    def _apply_memory_budget(self, inputs: Dict[str, Any], text_content: str, result: ToolResult) -> None:
+        """
+        Check the estimated peak memory against SS2_MEMORY_BUDGET_MB
+        
+        A document over budget is processed in chunked mode (the chunked
+        flag is set in the inputs passed on to _run). Chunked mode holds up to
+        chunk_workers chunks at once, so if that also exceeds the budget the
+        document is rejected before any work is done.
+        
+        Args:
+            inputs: Input parameters (chunked may be set)
+            text_content: Source text
+            result: Result object for audit trail
+        """
+        estimate = estimate_text_bytes(len(text_content))
+        result.metadata['memory_estimate_bytes'] = estimate
+        
+        chunked = self._use_chunking(inputs)
+        if not chunked and estimate <= self.memory_budget:
+            return
+        
+        chunk_estimate = estimate_text_bytes(min(len(text_content), self.chunk_size)) * max(1, self.chunk_workers)
+        try:
+            check_budget(chunk_estimate, 'chunked extraction', self.memory_budget)
+        except MemoryBudgetExceeded as e:
+            result.add_audit_entry(f"Memory budget check failed: {e}")
+            raise
+        
+        if not chunked:
+            inputs['chunked'] = True
+            result.metadata['memory_budget_action'] = 'chunked'
+            result.add_audit_entry(
+                f"Estimated memory {estimate / (1024*1024):.1f}MB over budget "
+                f"{self.memory_budget / (1024*1024):.1f}MB: switching to chunked extraction"
+            )
+
+    def _use_chunking(self, inputs: Dict[str, Any]) -> bool:
+        """Check whether chunked extraction is requested (kwarg overrides SS2_CHUNKED_EXTRACTION)"""
+        chunked = inputs.get('chunked')
+        return self.chunked if chunked is None else bool(chunked)
+
+    def _process_report(self, instructions: str, text_content: str, chunked: bool = False) -> str:
+        """
+        Run the SS1 backend over the whole text or over its chunks
+        
+        In chunked mode the text is split on structural boundaries, chunks are
+        processed concurrently by a bounded thread pool, and chunk results are
+        merged in document order regardless of completion order.
+        
+        Args:
+            instructions: Extraction instructions
+            text_content: Source text to process
+            chunked: Split long text into chunks
+            
+        Returns:
+            Backend result (merged over chunks in chunked mode)
+        """
+        if not chunked or len(text_content) <= self.chunk_size:
+            return self._ss1_processor.process_report(instructions, text_content)
+        
+        chunks = split_into_chunks(text_content, self.chunk_size)
+        workers = max(1, min(self.chunk_workers, len(chunks)))
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-chunk") as executor:
+            outputs = list(executor.map(
+                lambda chunk: self._ss1_processor.process_report(instructions, chunk.text), chunks
+            ))
+        
+        provenance = []
+        for chunk, output in zip(chunks, outputs):
+            record = chunk.to_dict()
+            record['output_hash'] = self._hash_content(output)
+            provenance.append(record)
+        self._current_chunks = provenance
+        
+        return '\n\n'.join(output.strip() for output in outputs)
+
     def _run(self, instructions: str, text_content: str, **kwargs) -> str:
         """
         Perform AI extraction using Safety Sigma 1.0 backend
@@ -277,6 +429,12 @@ class ExtractionTool(BaseTool):
         if not self._ss1_processor:
             raise RuntimeError("Safety Sigma 1.0 processor not initialized")
         
+        # Keep source content for compliance checking in _validate_outputs
+        self._current_source_content = text_content
+        self._current_cache_status = None
+        self._current_near_duplicate = None
+        self._current_chunks = None
+        
         # Check if we're in simulation mode
         simulate = kwargs.get('simulate', False)
         if simulate or os.getenv('OPENAI_API_KEY', '').startswith('mock'):
@@ -287,9 +445,47 @@ class ExtractionTool(BaseTool):
         # Clear simulation mode flag
         self._current_simulation_mode = False
         
+        fingerprint = self._result_fingerprint(instructions, text_content, **kwargs)
+        
+        # Reuse an earlier backend result for the same document and configuration
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(fingerprint)
+            entry = self.result_cache.get(cache_key)
+            if entry is not None:
+                self._current_cache_status = {
+                    'hit': True,
+                    'key': cache_key,
+                    'cached_at': entry.created_at,
+                    'cached_output_hash': entry.metadata.get('output_hash'),
+                    'hits': entry.hits,
+                }
+                self._current_chunks = entry.metadata.get('chunks')
+                return entry.output
+        
+        # Reuse the result of a near-identical document processed with the same configuration
+        signature = None
+        if self.near_duplicate_index is not None:
+            scope = ResultCache.make_key(dict(fingerprint, content_hash=None))
+            signature = self.near_duplicate_index.signature(text_content)
+            reused = self._reuse_near_duplicate(text_content, scope, signature)
+            if reused is not None:
+                return reused
+        
         # Use SS1 processing method
         try:
-            result = self._ss1_processor.process_report(instructions, text_content)
+            result = self._process_report(instructions, text_content, chunked=self._use_chunking(kwargs))
+            
+            if cache_key is not None and isinstance(result, str):
+                self.result_cache.put(cache_key, result, fingerprint,
+                                      metadata={'output_hash': self._hash_content(result),
+                                                'chunks': self._current_chunks})
+                self._current_cache_status = {'hit': False, 'key': cache_key}
+            
+            if signature is not None and isinstance(result, str):
+                self.near_duplicate_index.add(fingerprint['content_hash'], text_content, result,
+                                              scope=scope, signature=signature)
+            
             return result
             
         except Exception as e:
@@ -299,6 +495,40 @@ class ExtractionTool(BaseTool):
                 return self._simulate_extraction(instructions, text_content)
             raise
 
+    def _reuse_near_duplicate(self, text_content: str, scope: str, signature: Any) -> Optional[str]:
+        """
+        Reuse the result of a near-duplicate document if it is traceable to this source
+        
+        Args:
+            text_content: Source text to process
+            scope: Near-duplicate matching scope
+            signature: MinHash signature of text_content
+            
+        Returns:
+            Earlier result, or None if there is no usable near-duplicate
+        """
+        match = self.near_duplicate_index.find(text_content, scope=scope, signature=signature)
+        if match is None:
+            return None
+        
+        document = match.document
+        status = {
+            'near_duplicate_of': document.doc_id,
+            'similarity': round(match.similarity, 4),
+            'diff': summarize_diff(document.text, text_content),
+            'reused': True,
+        }
+        
+        # The earlier result must still hold against the edited source
+        if self.zero_inference:
+            violations = self._check_zero_inference_compliance(document.result, text_content)
+            if violations:
+                status['reused'] = False
+                status['reason'] = f"{len(violations)} zero-inference violations against new source"
+        
+        self._current_near_duplicate = status
+        return document.result if status['reused'] else None
+
     def _simulate_extraction(self, instructions: str, text_content: str) -> str:
         """
         Simulate extraction for testing purposes
@@ -364,6 +594,27 @@ Generated by Safety Sigma 2.0 Tool Abstraction Layer
             }
         })
         
+        cache_status = getattr(self, '_current_cache_status', None)
+        if cache_status:
+            metadata["result_cache"] = {
+                "hit": cache_status['hit'],
+                "key": cache_status['key'],
+                "cached_at": cache_status.get('cached_at'),
+            }
+        
+        chunks = getattr(self, '_current_chunks', None)
+        if chunks:
+            metadata["chunks"] = chunks
+        
+        near_duplicate = getattr(self, '_current_near_duplicate', None)
+        if near_duplicate:
+            metadata["near_duplicate"] = {
+                "near_duplicate_of": near_duplicate['near_duplicate_of'],
+                "similarity": near_duplicate['similarity'],
+                "reused": near_duplicate['reused'],
+                "diff": near_duplicate['diff'],
+            }
+        
         return metadata
 
 
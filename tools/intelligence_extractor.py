@@ -6,9 +6,11 @@ Operates exclusively on provided document text with mandatory source evidence.
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 
+from tools.document_view import DocumentView
+
 @dataclass 
 class ExtractionResult:
     fraud_types: List[Dict[str, str]]
@@ -31,12 +33,16 @@ class IntelligenceExtractor:
             'countries': r'\b(?:China|UK|U\.K\.|United States|U\.S\.|Beijing|London|US)\b',
             'agencies': r'\b(?:FTC|CFPB|IC3|FBI|CGTN|Graphika)\b'
         }
+        self._current_view: Optional[DocumentView] = None
     
-    def extract_intelligence(self, document_content: str, analyst_instructions: str = "") -> Dict[str, Any]:
+    def extract_intelligence(self, document_content: Union[str, DocumentView], analyst_instructions: str = "") -> Dict[str, Any]:
         """
         Extract structured intelligence with source evidence.
         Returns JSON that can be passed to forced tool.
+        Accepts a shared DocumentView so lowercase text is computed once.
         """
+        self._current_view = DocumentView.of(document_content)
+        document_content = self._current_view.text
         
         return {
             "fraud_types": self._extract_fraud_types(document_content),
@@ -50,7 +56,7 @@ class IntelligenceExtractor:
         fraud_types = []
         
         # Look for information laundering operations
-        if "information laundering" in content.lower():
+        if "information laundering" in self._lower(content):
             evidence = self._find_context_around_phrase(content, "information laundering", 100)
             fraud_types.append({
                 "type": "Information laundering network", 
@@ -68,7 +74,7 @@ class IntelligenceExtractor:
             })
         
         # Look for coordinated inauthentic behavior
-        if "coordinated network" in content.lower():
+        if "coordinated network" in self._lower(content):
             evidence = self._find_context_around_phrase(content, "coordinated network", 100)
             fraud_types.append({
                 "type": "Coordinated inauthentic behavior",
@@ -144,7 +150,7 @@ class IntelligenceExtractor:
             })
         
         # Look for domain registration patterns
-        if "Alibaba Cloud" in content and "registrar" in content.lower():
+        if "Alibaba Cloud" in content and "registrar" in self._lower(content):
             evidence = self._find_context_around_phrase(content, "Alibaba Cloud", 150)
             methods.append({
                 "technique": "Coordinated domain registration",
@@ -215,16 +221,19 @@ class IntelligenceExtractor:
         
         return platforms
     
+    def _view_for(self, content: str) -> DocumentView:
+        """Shared view when content is the document being extracted, else a new view."""
+        view = self._current_view
+        return view if view is not None and view.text is content else DocumentView(content)
+    
+    def _lower(self, content: str) -> str:
+        """Lowercased content, cached on the shared view."""
+        return self._view_for(content).lower
+    
     def _find_context_around_phrase(self, content: str, phrase: str, context_length: int) -> str:
         """Find context around a phrase with specified character length."""
-        match = re.search(re.escape(phrase), content, re.IGNORECASE)
-        if not match:
-            return "Phrase not found in source"
-        
-        start = max(0, match.start() - context_length//2)
-        end = min(len(content), match.end() + context_length//2)
-        
-        return content[start:end].strip()
+        context = self._view_for(content).context_around(phrase, context_length)
+        return context if context is not None else "Phrase not found in source"
     
     def _find_context_around_match(self, content: str, match, context_length: int) -> str:
         """Find context around a regex match object."""
@@ -0,0 +1,304 @@
+"""
+Near-Duplicate Detection for Safety Sigma 2.0
+
+MinHash signatures with locality-sensitive hashing (LSH) over extracted
+document text. Re-posted, lightly edited or re-rendered reports are found
+without comparing every pair of documents, so their earlier extraction
+results can be reused.
+"""
+
+import difflib
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+# Number of consecutive words in a document shingle
+SHINGLE_WORDS = 5
+
+# Signature slot value for bins that received no shingle
+_EMPTY = 1 << 64
+_HASH_MASK = (1 << 64) - 1
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def document_shingles(text: str, size: int = SHINGLE_WORDS) -> Set[int]:
+    """
+    Hash the word shingles of a document
+
+    Hashes use Python's string hash, so signatures are only comparable
+    within one process (the index is held in memory).
+
+    Args:
+        text: Document text
+        size: Number of words per shingle
+
+    Returns:
+        Set of unsigned 64-bit shingle hashes
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {hash(' '.join(words)) & _HASH_MASK} if words else set()
+
+    return {hash(' '.join(words[i:i + size])) & _HASH_MASK for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    One-permutation MinHash signature generator
+
+    Each shingle hash is assigned to one of `num_perm` bins by its low bits
+    and the minimum of the remaining bits is kept per bin. This takes a
+    single pass over the shingles instead of one pass per permutation, and
+    gives an unbiased Jaccard estimate when bins empty in both signatures
+    are ignored.
+    """
+
+    def __init__(self, num_perm: int = 64):
+        """
+        Initialize MinHash generator
+
+        Args:
+            num_perm: Number of bins (signature length), a power of two
+        """
+        if num_perm <= 0 or num_perm & (num_perm - 1):
+            raise ValueError(f"num_perm must be a power of two, got {num_perm}")
+
+        self.num_perm = num_perm
+        self._bin_mask = num_perm - 1
+        self._bin_bits = num_perm.bit_length() - 1
+
+    def signature(self, shingles: Set[int]) -> Tuple[int, ...]:
+        """
+        Compute MinHash signature of a shingle set
+
+        Args:
+            shingles: Shingle hashes from document_shingles()
+
+        Returns:
+            Signature tuple of length num_perm
+        """
+        mins = [_EMPTY] * self.num_perm
+        bin_mask = self._bin_mask
+        bin_bits = self._bin_bits
+
+        for shingle in shingles:
+            slot = shingle & bin_mask
+            value = shingle >> bin_bits
+            if value < mins[slot]:
+                mins[slot] = value
+
+        return tuple(mins)
+
+    @staticmethod
+    def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two signatures"""
+        compared = matched = 0
+        for x, y in zip(sig_a, sig_b):
+            if x == _EMPTY and y == _EMPTY:
+                continue
+            compared += 1
+            matched += x == y
+        return matched / compared if compared else 0.0
+
+
+@dataclass
+class IndexedDocument:
+    """
+    Document stored in the near-duplicate index with its reusable result
+    """
+    doc_id: str
+    signature: Tuple[int, ...]
+    text: str
+    result: Any
+    scope: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class NearDuplicateMatch:
+    """
+    Near-duplicate of a query document
+    """
+    document: IndexedDocument
+    similarity: float
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index over extracted document text
+
+    Signatures are split into `bands` bands of `num_perm // bands` rows; any
+    document sharing a band bucket with the query is a candidate, and
+    candidates are accepted when their estimated Jaccard similarity reaches
+    the threshold. Documents are only matched within the same scope (e.g.
+    the same instructions and ruleset versions).
+    """
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: int = 64,
+                 bands: int = 16, max_documents: int = 1000):
+        """
+        Initialize near-duplicate index
+
+        Args:
+            threshold: Minimum Jaccard similarity (default: SS2_NEAR_DUP_THRESHOLD or 0.9)
+            num_perm: MinHash signature length (power of two)
+            bands: Number of LSH bands (must divide num_perm)
+            max_documents: Oldest documents are dropped beyond this many
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        self.threshold = threshold if threshold is not None else \
+            float(os.getenv('SS2_NEAR_DUP_THRESHOLD', '0.9'))
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_documents = max_documents
+        self.hasher = MinHasher(num_perm=num_perm)
+
+        self._documents: Dict[str, IndexedDocument] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute MinHash signature of document text"""
+        return self.hasher.signature(document_shingles(text))
+
+    def add(self, doc_id: str, text: str, result: Any, scope: str = "",
+            signature: Optional[Tuple[int, ...]] = None,
+            metadata: Optional[Dict[str, Any]] = None) -> IndexedDocument:
+        """
+        Add a document and its result to the index
+
+        Args:
+            doc_id: Unique document identifier (e.g. content hash)
+            text: Document text
+            result: Result to reuse for near-duplicates
+            scope: Matching scope
+            signature: Precomputed signature, if available
+            metadata: Additional information stored with the document
+
+        Returns:
+            Indexed document
+        """
+        document = IndexedDocument(
+            doc_id=doc_id,
+            signature=signature or self.signature(text),
+            text=text,
+            result=result,
+            scope=scope,
+            metadata=metadata or {},
+        )
+
+        with self._lock:
+            if doc_id in self._documents:
+                self._remove(doc_id)
+            self._documents[doc_id] = document
+            for band, key in zip(self._buckets, self._band_keys(document.signature)):
+                band.setdefault(key, set()).add(doc_id)
+
+            while len(self._documents) > self.max_documents:
+                self._remove(next(iter(self._documents)))
+
+        return document
+
+    def _remove(self, doc_id: str) -> None:
+        document = self._documents.pop(doc_id)
+        for band, key in zip(self._buckets, self._band_keys(document.signature)):
+            bucket = band.get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del band[key]
+
+    def find(self, text: str, scope: str = "",
+             signature: Optional[Tuple[int, ...]] = None) -> Optional[NearDuplicateMatch]:
+        """
+        Find the most similar indexed document above the threshold
+
+        Args:
+            text: Query document text
+            scope: Matching scope
+            signature: Precomputed signature, if available
+
+        Returns:
+            Best NearDuplicateMatch, or None
+        """
+        signature = signature or self.signature(text)
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+
+            best = None
+            for doc_id in candidates:
+                document = self._documents[doc_id]
+                if document.scope != scope:
+                    continue
+                similarity = MinHasher.estimate_jaccard(signature, document.signature)
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = NearDuplicateMatch(document=document, similarity=similarity)
+
+        return best
+
+
+def summarize_diff(original: str, revised: str, max_changes: int = 5) -> Dict[str, Any]:
+    """
+    Summarize line-level differences between two documents
+
+    Args:
+        original: Earlier document text
+        revised: New document text
+        max_changes: Maximum number of changed lines to include
+
+    Returns:
+        Counts of added/removed lines and a sample of the changes
+    """
+    added, removed = [], []
+    for line in difflib.unified_diff(original.splitlines(), revised.splitlines(), lineterm='', n=0):
+        if line.startswith('+++') or line.startswith('---'):
+            continue
+        if line.startswith('+'):
+            added.append(line[1:])
+        elif line.startswith('-'):
+            removed.append(line[1:])
+
+    return {
+        'lines_added': len(added),
+        'lines_removed': len(removed),
+        'added_sample': [line[:100] for line in added[:max_changes]],
+        'removed_sample': [line[:100] for line in removed[:max_changes]],
+    }
+
+
+_shared_index: Optional[NearDuplicateIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_shared_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Get the process-wide near-duplicate index if enabled
+
+    Returns:
+        Shared NearDuplicateIndex when SS2_NEAR_DUPLICATE_REUSE is enabled, otherwise None
+    """
+    global _shared_index
+
+    if os.getenv('SS2_NEAR_DUPLICATE_REUSE', 'false').lower() != 'true':
+        return None
+
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = NearDuplicateIndex()
+        return _shared_index
@@ -10,6 +10,8 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from metrics.memory import PDF_BYTES_PER_FILE_BYTE, MemoryBudgetExceeded, check_budget
+
 from .base_tool import BaseTool, ToolResult
 
 
@@ -90,6 +92,14 @@ class PDFTool(BaseTool):
             result.add_audit_entry(f"Size validation failed: {error_msg}")
             raise ValueError(error_msg)
         
+        # Memory budget pre-flight (PDF extraction has no chunked mode, so fail fast)
+        if self.memory_budget:
+            try:
+                check_budget(file_size * PDF_BYTES_PER_FILE_BYTE, f"PDF {pdf_path.name}", self.memory_budget)
+            except MemoryBudgetExceeded as e:
+                result.add_audit_entry(f"Memory budget check failed: {e}")
+                raise
+        
         result.add_audit_entry(f"PDF validation passed: {pdf_path} ({file_size / 1024:.1f}KB)")
         
         # Store file metadata for audit trail
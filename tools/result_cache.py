@@ -0,0 +1,166 @@
+"""
+Result Cache for Safety Sigma 2.0
+
+Fingerprint-keyed cache of tool outputs. Resubmitting the same document with
+the same instructions, ruleset versions and tool versions reuses the stored
+result instead of running the backend again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cached tool output with the fingerprint it was stored under
+    """
+    key: str
+    output: Any
+    fingerprint: Dict[str, Any]
+    created_at: float
+    hits: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ResultCache:
+    """
+    Bounded, TTL-limited LRU cache of tool results
+
+    Provides:
+    - Deterministic keys from result fingerprints
+    - Expiry after a configurable TTL
+    - Least-recently-used eviction beyond a size bound
+    - Thread-safe access for concurrent tool executions
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries: Maximum number of cached results (default: from env)
+            ttl_seconds: Seconds before an entry expires (default: from env)
+        """
+        self.max_entries = max_entries if max_entries is not None else \
+            int(os.getenv('SS2_RESULT_CACHE_SIZE', '128'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else \
+            float(os.getenv('SS2_RESULT_CACHE_TTL', '3600'))
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(fingerprint: Dict[str, Any]) -> str:
+        """
+        Build cache key from a result fingerprint
+
+        Args:
+            fingerprint: Hashes and versions identifying a result
+
+        Returns:
+            Hex digest key
+        """
+        canonical = json.dumps(fingerprint, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            CacheEntry, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, output: Any, fingerprint: Dict[str, Any],
+            metadata: Optional[Dict[str, Any]] = None) -> CacheEntry:
+        """
+        Store a result, evicting least recently used entries beyond the size bound
+
+        Args:
+            key: Cache key from make_key()
+            output: Tool output to cache
+            fingerprint: Fingerprint the key was built from
+            metadata: Additional information stored with the entry
+
+        Returns:
+            Stored CacheEntry
+        """
+        entry = CacheEntry(
+            key=key,
+            output=output,
+            fingerprint=fingerprint,
+            created_at=time.time(),
+            metadata=metadata or {},
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(0, self.max_entries):
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_shared_cache: Optional[ResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_result_cache() -> Optional[ResultCache]:
+    """
+    Get the process-wide result cache if enabled
+
+    Returns:
+        Shared ResultCache when SS2_RESULT_CACHE is enabled, otherwise None
+    """
+    global _shared_cache
+
+    if os.getenv('SS2_RESULT_CACHE', 'false').lower() != 'true':
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
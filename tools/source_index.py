@@ -0,0 +1,158 @@
+"""
+Source Indexes for Safety Sigma 2.0
+
+Per-document indexes over source text used by the compliance checks:
+- Shingle index for zero-inference phrase coverage
+- Evidence index for verbatim source evidence with exact offsets
+Built once per document so that every output claim can be checked against
+the source without rescanning it.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .document_view import DocumentView
+
+
+# Number of consecutive words in a phrase shingle
+SHINGLE_SIZE = 3
+
+
+class ShingleIndex:
+    """
+    Hashed word-shingle index over lowercased source text
+
+    Source text is split on '.' (matching how output is split into sentences)
+    and then on whitespace. Every run of SHINGLE_SIZE consecutive words is
+    stored as a hash, so checking a phrase is a single set lookup instead of
+    a linear substring scan of the whole document.
+    """
+
+    def __init__(self, source_content: Union[str, DocumentView], size: int = SHINGLE_SIZE):
+        """
+        Build shingle index for source content
+
+        Args:
+            source_content: Original source text (or a shared DocumentView)
+            size: Number of words per shingle
+        """
+        self.size = size
+        self._shingles: Set[int] = set()
+
+        for segment in DocumentView.of(source_content).lower.split('.'):
+            self._add_words(segment.split())
+
+    def _add_words(self, words: List[str]) -> None:
+        """Add all shingles of a word sequence to the index"""
+        size = self.size
+        shingles = self._shingles
+        for i in range(len(words) - size + 1):
+            shingles.add(hash(' '.join(words[i:i + size])))
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def contains_phrase(self, words: Sequence[str]) -> bool:
+        """
+        Check whether a phrase of exactly `size` lowercased words occurs in source
+
+        Args:
+            words: Lowercased words of the phrase
+
+        Returns:
+            True if the phrase is present in the source
+        """
+        return hash(' '.join(words)) in self._shingles
+
+    def covers_sentence(self, sentence: str, min_phrase_length: int = 10) -> bool:
+        """
+        Check whether any shingle of a sentence is present in the source
+
+        Args:
+            sentence: Output sentence to check
+            min_phrase_length: Ignore phrases shorter than this many characters
+
+        Returns:
+            True if at least one qualifying phrase is found in the source
+        """
+        words = sentence.lower().split()
+        size = self.size
+        shingles = self._shingles
+
+        for i in range(len(words) - size + 1):
+            phrase = ' '.join(words[i:i + size])
+            if len(phrase) > min_phrase_length and hash(phrase) in shingles:
+                return True
+        return False
+
+    def uncovered_sentences(self, sentences: Iterable[str], min_length: int = 50) -> List[str]:
+        """
+        Find sentences with no supporting phrase in the source
+
+        Args:
+            sentences: Output sentences to check
+            min_length: Only report sentences longer than this many characters
+
+        Returns:
+            Sentences that could not be traced back to the source
+        """
+        return [s for s in sentences if len(s) > min_length and not self.covers_sentence(s)]
+
+
+class EvidenceIndex:
+    """
+    Verbatim evidence lookup over source text
+
+    Resolves each evidence string to the exact (start, end) character offsets
+    of its first occurrence in the source. Lookups are memoised, so evidence
+    shared by several claims is only searched once per document.
+    """
+
+    def __init__(self, source_content: str):
+        """
+        Build evidence index for source content
+
+        Args:
+            source_content: Original source text
+        """
+        self.source = source_content
+        self._spans: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def locate(self, evidence: Optional[str]) -> Optional[Tuple[int, int]]:
+        """
+        Find exact offsets of evidence in the source
+
+        Args:
+            evidence: Evidence string claimed to be quoted from the source
+
+        Returns:
+            (start, end) offsets, or None if evidence is not verbatim source text
+        """
+        if not evidence or not isinstance(evidence, str):
+            return None
+
+        if evidence not in self._spans:
+            start = self.source.find(evidence)
+            self._spans[evidence] = (start, start + len(evidence)) if start >= 0 else None
+        return self._spans[evidence]
+
+    def verify_items(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Attach source offsets to intelligence items with verbatim evidence
+
+        Items whose 'source_evidence' is found get a 'source_offsets' entry;
+        items whose evidence is missing or not verbatim are returned.
+
+        Args:
+            items: Extracted intelligence items
+
+        Returns:
+            Items that failed verification
+        """
+        unverified = []
+        for item in items:
+            span = self.locate(item.get('source_evidence'))
+            if span is None:
+                unverified.append(item)
+            else:
+                item['source_offsets'] = {'start': span[0], 'end': span[1]}
+        return unverified
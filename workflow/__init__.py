@@ -0,0 +1,29 @@
+"""
+Safety Sigma 2.0 Workflow Package
+
+Provides distributed processing support with:
+- Built-in SQLite job broker with leases, heartbeats and re-queueing
+- TCP access to the broker for workers on other hosts
+- Content-addressed document store shared by coordinator and workers
+- Coordinator (hash sharding, idempotent submission) and pull-based workers
+- Size/complexity-aware routing to worker pools, shortest expected job first
+"""
+
+from .broker import SQLiteBroker, connect_broker, serve_broker
+from .content_store import CachedContentStore, ContentStore
+from .coordinator import Coordinator
+from .scheduler import LatencyModel, Scheduler, profile_document
+from .worker import Worker
+
+__all__ = [
+    'SQLiteBroker',
+    'connect_broker',
+    'serve_broker',
+    'ContentStore',
+    'CachedContentStore',
+    'Coordinator',
+    'Scheduler',
+    'LatencyModel',
+    'profile_document',
+    'Worker',
+]
@@ -0,0 +1,392 @@
+"""
+Job Broker for Safety Sigma 2.0 Distributed Mode
+
+Built-in stand-in for an external queue: a SQLite job table with leases.
+
+- Jobs are enqueued idempotently (the job id is derived from the document
+  and instruction digests), each tagged with the shard its document hashes to
+- Workers lease the queued job of their pools and shards with the lowest
+  expected latency (oldest first among jobs without an estimate); a lease
+  expires unless the worker heartbeats, and expired leases go back to the queue
+- Failed jobs are re-queued until max_attempts is reached
+
+Workers on the same host (or a shared filesystem) open the database
+directly. Workers on other hosts connect over TCP to serve_broker(), which
+exposes the broker and the content store with multiprocessing managers
+(authenticated with SS2_BROKER_AUTHKEY).
+
+Configuration:
+    SS2_BROKER_AUTHKEY      - Shared secret for TCP broker connections
+    SS2_JOB_LEASE_SECONDS   - Lease length before an unacknowledged job is re-queued (default: 60)
+    SS2_JOB_MAX_ATTEMPTS    - Attempts before a job is marked failed (default: 3)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+JOB_STATUSES = ('queued', 'leased', 'done', 'failed')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    document_digest TEXT NOT NULL,
+    instructions_digest TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker_id TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result_digest TEXT,
+    error TEXT,
+    pool TEXT,
+    job_class TEXT,
+    pages INTEGER,
+    expected_ms REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, shard, enqueued_at);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    shards TEXT,
+    current_job TEXT,
+    last_heartbeat REAL NOT NULL,
+    jobs_done INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+# Scheduling columns added after the first release, migrated into older databases
+_SCHEDULING_COLUMNS = (('pool', 'TEXT'), ('job_class', 'TEXT'), ('pages', 'INTEGER'), ('expected_ms', 'REAL'))
+
+
+def shard_for(digest: str, shards: int) -> int:
+    """Shard of a content digest ('sha256:<hex>' or hex)"""
+    return int(digest.split(':')[-1][:8], 16) % max(1, shards)
+
+
+class SQLiteBroker:
+    """
+    Leased job queue in a SQLite database
+
+    Every call opens its own connection, so one broker object can be shared
+    by threads (heartbeats, TCP server connections). Claims run in
+    BEGIN IMMEDIATE transactions, so two workers never lease the same job.
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: Optional[float] = None,
+                 max_attempts: Optional[int] = None):
+        """
+        Initialize broker
+
+        Args:
+            path: SQLite database file (created if missing)
+            lease_seconds: Lease length (default: SS2_JOB_LEASE_SECONDS)
+            max_attempts: Attempts per job (default: SS2_JOB_MAX_ATTEMPTS)
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds if lease_seconds is not None else \
+                             float(os.getenv('SS2_JOB_LEASE_SECONDS', '60'))
+        self.max_attempts = max_attempts if max_attempts is not None else \
+                            int(os.getenv('SS2_JOB_MAX_ATTEMPTS', '3'))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _SCHEDULING_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---------- Coordinator side ----------
+
+    def enqueue(self, job_id: str, name: str, shard: int, document_digest: str, instructions_digest: str,
+                options: str = '{}', pool: Optional[str] = None, job_class: Optional[str] = None,
+                pages: Optional[int] = None, expected_ms: Optional[float] = None) -> bool:
+        """
+        Add a job unless one with the same id exists
+
+        Args:
+            pool, job_class, pages, expected_ms: Scheduler placement (unset: any pool, oldest first)
+
+        Returns:
+            True if the job was added
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, name, shard, document_digest, instructions_digest, options, "
+                "max_attempts, enqueued_at, pool, job_class, pages, expected_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, name, shard, document_digest, instructions_digest, options, self.max_attempts, time.time(),
+                 pool, job_class, pages, expected_ms),
+            )
+            return cursor.rowcount == 1
+
+    def retry(self, job_id: str) -> bool:
+        """Put a failed job back in the queue with a fresh attempt budget"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, worker_id = NULL "
+                "WHERE job_id = ? AND status = 'failed'", (job_id,))
+            return cursor.rowcount == 1
+
+    def jobs(self, job_ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Job rows (all, or the given ids)"""
+        with self._connect() as conn:
+            if job_ids is not None and not job_ids:
+                return []
+            if job_ids is None:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY enqueued_at").fetchall()
+            else:
+                placeholders = ', '.join('?' * len(job_ids))
+                rows = conn.execute(f"SELECT * FROM jobs WHERE job_id IN ({placeholders})", tuple(job_ids)).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self, worker_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Job counts per status (overall and per pool) and workers seen within worker_timeout (default: one lease)"""
+        worker_timeout = worker_timeout or self.lease_seconds
+        with self._connect() as conn:
+            counts = dict.fromkeys(JOB_STATUSES, 0)
+            pools: Dict[str, Dict[str, int]] = {}
+            for row in conn.execute("SELECT pool, status, count(*) AS n FROM jobs GROUP BY pool, status"):
+                counts[row['status']] += row['n']
+                pools.setdefault(row['pool'] or 'any', dict.fromkeys(JOB_STATUSES, 0))[row['status']] = row['n']
+            workers = [dict(row) for row in conn.execute("SELECT * FROM workers ORDER BY worker_id")]
+        now = time.time()
+        for worker in workers:
+            worker['alive'] = now - worker['last_heartbeat'] <= worker_timeout
+        return {'jobs': counts, 'pools': pools, 'workers': workers}
+
+    def requeue_expired(self) -> int:
+        """Return jobs with expired leases to the queue (or fail them when out of attempts)"""
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    @staticmethod
+    def _requeue_expired(conn: sqlite3.Connection, now: float) -> int:
+        failed = conn.execute(
+            "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'lease expired (worker lost)' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts", (now, now)).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = 'queued', worker_id = NULL, lease_expires = NULL "
+            "WHERE status = 'leased' AND lease_expires < ?", (now,)).rowcount
+        return failed + requeued
+
+    # ---------- Worker side ----------
+
+    def register_worker(self, worker_id: str, host: str, pid: int, shards: Optional[Sequence[int]] = None) -> None:
+        """Record a worker (and its first heartbeat)"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, host, pid, shards, last_heartbeat) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET host = excluded.host, pid = excluded.pid, "
+                "shards = excluded.shards, last_heartbeat = excluded.last_heartbeat",
+                (worker_id, host, pid, ','.join(map(str, shards)) if shards is not None else None, time.time()),
+            )
+
+    def lease(self, worker_id: str, shards: Optional[Sequence[int]] = None, steal: bool = True,
+              pools: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next queued job, re-queueing expired leases first
+
+        Jobs are taken in order of pool preference, shard preference, then
+        shortest expected latency (jobs without an estimate last, oldest first).
+
+        Args:
+            worker_id: Claiming worker
+            shards: Preferred shards (default: any)
+            steal: Take jobs of other shards when the preferred ones are empty,
+                so the shards of a lost worker are not starved
+            pools: Pools served, most preferred first (default or empty: any);
+                jobs without a pool are served by every worker
+
+        Returns:
+            Job row, or None if the queue is empty
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            query = "SELECT job_id FROM jobs WHERE status = 'queued'"
+            order = ["expected_ms IS NULL", "expected_ms", "enqueued_at"]
+            params: Tuple[Any, ...] = ()
+            order_params: Tuple[Any, ...] = ()
+            if pools:
+                query += f" AND (pool IS NULL OR pool IN ({', '.join('?' * len(pools))}))"
+                params += tuple(pools)
+                preference = ' '.join(f'WHEN ? THEN {rank}' for rank in range(len(pools)))
+                order.insert(0, f"CASE pool {preference} ELSE {len(pools)} END")
+                order_params += tuple(pools)
+            if shards is not None:
+                in_shards = f"shard IN ({', '.join('?' * len(shards))})"
+                if steal:
+                    order.insert(len(order) - 3, f"{in_shards} DESC")
+                    order_params += tuple(shards)
+                else:
+                    query += f" AND {in_shards}"
+                    params += tuple(shards)
+            row = conn.execute(f"{query} ORDER BY {', '.join(order)} LIMIT 1", params + order_params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker_id = ?, attempts = attempts + 1, lease_expires = ?, "
+                "started_at = ? WHERE job_id = ?", (worker_id, now + self.lease_seconds, now, row['job_id']))
+            conn.execute("UPDATE workers SET current_job = ?, last_heartbeat = ? WHERE worker_id = ?",
+                         (row['job_id'], now, worker_id))
+            return dict(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row['job_id'],)).fetchone())
+
+    def heartbeat(self, worker_id: str, job_id: Optional[str] = None) -> bool:
+        """
+        Record that a worker is alive and extend its lease on job_id
+
+        Returns:
+            False if the job is no longer leased to this worker (it expired and was re-queued)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("UPDATE workers SET last_heartbeat = ?, current_job = ? WHERE worker_id = ?",
+                         (now, job_id, worker_id))
+            if job_id is None:
+                return True
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND worker_id = ? AND status = 'leased'",
+                (now + self.lease_seconds, job_id, worker_id)).rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result_digest: str) -> bool:
+        """Mark a leased job done (ignored if the lease was lost)"""
+        with self._transaction() as conn:
+            done = conn.execute(
+                "UPDATE jobs SET status = 'done', result_digest = ?, finished_at = ?, lease_expires = NULL, "
+                "error = NULL WHERE job_id = ? AND worker_id = ? AND status = 'leased'",
+                (result_digest, time.time(), job_id, worker_id)).rowcount == 1
+            if done:
+                conn.execute("UPDATE workers SET jobs_done = jobs_done + 1, current_job = NULL WHERE worker_id = ?",
+                             (worker_id,))
+            return done
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str:
+        """
+        Record a failed attempt: re-queue, or fail the job when out of attempts
+
+        Returns:
+            New job status
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE job_id = ? AND worker_id = ? "
+                               "AND status = 'leased'", (job_id, worker_id)).fetchone()
+            if row is None:
+                return 'lost'
+            status = 'failed' if row['attempts'] >= row['max_attempts'] else 'queued'
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires = NULL, "
+                "finished_at = CASE WHEN ? = 'failed' THEN ? END WHERE job_id = ?",
+                (status, error[:2000], status, time.time(), job_id))
+            conn.execute("UPDATE workers SET current_job = NULL WHERE worker_id = ?", (worker_id,))
+            return status
+
+
+# ---------- TCP access for workers on other hosts ----------
+
+class BrokerManager(BaseManager):
+    """Client side of the TCP broker: proxies for the served 'broker' and 'store'"""
+
+
+BrokerManager.register('broker')
+BrokerManager.register('store')
+
+
+def _authkey(authkey: Optional[Union[str, bytes]]) -> bytes:
+    authkey = authkey or os.getenv('SS2_BROKER_AUTHKEY')
+    if not authkey:
+        raise ValueError("TCP broker requires an authkey (--authkey or SS2_BROKER_AUTHKEY)")
+    return authkey.encode('utf-8') if isinstance(authkey, str) else authkey
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """'tcp://host:port' or 'host:port' to (host, port)"""
+    host, _, port = address[len('tcp://'):].rpartition(':') if address.startswith('tcp://') \
+        else address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def broker_server(broker: SQLiteBroker, store: Any, address: Union[str, Tuple[str, int]],
+                  authkey: Optional[Union[str, bytes]] = None) -> Any:
+    """
+    Create a TCP server for a broker and content store
+
+    Returns:
+        multiprocessing Server; call serve_forever() (it runs one thread per connection)
+    """
+    class ServerManager(BaseManager):
+        pass  # own registry, bound to these objects
+
+    ServerManager.register('broker', callable=lambda: broker)
+    ServerManager.register('store', callable=lambda: store)
+    address = parse_address(address) if isinstance(address, str) else address
+    return ServerManager(address=address, authkey=_authkey(authkey)).get_server()
+
+
+def serve_broker(broker: SQLiteBroker, store: Any, address: Union[str, Tuple[str, int]],
+                 authkey: Optional[Union[str, bytes]] = None, background: bool = False) -> Any:
+    """
+    Serve a broker and content store over TCP
+
+    Args:
+        broker: Broker to expose
+        store: Content store to expose
+        address: 'host:port' to listen on
+        authkey: Shared secret (default: SS2_BROKER_AUTHKEY)
+        background: Serve from a daemon thread and return the server
+
+    Returns:
+        Server (when background); otherwise serves until interrupted
+    """
+    server = broker_server(broker, store, address, authkey)
+    if not background:
+        server.serve_forever()
+    threading.Thread(target=server.serve_forever, name='ss2-broker', daemon=True).start()
+    return server
+
+
+def connect_broker(address: str, authkey: Optional[Union[str, bytes]] = None) -> Tuple[Any, Any]:
+    """
+    Connect to a TCP broker
+
+    Returns:
+        (broker proxy, content store proxy) with the same methods as the local objects
+    """
+    manager = BrokerManager(address=parse_address(address), authkey=_authkey(authkey))
+    manager.connect()
+    return manager.broker(), manager.store()
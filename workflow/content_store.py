@@ -0,0 +1,80 @@
+"""
+Content Store for Safety Sigma 2.0 Distributed Mode
+
+Documents, instructions and results are stored once, content-addressed, in
+an audit BlobStore; jobs carry only digests. Workers on other hosts read
+through CachedContentStore, which keeps a local copy of every blob it has
+fetched, so each document's bytes cross the network at most once per host.
+"""
+
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from audit.blob_store import BlobStore
+
+
+class ContentStore:
+    """
+    Shared content-addressed store backed by a BlobStore directory
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize content store
+
+        Args:
+            root: Blob directory (shared by the coordinator and local workers)
+        """
+        self.blobs = BlobStore(root)
+
+    def put(self, data: Union[str, bytes]) -> str:
+        """Store bytes or text; returns the 'sha256:<hex>' digest"""
+        return self.blobs.put(data)
+
+    def get(self, digest: str) -> bytes:
+        """Read and verify a blob"""
+        return self.blobs.get(digest)
+
+    def exists(self, digest: str) -> bool:
+        return self.blobs.exists(digest)
+
+
+class CachedContentStore:
+    """
+    Read-through local cache in front of a (remote) content store
+
+    Blobs are immutable, so a cached copy never needs invalidating.
+    """
+
+    def __init__(self, remote: Any, cache_root: Union[str, Path]):
+        """
+        Initialize cache
+
+        Args:
+            remote: ContentStore or a broker store proxy
+            cache_root: Local blob directory
+        """
+        self.remote = remote
+        self.local = BlobStore(cache_root)
+        self.fetched = 0
+
+    def put(self, data: Union[str, bytes]) -> str:
+        digest = self.remote.put(data)
+        self.local.put(data)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        if self.local.exists(digest):
+            return self.local.get(digest)
+        data = self.remote.get(digest)
+        self.fetched += 1
+        self.local.put(data)
+        return data
+
+    def exists(self, digest: str) -> bool:
+        return self.local.exists(digest) or self.remote.exists(digest)
+
+
+def open_store(root: Union[str, Path], remote: Optional[Any] = None) -> Any:
+    """Local store at root, or a cache at root in front of a remote store"""
+    return CachedContentStore(remote, root) if remote is not None else ContentStore(root)
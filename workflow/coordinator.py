@@ -0,0 +1,128 @@
+"""
+Coordinator for Safety Sigma 2.0 Distributed Mode
+
+Puts documents and instructions in the content store (once: a digest that
+is already stored is not uploaded again), shards each document by its
+content hash and enqueues one job per (document, instructions, options).
+Submitting the same job twice is a no-op, so a coordinator can be restarted
+and re-run over the same inputs. With a Scheduler, each job is also routed to
+a worker pool and given its expected latency, which orders the queue.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from audit.blob_store import DIGEST_PREFIX
+
+from .broker import shard_for
+from .scheduler import Scheduler
+
+
+class JobFailed(RuntimeError):
+    """Raised when reading the result of a job that failed"""
+
+
+class Coordinator:
+    """
+    Submits jobs and collects results
+    """
+
+    def __init__(self, broker: Any, store: Any, shards: Optional[int] = None,
+                 scheduler: Optional[Scheduler] = None):
+        """
+        Initialize coordinator
+
+        Args:
+            broker: SQLiteBroker or broker proxy
+            store: ContentStore or store proxy
+            shards: Number of shards (default: SS2_SHARDS or 8)
+            scheduler: Routes jobs to pools, shortest expected job first (default: one queue, oldest first)
+        """
+        self.broker = broker
+        self.store = store
+        self.shards = shards or int(os.getenv('SS2_SHARDS', '8'))
+        self.scheduler = scheduler
+
+    def _put(self, data: Union[str, bytes]) -> str:
+        raw = data.encode('utf-8') if isinstance(data, str) else data
+        digest = DIGEST_PREFIX + hashlib.sha256(raw).hexdigest()
+        if not self.store.exists(digest):
+            self.store.put(raw)
+        return digest
+
+    def submit(self, document: Union[str, Path, bytes], instructions: str, name: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Submit one document
+
+        Args:
+            document: Path to a PDF/text file, or document bytes
+            instructions: Instruction text
+            name: Display name (default: file name or digest)
+            options: Processing options passed to workers (e.g. {'simulate': True})
+
+        Returns:
+            Job id
+        """
+        if isinstance(document, (str, Path)):
+            path = Path(document)
+            name = name or path.name
+            document = path.read_bytes()
+        document_digest = self._put(document)
+        instructions_digest = self._put(instructions)
+        encoded_options = json.dumps(options or {}, sort_keys=True)
+
+        job_id = hashlib.sha256(
+            f"{document_digest}|{instructions_digest}|{encoded_options}".encode('utf-8')).hexdigest()[:32]
+        placement = {}
+        if self.scheduler is not None:
+            scheduled = self.scheduler.place(document)
+            placement = {'pool': scheduled.pool, 'job_class': scheduled.profile.job_class,
+                         'pages': scheduled.profile.pages, 'expected_ms': scheduled.expected_ms}
+        self.broker.enqueue(job_id, name or document_digest[len(DIGEST_PREFIX):][:16],
+                            shard_for(document_digest, self.shards), document_digest, instructions_digest,
+                            encoded_options, **placement)
+        return job_id
+
+    def submit_many(self, documents: Sequence[Union[str, Path]], instructions: str,
+                    options: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Submit several documents with the same instructions"""
+        return [self.submit(document, instructions, options=options) for document in documents]
+
+    def wait(self, job_ids: Sequence[str], timeout: Optional[float] = None,
+             poll_interval: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Wait until every job is done or failed, re-queueing expired leases meanwhile
+
+        Args:
+            job_ids: Jobs to wait for
+            timeout: Seconds to wait (default: no limit)
+            poll_interval: Seconds between polls
+
+        Returns:
+            Final job rows, in job_ids order
+
+        Raises:
+            TimeoutError: If jobs are still pending at the timeout
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            self.broker.requeue_expired()
+            rows = {row['job_id']: row for row in self.broker.jobs(list(job_ids))}
+            pending = [job_id for job_id in job_ids if rows[job_id]['status'] not in ('done', 'failed')]
+            if not pending:
+                return [rows[job_id] for job_id in job_ids]
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"{len(pending)} of {len(job_ids)} jobs still pending after {timeout}s")
+            time.sleep(poll_interval)
+
+    def result(self, job_id: str) -> str:
+        """Result text of a finished job"""
+        row = self.broker.jobs([job_id])[0]
+        if row['status'] != 'done':
+            raise JobFailed(f"Job {job_id} is {row['status']}: {row.get('error')}")
+        return self.store.get(row['result_digest']).decode('utf-8')
@@ -0,0 +1,273 @@
+"""
+Distributed Mode Command Line for Safety Sigma 2.0
+
+Coordinator/worker split with the built-in broker. On one box:
+
+    python -m workflow.distributed run-local --workers 4 --instructions prompt.md --output out/ reports/*.pdf
+
+Across hosts (the broker host keeps the job database and content store):
+
+    SS2_BROKER_AUTHKEY=secret python -m workflow.distributed broker --db jobs/broker.db --listen 0.0.0.0:7450
+    SS2_BROKER_AUTHKEY=secret python -m workflow.distributed worker --broker tcp://broker-host:7450
+    SS2_BROKER_AUTHKEY=secret python -m workflow.distributed submit --broker tcp://broker-host:7450 \\
+        --instructions prompt.md --wait --output out/ reports/*.pdf
+
+--broker takes a database path (same host or shared filesystem) or
+tcp://host:port. Remote workers keep fetched documents in a local cache
+(--cache, default SS2_WORKER_CACHE_DIR).
+
+Scheduling (submit --schedule, run-local --bulk-workers) routes small
+documents to the interactive pool and large ones to the bulk pool, each
+queue shortest expected job first (see workflow.scheduler):
+
+    python -m workflow.distributed run-local --workers 6 --bulk-workers 2 -i prompt.md -o out/ reports/*.pdf
+    python -m workflow.distributed worker --broker tcp://broker-host:7450 --pools bulk,interactive
+
+run-local --profile [sample|cprofile] profiles each worker process and
+writes profile_ss2-worker-<i> files (see metrics.profiling) to --output.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .broker import SQLiteBroker, connect_broker, serve_broker
+from .content_store import ContentStore, open_store
+from .coordinator import Coordinator, JobFailed
+from .scheduler import Scheduler, pool_environment
+from .worker import Worker
+
+
+def default_cache_dir() -> Path:
+    return Path(os.getenv('SS2_WORKER_CACHE_DIR', Path(tempfile.gettempdir()) / 'ss2_content_cache'))
+
+
+def local_store_root(db_path: str) -> Path:
+    """Content store directory kept next to a broker database"""
+    return Path(db_path).parent / 'content'
+
+
+def open_broker(spec: str, store: Optional[str] = None, cache: Optional[str] = None,
+                authkey: Optional[str] = None) -> Tuple[Any, Any]:
+    """
+    Open a broker and content store from a --broker spec
+
+    Args:
+        spec: Database path or tcp://host:port
+        store: Content store directory for a database broker (default: <db dir>/content)
+        cache: Local cache directory for a TCP broker (default: SS2_WORKER_CACHE_DIR)
+        authkey: TCP authkey (default: SS2_BROKER_AUTHKEY)
+
+    Returns:
+        (broker, store)
+    """
+    if spec.startswith('tcp://'):
+        broker, remote_store = connect_broker(spec, authkey)
+        return broker, open_store(cache or default_cache_dir(), remote=remote_store)
+    return SQLiteBroker(spec), ContentStore(store or local_store_root(spec))
+
+
+def _parse_shards(value: Optional[str]) -> Optional[List[int]]:
+    return [int(shard) for shard in value.split(',')] if value else None
+
+
+def _parse_pools(value: Optional[str]) -> Optional[List[str]]:
+    return value.split(',') if value else None
+
+
+def _worker_process(spec: str, store: Optional[str], shards: Optional[List[int]], idle_timeout: float,
+                    poll_interval: float, pools: Optional[List[str]] = None, profile: Optional[str] = None,
+                    profile_dir: Optional[str] = None) -> None:
+    """Entry point of a run-local worker process (configured for its first pool)"""
+    if pools:
+        os.environ.update(pool_environment(pools[0]))
+    broker, content = open_broker(spec, store)
+    worker = Worker(broker, content, shards=shards, poll_interval=poll_interval, pools=pools)
+    if not profile:
+        worker.run(idle_timeout=idle_timeout)
+        return
+    from metrics.profiling import Profiler
+    with Profiler(profile) as profiler:
+        worker.run(idle_timeout=idle_timeout)
+    profiler.write(profile_dir or '.', prefix=f"profile_{multiprocessing.current_process().name}")
+
+
+def _write_results(coordinator: Coordinator, rows: Sequence[dict], output: Path) -> int:
+    """Write done jobs to <output>/<name>.md and report failures; returns the failure count"""
+    output.mkdir(parents=True, exist_ok=True)
+    failures = 0
+    for row in rows:
+        try:
+            text = coordinator.result(row['job_id'])
+        except JobFailed as e:
+            failures += 1
+            print(f"❌ {row['name']}: {e}")
+            continue
+        path = output / f"{Path(row['name']).stem}_{row['job_id'][:8]}.md"
+        path.write_text(text, encoding='utf-8')
+        print(f"✅ {row['name']} → {path} (attempts: {row['attempts']})")
+    return failures
+
+
+def run_local(documents: Sequence[str], instructions: str, output: Path, workers: int, db: Path,
+              shards: Optional[int] = None, simulate: bool = False, timeout: Optional[float] = None,
+              bulk_workers: int = 0, profile: Optional[str] = None) -> int:
+    """
+    Coordinator plus worker processes on this machine
+
+    Workers prefer disjoint shard sets (worker i takes shards i, i+workers, ...)
+    and steal from other shards when theirs are empty. With bulk_workers, jobs
+    are scheduled: the last bulk_workers workers serve the bulk pool (and
+    interactive jobs when it is empty), the others only the interactive pool.
+    With profile ('sample' or 'cprofile'), each worker process profiles its
+    run and writes profile_ss2-worker-<i> files to the output directory.
+
+    Returns:
+        Number of failed jobs
+    """
+    if not 0 <= bulk_workers <= workers:
+        raise ValueError(f"bulk_workers must be between 0 and workers ({workers}), got {bulk_workers}")
+    broker, store = open_broker(str(db))
+    coordinator = Coordinator(broker, store, shards=shards or max(workers, 1) * 2,
+                              scheduler=Scheduler() if bulk_workers else None)
+    job_ids = coordinator.submit_many(documents, instructions, options={'simulate': True} if simulate else None)
+
+    processes = []
+    for index in range(workers):
+        worker_shards = list(range(index, coordinator.shards, workers))
+        pools = None
+        if bulk_workers:
+            pools = ['bulk', 'interactive'] if index >= workers - bulk_workers else ['interactive']
+        process = multiprocessing.Process(target=_worker_process,
+                                          args=(str(db), None, worker_shards, 2.0, 0.2, pools,
+                                                profile, str(output)),
+                                          name=f"ss2-worker-{index}")
+        process.start()
+        processes.append(process)
+
+    try:
+        rows = coordinator.wait(job_ids, timeout=timeout, poll_interval=0.2)
+    finally:
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+    return _write_results(coordinator, rows, output)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Safety Sigma distributed coordinator/worker mode',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log worker activity')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    broker = commands.add_parser('broker', help='Serve the broker and content store over TCP')
+    broker.add_argument('--db', required=True, help='Job database path')
+    broker.add_argument('--store', help='Content store directory (default: <db dir>/content)')
+    broker.add_argument('--listen', default='127.0.0.1:7450', help='host:port to listen on')
+    broker.add_argument('--authkey', help='Shared secret (default: SS2_BROKER_AUTHKEY)')
+
+    def connection(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument('--broker', required=True, help='Job database path or tcp://host:port')
+        sub.add_argument('--store', help='Content store directory for a database broker')
+        sub.add_argument('--authkey', help='Shared secret for a TCP broker (default: SS2_BROKER_AUTHKEY)')
+
+    submit = commands.add_parser('submit', help='Submit documents')
+    connection(submit)
+    submit.add_argument('documents', nargs='+', help='PDF or text documents')
+    submit.add_argument('--instructions', '-i', required=True, help='Instruction markdown file')
+    submit.add_argument('--shards', type=int, help='Number of shards (default: SS2_SHARDS or 8)')
+    submit.add_argument('--schedule', action='store_true',
+                        help='Route jobs to the interactive/bulk pools, shortest expected job first')
+    submit.add_argument('--audit-dir', help='Job latency history for --schedule (default: SS2_AUDIT_DIR)')
+    submit.add_argument('--simulate', action='store_true', help='Simulate processing (no API calls)')
+    submit.add_argument('--wait', action='store_true', help='Wait for the jobs and write their results')
+    submit.add_argument('--timeout', type=float, help='Seconds to wait with --wait')
+    submit.add_argument('--output', '-o', default='.', help='Output directory for --wait')
+
+    worker = commands.add_parser('worker', help='Process jobs')
+    connection(worker)
+    worker.add_argument('--cache', help='Local content cache for a TCP broker (default: SS2_WORKER_CACHE_DIR)')
+    worker.add_argument('--shards', help='Preferred shards, comma separated (default: any)')
+    worker.add_argument('--pools', help='Pools served, most preferred first, comma separated (default: any)')
+    worker.add_argument('--max-jobs', type=int, help='Exit after this many jobs')
+    worker.add_argument('--idle-timeout', type=float, help='Exit after the queue is empty this many seconds')
+
+    status = commands.add_parser('status', help='Show job counts and workers')
+    connection(status)
+
+    local = commands.add_parser('run-local', help='Coordinator and worker processes on this machine')
+    local.add_argument('documents', nargs='+', help='PDF or text documents')
+    local.add_argument('--instructions', '-i', required=True, help='Instruction markdown file')
+    local.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 2)
+    local.add_argument('--db', help='Job database path (default: <output>/.ss2_jobs/broker.db)')
+    local.add_argument('--shards', type=int, help='Number of shards (default: 2 per worker)')
+    local.add_argument('--bulk-workers', type=int, default=0,
+                       help='Workers reserved for large documents; enables scheduling (default: 0)')
+    local.add_argument('--simulate', action='store_true', help='Simulate processing (no API calls)')
+    local.add_argument('--timeout', type=float, help='Seconds to wait for all jobs')
+    local.add_argument('--output', '-o', default='.', help='Output directory')
+    local.add_argument('--profile', nargs='?', const='sample', choices=['sample', 'cprofile'],
+                       help='Profile each worker process and write the results to the output directory')
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = create_argument_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(processName)s %(message)s')
+
+    if args.command == 'broker':
+        print(f"Serving broker {args.db} on {args.listen}")
+        serve_broker(SQLiteBroker(args.db), ContentStore(args.store or local_store_root(args.db)),
+                     args.listen, args.authkey)
+        return 0
+
+    if args.command == 'run-local':
+        output = Path(args.output)
+        db = Path(args.db) if args.db else output / '.ss2_jobs' / 'broker.db'
+        instructions = Path(args.instructions).read_text(encoding='utf-8')
+        failures = run_local(args.documents, instructions, output, args.workers, db, args.shards,
+                             args.simulate, args.timeout, args.bulk_workers, args.profile)
+        return 1 if failures else 0
+
+    broker, store = open_broker(args.broker, args.store, getattr(args, 'cache', None), args.authkey)
+
+    if args.command == 'submit':
+        coordinator = Coordinator(broker, store, shards=args.shards,
+                                  scheduler=Scheduler(audit_dir=args.audit_dir) if args.schedule else None)
+        instructions = Path(args.instructions).read_text(encoding='utf-8')
+        job_ids = coordinator.submit_many(args.documents, instructions,
+                                          options={'simulate': True} if args.simulate else None)
+        for job_id, document in zip(job_ids, args.documents):
+            print(f"{job_id}  {document}")
+        if args.wait:
+            rows = coordinator.wait(job_ids, timeout=args.timeout)
+            return 1 if _write_results(coordinator, rows, Path(args.output)) else 0
+        return 0
+
+    if args.command == 'worker':
+        pools = _parse_pools(args.pools)
+        if pools:
+            os.environ.update(pool_environment(pools[0]))
+        worker = Worker(broker, store, shards=_parse_shards(args.shards), pools=pools)
+        print(f"Worker {worker.worker_id} started")
+        try:
+            worker.run(max_jobs=args.max_jobs, idle_timeout=args.idle_timeout)
+        except KeyboardInterrupt:
+            worker.stop()
+        print(f"Worker {worker.worker_id} completed {worker.processed} jobs ({worker.failed} failed attempts)")
+        return 0
+
+    print(json.dumps(broker.stats(), indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Size- and Complexity-Aware Scheduling for Safety Sigma 2.0 Distributed Mode
+
+Routes each document to a worker pool and orders the queue shortest
+expected job first, so a two-page alert is not stuck behind a 500-page
+report:
+
+- Every document is profiled with the same classes the agents use for
+  template selection (SimpleAgent file size class, EnhancedAgent
+  complexity level) plus its page count
+- Small documents go to the low-latency 'interactive' pool; large ones
+  (or more than SS2_SCHED_BULK_PAGES pages) go to the 'bulk' pool, whose
+  workers run chunked extraction with a larger memory budget
+- The expected latency of a job is its page count times the historical
+  milliseconds per page of its class (size class / complexity), learned
+  from the workflow_jobs audit logs workers write; classes with fewer than
+  SS2_SCHED_MIN_SAMPLES observations use a complexity-weighted default
+- The broker leases the queued job with the lowest expected latency
+
+Configuration:
+    SS2_SCHED_BULK_PAGES   - Page count from which documents go to the bulk pool (default: 100)
+    SS2_SCHED_MIN_SAMPLES  - Observations before a class's history replaces the default rate (default: 3)
+    SS2_BULK_MEMORY_MB     - Memory budget of bulk pool workers (default: SS2_MEMORY_BUDGET_MB)
+"""
+
+import math
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from agents.enhanced_agent import assess_complexity
+from agents.simple_agent import categorize_file_size
+from audit.serialization import HAS_MSGPACK, HAS_ZSTD, get_serializer, iter_records, log_format
+from rules.document_classifier import DocumentClassifierEngine
+
+
+POOLS = ('interactive', 'bulk')
+
+BULK_SIZE_CLASSES = ('large', 'very_large')
+
+# Audit log (workflow_jobs_<date>) that workers append job latencies to
+JOB_RECORD_NAME = 'workflow_jobs'
+
+# Page estimates when a document does not say how many pages it has
+WORDS_PER_PAGE = 500
+PDF_BYTES_PER_PAGE = 50_000
+
+# Default latency before a class has history: LLM processing dominates and
+# grows with the amount of text, more so for structured/technical documents
+DEFAULT_MS_PER_PAGE = 300.0
+COMPLEXITY_FACTORS = {'simple': 1.0, 'moderate': 1.5, 'complex': 2.5}
+
+_PDF_PAGES_DICT = re.compile(rb'<<[^<>]*/Type\s*/Pages\b[^<>]*>>')
+_PDF_COUNT = re.compile(rb'/Count\s+(\d+)')
+_PDF_PAGE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+_classifier: Optional[DocumentClassifierEngine] = None
+
+
+def count_pdf_pages(data: bytes) -> int:
+    """
+    Page count of a PDF without parsing it
+
+    Uses the largest /Count of a /Pages node (the page tree root), else the
+    number of /Page objects, else an estimate from the file size (page
+    objects inside compressed object streams are not visible).
+
+    Args:
+        data: PDF bytes
+
+    Returns:
+        Page count (at least 1)
+    """
+    counts = [int(count) for node in _PDF_PAGES_DICT.findall(data) for count in _PDF_COUNT.findall(node)]
+    if counts:
+        return max(1, max(counts))
+    pages = len(_PDF_PAGE.findall(data))
+    return pages or max(1, len(data) // PDF_BYTES_PER_PAGE)
+
+
+@dataclass(frozen=True)
+class DocumentProfile:
+    """
+    Scheduling profile of one document
+    """
+    size_bytes: int
+    pages: int
+    word_count: int
+    size_class: str
+    complexity: str
+    is_pdf: bool
+
+    @property
+    def job_class(self) -> str:
+        """History key: '<size class>/<complexity>'"""
+        return f"{self.size_class}/{self.complexity}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['job_class'] = self.job_class
+        return data
+
+
+def profile_document(document: bytes) -> DocumentProfile:
+    """
+    Profile a document for scheduling
+
+    Text documents are classified with the same context EnhancedAgent uses.
+    PDF text is not extracted at submit time: the word count is estimated
+    from the page count and the report is taken to be structured.
+
+    Args:
+        document: PDF or UTF-8 text bytes
+
+    Returns:
+        DocumentProfile
+    """
+    global _classifier
+    is_pdf = document.startswith(b'%PDF-')
+    if is_pdf:
+        pages = count_pdf_pages(document)
+        context = {'word_count': pages * WORDS_PER_PAGE, 'has_headers': True}
+    else:
+        if _classifier is None:
+            _classifier = DocumentClassifierEngine()
+        context = _classifier.analyze_document_context(document.decode('utf-8', errors='replace'))
+        pages = max(1, math.ceil(context['word_count'] / WORDS_PER_PAGE))
+
+    return DocumentProfile(
+        size_bytes=len(document),
+        pages=pages,
+        word_count=context['word_count'],
+        size_class=categorize_file_size(len(document)),
+        complexity=assess_complexity(context),
+        is_pdf=is_pdf,
+    )
+
+
+class LatencyModel:
+    """
+    Per-class processing rate (milliseconds per page) learned from history
+    """
+
+    def __init__(self, min_samples: Optional[int] = None, default_ms_per_page: float = DEFAULT_MS_PER_PAGE):
+        """
+        Initialize model
+
+        Args:
+            min_samples: Observations before a class uses its own rate (default: SS2_SCHED_MIN_SAMPLES)
+            default_ms_per_page: Rate for simple documents without history
+        """
+        self.min_samples = min_samples if min_samples is not None else \
+                           int(os.getenv('SS2_SCHED_MIN_SAMPLES', '3'))
+        self.default_ms_per_page = default_ms_per_page
+        self._history: Dict[str, list] = {}  # job_class -> [count, total_ms, total_pages]
+
+    def observe(self, job_class: str, duration_ms: float, pages: int) -> None:
+        """Record one completed job"""
+        entry = self._history.setdefault(job_class, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += duration_ms
+        entry[2] += max(1, pages)
+
+    def samples(self, job_class: str) -> int:
+        return self._history.get(job_class, [0])[0]
+
+    def ms_per_page(self, job_class: str, complexity: str = 'simple') -> float:
+        """Historical rate of a class, or the complexity-weighted default"""
+        entry = self._history.get(job_class)
+        if entry is not None and entry[0] >= self.min_samples:
+            return entry[1] / entry[2]
+        return self.default_ms_per_page * COMPLEXITY_FACTORS.get(complexity, 1.0)
+
+    def expected_ms(self, profile: DocumentProfile) -> float:
+        """Expected processing time of a document"""
+        return self.ms_per_page(profile.job_class, profile.complexity) * profile.pages
+
+    def load(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Learn from workflow job records (failed attempts are ignored)
+
+        Returns:
+            Number of records used
+        """
+        used = 0
+        for record in records:
+            metadata = record.get('metadata') or {}
+            if record.get('success') and metadata.get('job_class'):
+                self.observe(metadata['job_class'], record['duration_ms'], metadata.get('pages') or 1)
+                used += 1
+        return used
+
+    @classmethod
+    def from_audit_dir(cls, audit_dir: Optional[Union[str, Path]] = None, **kwargs) -> 'LatencyModel':
+        """
+        Model learned from the workflow_jobs logs of an audit directory
+
+        Args:
+            audit_dir: Audit directory (default: SS2_AUDIT_DIR)
+            **kwargs: LatencyModel arguments
+
+        Returns:
+            LatencyModel (empty if there is no history)
+        """
+        model = cls(**kwargs)
+        audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+        for path in sorted(audit_dir.glob(f"{JOB_RECORD_NAME}_*")):
+            fmt = log_format(path)
+            if path.suffix == '.zst' and not HAS_ZSTD:
+                continue
+            if fmt == 'json' or (fmt == 'msgpack' and HAS_MSGPACK):
+                model.load(iter_records(path))
+        return model
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {job_class: {'samples': count, 'ms_per_page': total_ms / total_pages}
+                for job_class, (count, total_ms, total_pages) in sorted(self._history.items())}
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    Pool and queue priority of one document
+    """
+    profile: DocumentProfile
+    pool: str
+    expected_ms: float
+
+
+class Scheduler:
+    """
+    Routes documents to pools and estimates their latency
+    """
+
+    def __init__(self, model: Optional[LatencyModel] = None, bulk_pages: Optional[int] = None,
+                 audit_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            model: Latency model (default: learned from audit_dir)
+            bulk_pages: Page count from which documents go to the bulk pool (default: SS2_SCHED_BULK_PAGES)
+            audit_dir: Audit directory with workflow job history (default: SS2_AUDIT_DIR)
+        """
+        self.model = model if model is not None else LatencyModel.from_audit_dir(audit_dir)
+        self.bulk_pages = bulk_pages if bulk_pages is not None else int(os.getenv('SS2_SCHED_BULK_PAGES', '100'))
+
+    def route(self, profile: DocumentProfile) -> str:
+        """Pool for a document profile"""
+        if profile.size_class in BULK_SIZE_CLASSES or profile.pages >= self.bulk_pages:
+            return 'bulk'
+        return 'interactive'
+
+    def place(self, document: bytes) -> Placement:
+        """Profile, route and estimate one document"""
+        profile = profile_document(document)
+        return Placement(profile, self.route(profile), self.model.expected_ms(profile))
+
+
+def pool_environment(pool: str) -> Dict[str, str]:
+    """
+    Environment overrides for the worker processes of a pool
+
+    Bulk workers extract in chunks and get SS2_BULK_MEMORY_MB (when set) as
+    their memory budget; interactive workers use the process defaults.
+    """
+    if pool != 'bulk':
+        return {}
+    environment = {'SS2_CHUNKED_EXTRACTION': 'true'}
+    if os.getenv('SS2_BULK_MEMORY_MB'):
+        environment['SS2_MEMORY_BUDGET_MB'] = os.environ['SS2_BULK_MEMORY_MB']
+    return environment
+
+
+def record_job_latency(job: Dict[str, Any], worker_id: str, start: float, end: float, success: bool,
+                       audit_dir: Optional[Union[str, Path]] = None) -> None:
+    """
+    Append a job's processing time to the workflow_jobs audit log
+
+    Args:
+        job: Job row (with job_class and pages)
+        worker_id: Worker that processed the job
+        start: Processing start time
+        end: Processing end time
+        success: Whether the attempt succeeded
+        audit_dir: Audit directory (default: SS2_AUDIT_DIR)
+    """
+    audit_dir = Path(audit_dir or os.getenv('SS2_AUDIT_DIR', 'audit_logs'))
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    serializer = get_serializer()
+    serializer.write(
+        {
+            'tool_name': JOB_RECORD_NAME,
+            'run_id': job['job_id'],
+            'start_time': start,
+            'end_time': end,
+            'duration_ms': (end - start) * 1000.0,
+            'success': success,
+            'metadata': {
+                'name': job['name'],
+                'job_class': job['job_class'],
+                'pool': job['pool'],
+                'pages': job['pages'],
+                'expected_ms': job['expected_ms'],
+                'worker_id': worker_id,
+                'attempt': job['attempts'],
+            },
+        },
+        log_path=serializer.log_path(audit_dir, f"{JOB_RECORD_NAME}_{time.strftime('%Y-%m-%d')}"),
+    )
@@ -0,0 +1,179 @@
+"""
+Worker for Safety Sigma 2.0 Distributed Mode
+
+Pulls jobs from the broker, reads the document and instructions from the
+content store by digest, processes them and stores the result. A background
+thread heartbeats while the worker runs, extending the lease of the job in
+progress; a worker that dies stops heartbeating and its job is re-queued
+when the lease expires. Exceptions fail the attempt, and the broker
+re-queues the job until it runs out of attempts. The processing time of
+scheduled jobs is appended to the workflow_jobs audit log, the history the
+Scheduler estimates latencies from.
+
+Configuration:
+    SS2_WORKER_HEARTBEAT_SECONDS - Heartbeat interval (default: a third of the lease)
+"""
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .scheduler import record_job_latency
+
+logger = logging.getLogger('safety_sigma.workflow')
+
+# handler(job, document bytes, instructions, options) -> result text
+JobHandler = Callable[[Dict[str, Any], bytes, str, Dict[str, Any]], str]
+
+
+class DocumentHandler:
+    """
+    Default job handler: the same processing as the safety-sigma command
+
+    PDF documents are written to a temporary file for text extraction; other
+    documents are decoded as UTF-8 text. The processor is created on first
+    use and reused for every job of the worker.
+    """
+
+    def __init__(self):
+        self._processor = None
+
+    def __call__(self, job: Dict[str, Any], document: bytes, instructions: str, options: Dict[str, Any]) -> str:
+        if options.get('simulate'):
+            return (f"# Safety Sigma Analysis (SIMULATED)\n\nSimulated processing of {job['name']} "
+                    f"({len(document)} bytes)")
+
+        if self._processor is None:
+            from safety_sigma.processor import SafetySigmaProcessor
+            self._processor = SafetySigmaProcessor()
+
+        if document.startswith(b'%PDF-'):
+            with tempfile.NamedTemporaryFile(suffix='.pdf') as f:
+                f.write(document)
+                f.flush()
+                text = self._processor.extract_pdf_text(f.name)
+        else:
+            text = document.decode('utf-8')
+        return self._processor.process_report(instructions, text)
+
+
+class Worker:
+    """
+    Pull-based job worker
+    """
+
+    def __init__(self, broker: Any, store: Any, worker_id: Optional[str] = None,
+                 shards: Optional[Sequence[int]] = None, handler: Optional[JobHandler] = None,
+                 heartbeat_interval: Optional[float] = None, poll_interval: float = 1.0,
+                 pools: Optional[Sequence[str]] = None):
+        """
+        Initialize worker
+
+        Args:
+            broker: SQLiteBroker or broker proxy
+            store: Content store (or a CachedContentStore on remote hosts)
+            worker_id: Unique id (default: host-pid-random)
+            shards: Preferred shards (default: any)
+            handler: Job handler (default: DocumentHandler)
+            heartbeat_interval: Seconds between heartbeats (default: SS2_WORKER_HEARTBEAT_SECONDS or lease/3)
+            poll_interval: Seconds to sleep when the queue is empty
+            pools: Pools served, most preferred first (default: any)
+        """
+        self.broker = broker
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.shards = list(shards) if shards is not None else None
+        self.pools = list(pools) if pools is not None else None
+        self.handler = handler or DocumentHandler()
+        lease_seconds = getattr(broker, 'lease_seconds', None) or float(os.getenv('SS2_JOB_LEASE_SECONDS', '60'))
+        self.heartbeat_interval = heartbeat_interval or \
+                                  float(os.getenv('SS2_WORKER_HEARTBEAT_SECONDS', str(lease_seconds / 3)))
+        self.poll_interval = poll_interval
+        self.current_job: Optional[str] = None
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            job_id = self.current_job
+            try:
+                if not self.broker.heartbeat(self.worker_id, job_id) and job_id is not None:
+                    logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}")
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for worker {self.worker_id}: {e}")
+
+    def run_one(self) -> Optional[str]:
+        """
+        Lease and process one job
+
+        Returns:
+            Outcome ('done', 'queued' or 'failed' after an error, 'lost'), or None if no job was available
+        """
+        job = self.broker.lease(self.worker_id, self.shards, pools=self.pools)
+        if job is None:
+            return None
+
+        self.current_job = job['job_id']
+        start = time.time()
+        try:
+            document = self.store.get(job['document_digest'])
+            instructions = self.store.get(job['instructions_digest']).decode('utf-8')
+            result = self.handler(job, document, instructions, json.loads(job['options']))
+            result_digest = self.store.put(result)
+            outcome = 'done' if self.broker.complete(job['job_id'], self.worker_id, result_digest) else 'lost'
+            if outcome == 'done':
+                self.processed += 1
+            logger.info(f"Job {job['job_id']} ({job['name']}) {outcome} in {time.time() - start:.2f}s")
+        except Exception as e:
+            self.failed += 1
+            outcome = self.broker.fail(job['job_id'], self.worker_id, f"{type(e).__name__}: {e}")
+            logger.error(f"Job {job['job_id']} ({job['name']}) failed on attempt {job['attempts']}: {e}")
+        finally:
+            self.current_job = None
+        if job.get('job_class'):
+            try:
+                record_job_latency(job, self.worker_id, start, time.time(), outcome == 'done')
+            except Exception as e:
+                logger.warning(f"Failed to record latency of job {job['job_id']}: {e}")
+        return outcome
+
+    def run(self, max_jobs: Optional[int] = None, idle_timeout: Optional[float] = None) -> int:
+        """
+        Process jobs until stopped
+
+        Args:
+            max_jobs: Stop after this many leased jobs
+            idle_timeout: Stop after the queue has been empty this long
+
+        Returns:
+            Number of jobs completed
+        """
+        self.broker.register_worker(self.worker_id, socket.gethostname(), os.getpid(), self.shards)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name=f"heartbeat-{self.worker_id}", daemon=True)
+        heartbeat.start()
+        leased = 0
+        idle_since = time.time()
+        try:
+            while not self._stop.is_set() and (max_jobs is None or leased < max_jobs):
+                if self.run_one() is None:
+                    if idle_timeout is not None and time.time() - idle_since >= idle_timeout:
+                        break
+                    self._stop.wait(self.poll_interval)
+                else:
+                    leased += 1
+                    idle_since = time.time()
+        finally:
+            self._stop.set()
+            heartbeat.join(timeout=self.heartbeat_interval)
+        return self.processed
+
+    def stop(self) -> None:
+        """Stop after the job in progress"""
+        self._stop.set()